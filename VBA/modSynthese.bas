@@ -89,10 +89,11 @@ ErrorHandler:
 End Sub
 
 Sub Btn_Collect_RM_Data()
-    Dim baseDir As String, xmlPath As String
+    Dim baseDir As String, xmlPath As String, statusPath As String
     Dim ws As Worksheet, wsLC As Worksheet
     Dim result As Collection
     Dim exitCode As Long, rowsImported As Long, startRow As Long
+    Dim useStatus As Boolean
 
     If MsgBox("Do you want to proceed with importing the pointage data?" & vbCrLf & _
               "This will import data from RM_Collaborateurs into the SYNTHESE sheet.", _
@@ -133,14 +134,24 @@ Sub Btn_Collect_RM_Data()
     If startRow < 3 Then startRow = 3
     rowsImported = 0
 
-    ImportPointageRows ws, result, startRow, rowsImported, 11, 53
+    ' Row colors come precomputed as ranges; older exports only carry the per-row helper total
+    statusPath = baseDir & "\pointage_status.xml"
+    useStatus = (Dir(statusPath) <> "")
+    ImportPointageRows ws, result, startRow, rowsImported, 11, IIf(useStatus, 0, 53)
 
     If rowsImported > 0 Then
         Set wsLC = ThisWorkbook.Sheets(SHEET_LC)
         UpdateSyntheseFromLC ws, wsLC, startRow, startRow + rowsImported - 1
     End If
 
-    ApplySyntheseRowColoring ws, startRow, 11, 53, 35
+    If useStatus Then
+        If Not ApplySyntheseStatusRanges(ws, statusPath, startRow, 11) Then
+            MsgBox "Could not read pointage_status.xml: rows were imported without colors.", vbExclamation, "Warning"
+        End If
+        Kill statusPath
+    Else
+        ApplySyntheseRowColoring ws, startRow, 11, 53, 35
+    End If
     If Dir(xmlPath) <> "" Then Kill xmlPath
 
     MsgBox IIf(rowsImported > 0, _
@@ -156,10 +167,11 @@ ErrorHandler:
 End Sub
 
 Sub Btn_Collect_RM_Data_Reset()
-    Dim baseDir As String, xmlPath As String
+    Dim baseDir As String, xmlPath As String, statusPath As String
     Dim ws As Worksheet, wsLC As Worksheet
     Dim result As Collection
     Dim exitCode As Long, rowsImported As Long, startRow As Long
+    Dim useStatus As Boolean
 
     If MsgBox("Do you want to proceed with importing the pointage data?" & vbCrLf & _
               "This will import data into the SYNTHESE sheet, archive RM_Collaborateurs and create new interfaces.", _
@@ -201,14 +213,24 @@ Sub Btn_Collect_RM_Data_Reset()
     If startRow < 3 Then startRow = 3
     rowsImported = 0
 
-    ImportPointageRows ws, result, startRow, rowsImported, 11, 53
+    ' Row colors come precomputed as ranges; older exports only carry the per-row helper total
+    statusPath = baseDir & "\pointage_status.xml"
+    useStatus = (Dir(statusPath) <> "")
+    ImportPointageRows ws, result, startRow, rowsImported, 11, IIf(useStatus, 0, 53)
 
     If rowsImported > 0 Then
         Set wsLC = ThisWorkbook.Sheets(SHEET_LC)
         UpdateSyntheseFromLC ws, wsLC, startRow, startRow + rowsImported - 1
     End If
 
-    ApplySyntheseRowColoring ws, startRow, 11, 53, 35
+    If useStatus Then
+        If Not ApplySyntheseStatusRanges(ws, statusPath, startRow, 11) Then
+            MsgBox "Could not read pointage_status.xml: rows were imported without colors.", vbExclamation, "Warning"
+        End If
+        Kill statusPath
+    Else
+        ApplySyntheseRowColoring ws, startRow, 11, 53, 35
+    End If
     If Dir(xmlPath) <> "" Then Kill xmlPath
 
     MsgBox IIf(rowsImported > 0, _
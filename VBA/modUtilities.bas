@@ -227,6 +227,36 @@ Sub ApplySyntheseRowColoring(ws As Worksheet, Optional startRow As Long = 3, _
     Next r
 End Sub
 
+' Colors SYNTHESE from pointage_status.xml: one Range call per run of rows with the same status.
+' first/last are 1-based positions in pointage_output.xml, i.e. offsets from startRow.
+Function ApplySyntheseStatusRanges(ws As Worksheet, statusPath As String, startRow As Long, _
+                                   Optional dataLastCol As Long = 11) As Boolean
+    Dim xml As Object, rangeNode As Object
+    Dim firstRow As Long, lastRow As Long
+    Dim redColor As Long, greenColor As Long
+
+    ApplySyntheseStatusRanges = False
+    If Dir(statusPath) = "" Then Exit Function
+
+    Set xml = CreateObject("MSXML2.DOMDocument")
+    xml.async = False
+    xml.Load statusPath
+    If xml.parseError.ErrorCode <> 0 Then Exit Function
+
+    redColor = RGB(255, 0, 0)
+    greenColor = RGB(0, 176, 80)
+
+    For Each rangeNode In xml.SelectNodes("//range")
+        firstRow = startRow + CLng(rangeNode.getAttribute("first")) - 1
+        lastRow = startRow + CLng(rangeNode.getAttribute("last")) - 1
+        With ws.Range(ws.Cells(firstRow, 1), ws.Cells(lastRow, dataLastCol)).Interior
+            If rangeNode.getAttribute("status") = "under" Then .Color = redColor Else .Color = greenColor
+        End With
+    Next rangeNode
+
+    ApplySyntheseStatusRanges = True
+End Function
+
 Sub ImportPointageRows(ws As Worksheet, result As Collection, startRow As Long, _
                        ByRef rowsImported As Long, _
                        Optional dataLastCol As Long = 11, Optional helperCol As Long = 53)
@@ -242,7 +272,7 @@ Sub ImportPointageRows(ws As Worksheet, result As Collection, startRow As Long,
             Value = rowData(c)
             If c <= dataLastCol Then
                 ws.Cells(r, c).Value = Value
-            ElseIf c = 12 Then
+            ElseIf c = 12 And helperCol > 0 Then
                 ws.Cells(r, helperCol).Value = Value
             End If
         Next c
@@ -0,0 +1,6 @@
+"""
+Benchmarks for CE VHST Roadmap automation.
+
+Run from the project root, e.g.:
+    python -m benchmarks.stat_calls --collaborators 200
+"""
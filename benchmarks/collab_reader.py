@@ -0,0 +1,104 @@
+"""
+Time reading the collaborator list from the synthesis workbook.
+
+Compares loading the workbook with openpyxl (read-only mode) to streaming only the
+'Gestion_Interfaces' sheet part with roadmap.xlsx, on a synthetic workbook whose SYNTHESE
+sheet holds a configurable number of pointage rows.
+
+Usage:
+    python -m benchmarks.collab_reader [--collaborators N] [--synthese-rows N]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+from roadmap.xlsx import read_column
+
+
+def make_synthese(path: Path, collaborators: int, synthese_rows: int) -> None:
+    """
+    Write a synthetic synthesis workbook.
+
+    Args:
+        path (Path): Output path.
+        collaborators (int): Names written to 'Gestion_Interfaces'!B3:B...
+        synthese_rows (int): Rows of 11 columns written to SYNTHESE.
+    """
+    wb = Workbook(write_only=True)
+    ws_gi = wb.create_sheet("Gestion_Interfaces")
+    ws_gi.append([])
+    ws_gi.append([None, "Collaborateur"])
+    for idx in range(collaborators):
+        ws_gi.append([None, f"COLLAB{idx:05d} Test"])
+
+    ws_synth = wb.create_sheet("SYNTHESE")
+    for idx in range(synthese_rows):
+        ws_synth.append([None, f"COLLAB{idx % max(collaborators, 1):05d} Test", "S0125", None,
+                         f"KEY{idx % 50:03d} Sprint 1", "Label", "Function", "", "", 7.5, ""])
+    wb.save(path)
+
+
+def with_openpyxl(path: Path) -> list[str]:
+    wb = load_workbook(path, read_only=True)
+    ws = wb["Gestion_Interfaces"]
+    names = []
+    for (value,) in ws.iter_rows(min_row=3, min_col=2, max_col=2, values_only=True):
+        if value is None or not str(value).strip():
+            break
+        names.append(str(value).strip())
+    wb.close()
+    return names
+
+
+def with_stream(path: Path) -> list[str]:
+    return read_column(path, "Gestion_Interfaces", "B", start_row=3)
+
+
+def run(collaborators: int, synthese_rows: int, repeat: int = 3) -> dict:
+    """
+    Measure both readers.
+
+    Returns:
+        dict: Best time of each reader in seconds and the speedup.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Synthèse_RM_CE.xlsm"
+        make_synthese(path, collaborators, synthese_rows)
+
+        timings = {}
+        for label, reader in (("openpyxl", with_openpyxl), ("stream", with_stream)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                names = reader(path)
+                best = min(best, time.perf_counter() - start)
+            assert len(names) == collaborators
+            timings[label] = best
+
+    return {
+        "collaborators": collaborators,
+        "synthese_rows": synthese_rows,
+        "openpyxl_s": round(timings["openpyxl"], 4),
+        "stream_s": round(timings["stream"], 4),
+        "speedup": round(timings["openpyxl"] / timings["stream"], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time reading the collaborator list from the synthesis workbook.")
+    parser.add_argument("--collaborators", type=int, default=200, help="Collaborators in Gestion_Interfaces (default: 200)")
+    parser.add_argument("--synthese-rows", type=int, default=20000, help="Rows in SYNTHESE (default: 20000)")
+    args = parser.parse_args()
+
+    result = run(args.collaborators, args.synthese_rows)
+    print(f"{result['collaborators']} collaborators, {result['synthese_rows']} SYNTHESE rows:")
+    print(f"  openpyxl (read-only): {result['openpyxl_s']:.4f}s")
+    print(f"  streamed sheet part:  {result['stream_s']:.4f}s")
+    print(f"  speedup: x{result['speedup']}")
+
+
+if __name__ == "__main__":
+    main()
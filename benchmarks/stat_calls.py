@@ -0,0 +1,228 @@
+"""
+Count the filesystem metadata calls made by the roadmap commands.
+
+Builds a synthetic base directory (see benchmarks.workspace) and runs the real RoadmapManager
+commands on it, one after the other, counting the metadata calls of each: os.stat, os.lstat,
+os.scandir and DirEntry.stat. On a OneDrive or SMB folder, each counted call is a network round
+trip. Reads of workbook content are not counted.
+
+For each command the report gives:
+    - listings: directory listings of 'RM_Collaborateurs' (one per command with the workspace
+      snapshot, see roadmap.snapshot; the flat layout has no subfolder to list)
+    - folder: metadata calls on 'RM_Collaborateurs' and the files it contains
+    - total: all metadata calls, including the template, the synthesis workbook and temporary files
+
+The counts are shown next to a baseline, by default 'stat_calls_baseline.json': the same
+benchmark run on the code before the workspace snapshot (commit 0191efa: one glob per listing
+and one Path.exists() per collaborator), which has no 'check' command. --output writes a run
+that can be given as --baseline later.
+
+Usage:
+    python -m benchmarks.stat_calls [--collaborators N] [--json] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.workspace import WorkspaceSpec, make_workspace, write_lc_payload
+from roadmap.roadmap import RoadmapManager
+
+COMMANDS = ("create", "cleanup", "pointage", "update", "check")
+BASELINE_FILE = Path(__file__).with_name("stat_calls_baseline.json")
+
+
+class _CountingEntry:
+    """DirEntry proxy counting stat() calls (a syscall on POSIX, free on Windows)."""
+
+    def __init__(self, entry, counter):
+        self._entry = entry
+        self._counter = counter
+
+    def stat(self, *args, **kwargs):
+        self._counter["DirEntry.stat"] += 1
+        return self._entry.stat(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self._entry.path
+
+
+class _CountingScandir:
+    def __init__(self, iterator, counter):
+        self._iterator = iterator
+        self._counter = counter
+
+    def __iter__(self):
+        for entry in self._iterator:
+            yield _CountingEntry(entry, self._counter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._iterator.close()
+
+    def close(self):
+        self._iterator.close()
+
+
+@contextlib.contextmanager
+def count_metadata_calls(folder: Path | str | None = None):
+    """
+    Count os.stat, os.lstat, os.scandir and DirEntry.stat calls made inside the block.
+
+    Args:
+        folder (Path | str | None, optional): Only count the calls on this folder and the
+            files under it. Defaults to None (every call).
+
+    Yields:
+        Counter: Call counts by function name.
+    """
+    counter = Counter()
+    original = {"stat": os.stat, "lstat": os.lstat, "scandir": os.scandir}
+    prefix = None if folder is None else os.path.abspath(folder)
+
+    def counted(path) -> bool:
+        if prefix is None:
+            return True
+        if isinstance(path, int):
+            return False
+        path = os.path.abspath(os.fsdecode(os.fspath(path)))
+        return path == prefix or path.startswith(prefix + os.sep)
+
+    def stat(path, *args, **kwargs):
+        if counted(path):
+            counter["os.stat"] += 1
+        return original["stat"](path, *args, **kwargs)
+
+    def lstat(path, *args, **kwargs):
+        if counted(path):
+            counter["os.lstat"] += 1
+        return original["lstat"](path, *args, **kwargs)
+
+    def scandir(path=".", *args, **kwargs):
+        iterator = original["scandir"](path, *args, **kwargs)
+        if not counted(path):
+            return iterator
+        counter["os.scandir"] += 1
+        return _CountingScandir(iterator, counter)
+
+    os.stat, os.lstat, os.scandir = stat, lstat, scandir
+    try:
+        yield counter
+    finally:
+        os.stat, os.lstat, os.scandir = original["stat"], original["lstat"], original["scandir"]
+
+
+def run_command(manager: RoadmapManager, command: str) -> None:
+    """Run one command of the benchmark (sequential variants, no worker processes)."""
+    if command == "create":
+        manager.create_interfaces()
+    elif command == "cleanup":
+        manager.delete_missing_collaborators()
+    elif command == "pointage":
+        manager.pointage()
+    elif command == "update":
+        manager.update_lc()
+    elif command == "check":
+        manager.check()
+    else:
+        raise ValueError(f"Unknown command '{command}'")
+
+
+def run(collaborators: int, commands: tuple[str, ...] = COMMANDS) -> dict:
+    """
+    Run the commands on a fresh synthetic workspace and count their metadata calls.
+
+    Args:
+        collaborators (int): Number of collaborators (interface files created by 'create').
+        commands (tuple[str, ...], optional): Commands run in order. Defaults to COMMANDS.
+
+    Returns:
+        dict: For each command, the listings of RM_Collaborateurs, the calls on the folder
+        (by function and in total) and the total of all calls.
+    """
+    spec = WorkspaceSpec(collaborators=collaborators, rows=0, lc_rows=20)
+    result = {"collaborators": collaborators, "commands": {}}
+    with tempfile.TemporaryDirectory(prefix="roadmap_stat_calls_") as tmp:
+        base = make_workspace(Path(tmp) / "base", spec)
+        write_lc_payload(base, spec)
+        manager = RoadmapManager(base)
+        manager.max_io_workers = 1
+        rm_folder = manager.rm_folder
+
+        for command in commands:
+            with count_metadata_calls() as every, count_metadata_calls(rm_folder) as folder:
+                run_command(manager, command)
+            result["commands"][command] = {
+                "listings": folder["os.scandir"],
+                "folder": dict(folder),
+                "folder_total": sum(folder.values()),
+                "total": sum(every.values()),
+            }
+    return result
+
+
+def compare(result: dict, baseline: dict) -> list[tuple[str, dict | None, dict]]:
+    """
+    Put the counts of a run next to the counts of a baseline run.
+
+    Args:
+        result (dict): Output of run().
+        baseline (dict): Output of an earlier run(), e.g. BASELINE_FILE.
+
+    Returns:
+        list[tuple[str, dict | None, dict]]: (command, baseline counts, current counts) for each
+        command of the run, with None when the baseline did not run it.
+
+    Raises:
+        ValueError: If the two runs used a different number of collaborators.
+    """
+    if result["collaborators"] != baseline.get("collaborators"):
+        raise ValueError(f"Baseline has {baseline.get('collaborators')} collaborators, "
+                         f"not {result['collaborators']}")
+    return [(command, baseline["commands"].get(command), counts) for command, counts in result["commands"].items()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count the metadata calls made by the roadmap commands.")
+    parser.add_argument("--collaborators", type=int, default=100, help="Number of collaborators (default: 100)")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("--output", type=Path, default=None, help="Write the result to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE,
+                        help="Compare with the result stored in this JSON file (default: the counts before the snapshot)")
+    args = parser.parse_args()
+
+    result = run(args.collaborators)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("collaborators") != args.collaborators:
+        print(f"{args.baseline.name} was measured with {baseline.get('collaborators')} collaborators: "
+              f"run with --collaborators {baseline.get('collaborators')} to compare")
+        baseline = {"collaborators": args.collaborators, "commands": {}}
+
+    def before(counts: dict | None, key: str) -> str:
+        return "-" if counts is None else str(counts[key])
+
+    print(f"Metadata calls per command, {args.collaborators} collaborators (before -> after):")
+    print(f"  {'command':<10} {'listings':>14} {'folder':>14} {'total':>14}  folder calls")
+    for command, old, new in compare(result, baseline):
+        print(f"  {command:<10}"
+              + "".join(f" {before(old, key) + ' -> ' + str(new[key]):>14}" for key in ("listings", "folder_total", "total"))
+              + f"  {new['folder']}")
+    print("  note: DirEntry.stat is served by the directory listing on Windows (no extra round trip)")
+
+
+if __name__ == "__main__":
+    main()
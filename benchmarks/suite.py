@@ -0,0 +1,256 @@
+"""
+Time the roadmap commands on a synthetic workspace and compare with a stored baseline.
+
+Each run builds a fresh workspace (see benchmarks.workspace) and times, in order:
+    worker_spawn start of one pool worker with the spawn start method (as on Windows and in
+                 the PyInstaller build), from pool creation to the result of a trivial task
+    create       create_interfaces() (sequential)
+    create_para  create_interfaces_fast() on an emptied RM_Collaborateurs folder
+    pointage     pointage() once every interface holds `--rows` rows
+    update       update_lc() from a generated 'LC.xlsx'
+    cleanup      delete_missing_collaborators() with 10% of the collaborators removed
+    delete       delete_and_archive_interfaces(archive=True)
+
+Each timing includes building the RoadmapManager, as a CLI call does. Preparation steps
+(workspace generation, filling the interfaces, writing 'collabs.xml' / 'LC.xlsx') are not
+timed. With --repeat, the best time of each command is kept.
+
+Results are written as JSON (--output). Given a --baseline written by an earlier run, the
+commands more than --tolerance slower are reported and the exit code is 1.
+
+Usage:
+    python -m benchmarks.suite [--collaborators N] [--rows M] [--lc-rows K] [--repeat R]
+                               [--output FILE] [--baseline FILE] [--tolerance 0.25]
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import openpyxl
+
+from benchmarks.workspace import (WorkspaceSpec, fill_pointage, make_workspace,
+                                  write_collabs_xml, write_lc_payload)
+from roadmap.worker import initialize, ping
+
+COMMANDS = ("worker_spawn", "create", "create_para", "pointage", "update", "cleanup", "delete")
+RESULTS_VERSION = 1
+DEFAULT_TOLERANCE = 0.25
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """
+    Timing of a command against the baseline.
+
+    Attributes:
+        command (str): Command name (see COMMANDS).
+        baseline_s (float): Baseline time in seconds.
+        current_s (float): Current time in seconds.
+        regressed (bool): Whether the current time exceeds the baseline by more than the tolerance.
+    """
+    command: str
+    baseline_s: float
+    current_s: float
+    regressed: bool
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s if self.baseline_s else float("inf")
+
+
+def _timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def time_worker_spawn() -> tuple[float, dict]:
+    """
+    Time the start of one spawned pool worker, as create_interfaces_fast() starts them.
+
+    Returns:
+        tuple[float, dict]: Seconds from pool creation to the first result, and what the
+        worker reported (see roadmap.worker.ping).
+    """
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=initialize, initargs=(None,)) as executor:
+        info = executor.submit(ping).result()
+        seconds = time.perf_counter() - start
+    return seconds, info
+
+
+def run_once(base: Path, spec: WorkspaceSpec, commands: tuple[str, ...] = COMMANDS) -> dict[str, float]:
+    """
+    Build a workspace in `base` and time the commands on it.
+
+    Args:
+        base (Path): Empty directory used as base directory.
+        spec (WorkspaceSpec): Scale of the workspace.
+        commands (tuple[str, ...], optional): Commands to time. Defaults to all of COMMANDS.
+            The preparation of skipped commands still runs, so later timings are unchanged.
+
+    Returns:
+        dict[str, float]: Seconds by command.
+    """
+    # Imported here: a spawned worker re-imports this module as __mp_main__, and must not load
+    # the manager, so that worker_spawn measures the worker bootstrap alone
+    from roadmap.roadmap import RoadmapManager
+
+    timings = {}
+    if "worker_spawn" in commands:
+        timings["worker_spawn"], _ = time_worker_spawn()
+
+    make_workspace(base, spec)
+    names = spec.names()
+
+    def step(command: str, func: Callable[[], object]) -> None:
+        if command in commands:
+            timings[command] = _timed(func)
+        else:
+            func()
+
+    step("create", lambda: RoadmapManager(base).create_interfaces())
+
+    shutil.rmtree(base / "RM_Collaborateurs")
+    (base / "RM_Collaborateurs").mkdir()
+    write_collabs_xml(base, names)
+    step("create_para", lambda: RoadmapManager(base).create_interfaces_fast())
+
+    fill_pointage(base, spec)
+    step("pointage", lambda: RoadmapManager(base).pointage())
+
+    write_lc_payload(base, spec)
+    step("update", lambda: RoadmapManager(base).update_lc())
+
+    write_collabs_xml(base, names[:len(names) - len(names) // 10])
+    step("cleanup", lambda: RoadmapManager(base).delete_missing_collaborators())
+
+    step("delete", lambda: RoadmapManager(base).delete_and_archive_interfaces(archive=True))
+    return timings
+
+
+def environment() -> dict:
+    """Machine and library versions, recorded with the results."""
+    return {
+        "python": platform.python_version(),
+        "openpyxl": openpyxl.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(spec: WorkspaceSpec, repeat: int = 1, commands: tuple[str, ...] = COMMANDS,
+        workdir: Path | str | None = None) -> dict:
+    """
+    Run the benchmark `repeat` times, each on a fresh workspace.
+
+    Args:
+        spec (WorkspaceSpec): Scale of the workspace.
+        repeat (int, optional): Number of runs. Defaults to 1.
+        commands (tuple[str, ...], optional): Commands to time. Defaults to all of COMMANDS.
+        workdir (Path | str | None, optional): Directory for the workspaces (e.g. a OneDrive
+            folder, to measure it). Defaults to a temporary directory.
+
+    Returns:
+        dict: JSON-serializable results: spec, environment, best time of each command
+        ('timings') and the times of every run ('runs').
+    """
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="roadmap_bench_", dir=workdir) as tmp:
+            runs.append(run_once(Path(tmp) / "base", spec, commands))
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "spec": spec.to_dict(),
+        "environment": environment(),
+        "repeat": repeat,
+        "timings": {command: round(min(r[command] for r in runs), 4) for command in commands},
+        "runs": [{command: round(seconds, 4) for command, seconds in r.items()} for r in runs],
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[Comparison]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (dict): Output of run().
+        baseline (dict): Output of an earlier run(), e.g. loaded from a stored JSON file.
+        tolerance (float, optional): Allowed slowdown, as a fraction of the baseline time.
+            Defaults to 0.25 (25%).
+
+    Returns:
+        list[Comparison]: One entry per command timed in both.
+
+    Raises:
+        ValueError: If the two were measured on workspaces of different scale.
+    """
+    if results.get("spec") != baseline.get("spec"):
+        raise ValueError(f"Baseline scale {baseline.get('spec')} differs from {results.get('spec')}")
+    return [
+        Comparison(command, baseline["timings"][command], seconds,
+                   seconds > baseline["timings"][command] * (1 + tolerance))
+        for command, seconds in results["timings"].items()
+        if command in baseline.get("timings", {})
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the roadmap commands on a synthetic workspace.")
+    parser.add_argument("--collaborators", type=int, default=51, help="Collaborators (default: 51)")
+    parser.add_argument("--rows", type=int, default=20, help="Pointage rows per collaborator (default: 20)")
+    parser.add_argument("--lc-rows", type=int, default=200, help="Rows of the LC lists (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated content (default: 0)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs, best time kept (default: 1)")
+    parser.add_argument("--commands", nargs="+", choices=COMMANDS, default=list(COMMANDS),
+                        help="Commands to time (default: all)")
+    parser.add_argument("--workdir", type=Path, default=None, help="Directory for the workspaces (default: temp dir)")
+    parser.add_argument("--output", type=Path, default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare with the results stored in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown against the baseline (default: 0.25 = 25%%)")
+    parser.add_argument("--verbose", action="store_true", help="Keep the INFO logs of the commands")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger("roadmap").setLevel(logging.WARNING)
+
+    spec = WorkspaceSpec(collaborators=args.collaborators, rows=args.rows, lc_rows=args.lc_rows, seed=args.seed)
+    results = run(spec, args.repeat, tuple(c for c in COMMANDS if c in args.commands), args.workdir)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{spec.collaborators} collaborators, {spec.rows} rows each, {spec.lc_rows} LC rows "
+          f"(best of {args.repeat}):")
+    for command, seconds in results["timings"].items():
+        print(f"  {command:<12} {seconds:8.3f}s")
+
+    if args.baseline:
+        comparisons = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        print(f"Against {args.baseline}:")
+        for c in comparisons:
+            flag = "  REGRESSION" if c.regressed else ""
+            print(f"  {c.command:<12} {c.baseline_s:8.3f}s -> {c.current_s:8.3f}s  x{c.ratio:.2f}{flag}")
+        if any(c.regressed for c in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
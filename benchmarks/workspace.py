@@ -0,0 +1,209 @@
+"""
+Synthetic workspace generator for the benchmarks.
+
+Builds a base directory laid out like the production one (see tests/conftest.py for the
+minimal version used by the tests), at a configurable scale:
+    - 'RM_template.xlsx' with a POINTAGE sheet (headers, week list) and an LC sheet
+    - 'Synthèse_RM_CE.xlsm' with Gestion_Interfaces, SYNTHESE, LC (lists B:D and lookup
+      table F:K) and Extract_MSP sheets
+    - 'collabs.xml' and the RM_Collaborateurs / Archived / Deleted folders
+
+Content is derived from a seed, so two workspaces built with the same parameters are identical.
+
+Usage:
+    python -m benchmarks.workspace OUTPUT_DIR [--collaborators N] [--rows M] [--lc-rows K]
+"""
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+FUNCTIONS = ("Développement", "Validation", "Intégration", "Gestion de projet", "Support")
+POINTAGE_HEADERS = ["Semaine", "Collaborateur", "Code semaine", "Semaine", "Clé", "Libellé", "Fonction",
+                    "Commentaire", "Date", "Heures", "Date saisie"]
+
+
+@dataclass(frozen=True)
+class WorkspaceSpec:
+    """
+    Scale of a synthetic workspace.
+
+    Attributes:
+        collaborators (int): Collaborators listed in Gestion_Interfaces and collabs.xml.
+        rows (int): Pointage rows filled in each interface file (see fill_pointage).
+        lc_rows (int): Rows of the LC lists (B:D) and of the lookup table (F:K).
+        weeks (int): Week codes offered in the POINTAGE week list.
+        seed (int): Seed of the generated content.
+    """
+    collaborators: int = 51
+    rows: int = 20
+    lc_rows: int = 200
+    weeks: int = 52
+    seed: int = 0
+
+    def names(self) -> list[str]:
+        return [f"COLLAB{idx:04d} Test" for idx in range(self.collaborators)]
+
+    def week_codes(self) -> list[str]:
+        return [f"S{week % 52 + 1:02d}25" for week in range(self.weeks)]
+
+    def lc_entries(self) -> list[tuple[str, str, str]]:
+        """(key, label, function) of each LC row."""
+        return [(f"KEY{idx:05d}", f"Libellé tâche {idx}", FUNCTIONS[idx % len(FUNCTIONS)])
+                for idx in range(self.lc_rows)]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _write_lc_sheet(ws, spec: WorkspaceSpec, lookup: bool) -> None:
+    """Fill an LC sheet: lists in B:D from row 3, and optionally the lookup table F:K."""
+    ws["B2"], ws["C2"], ws["D2"] = "Clé", "Libellé", "Fonction"
+    for row, (key, label, function) in enumerate(spec.lc_entries(), start=3):
+        ws.cell(row=row, column=2, value=key)
+        ws.cell(row=row, column=3, value=label)
+        ws.cell(row=row, column=4, value=function)
+        if lookup:
+            ws.cell(row=row, column=6, value=key)
+            ws.cell(row=row, column=7, value=label)
+            ws.cell(row=row, column=8, value=f"Lot {row % 7}")
+            ws.cell(row=row, column=9, value=f"Jalon {row % 11}")
+            ws.cell(row=row, column=10, value=function)
+            ws.cell(row=row, column=11, value=row % 20 + 1)
+
+
+def make_template(path: Path, spec: WorkspaceSpec) -> None:
+    """Write 'RM_template.xlsx'."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "POINTAGE"
+    ws["A1"], ws["J1"], ws["K1"] = "Pointage", "Total", 0
+    for col, header in enumerate(POINTAGE_HEADERS, start=1):
+        ws.cell(row=3, column=col, value=header)
+    # Week list referenced by the week data validation ('POINTAGE'!$A$2)
+    ws["A2"] = spec.week_codes()[0]
+    _write_lc_sheet(wb.create_sheet("LC"), spec, lookup=False)
+    wb.save(path)
+
+
+def make_synthese(path: Path, spec: WorkspaceSpec) -> None:
+    """Write 'Synthèse_RM_CE.xlsm' (xlsx content, as in the tests)."""
+    rng = random.Random(spec.seed)
+    wb = Workbook()
+    ws_gi = wb.active
+    ws_gi.title = "Gestion_Interfaces"
+    ws_gi["B2"] = "Collaborateur"
+    for row, name in enumerate(spec.names(), start=3):
+        ws_gi.cell(row=row, column=2, value=name)
+
+    ws_synth = wb.create_sheet("SYNTHESE")
+    for col, header in enumerate(POINTAGE_HEADERS, start=1):
+        ws_synth.cell(row=1, column=col, value=header)
+
+    _write_lc_sheet(wb.create_sheet("LC"), spec, lookup=True)
+
+    ws_msp = wb.create_sheet("Extract_MSP")
+    ws_msp.append(["Id", "Clé", "Fonction", None, None, "Libellé"])
+    entries = spec.lc_entries()
+    for idx in range(spec.lc_rows * 3):
+        key, label, function = entries[rng.randrange(len(entries))] if entries else ("", "", "")
+        row = [None] * 21
+        row[0], row[1], row[2], row[5] = idx + 1, key, function, label
+        row[13], row[20] = rng.choice((0, 1, 2.5)), rng.randrange(1, 21)
+        ws_msp.append(row)
+    wb.save(path)
+
+
+def write_collabs_xml(base: Path, names: list[str]) -> None:
+    """Write 'collabs.xml' as the VBA export does (consumed by the next command)."""
+    content = "".join(f"<collaborator>{name}</collaborator>" for name in names)
+    (base / "collabs.xml").write_text(
+        f'<?xml version="1.0" encoding="UTF-8"?><collaborators>{content}</collaborators>', encoding="utf-8")
+
+
+def make_workspace(base: Path | str, spec: WorkspaceSpec) -> Path:
+    """
+    Create a synthetic base directory.
+
+    Args:
+        base (Path | str): Directory to fill (created if needed).
+        spec (WorkspaceSpec): Scale of the workspace.
+
+    Returns:
+        Path: The base directory.
+    """
+    base = Path(base)
+    base.mkdir(parents=True, exist_ok=True)
+    make_template(base / "RM_template.xlsx", spec)
+    make_synthese(base / "Synthèse_RM_CE.xlsm", spec)
+    write_collabs_xml(base, spec.names())
+    for folder in ("RM_Collaborateurs", "Archived", "Deleted"):
+        (base / folder).mkdir(exist_ok=True)
+    return base
+
+
+def fill_pointage(base: Path | str, spec: WorkspaceSpec) -> int:
+    """
+    Fill the POINTAGE sheet of every interface file with `spec.rows` rows.
+
+    Args:
+        base (Path | str): Base directory with created interfaces.
+        spec (WorkspaceSpec): Scale of the workspace.
+
+    Returns:
+        int: Number of interface files filled.
+    """
+    rng = random.Random(spec.seed + 1)
+    entries = spec.lc_entries() or [("KEY", "Libellé", FUNCTIONS[0])]
+    weeks = spec.week_codes()
+    files = sorted((Path(base) / "RM_Collaborateurs").glob("RM_*.xlsx"))
+    for path in files:
+        name = path.stem[3:]
+        wb = load_workbook(path)
+        ws = wb["POINTAGE"]
+        total = 0.0
+        for row in range(4, 4 + spec.rows):
+            key, label, function = entries[rng.randrange(len(entries))]
+            hours = rng.choice((1.0, 2.5, 3.5, 7.0))
+            total += hours
+            values = ["S", name, rng.choice(weeks), None, f"{key} Sprint {rng.randrange(1, 21)}",
+                      label, function, None, None, hours, None]
+            for col, value in enumerate(values, start=1):
+                ws.cell(row=row, column=col, value=value)
+        ws["K1"] = total
+        wb.save(path)
+    return len(files)
+
+
+def write_lc_payload(base: Path | str, spec: WorkspaceSpec) -> Path:
+    """Write 'LC.xlsx' as CreateLCExcel does (LC lists as text), consumed by the update command."""
+    path = Path(base) / "LC.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "LC"
+    _write_lc_sheet(ws, spec, lookup=False)
+    for row in ws.iter_rows():
+        for cell in row:
+            cell.number_format = "@"
+    wb.save(path)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic roadmap base directory.")
+    parser.add_argument("output", type=Path, help="Directory to create")
+    parser.add_argument("--collaborators", type=int, default=51, help="Collaborators (default: 51)")
+    parser.add_argument("--rows", type=int, default=20, help="Pointage rows per collaborator (default: 20)")
+    parser.add_argument("--lc-rows", type=int, default=200, help="Rows of the LC lists (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated content (default: 0)")
+    args = parser.parse_args()
+
+    spec = WorkspaceSpec(collaborators=args.collaborators, rows=args.rows, lc_rows=args.lc_rows, seed=args.seed)
+    base = make_workspace(args.output, spec)
+    print(f"Workspace written to {base} ({spec.collaborators} collaborators, {spec.lc_rows} LC rows)")
+
+
+if __name__ == "__main__":
+    main()
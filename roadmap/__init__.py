@@ -18,7 +18,23 @@ Author: Mustapha EL KAMILI
 
 __version__ = "1.0.0"
 
-from roadmap.roadmap import RoadmapManager
-from roadmap.main import main
+import importlib
 
 __all__ = ["RoadmapManager", "main"]
+
+# Exports are loaded on first access, so that importing a submodule (e.g. roadmap.worker in a
+# spawned pool worker) does not load the manager, the CLI and their dependencies
+_EXPORTS = {"RoadmapManager": "roadmap.roadmap", "main": "roadmap.main"}
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'roadmap' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    # Importing roadmap.main binds the submodule to 'main': the exported function takes precedence
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,294 @@
+"""
+Integrity check of the archives of 'Archived' and 'Deleted' (roadmap archives verify).
+
+'delete' and 'cleanup' zip the interfaces before removing them (see roadmap.helpers.zip_folder),
+but nothing reads those zips until someone needs one. An archive truncated by a OneDrive sync
+conflict, or interrupted while being written, is then found too late. This module:
+    - reads every member of an archive to the end, which makes zipfile verify its CRC
+    - flags archives without a readable central directory, unreadable or damaged members,
+      and archives without any file
+    - compares the two zips written by one 'delete --archive' (same timestamp in 'Archived'
+      and 'Deleted'): both hold the whole RM_Collaborateurs folder, so a file missing from
+      one of them marks an incomplete snapshot
+
+Archives are verified in pool worker processes (reading and inflating is CPU-bound), so this
+module only imports the standard library and roadmap.trace (see roadmap.worker). Results are
+kept in 'archives_index.json' by size and modification time: an archive that did not change
+is not read again, and a run where nothing changed does not start the pool.
+"""
+import json
+import logging
+import re
+import time
+import zipfile
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from roadmap.jsonfile import load_json, save_json
+from roadmap.trace import span
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_INDEX_FILE_NAME = "archives_index.json"
+ARCHIVE_FOLDERS = ("Archived", "Deleted")
+ARCHIVE_SUFFIXES = (".zip", ".xlsx", ".xlsm")
+READ_CHUNK_SIZE = 1 << 20
+
+# Zips of one 'delete --archive' run share their timestamp (see delete_and_archive_interfaces)
+_SNAPSHOT_NAME = re.compile(r"^(Archived/Archive|Deleted/Deleted)_RM_Collaborateurs_(\d{8}_\d{6})\.zip$")
+
+# Problem codes
+ARCHIVE_CORRUPT = "corrupt"
+ARCHIVE_INCOMPLETE = "incomplete"
+ARCHIVE_ERROR = "error"
+
+
+@dataclass
+class ArchiveProblem:
+    """
+    One problem found in an archive.
+
+    Attributes:
+        code (str): Problem code: 'corrupt', 'incomplete' or 'error'.
+        message (str): Human-readable detail.
+    """
+    code: str
+    message: str
+
+
+@dataclass
+class ArchiveResult:
+    """
+    Outcome of the verification of one archive.
+
+    Attributes:
+        file (str): Archive path relative to the base directory, e.g.
+            'Archived/Archive_RM_Collaborateurs_01022025_101500.zip'.
+        members (list[str]): Names of the files of the archive.
+        size (int): Uncompressed size of the files, in bytes.
+        problems (list[ArchiveProblem]): Problems found, empty if the archive is sound.
+        seconds (float): Time taken by the verification (0 for a cached result).
+        cached (bool): True if the result comes from 'archives_index.json'.
+    """
+    file: str
+    members: list[str] = field(default_factory=list)
+    size: int = 0
+    problems: list[ArchiveProblem] = field(default_factory=list)
+    seconds: float = 0.0
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True if no problem was found."""
+        return not self.problems
+
+    def add(self, code: str, message: str) -> None:
+        """Record a problem."""
+        self.problems.append(ArchiveProblem(code, message))
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form, as written by 'roadmap archives verify --json'."""
+        return {
+            "file": self.file,
+            "ok": self.ok,
+            "members": len(self.members),
+            "size": self.size,
+            "problems": [asdict(problem) for problem in self.problems],
+            "cached": self.cached,
+            "seconds": round(self.seconds, 4),
+        }
+
+
+def verify_archive(path: str, name: str) -> ArchiveResult:
+    """
+    Read every member of an archive to the end, verifying its CRC.
+
+    Args:
+        path (str): Archive file.
+        name (str): Name of the result, relative to the base directory (see ArchiveResult.file).
+
+    Returns:
+        ArchiveResult: Members and problems. An archive whose central directory cannot be read
+        only gets a 'corrupt' problem; a file that cannot be read at all gets an 'error' problem.
+    """
+    start = time.perf_counter()
+    result = ArchiveResult(name)
+    with span("verify", path) as fields:
+        try:
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    result.members.append(info.filename)
+                    result.size += info.file_size
+                    try:
+                        with zf.open(info) as member:
+                            while member.read(READ_CHUNK_SIZE):
+                                pass
+                    except (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError) as e:
+                        result.add(ARCHIVE_CORRUPT, f"{info.filename}: {e}")
+        except zipfile.BadZipFile as e:
+            result.add(ARCHIVE_CORRUPT, f"Not a readable zip (truncated or damaged): {e}")
+        except OSError as e:
+            result.add(ARCHIVE_ERROR, f"Could not read the archive: {e}")
+        else:
+            if not result.members:
+                result.add(ARCHIVE_INCOMPLETE, "The archive holds no file")
+        fields["members"] = len(result.members)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def check_snapshots(results: list[ArchiveResult]) -> None:
+    """
+    Compare the 'Archived' and 'Deleted' zips written by the same 'delete --archive' run.
+
+    Both are zips of the same RM_Collaborateurs folder: the files of one missing from the other
+    are reported as an 'incomplete' problem on the archive that lacks them.
+
+    Args:
+        results (list[ArchiveResult]): Results of all archives, updated in place.
+
+    Note:
+        Archives whose file list could not be read (no central directory) are not compared.
+    """
+    pairs: dict[str, dict[str, ArchiveResult]] = {}
+    for result in results:
+        match = _SNAPSHOT_NAME.match(result.file)
+        if match and result.members:
+            pairs.setdefault(match.group(2), {})[match.group(1)] = result
+
+    for pair in pairs.values():
+        if len(pair) != 2:
+            continue
+        first, second = pair.values()
+        for result, other in ((first, second), (second, first)):
+            missing = sorted(set(other.members) - set(result.members))
+            if missing:
+                shown = ", ".join(missing[:5]) + (", ..." if len(missing) > 5 else "")
+                result.add(ARCHIVE_INCOMPLETE,
+                           f"{len(missing)} file(s) of {Path(other.file).name} missing: {shown}")
+
+
+class ArchiveIndex:
+    """
+    Verification results of the archives, kept across runs ('archives_index.json').
+
+    A result is reused while the size and modification time of its archive match. Problems
+    found by comparing archives (see check_snapshots) and read errors are not kept: the first
+    depend on other archives, the second are usually transient.
+
+    Example:
+        >>> index = ArchiveIndex.load(base_dir)
+        >>> index.result("Archived/Archive_RM_Collaborateurs_01022025_101500.zip", entry)
+        ArchiveResult(file='Archived/...', members=[...], cached=True, ...)
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Initialize an empty index bound to a file path.
+
+        Args:
+            path (Path | str): Path to the index JSON file.
+        """
+        self.path = Path(path)
+        self._files: dict[str, dict] = {}
+        self.changed = False
+
+    @classmethod
+    def load(cls, base_dir: Path | str) -> "ArchiveIndex":
+        """
+        Load the index from a base directory.
+
+        Args:
+            base_dir (Path | str): Base directory containing 'archives_index.json'.
+
+        Returns:
+            ArchiveIndex: The loaded index, empty if the file is missing or unreadable.
+        """
+        index = cls(Path(base_dir) / ARCHIVE_INDEX_FILE_NAME)
+        index._files = load_json(index.path, lambda data: dict(data.get("files", {})),
+                                 "ARCHIVES", "Verifying every archive.") or {}
+        return index
+
+    def result(self, name: str, size: int, mtime_ns: int) -> ArchiveResult | None:
+        """
+        Cached result of an archive, if it did not change since it was verified.
+
+        Args:
+            name (str): Archive path relative to the base directory.
+            size (int): Current size of the archive.
+            mtime_ns (int): Current modification time of the archive.
+
+        Returns:
+            ArchiveResult | None: The result (with `cached` set), or None if the archive is
+            unknown or has changed.
+        """
+        known = self._files.get(name)
+        if not known or known.get("size") != size or known.get("mtime_ns") != mtime_ns:
+            return None
+        return ArchiveResult(name, members=list(known.get("members", [])), size=known.get("uncompressed", 0),
+                             problems=[ArchiveProblem(**problem) for problem in known.get("problems", [])],
+                             cached=True)
+
+    def record(self, result: ArchiveResult, size: int, mtime_ns: int) -> None:
+        """
+        Record the result of a verified archive.
+
+        Args:
+            result (ArchiveResult): Result of verify_archive().
+            size (int): Size of the archive when it was verified.
+            mtime_ns (int): Modification time of the archive when it was verified.
+        """
+        if any(problem.code == ARCHIVE_ERROR for problem in result.problems):
+            return
+        self._files[result.file] = {"size": size, "mtime_ns": mtime_ns, "uncompressed": result.size,
+                                    "members": result.members,
+                                    "problems": [asdict(problem) for problem in result.problems]}
+        self.changed = True
+
+    def prune(self, names: set[str]) -> None:
+        """Forget the archives that are no longer on disk."""
+        for name in [name for name in self._files if name not in names]:
+            del self._files[name]
+            self.changed = True
+
+    def save(self) -> None:
+        """Write the index atomically (temporary file + replace)."""
+        save_json(self.path, {"files": self._files})
+        self.changed = False
+
+
+def summarize(results: list[ArchiveResult]) -> dict:
+    """
+    Machine-readable report of a verification run.
+
+    Args:
+        results (list[ArchiveResult]): Results, one per archive.
+
+    Returns:
+        dict: 'archives', 'verified' (read during this run), 'failed' (archives with problems),
+        'problems' (count per code) and 'files' (see ArchiveResult.to_dict).
+    """
+    counts: dict[str, int] = {}
+    for result in results:
+        for problem in result.problems:
+            counts[problem.code] = counts.get(problem.code, 0) + 1
+    return {
+        "archives": len(results),
+        "verified": sum(1 for result in results if not result.cached),
+        "failed": sum(1 for result in results if not result.ok),
+        "problems": dict(sorted(counts.items())),
+        "files": [result.to_dict() for result in results],
+    }
+
+
+def to_json(results: list[ArchiveResult]) -> str:
+    """Report of a verification run as indented JSON (see summarize)."""
+    return json.dumps(summarize(results), ensure_ascii=False, indent=2)
+
+
+def problem_rows(results: list[ArchiveResult]) -> list[tuple[str, str, str]]:
+    """(archive, code, message) of every problem, for the text output of 'roadmap archives verify'."""
+    return [(result.file, problem.code, problem.message) for result in results for problem in result.problems]
@@ -0,0 +1,145 @@
+"""
+Batch runs of a command across several base directories (--batch / --manifest).
+
+Each project has its own base directory, and a nightly job used to start the executable once
+per directory: every run paid the interpreter and package start-up, started its own worker
+pool, and parsed the same LC.xlsx or synthesis LC sheet again when projects share them. A batch
+runs the command for each base directory in one process:
+    - one worker process pool, shared by the workspaces (see RoadmapManager.executor)
+    - one ContentCache: files parsed by the commands (LC.xlsx rows, the LC sheet of the synthesis
+      workbook, the LC check of the template) are parsed once per distinct content, identified
+      by its SHA-256 hash, whatever the workspace they come from
+
+A manifest is a text file with one base directory per line; blank lines and lines starting
+with '#' are ignored, and relative paths are relative to the manifest's folder.
+"""
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, TypeVar
+
+from roadmap.logging_config import worker_log_queue
+from roadmap.worker import initialize
+
+MANIFEST_COMMENT = "#"
+DEFAULT_POOL_WORKERS = 8
+
+T = TypeVar("T")
+
+
+def read_manifest(path: Path | str) -> list[Path]:
+    """
+    Read the base directories listed in a manifest file.
+
+    Args:
+        path (Path | str): Manifest file (UTF-8, one base directory per line).
+
+    Returns:
+        list[Path]: Base directories, in file order.
+
+    Raises:
+        OSError: If the manifest cannot be read.
+    """
+    path = Path(path)
+    base_dirs = []
+    for line in path.read_text(encoding="utf-8-sig").splitlines():
+        line = line.strip()
+        if not line or line.startswith(MANIFEST_COMMENT):
+            continue
+        base_dir = Path(line).expanduser()
+        base_dirs.append(base_dir if base_dir.is_absolute() else path.parent / base_dir)
+    return base_dirs
+
+
+def batch_base_dirs(batch: Iterable[str] | None = None, manifest: str | None = None) -> list[Path]:
+    """
+    Base directories of a batch, from --batch options then the manifest, without duplicates.
+
+    Args:
+        batch (Iterable[str] | None, optional): Directories given with --batch. Defaults to None.
+        manifest (str | None, optional): Manifest file given with --manifest. Defaults to None.
+
+    Returns:
+        list[Path]: Base directories, empty if no batch was requested.
+
+    Raises:
+        OSError: If the manifest cannot be read.
+    """
+    base_dirs = [Path(d) for d in batch or []]
+    if manifest:
+        base_dirs += read_manifest(manifest)
+    unique: dict[Path, Path] = {}
+    for base_dir in base_dirs:
+        unique.setdefault(base_dir.resolve(), base_dir)
+    return list(unique.values())
+
+
+def file_digest(path: Path | str) -> str:
+    """SHA-256 of a file's content, as hexadecimal."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class ContentCache:
+    """
+    Values parsed from files, keyed by the hash of the file content.
+
+    Shared by the workspaces of a batch: a file identical in several base directories (same
+    LC.xlsx, same template) is parsed once. Values are shared, so callers must not modify them.
+
+    Example:
+        >>> cache = ContentCache()
+        >>> rows = cache.get("lc", base_dir / "LC.xlsx", parse_lc)
+        >>> cache.hits, cache.misses
+        (0, 1)
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._values: dict[tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, path: Path | str, parse: Callable[[Path], T]) -> T:
+        """
+        Return the value parsed from a file, parsing it only for a content not seen before.
+
+        Args:
+            kind (str): What is parsed (e.g. 'lc'), so one file can hold several cached values.
+            path (Path | str): File to parse.
+            parse (Callable[[Path], T]): Parser, called with `path` on a cache miss.
+
+        Returns:
+            T: The parsed value.
+
+        Raises:
+            OSError: If the file cannot be read. Errors of `parse` are not cached.
+        """
+        path = Path(path)
+        key = (kind, file_digest(path))
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+        value = parse(path)
+        with self._lock:
+            self.misses += 1
+            self._values[key] = value
+        return value
+
+
+def shared_pool(max_workers: int = DEFAULT_POOL_WORKERS) -> ProcessPoolExecutor:
+    """
+    Worker process pool shared by the workspaces of a batch.
+
+    Args:
+        max_workers (int, optional): Worker processes. Defaults to 8.
+
+    Returns:
+        ProcessPoolExecutor: The pool, with the same worker set-up as the per-command pools
+        (see roadmap.worker). The caller shuts it down.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=initialize,
+                               initargs=(worker_log_queue(),))
@@ -0,0 +1,205 @@
+"""
+Health check of the collaborator interface files (roadmap check).
+
+Broken interfaces used to be found only when 'pointage' or 'update' crashed on them. This
+module inspects an interface without loading it with openpyxl: the zip central directory is
+read when the package is opened, then only the parts needed (see roadmap.xlsx):
+    - 'xl/workbook.xml': the POINTAGE and LC sheets exist
+    - the POINTAGE sheet part: B1 holds the collaborator of the file name, and the list
+      validations of columns D-G are the ones written by create / update
+      (see roadmap.engine.add_data_validations_to_sheet)
+
+Reading a part also verifies its CRC, so truncated or damaged packages are reported as
+corrupt. Each file is checked independently, so files are checked in parallel threads.
+"""
+import json
+import re
+import time
+import zipfile
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from xml.etree.ElementTree import ParseError
+
+from roadmap.engine import POINTAGE_VALIDATIONS, VALIDATION_LAST_ROW
+from roadmap.locks import LockScan
+from roadmap.xlsx import (open_package, read_cell, read_data_validations,
+                          sheet_names)
+
+REQUIRED_SHEETS = ("POINTAGE", "LC")
+VALIDATION_FIRST_ROW = 3
+_COLUMN = re.compile(r"\$?([A-Z]+)")
+
+# Problem codes
+CHECK_CORRUPT = "corrupt"
+CHECK_MISSING_SHEET = "missing_sheet"
+CHECK_WRONG_NAME = "wrong_name"
+CHECK_STALE_VALIDATION = "stale_validation"
+CHECK_LOCKED = "locked"
+CHECK_ERROR = "error"
+
+
+@dataclass
+class Problem:
+    """
+    One problem found in an interface file.
+
+    Attributes:
+        code (str): Problem code: 'corrupt', 'missing_sheet', 'wrong_name', 'stale_validation',
+            'locked' or 'error'.
+        message (str): Human-readable detail.
+    """
+    code: str
+    message: str
+
+
+@dataclass
+class CheckResult:
+    """
+    Outcome of the check of one interface file.
+
+    Attributes:
+        file (str): Interface file name, e.g. 'RM_GANI Karim.xlsx'.
+        collaborator (str): Collaborator expected from the file name.
+        problems (list[Problem]): Problems found, empty if the file is healthy.
+        seconds (float): Time taken by the check.
+    """
+    file: str
+    collaborator: str
+    problems: list[Problem] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if no problem was found."""
+        return not self.problems
+
+    def add(self, code: str, message: str) -> None:
+        """Record a problem."""
+        self.problems.append(Problem(code, message))
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form, as written by 'roadmap check --json'."""
+        return {
+            "file": self.file,
+            "collaborator": self.collaborator,
+            "ok": self.ok,
+            "problems": [asdict(problem) for problem in self.problems],
+            "seconds": round(self.seconds, 4),
+        }
+
+
+def collaborator_of(path: Path | str) -> str:
+    """
+    Collaborator name of an interface file, e.g. 'GANI Karim' for 'RM_GANI Karim.xlsx'.
+
+    Args:
+        path (Path | str): Interface file.
+
+    Returns:
+        str: Name between the 'RM_' prefix and the extension.
+    """
+    stem = Path(path).stem
+    return stem[3:] if stem.startswith("RM_") else stem
+
+
+def _formula(formula: str | None) -> str:
+    """Validation source without '=' and sheet quotes: Excel saves 'LC'!$B$3 as LC!$B$3 in x14 validations."""
+    return (formula or "").lstrip("=").replace("'", "")
+
+
+def check_validations(result: CheckResult, validations: list[tuple[str, str | None, str | None]]) -> None:
+    """
+    Compare the list validations of POINTAGE with the ones create / update write.
+
+    Args:
+        result (CheckResult): Result receiving a 'stale_validation' problem per wrong column.
+        validations (list[tuple[str, str | None, str | None]]): Result of read_data_validations().
+    """
+    by_column: dict[str, list[tuple[set[str], str | None]]] = {}
+    for sqref, kind, formula in validations:
+        if kind != "list":
+            continue
+        ranges = set(sqref.split())
+        for column in {match.group(1) for match in map(_COLUMN.match, ranges) if match}:
+            by_column.setdefault(column, []).append((ranges, formula))
+
+    for column, expected in POINTAGE_VALIDATIONS:
+        expected = _formula(expected)
+        expected_range = f"{column}{VALIDATION_FIRST_ROW}:{column}{VALIDATION_LAST_ROW}"
+        found = by_column.get(column, [])
+        if not found:
+            result.add(CHECK_STALE_VALIDATION, f"No list validation on column {column} (expected {expected})")
+        elif not any(_formula(formula) == expected and expected_range in ranges for ranges, formula in found):
+            ranges, formula = found[0]
+            result.add(CHECK_STALE_VALIDATION, f"Column {column} validation is {formula} on {' '.join(sorted(ranges))} "
+                                               f"(expected {expected} on {expected_range})")
+
+
+def check_interface(path: Path | str, lock_scan: LockScan | None = None) -> CheckResult:
+    """
+    Check one interface file.
+
+    Args:
+        path (Path | str): Interface file, e.g. 'RM_Collaborateurs/RM_GANI Karim.xlsx'.
+        lock_scan (LockScan | None, optional): Owner files of the folder (see
+            roadmap.xlsx.open_package). Defaults to None (the folder is scanned).
+
+    Returns:
+        CheckResult: Problems found. A file that is not a valid package only gets a 'corrupt'
+        problem, the other checks need its parts.
+
+    Raises:
+        PermissionError: If the file cannot be opened (see roadmap.locks.run_lock_aware).
+    """
+    path = Path(path)
+    start = time.perf_counter()
+    result = CheckResult(path.name, collaborator_of(path))
+    try:
+        with open_package(path, lock_scan) as zf:
+            sheets = sheet_names(zf)
+            for sheet in REQUIRED_SHEETS:
+                if sheet not in sheets:
+                    result.add(CHECK_MISSING_SHEET, f"Sheet '{sheet}' not found")
+            if "POINTAGE" in sheets:
+                b1 = read_cell(zf, "POINTAGE", "B1")
+                if b1 is None or str(b1).strip() != result.collaborator:
+                    result.add(CHECK_WRONG_NAME, f"POINTAGE!B1 is {b1!r} (expected {result.collaborator!r})")
+                check_validations(result, read_data_validations(zf, "POINTAGE"))
+    except (zipfile.BadZipFile, zlib.error, ParseError, KeyError, EOFError) as e:
+        result.problems = [Problem(CHECK_CORRUPT, f"Damaged package: {e}")]
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def summarize(results: list[CheckResult]) -> dict:
+    """
+    Machine-readable report of a check run.
+
+    Args:
+        results (list[CheckResult]): Results, one per file.
+
+    Returns:
+        dict: 'checked' (files), 'failed' (files with problems), 'problems' (count per code)
+        and 'files' (see CheckResult.to_dict).
+    """
+    counts: dict[str, int] = {}
+    for result in results:
+        for problem in result.problems:
+            counts[problem.code] = counts.get(problem.code, 0) + 1
+    return {
+        "checked": len(results),
+        "failed": sum(1 for result in results if not result.ok),
+        "problems": dict(sorted(counts.items())),
+        "files": [result.to_dict() for result in results],
+    }
+
+
+def to_json(results: list[CheckResult]) -> str:
+    """Report of a check run as indented JSON (see summarize)."""
+    return json.dumps(summarize(results), ensure_ascii=False, indent=2)
+
+
+def problem_rows(results: list[CheckResult]) -> list[tuple[str, str, str]]:
+    """(file, code, message) of every problem, for the text output of 'roadmap check'."""
+    return [(result.file, problem.code, problem.message) for result in results for problem in result.problems]
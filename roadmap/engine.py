@@ -0,0 +1,97 @@
+"""
+Interface building engine.
+
+Functions run in the pool worker processes (see roadmap.worker). This module has no import-time
+side effects and only depends on openpyxl and the tracing helpers, so a spawned worker does
+not load the CLI, the logging setup or the rest of the package.
+"""
+import io
+import time
+
+from openpyxl import load_workbook
+from openpyxl.worksheet.datavalidation import (DataValidation,
+                                               DataValidationList)
+
+from roadmap.trace import span
+
+# List validations of the POINTAGE sheet: (column, source formula)
+POINTAGE_VALIDATIONS = (
+    ("D", "='POINTAGE'!$A$2:$A$2"),
+    ("E", "='LC'!$B$3:$B$10000"),
+    ("F", "='LC'!$C$3:$C$10000"),
+    ("G", "='LC'!$D$3:$D$10000"),
+)
+VALIDATION_LAST_ROW = 1000
+
+
+def add_data_validations_to_sheet(ws_pointage, start_row: int = 3) -> None:
+    """
+    Add standard data validation lists to POINTAGE sheet.
+
+    Creates data validation lists for columns D (week), E (key), F (label), and G (function).
+    This function centralizes the validation creation logic used across multiple methods.
+
+    Args:
+        ws_pointage: openpyxl worksheet object for the POINTAGE sheet.
+        start_row (int, optional): Starting row for validation ranges. Defaults to 3.
+
+    Returns:
+        None
+    """
+    # Clear existing validations to avoid duplicates
+    if hasattr(ws_pointage, 'data_validations') and ws_pointage.data_validations is not None:
+        if hasattr(ws_pointage.data_validations, 'dataValidation'):
+            ws_pointage.data_validations.dataValidation = []
+    else:
+        ws_pointage.data_validations = DataValidationList()
+
+    # Create standard data validation lists
+    for col, formula in POINTAGE_VALIDATIONS:
+        dv = DataValidation(type="list", formula1=formula)
+        ws_pointage.add_data_validation(dv)
+        dv.ranges.add(f"{col}{start_row}:{col}{VALIDATION_LAST_ROW}")
+
+
+def build_interface(template_bytes: bytes, output_path: str, collab_name: str) -> float:
+    """
+    Build a single collaborator interface Excel file from template.
+
+    Creates a new Excel file for a collaborator based on the template.
+    Sets the collaborator name in cell B1 and adds data validation lists
+    for pointage entry (week, key, label, function).
+
+    Args:
+        template_bytes (bytes): Binary content of the template Excel file.
+        output_path (str): Path where the new interface file should be saved.
+        collab_name (str): Name of the collaborator to set in the interface.
+
+    Returns:
+        float: Seconds taken to build the file (reported in the run metrics).
+
+    Note:
+        This function is designed to be called in parallel processes.
+        It uses bytes instead of file path to avoid file locking issues in parallel execution.
+
+    Data Validation Lists:
+        - Column D: Week (from POINTAGE!A2:A2)
+        - Column E: Key (from LC!B3:B1000)
+        - Column F: Label (from LC!C3:C1000)
+        - Column G: Function (from LC!D3:D1000)
+    """
+    start = time.perf_counter()
+    with span("open", output_path):
+        wb = load_workbook(filename=io.BytesIO(template_bytes))
+
+    with span("transform", output_path):
+        ws_pointage = wb["POINTAGE"]
+
+        # Write collaborator name
+        ws_pointage["B1"].value = collab_name
+
+        # Add data validations (using row 3 to match other methods)
+        add_data_validations_to_sheet(ws_pointage, start_row=3)
+
+    with span("save", output_path):
+        wb.save(output_path)
+        wb.close()
+    return time.perf_counter() - start
@@ -2,17 +2,17 @@
 Helper functions for roadmap management operations.
 
 This module provides utility functions for:
-    - XML export/import
-    - Reading collaborator lists from Excel
-    - Building Excel interfaces with data validation
+    - XML export/import (pointage rows and row status ranges)
+    - Reading collaborator lists from XML or directly from the synthesis workbook
+    - Building Excel interfaces with data validation (re-exported from roadmap.engine)
     - CLI argument parsing
     - Logging configuration
 
 Author: Mustapha ELKAMILI
 """
 import argparse
-import io
 import logging
+import multiprocessing
 import os
 import shutil
 import stat
@@ -25,8 +25,12 @@ from datetime import date, datetime
 from pathlib import Path
 
 from openpyxl import load_workbook
-from openpyxl.worksheet.datavalidation import (DataValidation,
-                                               DataValidationList)
+
+# Interface building lives in the worker-safe engine module; re-exported for existing callers
+from roadmap.engine import add_data_validations_to_sheet, build_interface  # noqa: F401
+from roadmap.locks import backoff_delays
+from roadmap.logging_config import configure_logging
+from roadmap.xlsx import read_column
 
 
 def get_exe_dir() -> Path:
@@ -74,14 +78,9 @@ def get_exe_dir() -> Path:
 
     return str(logs_dir / "roadmap.log")
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(get_exe_dir(), mode="a", encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
+# Pool workers re-importing this module (spawn) log through the main process instead
+if multiprocessing.parent_process() is None:
+    configure_logging(get_exe_dir())
 logger = logging.getLogger(__name__)
 
 def zip_folder(folder_path: Path, zip_path: Path) -> None:
@@ -112,6 +111,9 @@ def rmtree_with_retry(folder_path: Path, max_retries: int = 5) -> bool:
     """
     Remove a directory tree with retry logic for Windows/OneDrive locks.
 
+    Retries use the exponential backoff schedule shared with the lock-aware layer
+    (see roadmap.locks) instead of a fixed delay.
+
     Args:
         folder_path (Path): Path to the folder to remove.
         max_retries (int): Maximum number of retry attempts.
@@ -127,14 +129,15 @@ def rmtree_with_retry(folder_path: Path, max_retries: int = 5) -> bool:
         except Exception:
             pass
 
+    delays = backoff_delays(max_retries - 1)
     for attempt in range(max_retries):
         try:
             shutil.rmtree(folder_path, onerror=on_rm_error)
             return True
         except PermissionError as e:
             if attempt < max_retries - 1:
-                logger.warning(f"[RMTREE] Attempt {attempt + 1}/{max_retries} failed: {e}. Retrying in 2s...")
-                time.sleep(2)
+                logger.warning(f"[RMTREE] Attempt {attempt + 1}/{max_retries} failed: {e}. Retrying in {delays[attempt]:.1f}s...")
+                time.sleep(delays[attempt])
             else:
                 logger.error(f"[RMTREE] Failed to remove folder after {max_retries} attempts: {e}")
                 return False
@@ -171,45 +174,37 @@ def write_xml(rows: list, xml_output: Path) -> None:
     tree = ET.ElementTree(root)
     tree.write(xml_output, encoding="utf-8", xml_declaration=True)
 
-def add_data_validations_to_sheet(ws_pointage, start_row: int = 3) -> None:
+def write_status_xml(ranges: list, threshold: float, row_count: int, xml_output: Path) -> None:
     """
-    Add standard data validation lists to POINTAGE sheet.
+    Write the row status ranges of a pointage export in the format expected by VBA.
 
-    Creates data validation lists for columns D (week), E (key), F (label), and G (function).
-    This function centralizes the validation creation logic used across multiple methods.
+    Each range covers consecutive exported rows with the same status, so VBA colors it with a
+    single Range call (see ApplySyntheseStatusRanges).
 
     Args:
-        ws_pointage: openpyxl worksheet object for the POINTAGE sheet.
-        start_row (int, optional): Starting row for validation ranges. Defaults to 3.
+        ranges (list): StatusRange objects (see roadmap.status), in export order.
+        threshold (float): Hours threshold used to compute the statuses.
+        row_count (int): Number of rows in the matching 'pointage_output.xml'.
+        xml_output (Path): Path where the XML file should be written.
 
     Returns:
         None
+
+    Example:
+        >>> write_status_xml([StatusRange("under", 1, 12)], 35.0, 12, Path("pointage_status.xml"))
+        Creates <status threshold="35.0" rows="12"><range status="under" first="1" last="12"/></status>
     """
-    # Clear existing validations to avoid duplicates
-    if hasattr(ws_pointage, 'data_validations') and ws_pointage.data_validations is not None:
-        if hasattr(ws_pointage.data_validations, 'dataValidation'):
-            ws_pointage.data_validations.dataValidation = []
-    else:
-        ws_pointage.data_validations = DataValidationList()
-
-    # Create standard data validation lists
-    dv_semaine = DataValidation(type="list", formula1="='POINTAGE'!$A$2:$A$2")
-    dv_cle = DataValidation(type="list", formula1="='LC'!$B$3:$B$10000")
-    dv_libelle = DataValidation(type="list", formula1="='LC'!$C$3:$C$10000")
-    dv_fonction = DataValidation(type="list", formula1="='LC'!$D$3:$D$10000")
-
-    validations = [
-        (dv_semaine, 'D'),
-        (dv_cle, 'E'),
-        (dv_libelle, 'F'),
-        (dv_fonction, 'G'),
-    ]
-
-    for dv, col in validations:
-        ws_pointage.add_data_validation(dv)
-        dv.ranges.add(f"{col}{start_row}:{col}1000")
-
-def get_collaborators(synthese_file: Path | str) -> list[str]:
+    root = ET.Element("status", threshold=str(threshold), rows=str(row_count))
+
+    for status_range in ranges:
+        ET.SubElement(root, "range", status=status_range.status,
+                      first=str(status_range.first), last=str(status_range.last))
+
+    tree = ET.ElementTree(root)
+    tree.write(xml_output, encoding="utf-8", xml_declaration=True)
+
+
+def get_collaborators(synthese_file: Path | str, delete: bool = True) -> list[str]:
     """
     Extract collaborator names from XML file.
 
@@ -219,13 +214,15 @@ def get_collaborators(synthese_file: Path | str) -> list[str]:
     Args:
         synthese_file (Path | str): Path to the synthesis Excel file (used as base
             directory to locate collabs.xml).
+        delete (bool, optional): Delete collabs.xml after reading it. Defaults to True
+            (False for read-only uses such as 'sync --dry-run').
 
     Returns:
         list[str]: List of collaborator names, stripped of whitespace.
         Returns empty list if XML file cannot be read or doesn't exist.
 
     Note:
-        The collabs.xml file will be deleted after reading.
+        The collabs.xml file will be deleted after reading, unless `delete` is False.
     """
     collabs = []
     synthese_file = Path(synthese_file)
@@ -250,6 +247,8 @@ def get_collaborators(synthese_file: Path | str) -> list[str]:
         logger.info(f"[GET_COLLABORATORS] Read {len(collabs)} collaborators from XML")
 
         # Delete the XML file after reading
+        if not delete:
+            return collabs
         try:
             xml_file.unlink()
             logger.info(f"[GET_COLLABORATORS] Deleted XML file: {xml_file}")
@@ -262,7 +261,39 @@ def get_collaborators(synthese_file: Path | str) -> list[str]:
 
     return collabs
 
-def load_lc_excel(base_dir: Path | str) -> list[list]:
+def get_collaborators_from_workbook(synthese_file: Path | str) -> list[str]:
+    """
+    Read collaborator names directly from the synthesis workbook.
+
+    Streams 'Gestion_Interfaces'!B3:B... out of the .xlsm package (see roadmap.xlsx) instead of
+    waiting for VBA to write 'collabs.xml'. Like CreateCollabsXML, reading stops at the first
+    empty cell. An open workbook is read from a snapshot copy.
+
+    Args:
+        synthese_file (Path | str): Path to the synthesis Excel file.
+
+    Returns:
+        list[str]: List of collaborator names, stripped of whitespace.
+        Returns empty list if the workbook or the sheet cannot be read.
+
+    Note:
+        The workbook content is read as last saved: unsaved edits made in Excel are not seen.
+    """
+    synthese_file = Path(synthese_file)
+    if not synthese_file.exists():
+        logger.info(f"[GET_COLLABORATORS] Synthesis workbook not found: {synthese_file}")
+        return []
+
+    try:
+        collabs = read_column(synthese_file, "Gestion_Interfaces", column="B", start_row=3)
+        logger.info(f"[GET_COLLABORATORS] Read {len(collabs)} collaborators from {synthese_file.name}")
+        return collabs
+    except Exception as wb_err:
+        logger.error(f"[GET_COLLABORATORS] Error reading {synthese_file.name}: {wb_err}")
+
+    return []
+
+def load_lc_excel(base_dir: Path | str, delete: bool = True) -> list[list]:
     """
     Load LC (conditional lists) data from LC.xlsx file.
 
@@ -271,6 +302,8 @@ def load_lc_excel(base_dir: Path | str) -> list[list]:
 
     Args:
         base_dir (Path | str): Base directory path where LC.xlsx should be located.
+        delete (bool, optional): Delete LC.xlsx after reading it. Defaults to True
+            (False for read-only uses such as 'sync --dry-run').
 
     Returns:
         list[list]: List of row data, where each row is a list of 8 values (columns B-I).
@@ -278,7 +311,7 @@ def load_lc_excel(base_dir: Path | str) -> list[list]:
         Returns empty list if Excel file cannot be read or doesn't exist.
 
     Note:
-        The LC.xlsx file will be deleted after reading.
+        The LC.xlsx file will be deleted after reading, unless `delete` is False.
     """
     lc_data = []
     base_dir = Path(base_dir)
@@ -356,6 +389,8 @@ def load_lc_excel(base_dir: Path | str) -> list[list]:
         logger.info(f"[LOAD_LC_EXCEL] Loaded {len(lc_data)} rows of LC data from Excel")
 
         # Delete the Excel file after reading
+        if not delete:
+            return lc_data
         try:
             excel_file.unlink()
             logger.info(f"[LOAD_LC_EXCEL] Deleted Excel file: {excel_file}")
@@ -368,43 +403,6 @@ def load_lc_excel(base_dir: Path | str) -> list[list]:
 
     return lc_data
 
-def build_interface(template_bytes: bytes, output_path: str, collab_name: str) -> None:
-    """
-    Build a single collaborator interface Excel file from template.
-
-    Creates a new Excel file for a collaborator based on the template.
-    Sets the collaborator name in cell B1 and adds data validation lists
-    for pointage entry (week, key, label, function).
-
-    Args:
-        template_bytes (bytes): Binary content of the template Excel file.
-        output_path (str): Path where the new interface file should be saved.
-        collab_name (str): Name of the collaborator to set in the interface.
-
-    Returns:
-        None
-
-    Note:
-        This function is designed to be called in parallel processes.
-        It uses bytes instead of file path to avoid file locking issues in parallel execution.
-
-    Data Validation Lists:
-        - Column D: Week (from POINTAGE!A2:A2)
-        - Column E: Key (from LC!B3:B1000)
-        - Column F: Label (from LC!C3:C1000)
-        - Column G: Function (from LC!D3:D1000)
-    """
-    wb = load_workbook(filename=io.BytesIO(template_bytes))
-    ws_pointage = wb["POINTAGE"]
-
-    # Write collaborator name
-    ws_pointage["B1"].value = collab_name
-
-    # Add data validations (using row 3 to match other methods)
-    add_data_validations_to_sheet(ws_pointage, start_row=3)
-
-    wb.save(output_path)
-    wb.close()
 
 def get_parser() -> argparse.ArgumentParser:
     """
@@ -422,11 +420,30 @@ def get_parser() -> argparse.ArgumentParser:
         - delete: Delete collaborator interfaces
             Options: --archive, --force
         - pointage: Export time tracking data
-            Options: --delete
+            Options: --threshold, --direct, --weeks, --collab, --history, --validate
         - update: Update conditional lists
+        - lc-extract: Build the LC lookup table from an MS Project extract
+            Options: --source, --sheet
+        - query: Total hours from the pointage history
+            Options: --by, --weeks, --collab, --key, --year, --table, --window, --csv
+        - report: Summary workbook of the pointage data
+            Options: --output, --weeks, --collab, --threshold, --details
+        - check: Health check of the interface files
+            Options: --collab, --json
+        - archives verify: Integrity check of the archives of 'Archived' and 'Deleted'
+            Options: --full, --workers, --json
+        - sync: Cleanup, create and LC update in one pass
+            Options: --dry-run, --workers
+        - layout: Flat or sharded layout of RM_Collaborateurs
+            Options: --shard, --prefix-length, --teams
 
     Global Options:
         --basedir: Base directory for file operations
+        --batch: Run the command in this base directory too (repeatable)
+        --manifest: Run the command in every base directory listed in this file
+        --pool-workers: Worker processes shared by the base directories of a batch
+        --trace: Write timing spans as JSON lines next to the log file
+        --profile: Profile CPU time and memory, written next to the log file
     """
     parser = argparse.ArgumentParser(
         description="Roadmap Management CLI - Automate CE VHST roadmap operations including time tracking, interface creation, and data synchronization.",
@@ -440,6 +457,35 @@ def get_parser() -> argparse.ArgumentParser:
         default="none",
         help="Specify the base directory path containing roadmap files. If not provided, uses platform-specific default or current directory."
     )
+    parser.add_argument(
+        "--batch",
+        action="append",
+        metavar="BASEDIR",
+        default=None,
+        help="Run the command in this base directory; repeat to run it in several ones from a single process (replaces --basedir)"
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="Run the command in every base directory listed in this file (one per line, '#' for comments), from a single process"
+    )
+    parser.add_argument(
+        "--pool-workers",
+        type=int,
+        default=8,
+        help="Worker processes shared by the base directories of a batch (default: 8)"
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write per-file, per-phase timing spans as JSON lines to 'roadmap_trace.jsonl' next to 'roadmap.log'"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the command (cProfile and tracemalloc) and write 'profile_<command>.prof/.txt' next to 'roadmap.log'"
+    )
 
     subparsers_action = parser.add_subparsers(dest="action", required=True)
     create_parser = subparsers_action.add_parser("create", help="Generate Excel interface files for all collaborators listed in the synthesis file")
@@ -463,8 +509,207 @@ def get_parser() -> argparse.ArgumentParser:
         help="Required flag to confirm deletion operation. Without this flag, the operation will be aborted with a warning"
     )
 
-    subparsers_action.add_parser("pointage", help="Export time tracking data from collaborator Excel files to XML format for VBA import")
+    pointage_parser = subparsers_action.add_parser("pointage", help="Export time tracking data from collaborator Excel files to XML format for VBA import")
+    pointage_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="Weekly hours below which SYNTHESE rows are colored red (default: 35)"
+    )
+    pointage_parser.add_argument(
+        "--direct",
+        action="store_true",
+        help="Write rows, LC columns and row colors straight into the SYNTHESE sheet (workbook must be closed) instead of exporting XML for VBA"
+    )
+    pointage_parser.add_argument(
+        "--weeks",
+        nargs="+",
+        metavar="WEEK",
+        default=None,
+        help="Only export these weeks: codes and ranges, e.g. 'S0525 S0725-S0825'. Files without these weeks are not opened"
+    )
+    pointage_parser.add_argument(
+        "--collab",
+        nargs="+",
+        metavar="NAME",
+        default=None,
+        help="Only export these collaborators (names as in Gestion_Interfaces, case and accents ignored)"
+    )
+    pointage_parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Also upsert the extracted rows into the local history store 'pointage_history.db' (see 'roadmap query')"
+    )
+    pointage_parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Also check every row against the LC sheet (unknown key/label/function, invalid combination, hours, duplicates) and write the rows with issues to 'pointage_validation.csv'"
+    )
     subparsers_action.add_parser("update", help="Synchronize conditional lists (LC) from master synthesis file to template and all collaborator interface files")
     subparsers_action.add_parser("cleanup", help="Delete interface files for collaborators that are missing from the XML list")
+    lc_extract_parser = subparsers_action.add_parser("lc-extract", help="Build the LC lookup table (LC!F:K) and LC.xlsx from an MS Project extract, without Excel")
+    lc_extract_parser.add_argument(
+        "--source",
+        type=str,
+        default=None,
+        help="MS Project extract: workbook (.xlsx/.xlsm) or tabular export (.csv/.txt). Defaults to the Extract_MSP sheet of the synthesis file"
+    )
+    lc_extract_parser.add_argument(
+        "--sheet",
+        type=str,
+        default="Extract_MSP",
+        help="Sheet holding the extract when the source is a workbook (default: Extract_MSP)"
+    )
+    query_parser = subparsers_action.add_parser("query", help="Print total hours from the pointage history (filled by 'pointage --history'), without opening any workbook")
+    query_parser.add_argument(
+        "--by",
+        nargs="+",
+        choices=["collaborator", "week", "key", "function", "label", "year"],
+        default=["collaborator"],
+        help="Columns to group the totals by (default: collaborator)"
+    )
+    query_parser.add_argument(
+        "--weeks",
+        nargs="+",
+        metavar="WEEK",
+        default=None,
+        help="Only count these weeks: codes and ranges, e.g. 'S0125-S2625'"
+    )
+    query_parser.add_argument(
+        "--collab",
+        nargs="+",
+        metavar="NAME",
+        default=None,
+        help="Only count these collaborators"
+    )
+    query_parser.add_argument(
+        "--key",
+        nargs="+",
+        metavar="KEY",
+        default=None,
+        help="Only count these LC keys"
+    )
+    query_parser.add_argument(
+        "--year",
+        type=int,
+        default=None,
+        help="Only count this year, e.g. 2025"
+    )
+    query_parser.add_argument(
+        "--table",
+        choices=["verif", "rolling", "fs"],
+        default=None,
+        help="Print a dashboard table instead of totals: 'verif' (hours per collaborator and week), 'rolling' (rolling totals), 'fs' (consumed hours per key and label)"
+    )
+    query_parser.add_argument(
+        "--window",
+        type=int,
+        default=4,
+        help="Weeks summed by '--table rolling' (default: 4)"
+    )
+    query_parser.add_argument(
+        "--csv",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write the result to a CSV file instead of printing it"
+    )
+    report_parser = subparsers_action.add_parser("report", help="Write a summary workbook (weekly heatmap per collaborator, totals per LC function) from the interface files, without Excel")
+    report_parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Report workbook (default: 'pointage_report.xlsx' in the base directory)"
+    )
+    report_parser.add_argument(
+        "--weeks",
+        nargs="+",
+        metavar="WEEK",
+        default=None,
+        help="Only report these weeks: codes and ranges, e.g. 'S0125-S2625'"
+    )
+    report_parser.add_argument(
+        "--collab",
+        nargs="+",
+        metavar="NAME",
+        default=None,
+        help="Only report these collaborators"
+    )
+    report_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="Weekly hours shown in full green on the heatmap (default: 35)"
+    )
+    report_parser.add_argument(
+        "--details",
+        action="store_true",
+        help="Add a 'Pointage' sheet with every row (columns A-K)"
+    )
+    check_parser = subparsers_action.add_parser("check", help="Check the interface files (damaged package, missing sheets, wrong B1, outdated validations) without opening them in Excel")
+    check_parser.add_argument(
+        "--collab",
+        nargs="+",
+        metavar="NAME",
+        default=None,
+        help="Only check these collaborators"
+    )
+    check_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON (one entry per file with its problems) instead of a table"
+    )
+    archives_parser = subparsers_action.add_parser("archives", help="Maintenance of the zip archives of the 'Archived' and 'Deleted' folders")
+    archives_actions = archives_parser.add_subparsers(dest="archives_action", required=True)
+    verify_parser = archives_actions.add_parser("verify", help="Verify the CRC of every file of every archive and report corrupt or incomplete snapshots (unchanged archives are not read again)")
+    verify_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Read every archive again, ignoring the results kept in 'archives_index.json'"
+    )
+    verify_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of worker processes reading the archives (default: 4)"
+    )
+    verify_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON (one entry per archive with its problems) instead of a table"
+    )
+    sync_parser = subparsers_action.add_parser("sync", help="Archive interfaces of removed collaborators, create missing ones and apply LC.xlsx in one pass, writing each file at most once")
+    sync_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the planned operations and their estimated cost without writing anything (LC.xlsx is kept)"
+    )
+    sync_parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of worker processes creating interfaces (default: 8)"
+    )
+    layout_parser = subparsers_action.add_parser("layout", help="Show the layout of RM_Collaborateurs, or move the interfaces into subfolders by name prefix or team (or back to a flat folder)")
+    layout_parser.add_argument(
+        "--shard",
+        choices=["flat", "prefix", "team"],
+        default=None,
+        help="Move the interfaces to this layout: 'prefix' (subfolder per first letter(s) of the name), 'team' (subfolder per team, see --teams) or 'flat'. Without it, the current layout is printed"
+    )
+    layout_parser.add_argument(
+        "--prefix-length",
+        type=int,
+        default=1,
+        help="Letters of the name used as subfolder with '--shard prefix' (default: 1)"
+    )
+    layout_parser.add_argument(
+        "--teams",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Team of each collaborator for '--shard team': two columns 'collaborator;team' (CSV, ';', ',' or tab separated). Defaults to the teams of the current layout"
+    )
 
     return parser
@@ -0,0 +1,566 @@
+"""
+Local pointage history store.
+
+Once SYNTHESE is cleared (Btn_Clear_Synthese archives it), past pointage only lives in Excel
+archives. `pointage --history` also upserts every extracted row into a SQLite database of the
+base directory ('pointage_history.db'), indexed on collaborator, week and key, so totals over
+any period are answered by `roadmap query` without opening a workbook:
+
+    >>> with PointageHistory.open(base_dir) as history:
+    ...     history.totals(["collaborator"], year=2025)
+    [('CLIGNIEZ Yann', 412.5), ('GANI Karim', 398.0)]
+
+Rows are identified by their interface file, their week and their position among the rows of
+that week in the file. An upsert compares the extracted rows with the stored ones: new rows are
+inserted, changed rows updated, unchanged rows left as is, and stored rows that no longer exist
+in the files read (for the weeks read) are deleted.
+
+Aggregate tables are maintained by triggers on the row table, so each inserted, updated or
+deleted row adjusts a handful of aggregate rows and queries read only the aggregates:
+    - agg_collab_week: hours per collaborator and week (Vérif_Collaborateur, rolling totals)
+    - agg_function_sprint: hours per function, key and sprint ('KEY001 Sprint 3')
+    - agg_fs: hours per key, function, label and collaborator ('Fichier de synthèse' tables)
+Each aggregate row counts its source rows and is deleted when the count drops to 0.
+"""
+import csv
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable
+
+from roadmap.pointage import ConsumedHours, PointageRecord, WeekCode, nonzero_share
+from roadmap.synthese import split_sprint
+
+HISTORY_FILE_NAME = "pointage_history.db"
+SCHEMA_VERSION = 2
+HISTORY_TABLES = ("verif", "rolling", "fs")
+
+# Grouping columns accepted by totals(), with their SQL expression
+GROUP_COLUMNS = {
+    "collaborator": "collaborator",
+    "week": "week",
+    "key": "key",
+    "function": "function",
+    "label": "label",
+    "year": "year",
+    "sprint": "sprint",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pointage (
+    source TEXT NOT NULL,
+    week TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    collaborator TEXT,
+    year INTEGER,
+    week_num INTEGER,
+    ordinal INTEGER,
+    key TEXT,
+    label TEXT,
+    function TEXT,
+    key_part TEXT,
+    sprint TEXT,
+    comment TEXT,
+    work_date TEXT,
+    hours REAL,
+    entered_at TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (source, week, line)
+);
+CREATE INDEX IF NOT EXISTS idx_pointage_collaborator ON pointage (collaborator);
+CREATE INDEX IF NOT EXISTS idx_pointage_week ON pointage (year, week_num);
+CREATE INDEX IF NOT EXISTS idx_pointage_key ON pointage (key);
+"""
+
+# Stored columns compared by upsert(), in table order after (source, week, line)
+DATA_COLUMNS = ("collaborator", "year", "week_num", "ordinal", "key", "label", "function", "key_part", "sprint",
+                "comment", "work_date", "hours", "entered_at")
+
+# Aggregate tables: grouping columns and columns derived from them, as expressions of a row
+# ('{r}' is NEW / OLD in the triggers, pointage when rebuilding). NULLs are stored as '' in
+# grouping columns, since NULLs never conflict in a primary key.
+AGGREGATES = {
+    "agg_collab_week": {
+        "keys": {"collaborator": "COALESCE({r}.collaborator, '')", "week": "{r}.week"},
+        "derived": {"year": "{r}.year", "week_num": "{r}.week_num", "ordinal": "{r}.ordinal"},
+    },
+    "agg_function_sprint": {
+        "keys": {"function": "COALESCE({r}.function, '')", "key_part": "COALESCE({r}.key_part, '')",
+                 "sprint": "COALESCE({r}.sprint, '')"},
+        "derived": {},
+    },
+    "agg_fs": {
+        "keys": {"has_sprint": "({r}.key_part IS NOT NULL)", "key_part": "COALESCE({r}.key_part, '')",
+                 "function": "COALESCE({r}.function, '')", "label": "COALESCE({r}.label, '')",
+                 "collaborator": "COALESCE({r}.collaborator, '')"},
+        "derived": {},
+    },
+}
+
+# Aggregate answering totals(): grouping columns it holds and filters it supports
+TOTALS_AGGREGATES = (
+    ("agg_collab_week", {"collaborator", "week", "year"}, {"weeks", "collaborators", "year"}),
+    ("agg_function_sprint", {"function", "sprint"}, set()),
+)
+
+
+def _add_sql(table: str, row: str) -> str:
+    """Statement adding a row ('NEW' or 'OLD') to an aggregate."""
+    spec = AGGREGATES[table]
+    exprs = {**spec["keys"], **spec["derived"]}
+    return (
+        f"INSERT INTO {table} ({', '.join(exprs)}, row_count, hours_rows, hours) "
+        f"VALUES ({', '.join(e.format(r=row) for e in exprs.values())}, 1, {row}.hours IS NOT NULL, "
+        f"COALESCE({row}.hours, 0)) "
+        f"ON CONFLICT ({', '.join(spec['keys'])}) DO UPDATE SET row_count = row_count + 1, "
+        "hours_rows = hours_rows + excluded.hours_rows, hours = hours + excluded.hours;")
+
+
+def _remove_sql(table: str, row: str) -> str:
+    """Statements removing a row ('NEW' or 'OLD') from an aggregate."""
+    match = " AND ".join(f"{column} = {expr.format(r=row)}" for column, expr in AGGREGATES[table]["keys"].items())
+    return (
+        f"UPDATE {table} SET row_count = row_count - 1, hours_rows = hours_rows - ({row}.hours IS NOT NULL), "
+        f"hours = hours - COALESCE({row}.hours, 0) WHERE {match};"
+        f"DELETE FROM {table} WHERE {match} AND row_count = 0;")
+
+
+def _aggregate_schema() -> list[str]:
+    """Statements creating the aggregate tables and the triggers maintaining them."""
+    statements = []
+    for table, spec in AGGREGATES.items():
+        keys = [f"{column} NOT NULL" for column in spec["keys"]]
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table} ({', '.join([*keys, *spec['derived']])}, "
+            "row_count INTEGER NOT NULL, hours_rows INTEGER NOT NULL, hours REAL NOT NULL, "
+            f"PRIMARY KEY ({', '.join(spec['keys'])}))")
+    statements.append("CREATE INDEX IF NOT EXISTS idx_agg_collab_week_ordinal ON agg_collab_week (collaborator, ordinal)")
+    statements.append("CREATE INDEX IF NOT EXISTS idx_agg_collab_week_year ON agg_collab_week (year, week_num)")
+    for event, body in (
+        ("INSERT", [_add_sql(t, "NEW") for t in AGGREGATES]),
+        ("DELETE", [_remove_sql(t, "OLD") for t in AGGREGATES]),
+        ("UPDATE", [_remove_sql(t, "OLD") for t in AGGREGATES] + [_add_sql(t, "NEW") for t in AGGREGATES]),
+    ):
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS pointage_after_{event.lower()} AFTER {event} ON pointage "
+            f"BEGIN {' '.join(body)} END")
+    return statements
+
+
+def _cell_text(value) -> str | None:
+    """Text stored for a free cell (comment, dates): ISO format for dates."""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    text = str(value).strip()
+    return text or None
+
+
+def history_row(record: PointageRecord) -> tuple:
+    """
+    Stored values of a record, in DATA_COLUMNS order.
+
+    Args:
+        record (PointageRecord): Extracted record.
+
+    Returns:
+        tuple: Collaborator, year, week number, week ordinal (consecutive ISO weeks have
+        consecutive ordinals), key, label, function, key part and sprint
+        (column E split around 'Sprint'), comment (H), date (I), hours (J) and entry date (K).
+    """
+    week = record.week
+    monday = week.monday if week is not None else None
+    parts = split_sprint(record.key)
+    return (
+        record.collaborator,
+        week.year if week is not None else None,
+        week.week if week is not None else None,
+        monday.toordinal() // 7 if monday is not None else None,
+        record.key,
+        record.label,
+        record.function,
+        parts[0] if parts is not None else None,
+        parts[1] if parts is not None else None,
+        _cell_text(record.values[7]),
+        _cell_text(record.values[8]),
+        record.hours,
+        _cell_text(record.values[10]),
+    )
+
+
+@dataclass
+class UpsertResult:
+    """
+    Outcome of PointageHistory.upsert().
+
+    Attributes:
+        inserted (int): Rows added.
+        updated (int): Rows whose values changed.
+        deleted (int): Stored rows no longer present in the files read.
+        unchanged (int): Rows already up to date.
+    """
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+class PointageHistory:
+    """
+    SQLite store of the extracted pointage rows.
+
+    Attributes:
+        path (Path): Database file.
+        connection (sqlite3.Connection): Open connection.
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            path (Path | str): Database file, or ':memory:'.
+        """
+        self.path = Path(path)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.executescript(SCHEMA)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._migrate()
+
+    def _migrate(self) -> None:
+        """Add the columns and aggregate tables missing from an older store, then fill them."""
+        conn = self.connection
+        with conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(pointage)")}
+            for column, kind in (("ordinal", "INTEGER"), ("key_part", "TEXT"), ("sprint", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE pointage ADD COLUMN {column} {kind}")
+            # Filled before the triggers exist: the aggregates are rebuilt afterwards
+            updates = []
+            for rowid, week, key in conn.execute("SELECT rowid, week, key FROM pointage").fetchall():
+                code = WeekCode.parse(week)
+                monday = code.monday if code is not None else None
+                parts = split_sprint(key)
+                updates.append((monday.toordinal() // 7 if monday is not None else None,
+                                *(parts if parts is not None else (None, None)), rowid))
+            conn.executemany("UPDATE pointage SET ordinal = ?, key_part = ?, sprint = ? WHERE rowid = ?", updates)
+            for statement in _aggregate_schema():
+                conn.execute(statement)
+            self._rebuild()
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _rebuild(self) -> None:
+        """Recompute every aggregate table from the rows."""
+        for table, spec in AGGREGATES.items():
+            exprs = {**spec["keys"], **spec["derived"]}
+            self.connection.execute(f"DELETE FROM {table}")
+            self.connection.execute(
+                f"INSERT INTO {table} ({', '.join(exprs)}, row_count, hours_rows, hours) "
+                f"SELECT {', '.join(e.format(r='pointage') for e in exprs.values())}, "
+                "COUNT(*), COUNT(hours), COALESCE(SUM(hours), 0) FROM pointage "
+                f"GROUP BY {', '.join(e.format(r='pointage') for e in spec['keys'].values())}")
+
+    def rebuild(self) -> None:
+        """Recompute the aggregate tables from the rows (they are otherwise kept up to date)."""
+        with self.connection:
+            self._rebuild()
+
+    @classmethod
+    def open(cls, base_dir: Path | str) -> "PointageHistory":
+        """
+        Open the history of a base directory ('pointage_history.db').
+
+        Args:
+            base_dir (Path | str): Base directory.
+
+        Returns:
+            PointageHistory: The store.
+        """
+        return cls(Path(base_dir) / HISTORY_FILE_NAME)
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.connection.close()
+
+    def __enter__(self) -> "PointageHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM pointage").fetchone()[0]
+
+    def upsert(self, records: Iterable[PointageRecord], sources: Iterable[str],
+               weeks: set[str] | None = None) -> UpsertResult:
+        """
+        Bring the stored rows of some interface files in line with their extracted records.
+
+        Args:
+            records (Iterable[PointageRecord]): Records extracted from the files.
+            sources (Iterable[str]): Names of the files read (including files without rows).
+            weeks (set[str] | None, optional): Weeks the extraction was limited to. Stored rows
+                of other weeks are kept. Defaults to all weeks.
+
+        Returns:
+            UpsertResult: Rows inserted, updated, deleted and unchanged.
+        """
+        incoming: dict[tuple, tuple] = {}
+        lines: dict[tuple[str, str], int] = {}
+        for record in records:
+            group = (record.source, record.week or "")
+            line = lines.get(group, 0) + 1
+            lines[group] = line
+            incoming[(*group, line)] = history_row(record)
+
+        result = UpsertResult()
+        now = datetime.now().isoformat(timespec="seconds")
+        conn = self.connection
+        with conn:
+            stored = {}
+            for source in set(sources):
+                query = f"SELECT source, week, line, {', '.join(DATA_COLUMNS)} FROM pointage WHERE source = ?"
+                for row in conn.execute(query, (source,)):
+                    if weeks is None or row[1] in weeks:
+                        stored[row[:3]] = row[3:]
+
+            inserts, updates = [], []
+            for ident, values in incoming.items():
+                previous = stored.pop(ident, None)
+                if previous is None:
+                    inserts.append((*ident, *values, now))
+                elif previous != values:
+                    updates.append((*values, now, *ident))
+                else:
+                    result.unchanged += 1
+
+            columns = ("source", "week", "line", *DATA_COLUMNS, "updated_at")
+            conn.executemany(
+                f"INSERT INTO pointage ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", inserts)
+            conn.executemany(
+                f"UPDATE pointage SET {', '.join(f'{c} = ?' for c in (*DATA_COLUMNS, 'updated_at'))} "
+                "WHERE source = ? AND week = ? AND line = ?", updates)
+            conn.executemany("DELETE FROM pointage WHERE source = ? AND week = ? AND line = ?", list(stored))
+
+        result.inserted, result.updated, result.deleted = len(inserts), len(updates), len(stored)
+        return result
+
+    def totals(self, by: Iterable[str], weeks: Iterable[str] | None = None,
+               collaborators: Iterable[str] | None = None, keys: Iterable[str] | None = None,
+               year: int | None = None) -> list[tuple]:
+        """
+        Total hours grouped by some columns.
+
+        Args:
+            by (Iterable[str]): Grouping columns among GROUP_COLUMNS, e.g. ['collaborator', 'week'].
+            weeks (Iterable[str] | None, optional): Week codes to include. Defaults to all.
+            collaborators (Iterable[str] | None, optional): Collaborators to include. Defaults to all.
+            keys (Iterable[str] | None, optional): LC keys to include. Defaults to all.
+            year (int | None, optional): Year to include, e.g. 2025. Defaults to all.
+
+        Returns:
+            list[tuple]: One tuple per group: the grouping values, then the total hours.
+            Weeks are sorted chronologically, other columns alphabetically.
+
+        Raises:
+            ValueError: If a grouping column is unknown.
+        """
+        by = list(by)
+        unknown = [column for column in by if column not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown grouping column(s): {', '.join(unknown)} "
+                             f"(expected {', '.join(GROUP_COLUMNS)})")
+
+        filters = {"weeks": weeks, "collaborators": collaborators, "keys": keys, "year": year}
+        used = {name for name, value in filters.items() if value is not None}
+        table = next((table for table, columns, supported in TOTALS_AGGREGATES
+                      if set(by) <= columns and used <= supported), None)
+
+        conditions, params = [], []
+        for column, values in (("week", weeks), ("collaborator", collaborators), ("key", keys)):
+            if values is not None:
+                values = list(values)
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if year is not None:
+            conditions.append("year = ?")
+            params.append(year)
+
+        if table is None:
+            select = [GROUP_COLUMNS[column] for column in by]
+            total = "SUM(hours)"
+        else:
+            # Grouping columns hold '' for NULL in the aggregates
+            select = [column if column == "year" else f"NULLIF({column}, '')" for column in by]
+            total = "CASE WHEN SUM(hours_rows) > 0 THEN ROUND(SUM(hours), 6) END"
+        order = [("year, week_num, week" if column == "week" else expr) for column, expr in zip(by, select)]
+        query = f"SELECT {', '.join([*select, total])} FROM {table or 'pointage'}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if select:
+            query += f" GROUP BY {', '.join(select)} ORDER BY {', '.join(order)}"
+        return [tuple(row) for row in self.connection.execute(query, params)]
+
+    def _collab_weeks(self, select: str, weeks: Iterable[str] | None,
+                      collaborators: Iterable[str] | None, params: list | None = None) -> dict[str, dict[WeekCode, float]]:
+        """Run a query over agg_collab_week 'a' returning (collaborator, week, hours) rows."""
+        conditions, params = ["a.collaborator <> ''", "a.week <> ''"], list(params or [])
+        for column, values in (("a.week", weeks), ("a.collaborator", collaborators)):
+            if values is not None:
+                values = list(values)
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        table: dict[str, dict[WeekCode, float]] = {}
+        query = f"{select} WHERE {' AND '.join(conditions)} GROUP BY a.collaborator, a.week ORDER BY a.collaborator, a.year, a.week_num"
+        for collaborator, week, hours in self.connection.execute(query, params):
+            if hours is not None:
+                table.setdefault(collaborator, {})[WeekCode.parse(week)] = hours
+        return table
+
+    def weekly_hours(self, weeks: Iterable[str] | None = None,
+                     collaborators: Iterable[str] | None = None) -> dict[str, dict[WeekCode, float]]:
+        """
+        Hours per collaborator and week (Vérif_Collaborateur), from the aggregates.
+
+        Same result as roadmap.pointage.weekly_hours() over the stored rows.
+
+        Args:
+            weeks (Iterable[str] | None, optional): Week codes to include. Defaults to all.
+            collaborators (Iterable[str] | None, optional): Collaborators to include. Defaults to all.
+
+        Returns:
+            dict[str, dict[WeekCode, float]]: Hours by collaborator, then week code.
+        """
+        return self._collab_weeks(
+            "SELECT a.collaborator, a.week, CASE WHEN SUM(a.hours_rows) > 0 THEN ROUND(SUM(a.hours), 6) END "
+            "FROM agg_collab_week a", weeks, collaborators)
+
+    def rolling_hours(self, window: int = 4, weeks: Iterable[str] | None = None,
+                      collaborators: Iterable[str] | None = None) -> dict[str, dict[WeekCode, float]]:
+        """
+        Rolling totals per collaborator: hours of each week and the `window - 1` weeks before it.
+
+        Args:
+            window (int, optional): Number of weeks summed. Defaults to 4.
+            weeks (Iterable[str] | None, optional): Weeks to compute (the weeks before them are
+                still counted). Defaults to all weeks with hours.
+            collaborators (Iterable[str] | None, optional): Collaborators to include. Defaults to all.
+
+        Returns:
+            dict[str, dict[WeekCode, float]]: Rolling totals by collaborator, then week code.
+
+        Raises:
+            ValueError: If window is lower than 1.
+        """
+        if window < 1:
+            raise ValueError(f"Rolling window must be at least 1 week, got {window}")
+        return self._collab_weeks(
+            "SELECT a.collaborator, a.week, ROUND(SUM(b.hours), 6) FROM agg_collab_week a "
+            "JOIN agg_collab_week b ON b.collaborator = a.collaborator "
+            "AND b.ordinal BETWEEN a.ordinal - ? AND a.ordinal AND b.hours_rows > 0",
+            weeks, collaborators, [window - 1])
+
+    def consumed_hours(self) -> ConsumedHours:
+        """
+        Consumed hours of the 'Fichier de synthèse' tables, from the aggregates.
+
+        Same result as roadmap.pointage.consumed_hours() over the stored rows.
+
+        Returns:
+            ConsumedHours: The aggregated hours.
+        """
+        result = ConsumedHours()
+        queries = (
+            (result.by_key_function, "key_part, function", "has_sprint AND (key_part <> '' OR function <> '')"),
+            (result.by_label, "label", "label <> ''"),
+            (result.by_key_label, "key_part, label", "key_part <> '' AND label <> ''"),
+            (result.by_collaborator, "key_part, label, collaborator",
+             "key_part <> '' AND label <> '' AND collaborator <> ''"),
+        )
+        for target, columns, condition in queries:
+            query = (f"SELECT {columns}, ROUND(SUM(hours), 6) FROM agg_fs WHERE {condition} "
+                     f"GROUP BY {columns} HAVING SUM(hours_rows) > 0 ORDER BY {columns}")
+            for *group, hours in self.connection.execute(query):
+                target[group[0] if len(group) == 1 else tuple(group)] = hours
+        return result
+
+
+def matrix_table(table: dict[str, dict[WeekCode, float]], share: bool = False) -> tuple[list[str], list[tuple]]:
+    """
+    Collaborator x week matrix, as laid out in Vérif_Collaborateur.
+
+    Args:
+        table (dict[str, dict[WeekCode, float]]): Hours by collaborator, then week.
+        share (bool, optional): Add a last row with the share of collaborators with hours per
+            week (see roadmap.pointage.nonzero_share). Defaults to False.
+
+    Returns:
+        tuple[list[str], list[tuple]]: Column headers (collaborator, then weeks in chronological
+        order) and rows (collaborators in name order, 0 for weeks without hours).
+    """
+    weeks = sorted({week for hours in table.values() for week in hours},
+                   key=lambda week: WeekCode.parse(week).sort_key())
+    rows = [(name, *(float(table[name].get(week, 0.0)) for week in weeks)) for name in sorted(table)]
+    if share:
+        shares = nonzero_share(table)
+        rows.append(("% non-zero", *(shares[week] for week in weeks)))
+    return ["collaborator", *weeks], rows
+
+
+def fs_table(consumed: ConsumedHours) -> tuple[list[str], list[tuple]]:
+    """
+    Consumed hours per key and label with the per-collaborator breakdown ('Fichier de synthèse' table 3).
+
+    Args:
+        consumed (ConsumedHours): Result of consumed_hours().
+
+    Returns:
+        tuple[list[str], list[tuple]]: Column headers (key, label, hours, then collaborators in
+        name order) and one row per (key, label).
+    """
+    collaborators = sorted({combo[2] for combo in consumed.by_collaborator})
+    rows = [
+        (key, label, hours, *(consumed.by_collaborator.get((key, label, name), 0.0) for name in collaborators))
+        for (key, label), hours in sorted(consumed.by_key_label.items())
+    ]
+    return ["key", "label", "hours", *collaborators], rows
+
+
+def write_csv(path: Path | str, columns: list[str], rows: list[tuple]) -> None:
+    """
+    Write query results to a CSV file (UTF-8 with BOM, so Excel detects the encoding).
+
+    Args:
+        path (Path | str): Output file.
+        columns (list[str]): Column headers.
+        rows (list[tuple]): Rows.
+    """
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def format_table(columns: list[str], rows: list[tuple]) -> str:
+    """
+    Render query results as an aligned text table.
+
+    Args:
+        columns (list[str]): Column headers.
+        rows (list[tuple]): Rows; floats are written with 2 decimals and numbers right-aligned.
+
+    Returns:
+        str: The table, header first.
+    """
+    cells = [[("" if v is None else f"{v:.2f}" if isinstance(v, float) else str(v)) for v in row] for row in rows]
+    widths = [max([len(header)] + [len(row[i]) for row in cells]) for i, header in enumerate(columns)]
+    lines = ["  ".join(header.ljust(width) for header, width in zip(columns, widths)),
+             "  ".join("-" * width for width in widths)]
+    for row, text in zip(rows, cells):
+        lines.append("  ".join(
+            value.rjust(width) if isinstance(raw, (int, float)) else value.ljust(width)
+            for raw, value, width in zip(row, text, widths)).rstrip())
+    return "\n".join(lines)
+
@@ -0,0 +1,71 @@
+"""
+JSON state files kept next to the workbooks.
+
+The collaborator registry, the pointage week index, the archive index and the layout index
+of a sharded folder are small JSON files that the tool rewrites on most runs. They share the
+same rules:
+    - A missing file is not an error: the caller starts from an empty state
+    - An unreadable file (truncated by a sync conflict, edited by hand) is logged and ignored
+    - A write never leaves a partial file: the content goes to a temporary file in the same
+      folder, which then replaces the old one
+
+This module only depends on the standard library: roadmap.archives, which uses it, is
+imported by pool worker processes (see roadmap.worker).
+"""
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def load_json(path: Path | str, parse: Callable[[dict], T], tag: str, fallback: str) -> T | None:
+    """
+    Read a JSON state file.
+
+    Args:
+        path (Path | str): File to read.
+        parse (Callable[[dict], T]): Builds the state from the decoded content. Its errors
+            (missing keys, wrong types) count as an unreadable file.
+        tag (str): Log prefix of the caller (e.g. 'REGISTRY').
+        fallback (str): What the caller does instead, appended to the warning
+            (e.g. 'Starting from an empty registry.').
+
+    Returns:
+        T | None: The parsed state, or None if the file is missing or unreadable.
+    """
+    path = Path(path)
+    try:
+        return parse(json.loads(path.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"[{tag}] Could not read {path.name}: {e}. {fallback}")
+        return None
+
+
+def save_json(path: Path | str, data: object) -> None:
+    """
+    Write a JSON state file atomically (temporary file + replace).
+
+    Args:
+        path (Path | str): File to write. Its folder must exist.
+        data (object): JSON-serializable content.
+
+    Raises:
+        OSError: If the file cannot be written; the old content is left unchanged.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem}_", suffix=path.suffix, dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_name, path)
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,205 @@
+"""
+Sharded layout of the collaborator interface folder.
+
+'RM_Collaborateurs' is a flat folder by default. On synced cloud folders (OneDrive, SharePoint)
+a folder of a few thousand workbooks is slow to list and to watch for changes, so the folder can
+be split into subfolders ('shards'):
+    - prefix: by the first letter(s) of the collaborator name, e.g. 'G/RM_GANI Karim.xlsx'
+    - team: by team, from a 'collaborator;team' file, e.g. 'Team A/RM_GANI Karim.xlsx'
+
+The layout is recorded in 'RM_Collaborateurs/interfaces_index.json', with the path of every
+interface file (relative to the folder), so scripts can find a collaborator's workbook without
+listing the folder. Without this file the folder is flat. Commands list the folder through
+WorkspaceSnapshot, which reads the shards, so they work the same with both layouts; the index
+is rewritten by the commands that create or remove interfaces.
+"""
+import csv
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from roadmap.jsonfile import load_json, save_json
+from roadmap.registry import interface_file_name, normalize_collab_key
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_INDEX_FILE_NAME = "interfaces_index.json"
+
+LAYOUT_FLAT = "flat"
+LAYOUT_PREFIX = "prefix"
+LAYOUT_TEAM = "team"
+LAYOUTS = (LAYOUT_FLAT, LAYOUT_PREFIX, LAYOUT_TEAM)
+
+DEFAULT_PREFIX_LENGTH = 1
+# Shard of the collaborators without a team in the team file
+UNASSIGNED_SHARD = "_Unassigned"
+
+# Characters not allowed in Windows folder names
+_INVALID_FOLDER_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def shard_folder_name(text: str) -> str:
+    """
+    Turn a team name or a name prefix into a valid folder name.
+
+    Args:
+        text (str): Team name or prefix, e.g. 'R&D / Tests'.
+
+    Returns:
+        str: Folder name, e.g. 'R&D _ Tests', or '_' when nothing is left.
+    """
+    name = _INVALID_FOLDER_CHARS.sub("_", text).strip().rstrip(". ")
+    return name or "_"
+
+
+def read_teams(path: Path | str) -> dict[str, str]:
+    """
+    Read the team of each collaborator from a two-column text file.
+
+    Each line holds a collaborator name and a team, separated by ';', ',' or a tab (e.g. a CSV
+    saved by Excel). Lines without a team are ignored; a header line is read as a collaborator
+    named like the header and does no harm.
+
+    Args:
+        path (Path | str): Team file (UTF-8).
+
+    Returns:
+        dict[str, str]: Team by normalized collaborator key (see roadmap.registry.normalize_collab_key).
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    text = Path(path).read_text(encoding="utf-8-sig")
+    try:
+        delimiter = csv.Sniffer().sniff(text[:4096], delimiters=";,\t").delimiter
+    except csv.Error:
+        delimiter = ";"
+    teams = {}
+    for row in csv.reader(text.splitlines(), delimiter=delimiter):
+        if len(row) >= 2 and row[0].strip() and row[1].strip():
+            teams[normalize_collab_key(row[0])] = row[1].strip()
+    return teams
+
+
+@dataclass
+class InterfaceLayout:
+    """
+    Layout of 'RM_Collaborateurs' and index of its interface files.
+
+    Attributes:
+        folder (Path): The 'RM_Collaborateurs' folder.
+        mode (str): 'flat', 'prefix' or 'team'.
+        prefix_length (int): Letters of the name used as shard ('prefix' mode).
+        teams (dict[str, str]): Team by normalized collaborator key ('team' mode).
+        paths (dict[str, str]): Interface path relative to `folder` by collaborator name,
+            as of the last command that changed the folder.
+
+    Example:
+        >>> layout = InterfaceLayout.load(rm_folder)
+        >>> layout.path_for("GANI Karim")
+        PosixPath('.../RM_Collaborateurs/G/RM_GANI Karim.xlsx')
+    """
+    folder: Path
+    mode: str = LAYOUT_FLAT
+    prefix_length: int = DEFAULT_PREFIX_LENGTH
+    teams: dict[str, str] = field(default_factory=dict)
+    paths: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, folder: Path | str) -> "InterfaceLayout":
+        """
+        Load the layout of a collaborator folder.
+
+        Args:
+            folder (Path | str): The 'RM_Collaborateurs' folder.
+
+        Returns:
+            InterfaceLayout: The recorded layout, or a flat layout if the folder has no index
+            (or an unreadable one).
+        """
+        folder = Path(folder)
+
+        def parse(data: dict) -> "InterfaceLayout":
+            mode = data.get("layout", LAYOUT_FLAT)
+            if mode not in LAYOUTS:
+                raise ValueError(f"unknown layout '{mode}'")
+            return cls(folder, mode, max(1, int(data.get("prefix_length", DEFAULT_PREFIX_LENGTH))),
+                       dict(data.get("teams", {})), dict(data.get("collaborators", {})))
+
+        layout = load_json(folder / LAYOUT_INDEX_FILE_NAME, parse, "LAYOUT", "The folder is read as flat.")
+        return cls(folder) if layout is None else layout
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the index file."""
+        return self.folder / LAYOUT_INDEX_FILE_NAME
+
+    @property
+    def sharded(self) -> bool:
+        """True if interfaces are stored in subfolders."""
+        return self.mode != LAYOUT_FLAT
+
+    def shard(self, name: str) -> str:
+        """
+        Return the subfolder of a collaborator's interface.
+
+        Args:
+            name (str): Collaborator name.
+
+        Returns:
+            str: Subfolder name, '' for the flat layout.
+        """
+        if self.mode == LAYOUT_PREFIX:
+            key = normalize_collab_key(name).replace(" ", "")
+            return shard_folder_name(key[:self.prefix_length].upper())
+        if self.mode == LAYOUT_TEAM:
+            return shard_folder_name(self.teams.get(normalize_collab_key(name), UNASSIGNED_SHARD))
+        return ""
+
+    def path_for(self, name: str) -> Path:
+        """
+        Return where the layout stores a collaborator's interface.
+
+        Args:
+            name (str): Collaborator name.
+
+        Returns:
+            Path: Interface path, e.g. 'RM_Collaborateurs/G/RM_GANI Karim.xlsx'.
+        """
+        shard = self.shard(name)
+        return (self.folder / shard if shard else self.folder) / interface_file_name(name)
+
+    def index(self, interfaces: list[Path]) -> None:
+        """
+        Record the interface files present in the folder.
+
+        Args:
+            interfaces (list[Path]): Interface paths (see WorkspaceSnapshot.interfaces).
+        """
+        self.paths = {
+            path.stem[3:] if path.stem.startswith("RM_") else path.stem:
+                path.relative_to(self.folder).as_posix()
+            for path in interfaces
+        }
+
+    def save(self) -> None:
+        """
+        Write the index file atomically (temporary file + replace); a flat layout removes it.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        if not self.sharded:
+            self.index_path.unlink(missing_ok=True)
+            return
+        save_json(self.index_path, {"layout": self.mode, "prefix_length": self.prefix_length, "teams": self.teams,
+                                    "collaborators": dict(sorted(self.paths.items()))})
+
+    def shard_counts(self) -> list[tuple[str, int]]:
+        """(subfolder, interfaces) of the indexed files, for 'roadmap layout'."""
+        counts: dict[str, int] = {}
+        for relative in self.paths.values():
+            shard = relative.rpartition("/")[0] or "."
+            counts[shard] = counts.get(shard, 0) + 1
+        return sorted(counts.items())
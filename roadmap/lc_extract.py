@@ -0,0 +1,272 @@
+"""
+LC lookup table built straight from an MS Project extract.
+
+Btn_Extract_LC_MSP reads 'Extract_MSP'!A2:U, keeps columns B, C, F, N, O and U of each row
+with a non-empty B, blanks N when it is 0, deduplicates the rows on their composite key and
+writes the unique rows to 'LC'!F:K from row 3, all through COM. On extracts of tens of
+thousands of rows this blocks Excel. This module does the same in a single streamed pass:
+    - The source is the 'Extract_MSP' sheet of a workbook (the synthesis workbook by
+      default) or the tabular export (.csv / .txt) of the same MS Project view
+    - Rows are deduplicated with a set of case-insensitive keys, like the Scripting.Dictionary
+      with CompareMode = 1 used by the VBA
+    - The unique rows are written to 'LC'!F:K of the closed synthesis workbook (see
+      roadmap.xlsx.patch_rows) and to the 'LC.xlsx' payload read by the update command
+"""
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from openpyxl import Workbook
+
+from roadmap.locks import LockScan
+from roadmap.synthese import LC_LOOKUP_COL_F, LC_LOOKUP_COL_K, LC_LOOKUP_FIRST_ROW, LC_SHEET, vba_text
+from roadmap.xlsx import (CellStyles, iter_rows, last_value_row, open_package,
+                          patch_rows, read_rows, replace_parts, sheet_part_name)
+
+EXTRACT_MSP_SHEET = "Extract_MSP"
+EXTRACT_FIRST_ROW = 2
+EXTRACT_LAST_COL = 21   # U
+EXTRACT_KEY_COL = 2     # B: rows without a value here are skipped
+# Extract_MSP column copied to each LC lookup column F, G, H, I, J, K
+LOOKUP_SOURCE_COLS = (2, 6, 14, 15, 3, 21)   # B, F, N, O, C, U
+LOOKUP_ZERO_BLANK_COL = 14                   # N is left empty when it equals 0
+LC_PAYLOAD_FILE = "LC.xlsx"
+
+TABULAR_SUFFIXES = (".csv", ".txt")
+WORKBOOK_SUFFIXES = (".xlsx", ".xlsm")
+
+
+@dataclass
+class LookupExtract:
+    """
+    Result of an extraction.
+
+    Attributes:
+        rows (list[list]): Unique LC lookup rows (values of columns F to K), in source order.
+        source_rows (int): Source rows up to the last one with a value in column B, as counted
+            by Btn_Extract_LC_MSP.
+    """
+    rows: list[list] = field(default_factory=list)
+    source_rows: int = 0
+
+
+def _cstr(value) -> str:
+    """Text of a value as VBA CStr would give it (not trimmed)."""
+    return value if isinstance(value, str) else vba_text(value)
+
+
+def _is_zero(value) -> bool:
+    """True when IsNumeric(value) And CDbl(value) = 0 in VBA (Empty counts as 0)."""
+    if value is None:
+        return True
+    if isinstance(value, bool):
+        return not value
+    if isinstance(value, (int, float)):
+        return value == 0
+    if isinstance(value, str):
+        try:
+            return float(value.strip().replace(",", ".")) == 0
+        except ValueError:
+            return False
+    return False
+
+
+def lookup_row(cells: dict[int, object]) -> list | None:
+    """
+    Map an Extract_MSP row to an LC lookup row, like Btn_Extract_LC_MSP.
+
+    Args:
+        cells (dict[int, object]): Source values by column index (A = 1).
+
+    Returns:
+        list | None: Values of LC columns F to K, or None when column B is empty.
+    """
+    key = vba_text(cells.get(EXTRACT_KEY_COL))
+    if not key:
+        return None
+    row = [cells.get(col) for col in LOOKUP_SOURCE_COLS]
+    row[0] = key
+    zero_blank = LOOKUP_SOURCE_COLS.index(LOOKUP_ZERO_BLANK_COL)
+    if _is_zero(row[zero_blank]):
+        row[zero_blank] = None
+    return row
+
+
+def dedupe_lookup(rows: Iterable[tuple[int, dict[int, object]]]) -> LookupExtract:
+    """
+    Build the unique LC lookup rows from source rows.
+
+    Args:
+        rows (Iterable[tuple[int, dict[int, object]]]): Row number and values by column index,
+            e.g. from roadmap.xlsx.iter_rows. Consumed once.
+
+    Returns:
+        LookupExtract: Rows unique on B||F||N||O||C||U, compared case-insensitively; the first
+        occurrence is kept.
+    """
+    result = LookupExtract()
+    seen = set()
+    last_row = EXTRACT_FIRST_ROW - 1
+    for row_number, cells in rows:
+        row = lookup_row(cells)
+        if row is None:
+            continue
+        last_row = row_number
+        key = tuple(_cstr(value).casefold() for value in row)
+        if key not in seen:
+            seen.add(key)
+            result.rows.append(row)
+    result.source_rows = last_row - EXTRACT_FIRST_ROW + 1
+    return result
+
+
+def iter_tabular(path: Path) -> Iterator[tuple[int, dict[int, object]]]:
+    """
+    Stream a tabular MS Project export laid out like the 'Extract_MSP' sheet.
+
+    The first line holds the headers (row 1 of the sheet); columns are taken by position.
+    The delimiter (',', ';' or tab) is detected from the header line, and the file is read as
+    UTF-8 (with or without BOM), falling back to cp1252 as written by MS Project on Windows.
+
+    Args:
+        path (Path): Path to the .csv / .txt file.
+
+    Yields:
+        tuple[int, dict[int, object]]: Sheet row number (from 2) and non-empty texts by column.
+    """
+    raw = path.read_bytes()
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = raw.decode("cp1252")
+    header = text.split("\n", 1)[0]
+    delimiter = max((",", ";", "\t"), key=header.count)
+
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=delimiter)
+    next(reader, None)
+    for row_number, values in enumerate(reader, start=EXTRACT_FIRST_ROW):
+        cells = {col: value for col, value in enumerate(values[:EXTRACT_LAST_COL], start=1) if value != ""}
+        if cells:
+            yield row_number, cells
+
+
+def extract_lookup(source: Path | str, sheet_name: str = EXTRACT_MSP_SHEET) -> LookupExtract:
+    """
+    Read an MS Project extract and build the unique LC lookup rows in a single pass.
+
+    Args:
+        source (Path | str): Workbook holding the extract sheet (.xlsx / .xlsm, read from a
+            snapshot copy if open in Excel) or tabular export (.csv / .txt).
+        sheet_name (str, optional): Sheet of the extract in a workbook. Defaults to 'Extract_MSP'.
+
+    Returns:
+        LookupExtract: Unique rows and number of source rows.
+
+    Raises:
+        ValueError: If the source format is not supported.
+        KeyError: If the workbook has no such sheet.
+    """
+    source = Path(source)
+    suffix = source.suffix.lower()
+    if suffix in TABULAR_SUFFIXES:
+        return dedupe_lookup(iter_tabular(source))
+    if suffix in WORKBOOK_SUFFIXES:
+        with open_package(source) as zf:
+            return dedupe_lookup(iter_rows(zf, sheet_name, min_row=EXTRACT_FIRST_ROW,
+                                           max_col=EXTRACT_LAST_COL, dates=True))
+    raise ValueError(
+        f"Unsupported MS Project extract '{source.name}': expected a workbook "
+        f"({', '.join(WORKBOOK_SUFFIXES)}) or a tabular export ({', '.join(TABULAR_SUFFIXES)})")
+
+
+def write_lookup_table(synthese_file: Path | str, rows: list[list]) -> int:
+    """
+    Replace the LC lookup table ('LC'!F:K from row 3) of a closed synthesis workbook.
+
+    Like Btn_Extract_LC_MSP, the old values are cleared (formats are kept) down to the last
+    row with a value in column F, then the unique rows are written from row 3.
+
+    Args:
+        synthese_file (Path | str): Path to 'Synthèse_RM_CE.xlsm'.
+        rows (list[list]): Values of columns F to K (see extract_lookup).
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        PermissionError: If the workbook is open in Excel.
+        ValueError: If a cell of the table holds a formula.
+        KeyError: If the LC sheet does not exist.
+    """
+    synthese_file = Path(synthese_file)
+    if LockScan.scan(synthese_file.parent).is_locked(synthese_file):
+        raise PermissionError(f"'{synthese_file.name}' is open in Excel")
+
+    with open_package(synthese_file) as zf:
+        part = sheet_part_name(zf, LC_SHEET)
+        sheet_xml = zf.read(part).decode("utf-8")
+        styles = CellStyles(zf.read("xl/styles.xml").decode("utf-8"))
+
+    first_row = LC_LOOKUP_FIRST_ROW + 1
+    last_old_row = last_value_row(sheet_xml, LC_LOOKUP_COL_F)
+    values = {row_number: [] for row_number in range(first_row, last_old_row + 1)}
+    values.update({first_row + offset: row for offset, row in enumerate(rows)})
+    sheet_xml = patch_rows(sheet_xml, values, LC_LOOKUP_COL_F, LC_LOOKUP_COL_K, styles, sheet_name=LC_SHEET)
+
+    replace_parts(synthese_file, {part: sheet_xml.encode("utf-8"), "xl/styles.xml": styles.render()})
+    return len(rows)
+
+
+def _payload_text(value) -> str:
+    """Displayed text of a value in the LC sheet (dates as dd/mm/yyyy, see UpdateLCInWorkbook)."""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%d/%m/%Y")
+    return vba_text(value)
+
+
+def write_lc_payload(synthese_file: Path | str, rows: list[list], output: Path | str) -> int:
+    """
+    Write the 'LC.xlsx' payload with the new lookup table, like CreateLCExcel.
+
+    The 'LC' sheet of the synthesis workbook is copied as text ('@' format), with the lookup
+    table (F:K from row 3) replaced by the new rows. The workbook may be open in Excel.
+
+    Args:
+        synthese_file (Path | str): Path to 'Synthèse_RM_CE.xlsm'.
+        rows (list[list]): Values of columns F to K (see extract_lookup).
+        output (Path | str): Path of the payload, e.g. '<base>/LC.xlsx'.
+
+    Returns:
+        int: Number of rows written to the payload sheet.
+
+    Raises:
+        KeyError: If the LC sheet does not exist.
+    """
+    with open_package(synthese_file) as zf:
+        cells = read_rows(zf, LC_SHEET, dates=True)
+
+    first_row = LC_LOOKUP_FIRST_ROW + 1
+    for row_number, row_cells in cells.items():
+        if row_number >= first_row:
+            for col in range(LC_LOOKUP_COL_F, LC_LOOKUP_COL_K + 1):
+                row_cells.pop(col, None)
+    for offset, row in enumerate(rows):
+        row_cells = cells.setdefault(first_row + offset, {})
+        for col, value in enumerate(row, start=LC_LOOKUP_COL_F):
+            if value is not None and value != "":
+                row_cells[col] = value
+
+    # Not write-only: load_lc_excel relies on the sheet dimension, which write-only mode omits
+    wb = Workbook()
+    ws = wb.active
+    ws.title = LC_SHEET
+    last_row = max((r for r, row_cells in cells.items() if row_cells), default=0)
+    for row_number, row_cells in cells.items():
+        for col, value in row_cells.items():
+            cell = ws.cell(row=row_number, column=col, value=_payload_text(value))
+            cell.number_format = "@"
+    wb.save(output)
+    return last_row
@@ -0,0 +1,275 @@
+"""
+Lock-aware file access layer for roadmap operations.
+
+Collaborator interfaces live on shared (often OneDrive-synced) folders and are regularly
+left open in Excel. This module provides a single way for every command to deal with that:
+    - Scanning a folder once for Excel owner files ('~$...')
+    - Probing for open handles where the platform makes it detectable
+    - Running a per-file operation with locked files routed to a deferred retry queue
+    - Producing one consolidated report at the end of the run
+
+On Windows, Excel holds a share-deny-write handle on open workbooks, so opening a file for
+writing fails with PermissionError. On other platforms only owner files are detectable.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+OWNER_FILE_PREFIX = "~$"
+
+# Delays (in seconds) between successive retries of the deferred queue
+DEFAULT_RETRY_DELAYS = (0.2, 0.4, 0.8)
+
+
+def backoff_delays(retries: int, base_delay: float = 0.2, factor: float = 2.0) -> tuple[float, ...]:
+    """
+    Compute an exponential backoff schedule.
+
+    Args:
+        retries (int): Number of retries (the schedule has one delay per retry).
+        base_delay (float, optional): Delay before the first retry. Defaults to 0.2.
+        factor (float, optional): Multiplier applied between retries. Defaults to 2.0.
+
+    Returns:
+        tuple[float, ...]: Delays in seconds, e.g. (0.2, 0.4, 0.8) for 3 retries.
+    """
+    return tuple(base_delay * factor ** attempt for attempt in range(max(retries, 0)))
+
+
+def owner_file_names(file_name: str) -> tuple[str, ...]:
+    """
+    Return the owner file names Office may create for a given file.
+
+    Excel creates '~$<name>' next to an open workbook. For long names, Office replaces the
+    first two characters instead of prefixing, so both forms are checked.
+
+    Args:
+        file_name (str): Name of the workbook (e.g. 'RM_GANI Karim.xlsx').
+
+    Returns:
+        tuple[str, ...]: Candidate owner file names.
+    """
+    candidates = [OWNER_FILE_PREFIX + file_name]
+    if len(file_name) > 2:
+        candidates.append(OWNER_FILE_PREFIX + file_name[2:])
+    return tuple(candidates)
+
+
+def probe_exclusive(path: Path) -> bool:
+    """
+    Check whether another process holds a handle that prevents writing to a file.
+
+    Args:
+        path (Path): File to probe.
+
+    Returns:
+        bool: True if the file exists but cannot be opened for writing.
+    """
+    try:
+        with open(path, "r+b"):
+            return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+
+
+@dataclass(frozen=True)
+class LockScan:
+    """
+    Result of a single scan of a folder for Excel owner files.
+
+    Attributes:
+        folder (Path): Scanned folder.
+        owner_files (frozenset[str]): Names of the owner files found ('~$...').
+    """
+    folder: Path
+    owner_files: frozenset[str] = frozenset()
+
+    @classmethod
+    def scan(cls, folder: Path | str) -> "LockScan":
+        """
+        Scan a folder once and record every owner file it contains.
+
+        Args:
+            folder (Path | str): Folder to scan. A missing folder yields an empty scan.
+
+        Returns:
+            LockScan: The scan result.
+        """
+        folder = Path(folder)
+        try:
+            with os.scandir(folder) as entries:
+                owners = frozenset(e.name for e in entries if e.name.startswith(OWNER_FILE_PREFIX))
+        except OSError:
+            owners = frozenset()
+        return cls(folder=folder, owner_files=owners)
+
+    def has_owner_file(self, path: Path | str) -> bool:
+        """
+        Return True if the given workbook currently has an Excel owner file.
+
+        Only files flagged by the scan are re-checked on disk, so unflagged files cost no
+        extra metadata call and deferred files are released as soon as Excel closes them.
+
+        Args:
+            path (Path | str): Workbook to check.
+
+        Returns:
+            bool: True if an owner file was found by the scan and still exists.
+        """
+        path = Path(path)
+        if path.name.startswith(OWNER_FILE_PREFIX):
+            return False
+        flagged = [name for name in owner_file_names(path.name) if name in self.owner_files]
+        return any((path.parent / name).exists() for name in flagged)
+
+    def is_locked(self, path: Path | str) -> bool:
+        """
+        Return True if the file is open in Excel or held by another process.
+
+        Args:
+            path (Path | str): File to check.
+
+        Returns:
+            bool: True when an owner file exists or an exclusive handle is detected.
+        """
+        return self.has_owner_file(path) or probe_exclusive(Path(path))
+
+
+@dataclass
+class LockReport:
+    """
+    Consolidated outcome of a lock-aware run.
+
+    Attributes:
+        processed (list[Path]): Files processed on the first attempt.
+        recovered (list[Path]): Files processed after being deferred at least once.
+        locked (list[Path]): Files still locked after every retry (skipped).
+        failed (list[tuple[Path, str]]): Files that raised a non-lock error, with the message.
+        durations (dict[Path, float]): Seconds taken by the successful attempt on each processed file.
+    """
+    processed: list[Path] = field(default_factory=list)
+    recovered: list[Path] = field(default_factory=list)
+    locked: list[Path] = field(default_factory=list)
+    failed: list[tuple[Path, str]] = field(default_factory=list)
+    durations: dict[Path, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True if every file was processed."""
+        return not self.locked and not self.failed
+
+    def log(
+        self,
+        tag: str,
+        locked_message: str = "Skipped {name} - file is open in Excel or locked by another process",
+        failed_message: str = "Error processing {name}: {error}",
+    ) -> None:
+        """
+        Log the consolidated report: one line per locked or failed file, then a summary.
+
+        Args:
+            tag (str): Log prefix of the calling command (e.g. 'UPDATE_LC').
+            locked_message (str, optional): Format for locked files ('{name}' placeholder).
+            failed_message (str, optional): Format for failed files ('{name}', '{error}').
+        """
+        for path in self.locked:
+            logger.warning(f"[{tag}] " + locked_message.format(name=Path(path).name))
+        for path, error in self.failed:
+            logger.error(f"[{tag}] " + failed_message.format(name=Path(path).name, error=error))
+
+        done = len(self.processed) + len(self.recovered)
+        logger.info(
+            f"[{tag}] Lock report: {done} processed ({len(self.recovered)} after retry), "
+            f"{len(self.locked)} locked, {len(self.failed)} failed")
+
+
+def run_lock_aware(
+    paths: Iterable[Path],
+    func: Callable[[Path], object],
+    *,
+    is_locked: Callable[[Path], bool] | None = None,
+    max_workers: int = 1,
+    delays: Iterable[float] = DEFAULT_RETRY_DELAYS,
+    sleep: Callable[[float], None] = time.sleep,
+) -> tuple[dict[Path, object], LockReport]:
+    """
+    Apply an operation to files, deferring locked ones to a retry queue with backoff.
+
+    Unlocked files are processed immediately (in parallel threads when max_workers > 1).
+    Files reported locked by `is_locked`, or whose operation raises PermissionError, are
+    queued and retried after each delay in `delays`. Any other exception marks the file as
+    failed without stopping the run.
+
+    Args:
+        paths (Iterable[Path]): Files to process.
+        func (Callable[[Path], object]): Operation applied to each file.
+        is_locked (Callable[[Path], bool] | None, optional): Pre-check run before each attempt.
+            Defaults to None (rely on PermissionError only).
+        max_workers (int, optional): Threads used for the first pass. Defaults to 1.
+        delays (Iterable[float], optional): Backoff schedule for the deferred queue.
+            Defaults to DEFAULT_RETRY_DELAYS.
+        sleep (Callable[[float], None], optional): Sleep function (injectable for tests).
+
+    Returns:
+        tuple[dict[Path, object], LockReport]: Results keyed by path (input order) and the report.
+    """
+    paths = list(paths)
+    report = LockReport()
+    outcomes: dict[Path, tuple[str, object]] = {}
+
+    def attempt(path: Path) -> tuple[str, object]:
+        if is_locked is not None and is_locked(path):
+            return "locked", None
+        start = time.perf_counter()
+        try:
+            result = func(path)
+        except PermissionError:
+            return "locked", None
+        except Exception as e:
+            return "failed", str(e)
+        report.durations[path] = time.perf_counter() - start
+        return "ok", result
+
+    if max_workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for path, outcome in zip(paths, executor.map(attempt, paths)):
+                outcomes[path] = outcome
+    else:
+        for path in paths:
+            outcomes[path] = attempt(path)
+
+    deferred = [p for p in paths if outcomes[p][0] == "locked"]
+    retried = set(deferred)
+
+    for delay in delays:
+        if not deferred:
+            break
+        logger.debug(f"[LOCKS] {len(deferred)} locked file(s) deferred, retrying in {delay:.1f}s")
+        sleep(delay)
+        still_locked = []
+        for path in deferred:
+            outcomes[path] = attempt(path)
+            if outcomes[path][0] == "locked":
+                still_locked.append(path)
+        deferred = still_locked
+
+    results: dict[Path, object] = {}
+    for path in paths:
+        status, value = outcomes[path]
+        if status == "ok":
+            results[path] = value
+            (report.recovered if path in retried else report.processed).append(path)
+        elif status == "locked":
+            report.locked.append(path)
+        else:
+            report.failed.append((path, value))
+
+    return results, report
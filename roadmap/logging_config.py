@@ -0,0 +1,168 @@
+"""
+Queue-based logging setup.
+
+Log calls never write to a file themselves: the root logger only has a QueueHandler, and a
+QueueListener thread of the main process passes the records to the real handlers:
+    - a size-based RotatingFileHandler on 'roadmap.log' (5 MB, 5 backups), whose rotated
+      files are gzip-compressed ('roadmap.log.1.gz', ...)
+    - a StreamHandler on stderr
+
+Pool worker processes do not open the log file. They are started with init_worker_logging()
+as initializer, which sends their records through a multiprocessing queue (see
+worker_log_queue()) to a second listener of the main process, writing to the same handlers.
+Only the main process writes the file, so lines of different processes never interleave.
+"""
+import atexit
+import gzip
+import logging
+import logging.handlers
+import multiprocessing
+import multiprocessing.queues
+import os
+import queue
+import shutil
+import threading
+from pathlib import Path
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+_listener = None
+_queue_handler = None
+_worker_queue = None
+_worker_listener = None
+_handlers = []
+_setup_lock = threading.Lock()
+
+
+def gzip_namer(name: str) -> str:
+    """Name of a rotated log file: 'roadmap.log.1' -> 'roadmap.log.1.gz'."""
+    return f"{name}.gz"
+
+
+def gzip_rotator(source: str, dest: str) -> None:
+    """Compress the log file being rotated into `dest`, then remove it."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def rotating_file_handler(log_file: Path | str, max_bytes: int = LOG_MAX_BYTES,
+                          backup_count: int = LOG_BACKUP_COUNT) -> logging.handlers.RotatingFileHandler:
+    """
+    Build the handler of the log file.
+
+    Args:
+        log_file (Path | str): Log file ('roadmap.log').
+        max_bytes (int, optional): Size above which the file is rotated. Defaults to 5 MB.
+        backup_count (int, optional): Compressed files kept. Defaults to 5.
+
+    Returns:
+        logging.handlers.RotatingFileHandler: Handler rotating into gzip files.
+
+    Note:
+        Rotation runs in the listener thread, so compressing a full file never stalls the
+        commands: their records wait in the queue meanwhile.
+    """
+    handler = logging.handlers.RotatingFileHandler(
+        log_file, mode="a", maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+    handler.namer = gzip_namer
+    handler.rotator = gzip_rotator
+    return handler
+
+
+def configure_logging(log_file: Path | str, level: int = logging.DEBUG) -> None:
+    """
+    Route the root logger through a queue to the log file and stderr.
+
+    Does nothing if logging is already configured by this module.
+
+    Args:
+        log_file (Path | str): Log file ('roadmap.log').
+        level (int, optional): Root logger level. Defaults to DEBUG.
+    """
+    global _listener, _queue_handler, _handlers
+    with _setup_lock:
+        if _listener is not None:
+            return
+        formatter = logging.Formatter(LOG_FORMAT)
+        _handlers = [rotating_file_handler(log_file), logging.StreamHandler()]
+        for handler in _handlers:
+            handler.setFormatter(formatter)
+
+        records = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.setLevel(level)
+        _queue_handler = logging.handlers.QueueHandler(records)
+        root.addHandler(_queue_handler)
+        _listener = logging.handlers.QueueListener(records, *_handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+
+
+def worker_log_queue() -> multiprocessing.queues.Queue | None:
+    """
+    Queue the pool workers send their records to (see init_worker_logging).
+
+    Created on first use, with the listener that writes its records.
+
+    Returns:
+        multiprocessing.queues.Queue | None: The queue, or None when logging is not configured.
+    """
+    global _worker_queue, _worker_listener
+    with _setup_lock:
+        if _listener is None:
+            return None
+        if _worker_queue is None:
+            _worker_queue = multiprocessing.Queue()
+            _worker_listener = logging.handlers.QueueListener(
+                _worker_queue, *_handlers, respect_handler_level=True)
+            _worker_listener.start()
+        return _worker_queue
+
+
+def init_worker_logging(log_queue: multiprocessing.queues.Queue | None, level: int = logging.DEBUG) -> None:
+    """
+    Initializer of pool worker processes: send their records to the main process.
+
+    Replaces the handlers the worker inherited (fork) or configured on import (spawn).
+
+    Args:
+        log_queue (multiprocessing.queues.Queue | None): Value of worker_log_queue() in the main process.
+            None leaves the worker logging unchanged.
+        level (int, optional): Root logger level of the worker. Defaults to DEBUG.
+    """
+    global _listener, _queue_handler, _worker_listener, _worker_queue, _handlers
+    if log_queue is None:
+        return
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    # State copied by fork belongs to the main process: the worker must not stop its listeners
+    _listener = _queue_handler = _worker_listener = _worker_queue = None
+    _handlers = []
+
+
+def stop_logging() -> None:
+    """
+    Write the queued records, stop the listeners and close the log file.
+
+    Registered to run at exit. configure_logging() can be called again afterwards.
+    """
+    global _listener, _queue_handler, _worker_listener, _worker_queue, _handlers
+    with _setup_lock:
+        if _queue_handler is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+        for listener in (_worker_listener, _listener):
+            if listener is not None:
+                listener.stop()
+        if _worker_queue is not None:
+            _worker_queue.close()
+            _worker_queue.join_thread()
+        for handler in _handlers:
+            handler.close()
+        _listener = _queue_handler = _worker_listener = _worker_queue = None
+        _handlers = []
@@ -10,15 +10,37 @@ The CLI supports the following commands:
     3. cleanup - Remove interfaces for missing collaborators
     4. pointage - Export time tracking data
     5. update - Update conditional lists (LC)
+    6. lc-extract - Build the LC lookup table from an MS Project extract
+    7. query - Total hours from the pointage history
+    8. report - Summary workbook of the pointage data
+    9. check - Health check of the interface files
+    10. archives verify - Integrity check of the archives
+    11. sync - Cleanup, create and LC update in one pass
+    12. layout - Flat or sharded layout of RM_Collaborateurs
 
 The module integrates with Excel files using openpyxl, and can be called from both command-line and VBA macros.
 
 Author: Mustapha EL KAMILI
 """
+import argparse
+import logging
 import sys
+import time
+from pathlib import Path
 
-from roadmap.helpers import get_parser, logger
+from roadmap import archives
+from roadmap.batch import (DEFAULT_POOL_WORKERS, ContentCache, batch_base_dirs,
+                           shared_pool)
+from roadmap.check import problem_rows, to_json
+from roadmap.helpers import get_exe_dir, get_parser, logger
+from roadmap.history import format_table, write_csv
+from roadmap.layout import LAYOUT_TEAM, read_teams
+from roadmap.metrics import (METRICS_STATE_FILE_NAME, ErrorCounter, load_state,
+                             metrics, write_metrics)
+from roadmap.profiling import profiler
 from roadmap.roadmap import RoadmapManager
+from roadmap.sync import action_rows, estimate_rates, estimate_rows
+from roadmap.trace import TRACE_FILE_NAME, span, tracer
 
 
 def main() -> None:
@@ -32,19 +54,118 @@ def main() -> None:
         - Windows: 'C:\\Users\\MustaphaELKAMILI\\OneDrive - IKOSCONSULTING\\test_RM\\files'
         - Other: '/mnt/c/Users/MustaphaELKAMILI/OneDrive - IKOSCONSULTING/test_RM/files'
 
-    Can be overridden with '--basedir' argument.
+    Can be overridden with '--basedir' argument, or with '--batch' / '--manifest' to run the
+    command in several base directories (see run_batch).
 
     Returns:
         None
     """
     logger.info("Roadmap Manager - Loading...")
     args = get_parser().parse_args()
-    if args.basedir == 'none':
-        logger.error("No base directory provided. Please use '--basedir' to specify the base directory.")
+    try:
+        base_dirs = batch_base_dirs(getattr(args, "batch", None), getattr(args, "manifest", None))
+    except OSError as e:
+        logger.error(f"[BATCH] Could not read the manifest: {e}")
         sys.exit(1)
-    else:
+    manager = None
+    if not base_dirs:
+        if args.basedir == 'none':
+            logger.error("No base directory provided. Please use '--basedir' to specify the base directory.")
+            sys.exit(1)
         manager = RoadmapManager(base_dir=args.basedir)
 
+    if getattr(args, "trace", False):
+        tracer.enable(Path(get_exe_dir()).with_name(TRACE_FILE_NAME), command=args.action)
+        logger.info(f"[TRACE] Writing timing spans to {tracer.path}")
+    if getattr(args, "profile", False):
+        profiler.enable(Path(get_exe_dir()).parent, command=args.action)
+        logger.info(f"[PROFILE] Profiling '{args.action}' (cProfile and tracemalloc)")
+
+    metrics.reset()
+    # Commands log most failures and return: a run with errors in the log is not a success
+    error_counter = ErrorCounter(metrics)
+    logging.getLogger().addHandler(error_counter)
+    start, success = time.perf_counter(), False
+    try:
+        with span("command"):
+            if manager is None:
+                run_batch(base_dirs, args)
+            else:
+                run_command(manager, args)
+        success = metrics.errors == 0
+    finally:
+        logging.getLogger().removeHandler(error_counter)
+        tracer.disable()
+        written = profiler.disable()
+        if written:
+            logger.info(f"[PROFILE] Statistics written to {written[0]} (summary: {written[1]})")
+        try:
+            write_metrics(Path(get_exe_dir()).parent, args.action, time.perf_counter() - start, success)
+        except OSError as e:
+            logger.warning(f"[METRICS] Could not update the metrics file: {e}")
+
+
+def run_batch(base_dirs: list[Path], args: argparse.Namespace) -> None:
+    """
+    Execute the command in several base directories from this process.
+
+    The workspaces share one worker process pool and one parse cache (see roadmap.batch). A
+    workspace that fails does not stop the others. A workspace fails when its command raises,
+    exits with a non-zero status or logs an error (see roadmap.metrics.ErrorCounter).
+
+    Args:
+        base_dirs (list[Path]): Base directories, in execution order.
+        args (argparse.Namespace): Parsed command-line arguments.
+
+    Returns:
+        None: Exits with status 1 after the last workspace if any of them failed.
+    """
+    cache = ContentCache()
+    failed = []
+    with shared_pool(max(1, getattr(args, "pool_workers", DEFAULT_POOL_WORKERS))) as pool:
+        for number, base_dir in enumerate(base_dirs, start=1):
+            logger.info(f"[BATCH] Workspace {number}/{len(base_dirs)}: {base_dir}")
+            if not Path(base_dir).is_dir():
+                logger.error(f"[BATCH] Base directory not found: {base_dir}")
+                failed.append(base_dir)
+                continue
+            manager = RoadmapManager(base_dir=base_dir)
+            manager.executor = pool
+            manager.content_cache = cache
+            # Commands log most failures and return: errors logged by this workspace fail it
+            errors = metrics.errors
+            try:
+                with span("workspace", base_dir):
+                    run_command(manager, args)
+            except SystemExit as e:
+                if e.code:
+                    failed.append(base_dir)
+                    continue
+            except Exception as e:
+                logger.error(f"[BATCH] {base_dir}: {e}", exc_info=True)
+                failed.append(base_dir)
+                continue
+            if metrics.errors > errors:
+                failed.append(base_dir)
+
+    logger.info(f"[BATCH] {len(base_dirs) - len(failed)}/{len(base_dirs)} workspace(s) succeeded; "
+                f"parse cache: {cache.hits} hit(s), {cache.misses} parse(s)")
+    if failed:
+        logger.error(f"[BATCH] Failed: {', '.join(str(base_dir) for base_dir in failed)}")
+        sys.exit(1)
+
+
+def run_command(manager: RoadmapManager, args: argparse.Namespace) -> None:
+    """
+    Execute the RoadmapManager operation selected on the command line.
+
+    Args:
+        manager (RoadmapManager): Manager of the base directory.
+        args (argparse.Namespace): Parsed command-line arguments.
+
+    Returns:
+        None
+    """
     if args.action == "create":
         if args.way == 'normal':
             manager.create_interfaces()
@@ -67,7 +188,24 @@ def main() -> None:
         return
 
     if args.action == "pointage":
-        manager.pointage()
+        options = {}
+        if getattr(args, "direct", False):
+            options["direct"] = True
+        if getattr(args, "threshold", None) is not None:
+            options["threshold"] = args.threshold
+        if getattr(args, "weeks", None):
+            options["weeks"] = args.weeks
+        if getattr(args, "collab", None):
+            options["collaborators"] = args.collab
+        if getattr(args, "history", False):
+            options["history"] = True
+        if getattr(args, "validate", False):
+            options["validate"] = True
+        try:
+            manager.pointage(**options)
+        except ValueError as e:
+            logger.error(f"[POINTAGE] {e}")
+            sys.exit(1)
         return
 
     if args.action == "update":
@@ -76,6 +214,114 @@ def main() -> None:
         except Exception as e:
             logger.error(f"Fatal error in update_lc: {e}", exc_info=True)
             sys.exit(1)
+        return
+
+    if args.action == "lc-extract":
+        if not manager.extract_lc(source=args.source, sheet_name=args.sheet):
+            sys.exit(1)
+        return
+
+    if args.action == "query":
+        table = getattr(args, "table", None)
+        try:
+            if table:
+                result = manager.history_table(table, weeks=args.weeks, collaborators=args.collab,
+                                               window=getattr(args, "window", 4))
+            else:
+                rows = manager.query(args.by, weeks=args.weeks, collaborators=args.collab,
+                                     keys=args.key, year=args.year)
+                result = None if rows is None else ([*args.by, "hours"], rows)
+        except ValueError as e:
+            logger.error(f"[QUERY] {e}")
+            sys.exit(1)
+        if result is None:
+            sys.exit(1)
+        if getattr(args, "csv", None):
+            write_csv(args.csv, *result)
+            logger.info(f"[QUERY] {len(result[1])} row(s) written → {args.csv}")
+        else:
+            print(format_table(*result))
+        return
+
+    if args.action == "report":
+        options = {}
+        for name, option in (("output", "output"), ("weeks", "weeks"), ("collab", "collaborators"),
+                             ("threshold", "threshold")):
+            if getattr(args, name, None) is not None:
+                options[option] = getattr(args, name)
+        if getattr(args, "details", False):
+            options["details"] = True
+        try:
+            output = manager.report(**options)
+        except ValueError as e:
+            logger.error(f"[REPORT] {e}")
+            sys.exit(1)
+        if output is None:
+            sys.exit(1)
+        return
+
+    if args.action == "check":
+        results = manager.check(collaborators=getattr(args, "collab", None))
+        if results is None:
+            sys.exit(1)
+        healthy = all(result.ok for result in results)
+        if getattr(args, "json", False):
+            print(to_json(results))
+        elif not healthy:
+            print(format_table(["file", "problem", "detail"], problem_rows(results)))
+        if not healthy:
+            sys.exit(1)
+        return
+
+    if args.action == "archives":
+        if args.archives_action == "verify":
+            results = manager.verify_archives(max_workers=max(1, getattr(args, "workers", 4)),
+                                              full=getattr(args, "full", False))
+            sound = all(result.ok for result in results)
+            if getattr(args, "json", False):
+                print(archives.to_json(results))
+            elif not sound:
+                print(format_table(["archive", "problem", "detail"], archives.problem_rows(results)))
+            if not sound:
+                sys.exit(1)
+        return
+
+    if args.action == "sync":
+        dry_run = getattr(args, "dry_run", False)
+        workers = max(1, getattr(args, "workers", 8))
+        plan = manager.sync(dry_run=dry_run, max_workers=workers)
+        if plan is None:
+            sys.exit(1)
+        if dry_run:
+            if plan.actions:
+                print(format_table(["operation", "file", "reason"], action_rows(plan)))
+                print()
+            # Rates come from the file durations of earlier cleanup / create / update runs
+            rates = estimate_rates(load_state(Path(get_exe_dir()).parent / METRICS_STATE_FILE_NAME))
+            print(format_table(["operation", "files", "MB", "seconds"], estimate_rows(plan, rates, workers)))
+        return
+
+    if args.action == "layout":
+        shard = getattr(args, "shard", None)
+        if shard is None:
+            layout = manager.layout
+            layout.index(manager.snapshot().interfaces())
+            print(f"Layout: {layout.mode}")
+            print(format_table(["folder", "interfaces"], layout.shard_counts()))
+            return
+        teams = None
+        if getattr(args, "teams", None):
+            try:
+                teams = read_teams(args.teams)
+            except OSError as e:
+                logger.error(f"[LAYOUT] Could not read the team file: {e}")
+                sys.exit(1)
+        elif shard == LAYOUT_TEAM and not manager.layout.teams:
+            logger.error("[LAYOUT] '--shard team' needs a team file (--teams)")
+            sys.exit(1)
+        if not manager.set_layout(shard, prefix_length=getattr(args, "prefix_length", 1), teams=teams):
+            sys.exit(1)
+
 
 def run() -> None:
     """
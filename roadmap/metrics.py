@@ -0,0 +1,271 @@
+"""
+Run metrics for monitoring scheduled runs.
+
+Every CLI run updates 'roadmap_metrics.prom' next to 'roadmap.log', in the Prometheus text
+exposition format, so a local collector (e.g. node_exporter's textfile collector, or any agent
+reading the format) can scrape it. The metrics accumulate over runs:
+
+    roadmap_runs_total{command, outcome}                 counter (outcome: success / failure)
+    roadmap_files_total{command, status}                 counter (status: processed / skipped / locked / failed)
+    roadmap_pointage_rows_exported_total                 counter
+    roadmap_command_duration_seconds{command}            histogram
+    roadmap_file_duration_seconds{command}               histogram (one observation per file processed)
+    roadmap_last_run_timestamp_seconds{command}          gauge
+    roadmap_last_run_success{command}                    gauge (1 / 0)
+
+A run succeeds when the command completes without logging an error: commands report most
+failures (missing files, locked template, unreadable workbooks) in the log and return early.
+
+Counters and histograms are kept in a JSON sidecar, 'roadmap_metrics.json', read and rewritten
+by each run. Both files are replaced atomically, so a scrape never sees a partial file.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from roadmap.locks import LockReport
+
+METRICS_FILE_NAME = "roadmap_metrics.prom"
+METRICS_STATE_FILE_NAME = "roadmap_metrics.json"
+METRICS_STATE_VERSION = 1
+
+FILE_STATUSES = ("processed", "skipped", "locked", "failed")
+COMMAND_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800)
+FILE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class RunMetrics:
+    """
+    Metrics of the current run, filled by the commands.
+
+    Attributes:
+        files (dict[str, int]): Files by status (see FILE_STATUSES).
+        file_durations (list[float]): Seconds spent on each processed file.
+        rows_exported (int): Rows exported by pointage.
+        errors (int): Records logged at ERROR level or above (see ErrorCounter).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.files = dict.fromkeys(FILE_STATUSES, 0)
+        self.file_durations = []
+        self.rows_exported = 0
+        self.errors = 0
+
+    def count(self, status: str, n: int = 1) -> None:
+        """Count `n` files with the given status (see FILE_STATUSES)."""
+        with self._lock:
+            self.files[status] += n
+
+    def observe_file(self, seconds: float) -> None:
+        """Count one processed file and the time it took."""
+        with self._lock:
+            self.files["processed"] += 1
+            self.file_durations.append(seconds)
+
+    def record_report(self, report: LockReport) -> None:
+        """Count the files of a lock-aware run (see roadmap.locks.run_lock_aware)."""
+        with self._lock:
+            self.files["processed"] += len(report.processed) + len(report.recovered)
+            self.files["locked"] += len(report.locked)
+            self.files["failed"] += len(report.failed)
+            self.file_durations.extend(report.durations.values())
+
+    def add_rows(self, n: int) -> None:
+        with self._lock:
+            self.rows_exported += n
+
+
+# Metrics of the current run
+metrics = RunMetrics()
+
+
+class ErrorCounter(logging.Handler):
+    """
+    Logging handler counting the errors logged during a run into RunMetrics.errors.
+
+    Example:
+        >>> logging.getLogger().addHandler(ErrorCounter())
+    """
+
+    def __init__(self, run: RunMetrics | None = None):
+        super().__init__(level=logging.ERROR)
+        self.run = metrics if run is None else run
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with self.run._lock:
+            self.run.errors += 1
+
+
+def _empty_histogram(buckets: tuple) -> dict:
+    return {"buckets": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0}
+
+
+def _observe(histogram: dict, buckets: tuple, value: float) -> None:
+    index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+    histogram["buckets"][index] += 1
+    histogram["sum"] += value
+    histogram["count"] += 1
+
+
+def load_state(path: Path) -> dict:
+    """
+    Read the accumulated metrics.
+
+    Args:
+        path (Path): JSON sidecar file.
+
+    Returns:
+        dict: The state, or an empty one if the file is missing, unreadable or of another
+        version (counters then restart from zero, which collectors handle as a reset).
+    """
+    empty = {"version": METRICS_STATE_VERSION, "runs": {}, "files": {}, "rows_exported": 0,
+             "command_duration": {}, "file_duration": {}, "last_run": {}}
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return empty
+    if not isinstance(state, dict) or state.get("version") != METRICS_STATE_VERSION:
+        return empty
+    return {**empty, **state}
+
+
+def update_state(state: dict, command: str, seconds: float, success: bool, run: RunMetrics,
+                 timestamp: float | None = None) -> dict:
+    """
+    Add one run to the accumulated metrics.
+
+    Args:
+        state (dict): State returned by load_state() (updated in place).
+        command (str): Command name.
+        seconds (float): Duration of the command.
+        success (bool): Whether the command completed without logging an error.
+        run (RunMetrics): Metrics collected during the run.
+        timestamp (float | None, optional): End of the run. Defaults to now.
+
+    Returns:
+        dict: The updated state.
+    """
+    outcome = "success" if success else "failure"
+    runs = state["runs"].setdefault(command, {})
+    runs[outcome] = runs.get(outcome, 0) + 1
+
+    files = state["files"].setdefault(command, dict.fromkeys(FILE_STATUSES, 0))
+    for status, n in run.files.items():
+        files[status] = files.get(status, 0) + n
+
+    if command == "pointage":
+        state["rows_exported"] += run.rows_exported
+
+    _observe(state["command_duration"].setdefault(command, _empty_histogram(COMMAND_BUCKETS)),
+             COMMAND_BUCKETS, seconds)
+    file_histogram = state["file_duration"].setdefault(command, _empty_histogram(FILE_BUCKETS))
+    for file_seconds in run.file_durations:
+        _observe(file_histogram, FILE_BUCKETS, file_seconds)
+
+    state["last_run"][command] = {"timestamp": round(timestamp or time.time(), 3), "success": success}
+    return state
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, histograms: dict, buckets: tuple) -> list[str]:
+    lines = []
+    for command, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, n in zip((*buckets, "+Inf"), histogram["buckets"]):
+            cumulative += n
+            lines.append(f'{name}_bucket{{command="{command}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{command="{command}"}} {_format_value(round(histogram["sum"], 6))}')
+        lines.append(f'{name}_count{{command="{command}"}} {histogram["count"]}')
+    return lines
+
+
+def render(state: dict) -> str:
+    """
+    Render the accumulated metrics in the Prometheus text exposition format.
+
+    Args:
+        state (dict): State returned by load_state() / update_state().
+
+    Returns:
+        str: Content of the metrics file.
+    """
+    lines = [
+        "# HELP roadmap_runs_total Command runs, by outcome.",
+        "# TYPE roadmap_runs_total counter",
+    ]
+    for command, outcomes in sorted(state["runs"].items()):
+        for outcome, n in sorted(outcomes.items()):
+            lines.append(f'roadmap_runs_total{{command="{command}",outcome="{outcome}"}} {n}')
+
+    lines += [
+        "# HELP roadmap_files_total Files handled by the commands, by status.",
+        "# TYPE roadmap_files_total counter",
+    ]
+    for command, files in sorted(state["files"].items()):
+        for status in FILE_STATUSES:
+            lines.append(f'roadmap_files_total{{command="{command}",status="{status}"}} {files.get(status, 0)}')
+
+    lines += [
+        "# HELP roadmap_pointage_rows_exported_total Rows exported by pointage.",
+        "# TYPE roadmap_pointage_rows_exported_total counter",
+        f"roadmap_pointage_rows_exported_total {state['rows_exported']}",
+        "# HELP roadmap_command_duration_seconds Duration of the commands.",
+        "# TYPE roadmap_command_duration_seconds histogram",
+        *_histogram_lines("roadmap_command_duration_seconds", state["command_duration"], COMMAND_BUCKETS),
+        "# HELP roadmap_file_duration_seconds Time spent on each processed file.",
+        "# TYPE roadmap_file_duration_seconds histogram",
+        *_histogram_lines("roadmap_file_duration_seconds", state["file_duration"], FILE_BUCKETS),
+        "# HELP roadmap_last_run_timestamp_seconds End of the last run of each command.",
+        "# TYPE roadmap_last_run_timestamp_seconds gauge",
+    ]
+    last_runs = sorted(state["last_run"].items())
+    for command, last in last_runs:
+        lines.append(f'roadmap_last_run_timestamp_seconds{{command="{command}"}} {_format_value(last["timestamp"])}')
+    lines += [
+        "# HELP roadmap_last_run_success Whether the last run of each command completed without error (1) or not (0).",
+        "# TYPE roadmap_last_run_success gauge",
+    ]
+    for command, last in last_runs:
+        lines.append(f'roadmap_last_run_success{{command="{command}"}} {int(last["success"])}')
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_metrics(folder: Path | str, command: str, seconds: float, success: bool,
+                  run: RunMetrics | None = None) -> Path:
+    """
+    Add the current run to the metrics file of a folder.
+
+    Args:
+        folder (Path | str): Folder of 'roadmap_metrics.prom' and its JSON sidecar (created if needed).
+        command (str): Command name.
+        seconds (float): Duration of the command.
+        success (bool): Whether the command completed without logging an error.
+        run (RunMetrics | None, optional): Metrics of the run. Defaults to the global `metrics`.
+
+    Returns:
+        Path: The metrics file.
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    state_file = folder / METRICS_STATE_FILE_NAME
+    state = update_state(load_state(state_file), command, seconds, success, metrics if run is None else run)
+    _write_atomic(state_file, json.dumps(state, indent=1))
+    metrics_file = folder / METRICS_FILE_NAME
+    _write_atomic(metrics_file, render(state))
+    return metrics_file
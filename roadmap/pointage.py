@@ -0,0 +1,569 @@
+"""
+In-process access to the pointage data of the interface files.
+
+iter_pointage() streams typed records from the POINTAGE sheets, one file at a time and one
+row at a time, so Python tools can consume interface data without the XML export and
+without holding every row in memory:
+
+    >>> from roadmap.roadmap import RoadmapManager
+    >>> manager = RoadmapManager("/path/to/files")
+    >>> for record in manager.iter_pointage(weeks={"S0525", "S0625"}):
+    ...     print(record.collaborator, record.week, record.key, record.hours)
+
+POINTAGE layout (row 3 holds the headers, data starts at row 4, K1 holds the weekly total):
+    A Semaine | B Collaborateur | C Code semaine | D Semaine | E Clé | F Libellé |
+    G Fonction | H Commentaire | I Date | J Heures | K Date saisie
+
+Records are compact: slotted, with the repeated texts (collaborator, week, key, label, function)
+interned, so a year of pointage for the whole department shares one string per distinct value.
+The aggregations of the synthesis workbook (Vérif_Collaborateur, Fichier de synthèse) and the
+SYNTHESE coloring run directly on them.
+"""
+import logging
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from openpyxl import load_workbook
+
+from roadmap.jsonfile import load_json, save_json
+from roadmap.registry import normalize_collab_key
+from roadmap.snapshot import FileEntry
+from roadmap.synthese import split_sprint
+from roadmap.trace import span
+
+logger = logging.getLogger(__name__)
+
+POINTAGE_SHEET = "POINTAGE"
+POINTAGE_FIRST_ROW = 4
+POINTAGE_LAST_COL = 11
+POINTAGE_TOTAL_CELL = "K1"
+WEEK_INDEX_FILE_NAME = "pointage_weeks.json"
+WEEKS_PER_YEAR = 53
+
+# 0-based positions in a POINTAGE row (columns A-K)
+COL_COLLABORATOR = 1
+COL_WEEK = 2
+COL_KEY = 4
+COL_LABEL = 5
+COL_FUNCTION = 6
+COL_HOURS = 9
+
+
+def _intern(value):
+    """Intern text cell values, so equal texts of different rows share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return sys.intern(text) if text else None
+
+
+def _number(value) -> float | None:
+    """Hours as float: numbers, or text with a decimal comma ('7,5'). None otherwise."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip().replace(",", ".")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class WeekCode(str):
+    """
+    Week code of column C ('SXXYY', e.g. 'S0525' for week 5 of 2025).
+
+    A str, so it compares and hashes like the code itself, with the week and year parsed and a
+    chronological sort key. Instances are cached: every row of a week shares one object.
+
+    Example:
+        >>> sorted([WeekCode.parse("S0126"), WeekCode.parse("S5225")], key=WeekCode.sort_key)
+        ['S5225', 'S0126']
+    """
+    __slots__ = ()
+    _cache: dict[str, "WeekCode"] = {}
+
+    @classmethod
+    def parse(cls, value) -> "WeekCode | None":
+        """
+        Week code of a cell value.
+
+        Args:
+            value: Value of column C.
+
+        Returns:
+            WeekCode | None: The code (trimmed), None for an empty cell.
+        """
+        text = _text(value)
+        if text is None:
+            return None
+        code = cls._cache.get(text)
+        if code is None:
+            code = cls._cache.setdefault(text, cls(text))
+        return code
+
+    @property
+    def week(self) -> int | None:
+        """Week number, None if the code is not 'SXXYY'."""
+        return int(self[1:3]) if self.is_valid else None
+
+    @property
+    def year(self) -> int | None:
+        """Four-digit year, None if the code is not 'SXXYY'."""
+        return 2000 + int(self[3:5]) if self.is_valid else None
+
+    @property
+    def is_valid(self) -> bool:
+        """True for an 'SXXYY' code."""
+        return len(self) == 5 and self[0] in "Ss" and self[1:].isdigit()
+
+    @property
+    def monday(self) -> date | None:
+        """Monday of the ISO week, None if the code is not 'SXXYY' or the week does not exist."""
+        if not self.is_valid:
+            return None
+        try:
+            return date.fromisocalendar(self.year, self.week, 1)
+        except ValueError:
+            return None
+
+    def sort_key(self) -> tuple:
+        """Chronological order; codes that are not 'SXXYY' come last, by text."""
+        if self.is_valid:
+            return (0, self.year, self.week, "")
+        return (1, 0, 0, str(self))
+
+
+@dataclass(frozen=True, slots=True)
+class PointageRecord:
+    """
+    One row of a POINTAGE sheet.
+
+    Attributes:
+        source (str): Interface file name, e.g. 'RM_GANI Karim.xlsx'.
+        collaborator (str | None): Collaborator (column B).
+        week (WeekCode | None): Week code, e.g. 'S0525' (column C).
+        key (str | None): LC key (column E).
+        label (str | None): Label (column F).
+        function (str | None): Function (column G).
+        hours (float | None): Hours (column J), None when empty or not numeric.
+        k1 (float): Weekly total of the file (K1), 0 when empty or not numeric.
+        values (tuple): Raw cell values A-K followed by the raw K1 value, as exported to
+            'pointage_output.xml' and SYNTHESE. Texts are interned.
+        sheet_row (int): Row of the POINTAGE sheet, 0 when unknown.
+    """
+    source: str
+    collaborator: str | None
+    week: WeekCode | None
+    key: str | None
+    label: str | None
+    function: str | None
+    hours: float | None
+    k1: float
+    values: tuple = field(repr=False)
+    sheet_row: int = 0
+
+    @classmethod
+    def from_cells(cls, source: str, cells: Iterable, k1, sheet_row: int = 0) -> "PointageRecord":
+        """
+        Build a record from the raw values of columns A-K and of K1.
+
+        Args:
+            source (str): Interface file name.
+            cells (Iterable): Values of columns A-K.
+            k1: Value of K1.
+            sheet_row (int, optional): Row of the POINTAGE sheet. Defaults to 0 (unknown).
+
+        Returns:
+            PointageRecord: The record.
+        """
+        values = tuple(map(_intern, (*cells, k1)))
+        return cls(
+            source=sys.intern(source),
+            collaborator=_text(values[COL_COLLABORATOR]),
+            week=WeekCode.parse(values[COL_WEEK]),
+            key=_text(values[COL_KEY]),
+            label=_text(values[COL_LABEL]),
+            function=_text(values[COL_FUNCTION]),
+            hours=_number(values[COL_HOURS]),
+            k1=_number(k1) or 0.0,
+            values=values,
+            sheet_row=sheet_row,
+        )
+
+    @property
+    def total(self):
+        """Raw K1 value, as used for the SYNTHESE coloring (see roadmap.status)."""
+        return self.values[-1]
+
+    def row(self) -> list:
+        """Row as exported: 11 values (A-K) followed by the K1 total."""
+        return list(self.values)
+
+
+def iso_weeks(year: int) -> int:
+    """Number of ISO weeks of a year (52 or 53): 28 December is always in the last week."""
+    return date(year, 12, 28).isocalendar().week
+
+
+def filter_week(text: str) -> WeekCode:
+    """
+    Week code of a --weeks filter value.
+
+    Args:
+        text (str): Week code, e.g. 'S0525' or 's0525'.
+
+    Returns:
+        WeekCode: The code as written in column C, e.g. 'S0525'.
+
+    Raises:
+        ValueError: If the value is not an 'SXXYY' code with a week from 1 to 53.
+    """
+    code = WeekCode.parse(text)
+    if code is None or not code.is_valid or not 1 <= code.week <= WEEKS_PER_YEAR:
+        raise ValueError(f"Invalid week code: {code!r} (expected SXXYY, e.g. S0525)")
+    return WeekCode.parse(code.upper())
+
+
+def week_range(first: str, last: str) -> list[WeekCode]:
+    """
+    Week codes from `first` to `last`, both included.
+
+    Args:
+        first (str): First week, e.g. 'S5025'.
+        last (str): Last week, e.g. 'S0226'.
+
+    Returns:
+        list[WeekCode]: The codes in chronological order, e.g. S5025, S5125, S5225, S0126,
+        S0226. Week 53 is only included in ISO years that have one (e.g. 2026).
+
+    Raises:
+        ValueError: If a bound is not an 'SXXYY' code or `last` is before `first`.
+    """
+    start, end = filter_week(first), filter_week(last)
+    if end.sort_key() < start.sort_key():
+        raise ValueError(f"Week range {start}-{end} ends before it starts")
+    codes = []
+    year, week = start.year, start.week
+    while (year, week) <= (end.year, end.week):
+        codes.append(WeekCode.parse(f"S{week:02d}{year % 100:02d}"))
+        year, week = (year + 1, 1) if week >= iso_weeks(year) else (year, week + 1)
+    return codes
+
+
+def parse_weeks(specs: Iterable[str]) -> set[str]:
+    """
+    Expand week filters given on the command line.
+
+    Args:
+        specs (Iterable[str]): Week codes ('S0525') and ranges ('S0525-S0825'), each
+            possibly a comma-separated list.
+
+    Returns:
+        set[str]: The week codes.
+
+    Raises:
+        ValueError: If a code or a range is invalid (see filter_week and week_range).
+    """
+    weeks = set()
+    for spec in specs:
+        for item in str(spec).split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if "-" in item:
+                first, _, last = item.partition("-")
+                weeks.update(week_range(first, last))
+            else:
+                weeks.add(filter_week(item))
+    return weeks
+
+
+def select_files(files: Iterable[Path | str], collaborators: Iterable[str] | None) -> list[Path]:
+    """
+    Keep the interface files of some collaborators, by file name.
+
+    Args:
+        files (Iterable[Path | str]): Interface files ('RM_<name>.xlsx').
+        collaborators (Iterable[str] | None): Collaborators to keep, compared by normalized name
+            (case, accents and spacing ignored). None keeps every file.
+
+    Returns:
+        list[Path]: The selected files, in input order.
+    """
+    files = [Path(path) for path in files]
+    if collaborators is None:
+        return files
+    wanted = {normalize_collab_key(c) for c in collaborators}
+    return [path for path in files if normalize_collab_key(path.stem.removeprefix("RM_")) in wanted]
+
+
+class WeekIndex:
+    """
+    Week codes found in each interface file, kept across runs ('pointage_weeks.json').
+
+    A file whose size and modification time match its entry, and whose weeks do not overlap
+    the requested ones, cannot contribute rows: a filtered pointage skips it without opening it.
+    Entries are refreshed whenever a file is read to the end.
+
+    Example:
+        >>> index = WeekIndex.load(base_dir)
+        >>> index.can_skip(snapshot.entry("RM_GANI Karim.xlsx"), {"S0525"})
+        True
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Initialize an empty index bound to a file path.
+
+        Args:
+            path (Path | str): Path to the index JSON file.
+        """
+        self.path = Path(path)
+        self._files: dict[str, dict] = {}
+        self.changed = False
+
+    @classmethod
+    def load(cls, base_dir: Path | str) -> "WeekIndex":
+        """
+        Load the index from a base directory.
+
+        Args:
+            base_dir (Path | str): Base directory containing 'pointage_weeks.json'.
+
+        Returns:
+            WeekIndex: The loaded index, empty if the file is missing or unreadable.
+        """
+        index = cls(Path(base_dir) / WEEK_INDEX_FILE_NAME)
+        index._files = load_json(index.path, lambda data: dict(data.get("files", {})),
+                                 "POINTAGE", "Starting from an empty week index.") or {}
+        return index
+
+    def weeks(self, entry: FileEntry | None) -> set[str] | None:
+        """
+        Week codes of a file, if its entry is still valid.
+
+        Args:
+            entry (FileEntry | None): Current metadata of the file (see WorkspaceSnapshot.entry).
+
+        Returns:
+            set[str] | None: The week codes, or None if the file is unknown or has changed.
+        """
+        if entry is None:
+            return None
+        known = self._files.get(entry.name)
+        if not known or known.get("size") != entry.size or known.get("mtime_ns") != entry.mtime_ns:
+            return None
+        return set(known.get("weeks", []))
+
+    def can_skip(self, entry: FileEntry | None, weeks: set[str]) -> bool:
+        """Return True if the file is known to hold none of the weeks."""
+        known = self.weeks(entry)
+        return known is not None and known.isdisjoint(weeks)
+
+    def record(self, entry: FileEntry | None, weeks: Iterable[str]) -> None:
+        """
+        Record the week codes of a file read to the end.
+
+        Args:
+            entry (FileEntry | None): Metadata of the file taken before reading it.
+            weeks (Iterable[str]): Week codes of all its rows.
+        """
+        if entry is None:
+            return
+        self._files[entry.name] = {"size": entry.size, "mtime_ns": entry.mtime_ns,
+                                   "weeks": sorted(weeks, key=lambda w: WeekCode.parse(w).sort_key())}
+        self.changed = True
+
+    def save(self) -> None:
+        """Write the index atomically (temporary file + replace)."""
+        save_json(self.path, {"files": self._files})
+        self.changed = False
+
+
+def read_pointage_file(path: Path | str, weeks: set[str] | None = None,
+                       weeks_seen: set[str] | None = None) -> Iterator[PointageRecord]:
+    """
+    Stream the records of one interface file.
+
+    Reads the POINTAGE sheet from row 4, columns A-K, and stops at the first fully empty row.
+    The workbook is opened when iteration starts and closed when it ends (or when the
+    generator is closed).
+
+    Args:
+        path (Path | str): Interface file.
+        weeks (set[str] | None, optional): Week codes to keep (column C). Defaults to all.
+            Other rows are dropped before a record is built.
+        weeks_seen (set[str] | None, optional): Filled with the week codes of every row, kept
+            or not (see WeekIndex).
+
+    Yields:
+        PointageRecord: Records in sheet order.
+
+    Raises:
+        PermissionError: If the file cannot be opened.
+        KeyError: If the file has no POINTAGE sheet.
+    """
+    path = Path(path)
+    with span("open", path):
+        wb = load_workbook(path, data_only=True, read_only=True)
+    try:
+        with span("parse", path) as fields:
+            sheet = wb[POINTAGE_SHEET]
+            k1 = sheet[POINTAGE_TOTAL_CELL].value or 0
+            count = 0
+            rows = sheet.iter_rows(min_row=POINTAGE_FIRST_ROW, min_col=1, max_col=POINTAGE_LAST_COL, values_only=True)
+            for row_number, row in enumerate(rows, start=POINTAGE_FIRST_ROW):
+                # Stop when hitting a fully empty row
+                if all(v is None for v in row):
+                    break
+                if weeks is not None or weeks_seen is not None:
+                    week = _text(row[COL_WEEK])
+                    if weeks_seen is not None and week is not None:
+                        weeks_seen.add(week)
+                    if weeks is not None and week not in weeks:
+                        continue
+                count += 1
+                yield PointageRecord.from_cells(path.name, row, k1, row_number)
+            fields["rows"] = count
+    finally:
+        wb.close()
+
+
+def iter_pointage(files: Iterable[Path | str], collaborators: Iterable[str] | None = None,
+                  weeks: Iterable[str] | None = None) -> Iterator[PointageRecord]:
+    """
+    Stream the records of several interface files, file by file.
+
+    Args:
+        files (Iterable[Path | str]): Interface files ('RM_<name>.xlsx').
+        collaborators (Iterable[str] | None, optional): Collaborators to keep. Compared by
+            normalized name (case, accents and spacing ignored) with the file name, so other
+            files are not opened. Defaults to all.
+        weeks (Iterable[str] | None, optional): Week codes to keep, e.g. {'S0525'}. Defaults to all.
+
+    Yields:
+        PointageRecord: Records, file after file.
+
+    Note:
+        A file that cannot be read (locked, corrupt, no POINTAGE sheet) is logged and skipped.
+    """
+    weeks = None if weeks is None else {str(w).strip() for w in weeks}
+    for path in select_files(files, collaborators):
+        try:
+            yield from read_pointage_file(path, weeks)
+        except Exception as e:
+            logger.error(f"[POINTAGE] Error reading {path.name}: {e}")
+
+
+def weekly_hours(records: Iterable[PointageRecord]) -> dict[str, dict[WeekCode, float]]:
+    """
+    Hours per collaborator and week, like the Vérif_Collaborateur matrix (Btn_Collect_Collab_nb_h).
+
+    Args:
+        records (Iterable[PointageRecord]): Records, e.g. from iter_pointage().
+
+    Returns:
+        dict[str, dict[WeekCode, float]]: Hours by collaborator, then week code. Rows without
+        collaborator, week or numeric hours are ignored.
+    """
+    table: dict[str, dict[WeekCode, float]] = {}
+    for record in records:
+        if record.collaborator is None or record.week is None or record.hours is None:
+            continue
+        weeks = table.get(record.collaborator)
+        if weeks is None:
+            weeks = table[record.collaborator] = {}
+        weeks[record.week] = weeks.get(record.week, 0.0) + record.hours
+    return table
+
+
+def nonzero_share(table: dict[str, dict[WeekCode, float]],
+                  collaborators: Iterable[str] | None = None) -> dict[WeekCode, float]:
+    """
+    Share of collaborators with hours, per week (percentage row of Vérif_Collaborateur).
+
+    Args:
+        table (dict[str, dict[WeekCode, float]]): Result of weekly_hours().
+        collaborators (Iterable[str] | None, optional): Rows of the matrix, e.g. the names of
+            Gestion_Interfaces. Missing collaborators count as 0 hours. Defaults to the
+            collaborators of the table.
+
+    Returns:
+        dict[WeekCode, float]: Share (0 to 1) by week, in chronological order.
+    """
+    names = list(table) if collaborators is None else list(collaborators)
+    weeks = sorted({week for hours in table.values() for week in hours},
+                   key=lambda week: WeekCode.parse(week).sort_key())
+    if not names:
+        return {week: 0.0 for week in weeks}
+    return {
+        week: sum(1 for name in names if table.get(name, {}).get(week, 0)) / len(names)
+        for week in weeks
+    }
+
+
+@dataclass
+class ConsumedHours:
+    """
+    Consumed hours of the 'Fichier de synthèse' tables (Btn_Collect_FS_Data).
+
+    The key part is column E up to 'Sprint' (e.g. 'KEY001' for 'KEY001 Sprint 3').
+
+    Attributes:
+        by_key_function (dict[tuple[str, str], float]): Table 1, by (key part, function),
+            for keys containing 'Sprint'.
+        by_label (dict[str, float]): Hours by label.
+        by_key_label (dict[tuple[str, str], float]): Table 2, by (key part, label).
+        by_collaborator (dict[tuple[str, str, str], float]): Table 3, by (key part, label,
+            collaborator).
+    """
+    by_key_function: dict[tuple[str, str], float] = field(default_factory=dict)
+    by_label: dict[str, float] = field(default_factory=dict)
+    by_key_label: dict[tuple[str, str], float] = field(default_factory=dict)
+    by_collaborator: dict[tuple[str, str, str], float] = field(default_factory=dict)
+
+
+def consumed_hours(records: Iterable[PointageRecord]) -> ConsumedHours:
+    """
+    Aggregate the consumed hours of the 'Fichier de synthèse' tables.
+
+    Args:
+        records (Iterable[PointageRecord]): Records, e.g. from iter_pointage().
+
+    Returns:
+        ConsumedHours: The aggregated hours. Rows without numeric hours are ignored.
+    """
+    result = ConsumedHours()
+    key_parts: dict[str | None, str | None] = {}
+    for record in records:
+        hours = record.hours
+        if hours is None:
+            continue
+        # Keys are interned and repeat across rows: split each distinct key once
+        if record.key in key_parts:
+            part = key_parts[record.key]
+        else:
+            parts = split_sprint(record.key)
+            part = key_parts[record.key] = None if parts is None else parts[0]
+        function = record.function or ""
+        label = record.label
+
+        if part is not None and (part or function):
+            result.by_key_function[(part, function)] = result.by_key_function.get((part, function), 0.0) + hours
+        if label is None:
+            continue
+        result.by_label[label] = result.by_label.get(label, 0.0) + hours
+        if part:
+            result.by_key_label[(part, label)] = result.by_key_label.get((part, label), 0.0) + hours
+            if record.collaborator is not None:
+                combo = (part, label, record.collaborator)
+                result.by_collaborator[combo] = result.by_collaborator.get(combo, 0.0) + hours
+    return result
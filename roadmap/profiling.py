@@ -0,0 +1,304 @@
+"""
+CPU and memory profiling of roadmap commands.
+
+With 'roadmap --profile <command>', the command runs under cProfile and tracemalloc. When it
+ends, two files are written next to 'roadmap.log':
+    - 'profile_<command>.prof': cProfile statistics, readable with pstats or snakeviz
+      (python -m pstats .logs/profile_update.prof)
+    - 'profile_<command>.txt': summary with the functions taking the most cumulative time,
+      the peak traced memory of each process and the top allocation sites
+
+Work done in pool threads (run_lock_aware) and pool worker processes (create --way para) is
+profiled too: threads through profile_thread(), processes through run_profiled(), which
+returns the worker statistics with its result. They are merged into the files of the command.
+Since Python 3.12 cProfile follows every thread of the interpreter (sys.monitoring), and only
+one profiler may be active at a time: profile_thread() then leaves the functions unchanged.
+
+Allocation sites are those holding the most memory at the highest point seen by a sampling
+thread (every 0.1s, and when a function run by run_profiled ends), not at the end of the
+command, when the workbooks are already released.
+"""
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+PROFILE_FILE_PREFIX = "profile_"
+TOP_FUNCTIONS = 40
+TOP_SITES = 20
+SAMPLE_INTERVAL = 0.1
+# A new snapshot is taken when traced memory grows by more than this fraction
+SAMPLE_GROWTH = 0.1
+# cProfile uses sys.monitoring since Python 3.12: one profiler per interpreter, for all threads
+PROFILER_FOLLOWS_THREADS = sys.version_info >= (3, 12)
+
+
+class _Stats:
+    """Raw cProfile statistics, in the form pstats.Stats.add() accepts."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def _profile_stats(profile: cProfile.Profile) -> dict:
+    profile.create_stats()
+    return profile.stats
+
+
+class _PeakSampler:
+    """
+    Keeps the allocation sites of the highest traced memory seen.
+
+    Attributes:
+        peak_bytes (int): Highest current traced memory seen by the sampler.
+        sites (list[tuple[str, int, int]]): (file:line, bytes, blocks) of the top sites at that point.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_bytes = 0
+        self.sites = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="roadmap-profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.sample()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """Take a snapshot if traced memory is notably above the last one."""
+        current, _ = tracemalloc.get_traced_memory()
+        threshold = self.peak_bytes * (1 + SAMPLE_GROWTH) if self.sites else self.peak_bytes
+        if current <= threshold:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        self.peak_bytes = current
+        self.sites = [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+            for stat in snapshot.statistics("lineno")[:TOP_SITES]
+        ]
+
+
+class Profiler:
+    """
+    Profiles the current command (CPU and memory).
+
+    Attributes:
+        command (str | None): Command being profiled (e.g. 'update').
+        output_dir (Path | None): Folder the profile files are written to.
+    """
+
+    def __init__(self):
+        self.command = None
+        self.output_dir = None
+        self._profile = None
+        self._sampler = None
+        self._extra_stats = []
+        self._worker_peaks = []
+        self._worker_sites = Counter()
+        self._worker_blocks = Counter()
+        self._lock = threading.Lock()
+        self._thread_id = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._profile is not None
+
+    @property
+    def in_profiled_thread(self) -> bool:
+        """True in the thread that enabled the profiler (already profiled)."""
+        return threading.get_ident() == self._thread_id
+
+    def enable(self, output_dir: Path | str, command: str) -> None:
+        """
+        Start profiling the calling thread, and tracing memory allocations.
+
+        Args:
+            output_dir (Path | str): Folder for the profile files (created if needed).
+            command (str): Command being profiled, used in the file names.
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.command = command
+        self._extra_stats, self._worker_peaks = [], []
+        self._worker_sites, self._worker_blocks = Counter(), Counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._sampler = _PeakSampler()
+        self._sampler.start()
+        self._thread_id = threading.get_ident()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def disable(self) -> tuple[Path, Path] | None:
+        """
+        Stop profiling and write the profile files.
+
+        Returns:
+            tuple[Path, Path] | None: The .prof and .txt files written, or None when not profiling.
+        """
+        if not self.enabled:
+            return None
+        self._profile.disable()
+        self._sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats = pstats.Stats(_Stats(_profile_stats(self._profile)))
+        for extra in self._extra_stats:
+            stats.add(_Stats(extra))
+        stem = f"{PROFILE_FILE_PREFIX}{self.command.replace(' ', '_')}"
+        prof_file = self.output_dir / f"{stem}.prof"
+        text_file = self.output_dir / f"{stem}.txt"
+        stats.dump_stats(prof_file)
+        text_file.write_text(self._summary(stats, peak), encoding="utf-8")
+
+        self._profile = self._sampler = None
+        return prof_file, text_file
+
+    def _summary(self, stats: pstats.Stats, peak: int) -> str:
+        out = io.StringIO()
+        out.write(f"Profile of '{self.command}'\n\n")
+        stats.stream = out
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+
+        out.write("Memory (tracemalloc)\n")
+        out.write(f"  Main process peak: {_mib(peak)}\n")
+        if self._worker_peaks:
+            out.write(f"  Worker calls: {len(self._worker_peaks)}, highest peak: {_mib(max(self._worker_peaks))}\n")
+        out.write(f"\nTop allocation sites, main process (at {_mib(self._sampler.peak_bytes)} traced):\n")
+        out.write(_format_sites(self._sampler.sites))
+        if self._worker_sites:
+            sites = [(site, size, self._worker_blocks[site]) for site, size in self._worker_sites.most_common(TOP_SITES)]
+            out.write("\nTop allocation sites, worker processes (summed over the calls):\n")
+            out.write(_format_sites(sites))
+        return out.getvalue()
+
+    def add_stats(self, stats: dict) -> None:
+        """Merge cProfile statistics collected in a pool thread."""
+        with self._lock:
+            self._extra_stats.append(stats)
+
+    def add_worker(self, profile: dict | None) -> None:
+        """Merge the profile returned by run_profiled() in a worker process."""
+        if not profile:
+            return
+        with self._lock:
+            self._extra_stats.append(profile["stats"])
+            self._worker_peaks.append(profile["peak"])
+            for site, size, blocks in profile["sites"]:
+                self._worker_sites[site] += size
+                self._worker_blocks[site] += blocks
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def _format_sites(sites: list[tuple[str, int, int]]) -> str:
+    if not sites:
+        return "  (none)\n"
+    return "".join(f"  {_mib(size):>10}  {blocks:>8} blocks  {site}\n" for site, size, blocks in sites)
+
+
+# Profiler of the current process
+profiler = Profiler()
+
+
+def profile_thread(func: Callable) -> Callable:
+    """
+    Wrap a function run by a thread pool, so its calls are profiled too.
+
+    Before Python 3.12 cProfile only follows the thread that enabled it: each call in another
+    thread runs under its own profile, merged into the command statistics. Returns `func`
+    unchanged when not profiling, or when the command profile already follows the threads.
+
+    Example:
+        >>> run_lock_aware(files, profile_thread(check_file), max_workers=4)
+    """
+    if not profiler.enabled or PROFILER_FOLLOWS_THREADS:
+        return func
+
+    def wrapper(*args, **kwargs):
+        if profiler.in_profiled_thread:
+            # Deferred retries run in the calling thread: a second profile would replace its hook
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            profiler.add_stats(_profile_stats(profile))
+
+    return wrapper
+
+
+def profiling_context() -> bool:
+    """Profiling context to pass to pool workers: whether the command is profiled."""
+    return profiler.enabled
+
+
+def run_profiled(enabled: bool, func: Callable, *args) -> tuple[object, dict | None]:
+    """
+    Call a function in a pool worker process, profiling it.
+
+    Must be submitted instead of `func` itself:
+    executor.submit(run_profiled, profiling_context(), func, *args).
+
+    Args:
+        enabled (bool): Value of profiling_context() in the main process.
+        func (Callable): Function to run.
+        *args: Arguments of the function.
+
+    Returns:
+        tuple[object, dict | None]: Result of the function and its profile (cProfile
+        statistics, peak traced memory and top allocation sites), to pass to
+        profiler.add_worker() in the main process. No profile when not profiling.
+
+    Note:
+        If the function raises, its profile is attached to the exception as `profile`.
+        Memory tracing is restarted, so this must only run in a worker process.
+    """
+    if not enabled:
+        return func(*args), None
+    # Drop the traces inherited from a forked parent: only count the worker's own allocations
+    tracemalloc.stop()
+    tracemalloc.start()
+    sampler = _PeakSampler()
+    sampler.start()
+    profile = cProfile.Profile()
+    result = {}
+    profile.enable()
+    try:
+        value = func(*args)
+        sampler.sample()
+        return value, result
+    except Exception as e:
+        e.profile = result
+        raise
+    finally:
+        profile.disable()
+        sampler.stop()
+        result.update(stats=_profile_stats(profile), peak=tracemalloc.get_traced_memory()[1], sites=sampler.sites)
+        tracemalloc.stop()
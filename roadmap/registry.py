@@ -0,0 +1,218 @@
+"""
+Persistent collaborator registry for roadmap management operations.
+
+'collabs.xml' is consumed (deleted) on read, so every command needing the collaborator list
+used to require VBA to regenerate it first. The registry keeps the last known list in the
+base directory ('collabs_registry.json') with, for each collaborator:
+    - The display name (as written in 'Gestion_Interfaces')
+    - The file name key (case and spacing insensitive, see file_name_key) for membership queries
+    - The interface file name ('RM_<name>.xlsx')
+
+A sync that adds or removes collaborators bumps the registry version. Commands fall back to
+the registry when neither 'collabs.xml' nor the synthesis workbook can be read; commands that
+delete files do not, as the registry may be stale.
+"""
+import logging
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from roadmap.jsonfile import load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_FILE_NAME = "collabs_registry.json"
+
+
+def normalize_collab_key(name: str) -> str:
+    """
+    Build the normalized key used to compare collaborator names.
+
+    Args:
+        name (str): Collaborator name, e.g. ' Gani  KARIM '.
+
+    Returns:
+        str: Accent-free, case-folded name with single spaces, e.g. 'gani karim'.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def file_name_key(name: str) -> str:
+    """
+    Build the key used to compare interface file names.
+
+    Windows and OneDrive compare file names without case, but 'é' and 'e' are different
+    letters: accents are kept, unlike normalize_collab_key.
+
+    Args:
+        name (str): Collaborator or file name, e.g. ' Hélène  DUPONT '.
+
+    Returns:
+        str: Case-folded name with single spaces, e.g. 'hélène dupont'.
+    """
+    return " ".join(name.casefold().split())
+
+
+def interface_file_name(name: str) -> str:
+    """
+    Return the interface file name of a collaborator.
+
+    Args:
+        name (str): Collaborator name.
+
+    Returns:
+        str: File name, e.g. 'RM_GANI Karim.xlsx'.
+    """
+    return f"RM_{name}.xlsx"
+
+
+def interface_key(path: Path | str) -> str | None:
+    """
+    Return the file name key of the collaborator of an interface file.
+
+    Args:
+        path (Path | str): Interface file, e.g. 'RM_Collaborateurs/RM_GANI Karim.xlsx'.
+
+    Returns:
+        str | None: Key of the name after 'RM_' (see file_name_key), e.g. 'gani karim', or
+        None for other files.
+    """
+    stem = Path(path).stem
+    return file_name_key(stem[3:]) if stem.startswith("RM_") else None
+
+
+@dataclass
+class RegistryDiff:
+    """
+    Difference between the registry and the collaborator list of a sync.
+
+    Attributes:
+        added (list[str]): Names present in the new list only.
+        removed (list[str]): Names present in the registry only.
+        unchanged (list[str]): Names present in both (registry spelling).
+    """
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """True if collaborators were added or removed."""
+        return bool(self.added or self.removed)
+
+
+class CollaboratorRegistry:
+    """
+    Persistent, versioned list of collaborators stored in the base directory.
+
+    Attributes:
+        path (Path): Path to the registry JSON file.
+        version (int): Incremented on every sync that changes the list.
+        synced_at (str | None): ISO timestamp of the last sync.
+
+    Example:
+        >>> registry = CollaboratorRegistry.load(base_dir)
+        >>> diff = registry.sync(["GANI Karim", "NAZIH Imane"])
+        >>> "gani karim" in registry
+        True
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Initialize an empty registry bound to a file path.
+
+        Args:
+            path (Path | str): Path to the registry JSON file.
+        """
+        self.path = Path(path)
+        self.version = 0
+        self.synced_at = None
+        self._entries: dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, base_dir: Path | str) -> "CollaboratorRegistry":
+        """
+        Load the registry from a base directory.
+
+        Args:
+            base_dir (Path | str): Base directory containing 'collabs_registry.json'.
+
+        Returns:
+            CollaboratorRegistry: The loaded registry, empty if the file is missing or unreadable.
+        """
+        path = Path(base_dir) / REGISTRY_FILE_NAME
+
+        def parse(data: dict) -> "CollaboratorRegistry":
+            registry = cls(path)
+            registry.version = int(data.get("version", 0))
+            registry.synced_at = data.get("synced_at")
+            for entry in data.get("collaborators", []):
+                # Keys are recomputed: older registries stored accent-free keys
+                key = file_name_key(entry["name"])
+                registry._entries.setdefault(key, {**entry, "key": key})
+            return registry
+
+        registry = load_json(path, parse, "REGISTRY", "Starting from an empty registry.")
+        return cls(path) if registry is None else registry
+
+    @property
+    def exists(self) -> bool:
+        """True if the registry has been saved at least once."""
+        return self.path.exists()
+
+    def names(self) -> list[str]:
+        """Return collaborator names in registry order."""
+        return [entry["name"] for entry in self._entries.values()]
+
+    def __contains__(self, name: str) -> bool:
+        return file_name_key(name) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sync(self, names: Iterable[str]) -> RegistryDiff:
+        """
+        Replace the registry content with a new collaborator list and save it.
+
+        The version is only bumped when collaborators were added or removed.
+
+        Args:
+            names (Iterable[str]): New collaborator list (e.g. read from 'collabs.xml').
+
+        Returns:
+            RegistryDiff: What changed compared to the previous content.
+        """
+        entries = {}
+        for name in names:
+            name = name.strip() if name else ""
+            key = file_name_key(name)
+            if name and key not in entries:
+                entries[key] = {"name": name, "key": key, "interface": interface_file_name(name)}
+        diff = RegistryDiff(
+            added=[entry["name"] for key, entry in entries.items() if key not in self._entries],
+            removed=[entry["name"] for key, entry in self._entries.items() if key not in entries],
+            unchanged=[entry["name"] for key, entry in self._entries.items() if key in entries],
+        )
+
+        if diff.changed or not self.exists:
+            self.version += 1
+        self._entries = entries
+        self.synced_at = datetime.now().isoformat(timespec="seconds")
+        self.save()
+
+        logger.info(
+            f"[REGISTRY] Synced {len(self)} collaborators (version {self.version}): "
+            f"{len(diff.added)} added, {len(diff.removed)} removed, {len(diff.unchanged)} unchanged")
+        return diff
+
+    def save(self) -> None:
+        """Write the registry atomically (temporary file + replace)."""
+        save_json(self.path, {
+            "version": self.version,
+            "synced_at": self.synced_at,
+            "collaborators": list(self._entries.values()),
+        })
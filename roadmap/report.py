@@ -0,0 +1,165 @@
+"""
+Summary workbooks built from the pointage data (roadmap report).
+
+Building summaries in VBA on top of SYNTHESE freezes Excel on department-wide data. The report is
+written with openpyxl's write-only mode instead: the records are streamed from the interface
+files (see roadmap.pointage.iter_pointage) in a single pass that only keeps the aggregates, and
+each sheet is streamed to the package row by row. Memory stays flat whatever the number of rows.
+
+Sheets:
+    - Heatmap: hours per collaborator (rows) and week (columns), colored from 0 (red) to the
+      weekly hours threshold (green), with totals and the share of collaborators with hours
+    - Fonctions: total hours per LC function, with their share, rows and collaborators
+    - Pointage (optional): every row, columns A-K as in SYNTHESE
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import ColorScaleRule
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from roadmap.pointage import PointageRecord, WeekCode, nonzero_share
+from roadmap.status import DEFAULT_THRESHOLD
+
+REPORT_FILE_NAME = "pointage_report.xlsx"
+HEATMAP_SHEET = "Heatmap"
+FUNCTIONS_SHEET = "Fonctions"
+DETAILS_SHEET = "Pointage"
+DETAILS_HEADERS = ["Semaine", "Collaborateur", "Code semaine", "Semaine", "Clé", "Libellé",
+                   "Fonction", "Commentaire", "Date", "Heures", "Date saisie"]
+
+# Heatmap color scale (Excel's red - yellow - green)
+SCALE_LOW = "F8696B"
+SCALE_MID = "FFEB84"
+SCALE_HIGH = "63BE7B"
+HEADER_FILL = "FFD9E1F2"
+
+
+@dataclass
+class ReportSummary:
+    """
+    Content of a written report.
+
+    Attributes:
+        path (Path): Report workbook.
+        rows (int): Pointage rows read.
+        collaborators (int): Collaborators in the heatmap.
+        weeks (int): Weeks in the heatmap.
+        functions (int): Functions in the Fonctions sheet.
+    """
+    path: Path
+    rows: int = 0
+    collaborators: int = 0
+    weeks: int = 0
+    functions: int = 0
+
+
+@dataclass
+class _FunctionTotal:
+    hours: float = 0.0
+    rows: int = 0
+    collaborators: set = field(default_factory=set)
+
+
+def _header(sheet, values: list) -> list[WriteOnlyCell]:
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill("solid", fgColor=HEADER_FILL)
+        cells.append(cell)
+    return cells
+
+
+def _number(sheet, value, number_format: str = "0.00") -> WriteOnlyCell:
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.number_format = number_format
+    return cell
+
+
+def write_report(path: Path | str, records: Iterable[PointageRecord], threshold: float = DEFAULT_THRESHOLD,
+                 details: bool = False) -> ReportSummary:
+    """
+    Write the summary workbook of some pointage records.
+
+    Args:
+        path (Path | str): Output workbook ('.xlsx').
+        records (Iterable[PointageRecord]): Records, consumed once (e.g. iter_pointage()).
+        threshold (float, optional): Weekly hours shown in full green on the heatmap. Defaults to 35.
+        details (bool, optional): Add the Pointage sheet with every row. Defaults to False.
+
+    Returns:
+        ReportSummary: What was written.
+
+    Raises:
+        PermissionError: If the output workbook is open in Excel.
+    """
+    path = Path(path)
+    wb = Workbook(write_only=True)
+    heatmap = wb.create_sheet(HEATMAP_SHEET)
+    functions = wb.create_sheet(FUNCTIONS_SHEET)
+    heatmap.freeze_panes = "B2"
+    heatmap.column_dimensions["A"].width = 30
+    functions.column_dimensions["A"].width = 30
+    detail_sheet = None
+    if details:
+        detail_sheet = wb.create_sheet(DETAILS_SHEET)
+        detail_sheet.freeze_panes = "A2"
+        detail_sheet.append(_header(detail_sheet, DETAILS_HEADERS))
+
+    # Single pass: rows go straight to the details sheet, only the aggregates are kept
+    summary = ReportSummary(path)
+    weekly: dict[str, dict[WeekCode, float]] = {}
+    by_function: dict[str, _FunctionTotal] = {}
+    for record in records:
+        summary.rows += 1
+        if detail_sheet is not None:
+            detail_sheet.append(list(record.values[:len(DETAILS_HEADERS)]))
+        if record.hours is None:
+            continue
+        if record.collaborator is not None and record.week is not None:
+            weeks = weekly.setdefault(record.collaborator, {})
+            weeks[record.week] = weeks.get(record.week, 0.0) + record.hours
+        total = by_function.setdefault(record.function or "", _FunctionTotal())
+        total.hours += record.hours
+        total.rows += 1
+        if record.collaborator is not None:
+            total.collaborators.add(record.collaborator)
+
+    week_codes = sorted({week for hours in weekly.values() for week in hours},
+                        key=lambda week: WeekCode.parse(week).sort_key())
+    heatmap.append(_header(heatmap, ["Collaborateur", *week_codes, "Total"]))
+    for name in sorted(weekly):
+        hours = [weekly[name].get(week, 0.0) for week in week_codes]
+        heatmap.append([name, *(_number(heatmap, h) for h in hours), _number(heatmap, sum(hours))])
+    if weekly:
+        shares = nonzero_share(weekly)
+        heatmap.append(_header(heatmap, ["Total"]) + [
+            _number(heatmap, sum(weekly[name].get(week, 0.0) for name in weekly)) for week in week_codes])
+        heatmap.append(_header(heatmap, ["% non nul"]) + [
+            _number(heatmap, shares[week], "0%") for week in week_codes])
+    if weekly and week_codes:
+        cells = f"B2:{get_column_letter(len(week_codes) + 1)}{len(weekly) + 1}"
+        heatmap.conditional_formatting.add(cells, ColorScaleRule(
+            start_type="num", start_value=0, start_color=SCALE_LOW,
+            mid_type="num", mid_value=threshold / 2, mid_color=SCALE_MID,
+            end_type="num", end_value=threshold, end_color=SCALE_HIGH))
+
+    grand_total = sum(total.hours for total in by_function.values())
+    functions.append(_header(functions, ["Fonction", "Heures", "Part", "Lignes", "Collaborateurs"]))
+    for name, total in sorted(by_function.items(), key=lambda item: (-item[1].hours, item[0])):
+        functions.append([
+            name or "(vide)",
+            _number(functions, total.hours),
+            _number(functions, total.hours / grand_total if grand_total else 0.0, "0.0%"),
+            total.rows,
+            len(total.collaborators),
+        ])
+
+    wb.save(path)
+    summary.collaborators, summary.weeks, summary.functions = len(weekly), len(week_codes), len(by_function)
+    return summary
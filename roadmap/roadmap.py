@@ -11,19 +11,83 @@ The class integrates with Excel files using openpyxl, and can be called from bot
 
 Author: Mustapha EL KAMILI
 """
+import functools
 import shutil
+import sqlite3
 import tempfile
 import time
-from concurrent.futures import ProcessPoolExecutor
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from openpyxl import load_workbook
 from tqdm import tqdm
 
-from roadmap.helpers import (add_data_validations_to_sheet, build_interface,
-                             get_collaborators, load_lc_excel, logger,
-                             rmtree_with_retry, write_xml, zip_folder)
+from roadmap.archives import (ARCHIVE_ERROR, ARCHIVE_FOLDERS, ARCHIVE_SUFFIXES,
+                              ArchiveIndex, ArchiveResult, check_snapshots,
+                              verify_archive)
+from roadmap.batch import ContentCache
+from roadmap.check import (CHECK_ERROR, CHECK_LOCKED, CheckResult,
+                           check_interface, collaborator_of)
+from roadmap.engine import add_data_validations_to_sheet, build_interface
+from roadmap.helpers import (get_collaborators, get_collaborators_from_workbook,
+                             load_lc_excel, logger, rmtree_with_retry,
+                             write_status_xml, write_xml, zip_folder)
+from roadmap.history import (HISTORY_FILE_NAME, HISTORY_TABLES, PointageHistory,
+                             fs_table, matrix_table)
+from roadmap.layout import DEFAULT_PREFIX_LENGTH, InterfaceLayout
+from roadmap.lc_extract import (EXTRACT_MSP_SHEET, LC_PAYLOAD_FILE,
+                                extract_lookup, write_lc_payload,
+                                write_lookup_table)
+from roadmap.locks import DEFAULT_RETRY_DELAYS, run_lock_aware
+from roadmap.logging_config import worker_log_queue
+from roadmap.metrics import metrics
+from roadmap.pointage import (PointageRecord, WeekIndex, iter_pointage, parse_weeks,
+                              read_pointage_file, select_files)
+from roadmap.profiling import profile_thread, profiler, profiling_context
+from roadmap.registry import (CollaboratorRegistry, file_name_key,
+                              interface_key)
+from roadmap.report import REPORT_FILE_NAME, write_report
+from roadmap.snapshot import FileEntry, WorkspaceSnapshot
+from roadmap.status import DEFAULT_THRESHOLD, status_ranges
+from roadmap.sync import (SYNC_ARCHIVE, SYNC_CREATE, SYNC_TEMPLATE, SYNC_UPDATE,
+                          SyncPlan, plan_sync)
+from roadmap.synthese import write_synthese_rows
+from roadmap.trace import span, tracer, worker_context
+from roadmap.validation import (VALIDATION_FILE_NAME, LCIndex, RowIssues,
+                                count_issues, validate_records,
+                                write_validation_report)
+from roadmap.worker import initialize, run_task
+
+# Outcomes of RoadmapManager._update_lc_in_file
+LC_UPDATED = "updated"
+LC_SKIPPED = "skipped"
+LC_LOCKED = "locked"
+LC_FAILED = "failed"
+
+
+def _command(method):
+    """
+    Mark a RoadmapManager method as a command sharing one workspace snapshot.
+
+    The snapshot left by the previous command is dropped when the command starts (unless
+    `snapshot_max_age` allows its reuse), then every snapshot() call of the command returns the
+    same one. A command run by another command shares the snapshot of the outer one.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._command_depth == 0 and self._snapshot is not None:
+            if self.snapshot_max_age <= 0 or self._snapshot.age > self.snapshot_max_age:
+                self._snapshot = None
+        self._command_depth += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._command_depth -= 1
+    return wrapper
 
 
 class RoadmapManager:
@@ -41,7 +105,16 @@ class RoadmapManager:
         archived_folder (Path): Directory for archived files.
         deleted_folder (Path): Directory for deleted files.
         xml_output (Path): Path for pointage XML export file.
+        status_output (Path): Path for the row status ranges of the pointage export.
+        hours_threshold (float): Weekly hours below which SYNTHESE rows are colored red.
+        collabs_xml (Path): Path to the collaborator list written by VBA (consumed on read).
+        registry (CollaboratorRegistry): Persistent collaborator list kept in the base directory.
         all_ok (bool): Flag indicating if all required files exist.
+        lock_retry_delays (tuple[float, ...]): Backoff schedule used to retry locked files.
+        max_io_workers (int): Threads used for per-file I/O bound operations (pointage, LC update).
+        snapshot_max_age (float): Seconds a workspace snapshot may be reused across commands.
+            0 (default) takes one snapshot per command.
+        layout (InterfaceLayout): Flat or sharded layout of 'RM_Collaborateurs' (see roadmap.layout).
 
     Example:
         >>> manager = RoadmapManager(base_dir="/path/to/roadmap")
@@ -75,10 +148,35 @@ class RoadmapManager:
         self.archived_folder = self.base_path / "Archived"
         self.deleted_folder = self.base_path / "Deleted"
         self.xml_output = self.base_path / "pointage_output.xml"
+        self.status_output = self.base_path / "pointage_status.xml"
+        self.history_file = self.base_path / HISTORY_FILE_NAME
+        self.validation_output = self.base_path / VALIDATION_FILE_NAME
+        self.hours_threshold = DEFAULT_THRESHOLD
+        self.collabs_xml = self.base_path / "collabs.xml"
+        self.lc_payload = self.base_path / LC_PAYLOAD_FILE
 
         for folder in [self.rm_folder, self.archived_folder, self.deleted_folder]:
             folder.mkdir(exist_ok=True)
 
+        # Lock-aware file access settings (see roadmap.locks)
+        self.lock_retry_delays = DEFAULT_RETRY_DELAYS
+        self.max_io_workers = 4
+
+        # Last known collaborator list, kept across runs (see roadmap.registry)
+        self.registry = CollaboratorRegistry.load(self.base_path)
+
+        # Single directory listing shared by the operations of a command (see roadmap.snapshot)
+        self.snapshot_max_age = 0.0
+        self._snapshot = None
+        self._command_depth = 0
+
+        # Flat folder, or interfaces in subfolders (see roadmap.layout)
+        self.layout = InterfaceLayout.load(self.rm_folder)
+
+        # Set by batch runs (see roadmap.batch): worker pool and parse cache shared by the workspaces
+        self.executor: Executor | None = None
+        self.content_cache: ContentCache | None = None
+
         # Check existence of essential files
         self.all_ok = all([
             self.synthese_file.exists(),
@@ -88,6 +186,124 @@ class RoadmapManager:
         if not self.all_ok:
             logger.error("Required files 'Synthese_RM_CE.xlsm' or 'RM_template.xlsx' are missing. Please check the base directory.")
 
+    def snapshot(self, refresh: bool = False) -> WorkspaceSnapshot:
+        """
+        Return the snapshot of the 'RM_Collaborateurs' folder.
+
+        The folder is listed on the first call of a command, and the snapshot is reused by the
+        rest of the command: operations record the files they create or remove in it. Commands
+        start with a new listing, unless the previous one is less than `snapshot_max_age` old.
+
+        Args:
+            refresh (bool, optional): Force a new directory listing. Defaults to False.
+
+        Returns:
+            WorkspaceSnapshot: Names, sizes, mtimes and owner files of the folder (and of its
+            subfolders with a sharded layout).
+        """
+        if refresh or self._snapshot is None:
+            self._snapshot = WorkspaceSnapshot.take(self.rm_folder, shards=self.layout.sharded,
+                                                    max_workers=self.max_io_workers)
+        return self._snapshot
+
+    def _save_layout(self, snapshot: WorkspaceSnapshot) -> None:
+        """
+        Rewrite the interface index of a sharded layout after files were created or removed.
+
+        Args:
+            snapshot (WorkspaceSnapshot): Snapshot of RM_Collaborateurs, up to date.
+        """
+        if not self.layout.sharded:
+            return
+        self.layout.index(snapshot.interfaces())
+        try:
+            self.layout.save()
+        except OSError as e:
+            logger.warning(f"[LAYOUT] Could not write {self.layout.index_path.name}: {e}")
+
+    @contextmanager
+    def _process_pool(self, max_workers: int) -> Iterator[Executor]:
+        """
+        Worker process pool of a command: the shared pool of a batch, or a new pool.
+
+        Args:
+            max_workers (int): Worker processes of a new pool (a shared pool keeps its own size).
+
+        Yields:
+            Executor: The pool. A new pool is shut down on exit, a shared one is left running.
+        """
+        if self.executor is not None:
+            yield self.executor
+            return
+        # Workers only load roadmap.worker and the engine, and log through the main process
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=initialize,
+                                 initargs=(worker_log_queue(),)) as executor:
+            yield executor
+
+    def _load_lc_data(self, delete: bool = True) -> list[list]:
+        """
+        Read LC.xlsx (see load_lc_excel), once per distinct content in a batch.
+
+        Args:
+            delete (bool, optional): Delete LC.xlsx after reading it. Defaults to True.
+
+        Returns:
+            list[list]: LC rows (columns B-I), empty if LC.xlsx is missing or unreadable.
+        """
+        lc_file = self.base_path / "LC.xlsx"
+        if self.content_cache is None or not lc_file.exists():
+            return load_lc_excel(self.base_path) if delete else load_lc_excel(self.base_path, delete=False)
+        lc_data = self.content_cache.get("lc", lc_file, lambda path: load_lc_excel(self.base_path, delete=False))
+        if delete:
+            try:
+                lc_file.unlink()
+            except OSError as e:
+                logger.warning(f"[LOAD_LC_EXCEL] Could not delete Excel file: {e}")
+        return lc_data
+
+    def _load_collaborators(self, read_only: bool = False, use_registry: bool = True) -> list[str]:
+        """
+        Get the current collaborator list.
+
+        Sources, in order of precedence:
+            1. 'collabs.xml' written by VBA (read, then deleted)
+            2. 'Gestion_Interfaces'!B3:B... streamed from the synthesis workbook, so commands
+               run without Excel (CLI, scheduler)
+            3. The persistent registry from the last successful read
+
+        A non-empty list read from 1 or 2 is synced into the registry.
+
+        Args:
+            read_only (bool, optional): Keep 'collabs.xml' and leave the registry unchanged.
+                Defaults to False.
+            use_registry (bool, optional): Fall back to the registry (source 3). Defaults to True;
+                commands deleting files pass False, as the registry may be stale.
+
+        Returns:
+            list[str]: Collaborator names. Empty if no source is available.
+
+        Note:
+            An empty or unreadable source is not synced, so a failed read never wipes the registry.
+            An existing but empty 'collabs.xml' is taken as is (no fallback).
+        """
+        if self.collabs_xml.exists():
+            collaborators = get_collaborators(self.synthese_file, delete=not read_only)
+        else:
+            collaborators = get_collaborators_from_workbook(self.synthese_file)
+            if not collaborators and use_registry and self.registry.exists:
+                logger.info(
+                    f"[REGISTRY] collabs.xml not found and synthesis workbook unreadable - using collaborator "
+                    f"registry (version {self.registry.version}, {len(self.registry)} collaborators)")
+                return self.registry.names()
+
+        if collaborators and not read_only:
+            try:
+                self.registry.sync(collaborators)
+            except Exception as e:
+                logger.warning(f"[REGISTRY] Could not save collaborator registry: {e}")
+        return collaborators
+
+    @_command
     def create_interfaces_fast(self, max_workers: int = 8) -> None:
         """
         Create user interfaces using parallel processing with openpyxl.
@@ -112,7 +328,7 @@ class RoadmapManager:
 
         logger.info("[CREATE_INTERFACES] Parallel processing mode interface creation")
 
-        collaborators = get_collaborators(self.synthese_file)
+        collaborators = self._load_collaborators()
         if not collaborators:
             logger.info(
                 "[CREATE_INTERFACES] the list of CE is empty."
@@ -124,20 +340,18 @@ class RoadmapManager:
         # Ensure RM_Collaborateurs folder exists
         self.rm_folder.mkdir(exist_ok=True)
 
-        try:
-            template_bytes = Path(self.template_file).read_bytes()
-        except PermissionError:
+        # Template may be briefly held by Excel or a sync client: retry with backoff
+        results, report = run_lock_aware(
+            [self.template_file], lambda path: path.read_bytes(), delays=self.lock_retry_delays)
+        if not report.ok:
             logger.error(f"'{self.template_file}' is opened. Please close the excel file")
             return
+        template_bytes = results[self.template_file]
 
-        # Filter out collaborators whose files already exist
-        missing_collabs = []
-        for collab in collaborators:
-            output_path = self.rm_folder / f"RM_{collab}.xlsx"
-            if not output_path.exists():
-                missing_collabs.append(collab)
-            else:
-                logger.debug(f"[CREATE_INTERFACES] File already exists: {output_path.name}")
+        # Filter out collaborators whose files already exist (answered from one directory listing)
+        snapshot = self.snapshot()
+        missing_collabs = self._missing_collaborators(collaborators, snapshot)
+        metrics.count("skipped", len(collaborators) - len(missing_collabs))
 
         if not missing_collabs:
             logger.info("[CREATE_INTERFACES] All collaborator files already exist. Nothing to create.")
@@ -145,27 +359,90 @@ class RoadmapManager:
 
         logger.info(f"[CREATE_INTERFACES] Creating {len(missing_collabs)} missing interface file(s)")
 
+        self._build_interfaces(missing_collabs, template_bytes, max_workers, snapshot)
+
+        logger.info("[CREATE_INTERFACES] parallel creation complete.")
+
+    def _missing_collaborators(self, collaborators: list[str], snapshot: WorkspaceSnapshot) -> list[str]:
+        """
+        Return the collaborators without an interface file.
+
+        Names are compared by file name key (see roadmap.registry.file_name_key), like cleanup
+        and sync: a file differing from its collaborator by case or spacing is kept, not
+        overwritten, and a name listed twice gets one file. Names differing by accents get a
+        file each.
+
+        Args:
+            collaborators (list[str]): Collaborator names.
+            snapshot (WorkspaceSnapshot): Snapshot of RM_Collaborateurs.
+
+        Returns:
+            list[str]: Collaborators to create, in list order.
+        """
+        existing: dict[str, Path] = snapshot.interface_keys()
+        missing = []
+        for collab in collaborators:
+            key = file_name_key(collab)
+            if key in existing:
+                logger.debug(f"[CREATE_INTERFACES] File already exists: {existing[key].name}")
+                continue
+            existing[key] = self.layout.path_for(collab)
+            missing.append(collab)
+        return missing
+
+    def _build_interfaces(self, collaborators: list[str], template_bytes: bytes, max_workers: int,
+                          snapshot: WorkspaceSnapshot) -> list[str]:
+        """
+        Build interface files in pool worker processes (see roadmap.engine.build_interface).
+
+        Args:
+            collaborators (list[str]): Collaborators whose interface is written.
+            template_bytes (bytes): Content of the template.
+            max_workers (int): Maximum number of worker processes.
+            snapshot (WorkspaceSnapshot): Snapshot of RM_Collaborateurs, updated with the created files.
+
+        Returns:
+            list[str]: Collaborators whose interface was created.
+        """
+        created = []
         futures = []
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            for collab in missing_collabs:
-                output_path = str(self.rm_folder / f"RM_{collab}.xlsx")
+        trace_context = worker_context()
+        profile_context = profiling_context()
+        targets = [self.layout.path_for(collab) for collab in collaborators]
+        for folder in {target.parent for target in targets}:
+            folder.mkdir(parents=True, exist_ok=True)
+        with self._process_pool(max_workers) as executor:
+            for collab, target in zip(collaborators, targets):
                 futures.append(
-                    executor.submit(build_interface, template_bytes, output_path, collab)
+                    executor.submit(run_task, profile_context, trace_context,
+                                    build_interface, template_bytes, str(target), collab)
                 )
 
-            for future in tqdm(futures, desc="Creating interfaces (parallel)"):
+            for collab, target, future in tqdm(zip(collaborators, targets, futures),
+                                               desc="Creating interfaces (parallel)", total=len(futures)):
                 try:
-                    future.result()
+                    seconds, spans, profile = future.result()
+                    tracer.extend(spans)
+                    profiler.add_worker(profile)
+                    metrics.observe_file(seconds)
+                    snapshot.record_created(target)
+                    created.append(collab)
                 except Exception as e:
+                    tracer.extend(getattr(e, "trace_spans", []))
+                    profiler.add_worker(getattr(e, "profile", None))
+                    metrics.count("failed")
                     logger.error(f"error: {e}")
+        if created:
+            self._save_layout(snapshot)
+        return created
 
-        logger.info("[CREATE_INTERFACES] parallel creation complete.")
-
+    @_command
     def create_interfaces(self) -> None:
         """
         Create user interfaces using sequential processing with openpyxl.
 
-        Creates individual Excel interface files for each collaborator from XML file.
+        Creates individual Excel interface files for each collaborator from XML file (or from the
+        collaborator registry when the XML file has already been consumed).
         Only creates missing collaborator files - checks if file exists before creating.
         Each interface is based on the template file and includes data validation lists for pointage entry.
 
@@ -181,7 +458,7 @@ class RoadmapManager:
 
         logger.info("[CREATE_INTERFACES] interface creation (Normal processing mode)")
 
-        collaborators = get_collaborators(self.synthese_file)
+        collaborators = self._load_collaborators()
         if not collaborators:
             logger.info(
                 "[CREATE_INTERFACES] the list of CE is empty."
@@ -193,14 +470,10 @@ class RoadmapManager:
         # Ensure RM_Collaborateurs folder exists
         self.rm_folder.mkdir(exist_ok=True)
 
-        # Filter out collaborators whose files already exist
-        missing_collabs = []
-        for collab in collaborators:
-            target = self.rm_folder / f"RM_{collab}.xlsx"
-            if not target.exists():
-                missing_collabs.append(collab)
-            else:
-                logger.debug(f"[CREATE_INTERFACES] File already exists: {target.name}")
+        # Filter out collaborators whose files already exist (answered from one directory listing)
+        snapshot = self.snapshot()
+        missing_collabs = self._missing_collaborators(collaborators, snapshot)
+        metrics.count("skipped", len(collaborators) - len(missing_collabs))
 
         if not missing_collabs:
             logger.info("[CREATE_INTERFACES] All collaborator files already exist. Nothing to create.")
@@ -208,28 +481,39 @@ class RoadmapManager:
 
         logger.info(f"[CREATE_INTERFACES] Creating {len(missing_collabs)} missing interface file(s)")
 
-        for collab in tqdm(missing_collabs, desc="Creating interfaces", total=len(missing_collabs)):
-            target = self.rm_folder / f"RM_{collab}.xlsx"
+        targets = [self.layout.path_for(collab) for collab in missing_collabs]
+        for folder in {target.parent for target in targets}:
+            folder.mkdir(parents=True, exist_ok=True)
+        for collab, target in tqdm(zip(missing_collabs, targets), desc="Creating interfaces", total=len(missing_collabs)):
+            start = time.perf_counter()
 
             try:
-                wb = load_workbook(self.template_file)
+                with span("open", target):
+                    wb = load_workbook(self.template_file)
             except PermissionError:
                 logger.error(f"'{self.template_file}' is opened. Please close the excel file")
+                self._save_layout(snapshot)
                 return
 
-            ws_pointage = wb["POINTAGE"]
+            with span("transform", target):
+                ws_pointage = wb["POINTAGE"]
 
-            # Write collaborator name
-            ws_pointage["B1"].value = collab
+                # Write collaborator name
+                ws_pointage["B1"].value = collab
 
-            # Add data validations
-            add_data_validations_to_sheet(ws_pointage, start_row=3)
+                # Add data validations
+                add_data_validations_to_sheet(ws_pointage, start_row=3)
 
-            wb.save(target)
-            wb.close()
+            with span("save", target):
+                wb.save(target)
+                wb.close()
+            snapshot.record_created(target)
+            metrics.observe_file(time.perf_counter() - start)
 
+        self._save_layout(snapshot)
         logger.info("[CREATE_INTERFACES] creation done.")
 
+    @_command
     def delete_and_archive_interfaces(self, archive: bool) -> None:
         """
         Delete or archive the entire RM_Collaborateurs folder.
@@ -247,6 +531,8 @@ class RoadmapManager:
 
         Note:
             This operation is destructive. The entire RM_Collaborateurs folder is removed.
+            Files open in Excel are waited for with backoff; if any is still open, nothing is
+            archived or deleted.
         """
         if not self.all_ok:
             return
@@ -254,29 +540,48 @@ class RoadmapManager:
         logger.info("[DELETE_INTERFACES] Starting interface deletion")
 
         rm_folder = self.rm_folder
-        if not rm_folder.exists():
+        snapshot = self.snapshot()
+        if not snapshot.exists:
             logger.warning("[DELETE_INTERFACES] RM_Collaborateurs folder does not exist")
             return
 
-        rm_count = sum(1 for f in rm_folder.glob("*.xlsx") if f.is_file())
+        rm_count = len(snapshot.interfaces())
 
         if rm_count == 0:
             logger.warning("[DELETE_INTERFACES] RM_Collaborateurs folder is empty")
             # Still delete the folder if it exists
             try:
+                self._snapshot = None
                 rmtree_with_retry(rm_folder)
                 logger.info("[DELETE_INTERFACES] Empty folder removed")
             except Exception as e:
                 logger.error(f"[DELETE_INTERFACES] Error removing empty folder: {e}")
             return
 
+        # Files open in Excel would be archived without their unsaved changes and block removal:
+        # wait for them with backoff, and abort before zipping if any is still open
+        lock_scan = snapshot.lock_scan
+        open_files = [f for f in snapshot.interfaces() if lock_scan.has_owner_file(f)]
+        if open_files:
+            logger.warning(f"[DELETE_INTERFACES] {len(open_files)} file(s) open in Excel: "
+                           f"{', '.join(f.name for f in open_files)}")
+            _, report = run_lock_aware(open_files, lambda path: None, is_locked=lock_scan.has_owner_file,
+                                       delays=self.lock_retry_delays)
+            if report.locked:
+                report.log("DELETE_INTERFACES", locked_message="{name} is still open in Excel")
+                metrics.count("locked", len(report.locked))
+                logger.error("[DELETE_INTERFACES] Close the files open in Excel and run again. "
+                             "Nothing was archived or deleted.")
+                return
+
         timestamp = datetime.now().strftime('%d%m%Y_%H%M%S')
 
         # Archive to Archived folder if requested
         if archive:
             try:
                 archived_zip = self.archived_folder / f"Archive_RM_Collaborateurs_{timestamp}.zip"
-                zip_folder(rm_folder, archived_zip)
+                with span("archive", archived_zip, files=rm_count):
+                    zip_folder(rm_folder, archived_zip)
                 logger.info(f"[DELETE_INTERFACES] Archived {rm_count} interface file(s) to {archived_zip.name}")
             except Exception as e:
                 logger.error(f"[DELETE_INTERFACES] Error while archiving folder: {e}")
@@ -285,23 +590,37 @@ class RoadmapManager:
         # Move to Deleted folder
         try:
             deleted_zip = self.deleted_folder / f"Deleted_RM_Collaborateurs_{timestamp}.zip"
-            zip_folder(rm_folder, deleted_zip)
+            with span("archive", deleted_zip, files=rm_count):
+                zip_folder(rm_folder, deleted_zip)
 
             # Remove the original folder after zipping
-            if not rmtree_with_retry(rm_folder):
+            self._snapshot = None
+            with span("delete", rm_folder, files=rm_count):
+                removed = rmtree_with_retry(rm_folder)
+            if not removed:
                 logger.warning("[DELETE_INTERFACES] Could not remove original folder, but zip was created")
             else:
+                metrics.count("processed", rm_count)
                 logger.info(f"[DELETE_INTERFACES] Deleted & Moved {rm_count} interface file(s) to {deleted_zip.name}")
+                if self.layout.sharded:
+                    # The layout outlives its files: the next 'create' shards them again
+                    rm_folder.mkdir(exist_ok=True)
+                    self._save_layout(WorkspaceSnapshot(rm_folder))
         except Exception as e:
             logger.error(f"[DELETE_INTERFACES] Error while zipping folder: {e}")
             return
 
+    @_command
     def delete_missing_collaborators(self) -> None:
         """
         Delete interface files for collaborators that are missing from the XML list.
 
-        Compares existing files in RM_Collaborateurs folder with the collaborator list from XML.
-        If a file exists but the collaborator is not in the XML list, that file is deleted.
+        Compares existing files in RM_Collaborateurs folder with the collaborator list from XML
+        (or from 'Gestion_Interfaces' when the XML file has already been consumed).
+        If a file exists but the collaborator is not in the list, that file is deleted.
+        The collaborator registry alone may be stale: without a current list nothing is deleted.
+        Names are compared by file name key (see roadmap.registry.file_name_key), so case or
+        spacing differences do not delete a file.
 
         Returns:
             None: Returns early if required files are missing or folder doesn't exist.
@@ -315,25 +634,28 @@ class RoadmapManager:
 
         logger.info("[DELETE_MISSING_COLLABORATORS] Starting cleanup of missing collaborators")
 
-        if not self.rm_folder.exists():
+        snapshot = self.snapshot()
+        if not snapshot.exists:
             logger.warning("[DELETE_MISSING_COLLABORATORS] RM_Collaborateurs folder does not exist")
             return
 
-        # Get current list of collaborators from XML
-        collaborators = get_collaborators(self.synthese_file)
+        # Get current list of collaborators from XML (or the synthesis workbook when XML is absent)
+        collaborators = self._load_collaborators(use_registry=False)
         if not collaborators:
-            logger.warning("[DELETE_MISSING_COLLABORATORS] No collaborators found in XML. Skipping cleanup.")
+            if self.registry.exists:
+                logger.warning(
+                    "[DELETE_MISSING_COLLABORATORS] collabs.xml not found and synthesis workbook unreadable."
+                    " Files are not deleted from the collaborator registry alone. Skipping cleanup.")
+            else:
+                logger.warning("[DELETE_MISSING_COLLABORATORS] No collaborators found in XML. Skipping cleanup.")
             return
 
-        # Create a set of expected file names for faster lookup
-        expected_files = {f"RM_{collab}.xlsx" for collab in collaborators}
+        # Create a set of expected file name keys for faster lookup
+        expected_keys = {file_name_key(collab) for collab in collaborators}
         logger.info(f"[DELETE_MISSING_COLLABORATORS] Found {len(collaborators)} collaborators in XML")
 
         # Get all existing files in the folder
-        existing_files = [
-            f for f in self.rm_folder.glob("*.xlsx")
-            if f.is_file() and not f.name.startswith("~$")
-        ]
+        existing_files = snapshot.interfaces()
 
         if not existing_files:
             logger.info("[DELETE_MISSING_COLLABORATORS] No files found in RM_Collaborateurs folder")
@@ -342,7 +664,7 @@ class RoadmapManager:
         # Find files that don't match any collaborator in the list
         files_to_delete = []
         for file_path in existing_files:
-            if file_path.name not in expected_files:
+            if interface_key(file_path) not in expected_keys:
                 files_to_delete.append(file_path)
 
         if not files_to_delete:
@@ -351,6 +673,19 @@ class RoadmapManager:
 
         logger.info(f"[DELETE_MISSING_COLLABORATORS] Found {len(files_to_delete)} file(s) to delete")
 
+        self._archive_and_delete(files_to_delete, snapshot)
+
+    def _archive_and_delete(self, files_to_delete: list[Path], snapshot: WorkspaceSnapshot) -> int:
+        """
+        Zip interface files to 'Deleted/Deleted_Missing_RM_collaborators_<timestamp>.zip', then delete them.
+
+        Args:
+            files_to_delete (list[Path]): Interface files to remove.
+            snapshot (WorkspaceSnapshot): Snapshot of RM_Collaborateurs, updated with the removed files.
+
+        Returns:
+            int: Number of files deleted. Files open in Excel are retried with backoff, then skipped.
+        """
         # Create zip archive of files to delete before deletion
         timestamp = datetime.now().strftime('%d%m%Y_%H%M%S')
         zip_filename = f"Deleted_Missing_RM_collaborators_{timestamp}.zip"
@@ -365,11 +700,13 @@ class RoadmapManager:
             # Copy files to temporary folder
             for file_path in files_to_delete:
                 dest_path = temp_folder_path / file_path.name
-                shutil.copy2(file_path, dest_path)
+                with span("copy", file_path):
+                    shutil.copy2(file_path, dest_path)
                 logger.debug(f"[DELETE_MISSING_COLLABORATORS] Copied to temp folder: {file_path.name}")
 
             # Zip the temporary folder using zip_folder function
-            zip_folder(temp_folder_path, zip_path)
+            with span("archive", zip_path, files=len(files_to_delete)):
+                zip_folder(temp_folder_path, zip_path)
             logger.info(f"[DELETE_MISSING_COLLABORATORS] Created archive: {zip_filename}")
         except Exception as e:
             logger.error(f"[DELETE_MISSING_COLLABORATORS] Error creating zip archive: {e}")
@@ -383,21 +720,211 @@ class RoadmapManager:
                 except Exception as e:
                     logger.warning(f"[DELETE_MISSING_COLLABORATORS] Could not remove temporary folder: {e}")
 
-        # Delete the orphaned files
-        deleted_count = 0
-        for file_path in files_to_delete:
-            try:
+        # Delete the orphaned files; files open in Excel are deferred and retried with backoff
+        def delete_file(file_path: Path) -> None:
+            with span("delete", file_path):
                 file_path.unlink()
-                logger.info(f"[DELETE_MISSING_COLLABORATORS] Deleted: {file_path.name}")
-                deleted_count += 1
-            except PermissionError:
-                logger.warning(f"[DELETE_MISSING_COLLABORATORS] Cannot delete {file_path.name} - file may be open in Excel")
-            except Exception as e:
-                logger.error(f"[DELETE_MISSING_COLLABORATORS] Error deleting {file_path.name}: {e}")
+            snapshot.record_removed(file_path)
+            logger.info(f"[DELETE_MISSING_COLLABORATORS] Deleted: {file_path.name}")
+
+        _, report = run_lock_aware(
+            files_to_delete, delete_file,
+            is_locked=snapshot.has_owner_file, delays=self.lock_retry_delays)
+        report.log(
+            "DELETE_MISSING_COLLABORATORS",
+            locked_message="Cannot delete {name} - file may be open in Excel",
+            failed_message="Error deleting {name}: {error}")
+        metrics.record_report(report)
+        deleted_count = len(report.processed) + len(report.recovered)
+        self._save_layout(snapshot)
 
         logger.info(f"[DELETE_MISSING_COLLABORATORS] Cleanup complete. Deleted {deleted_count} file(s). Archive saved to: {zip_filename}")
+        return deleted_count
+
+    @_command
+    def sync(self, dry_run: bool = False, max_workers: int = 8) -> SyncPlan | None:
+        """
+        Bring RM_Collaborateurs in line with the collaborator list and LC.xlsx in one pass.
+
+        Replaces 'cleanup', 'create' and 'update' run one after the other. The collaborator list,
+        LC.xlsx and the folder are read once, and a plan is computed before any file is written
+        (see roadmap.sync). The plan then runs in this order: interfaces of removed collaborators
+        are archived and deleted, the template gets the new LC if it differs, missing interfaces
+        are built from it (so they get the latest LC and validations), and the interfaces whose
+        LC or validations differ are updated. Each file is written at most once.
+
+        Args:
+            dry_run (bool, optional): Only compute the plan: nothing is written, and collabs.xml
+                and LC.xlsx are kept. Defaults to False.
+            max_workers (int, optional): Maximum number of worker processes creating interfaces.
+                Defaults to 8.
+
+        Returns:
+            SyncPlan | None: The plan (executed unless `dry_run`), or None if required files are
+            missing or the collaborator list is empty.
+
+        Note:
+            Without LC.xlsx, only the archive and create operations are planned. If the template
+            cannot be updated (open in Excel), the new interfaces are updated after being created.
+            When the list only comes from the collaborator registry, which may be stale, nothing
+            is archived.
+        """
+        if not self.all_ok:
+            return None
+
+        collaborators = self._load_collaborators(read_only=dry_run, use_registry=False)
+        registry_only = not collaborators and self.registry.exists
+        if registry_only:
+            logger.warning(
+                f"[SYNC] collabs.xml not found and synthesis workbook unreadable - using collaborator registry "
+                f"(version {self.registry.version}, {len(self.registry)} collaborators). Nothing is archived.")
+            collaborators = self.registry.names()
+        if not collaborators:
+            logger.warning(
+                "[SYNC] the list of CE is empty. Nothing is archived or created."
+                f" Please check XML file or 'Gestion_Interfaces' sheet in '{self.synthese_file}'")
+            return None
+
+        lc_data = self._load_lc_data(delete=not dry_run)
+        if not lc_data:
+            logger.info("[SYNC] No LC data (LC.xlsx missing or empty): LC sheets are not updated")
+
+        self.rm_folder.mkdir(exist_ok=True)
+        snapshot = self.snapshot()
+        plan = plan_sync(collaborators, snapshot, self.template_file, lc_data, max_workers=self.max_io_workers,
+                         cache=self.content_cache, layout=self.layout, archive=not registry_only)
+        logger.info(
+            f"[SYNC] Plan for {plan.collaborators} collaborators: {len(plan.of(SYNC_ARCHIVE))} to archive, "
+            f"{len(plan.of(SYNC_TEMPLATE))} template update, {len(plan.of(SYNC_CREATE))} to create, "
+            f"{len(plan.of(SYNC_UPDATE))} to update, {plan.current} up to date")
+        metrics.count("skipped", plan.current)
+        if dry_run or plan.empty:
+            return plan
+
+        archived = [action.path for action in plan.of(SYNC_ARCHIVE)]
+        if archived:
+            self._archive_and_delete(archived, snapshot)
+
+        template_current = True
+        if plan.of(SYNC_TEMPLATE):
+            logger.info("[SYNC] Updating template file...")
+            outcome = self._update_lc_in_file(self.template_file, lc_data)
+            if outcome == LC_LOCKED:
+                logger.error(f"[SYNC] '{self.template_file.name}' is opened: the template was not updated")
+            template_current = outcome == LC_UPDATED
+
+        updated = [action.path for action in plan.of(SYNC_UPDATE)]
+        to_create = [action.collaborator for action in plan.of(SYNC_CREATE)]
+        if to_create:
+            results, report = run_lock_aware(
+                [self.template_file], lambda path: path.read_bytes(), delays=self.lock_retry_delays)
+            if not report.ok:
+                logger.error(f"[SYNC] '{self.template_file}' is opened. Please close the excel file. No interface created.")
+            else:
+                logger.info(f"[SYNC] Creating {len(to_create)} missing interface file(s)")
+                created = self._build_interfaces(to_create, results[self.template_file],
+                                                 min(max_workers, len(to_create)), snapshot)
+                if not template_current:
+                    logger.warning("[SYNC] The template could not be updated: the new interfaces get the LC update instead")
+                    updated += [self.layout.path_for(collab) for collab in created]
+
+        if updated:
+            logger.info(f"[SYNC] Updating {len(updated)} collaborator files...")
+            self._update_lc_in_files(updated, lc_data, snapshot)
+
+        logger.info("[SYNC] Sync completed")
+        return plan
+
+    @_command
+    def set_layout(self, mode: str, prefix_length: int = DEFAULT_PREFIX_LENGTH,
+                   teams: dict[str, str] | None = None) -> bool:
+        """
+        Move the interface files to a flat or sharded layout of RM_Collaborateurs.
+
+        Files are renamed within the folder (not copied), then the index of the new layout is
+        written (see roadmap.layout). Every command reads the folder through the layout, so
+        nothing else changes for them; new interfaces are created in their subfolder.
 
-    def pointage(self) -> bool:
+        Args:
+            mode (str): 'flat', 'prefix' or 'team'.
+            prefix_length (int, optional): Letters of the name used as subfolder ('prefix' mode).
+                Defaults to 1.
+            teams (dict[str, str] | None, optional): Team by normalized collaborator key ('team'
+                mode, see roadmap.layout.read_teams). Defaults to None (teams of the current layout).
+
+        Returns:
+            bool: True if every interface is where the new layout expects it.
+
+        Note:
+            Nothing is moved while an interface is open in Excel. If some files cannot be moved
+            back to a flat folder, the folder keeps its sharded layout so that none is lost.
+        """
+        if not self.all_ok:
+            return False
+
+        snapshot = self.snapshot(refresh=True)
+        interfaces = snapshot.interfaces()
+        open_files = [path.name for path in interfaces if snapshot.has_owner_file(path)]
+        if open_files:
+            logger.error(f"[LAYOUT] {len(open_files)} file(s) open in Excel: {', '.join(open_files)}. "
+                         "Nothing was moved.")
+            return False
+
+        layout = InterfaceLayout(self.rm_folder, mode, max(1, prefix_length),
+                                 dict(self.layout.teams if teams is None else teams))
+        moves = {}
+        for path in interfaces:
+            shard = layout.shard(path.stem[3:] if path.stem.startswith("RM_") else path.stem)
+            target = (self.rm_folder / shard if shard else self.rm_folder) / path.name
+            if target != path:
+                moves[path] = target
+        logger.info(f"[LAYOUT] Moving {len(moves)} of {len(interfaces)} interface file(s) to the '{mode}' layout")
+        metrics.count("skipped", len(interfaces) - len(moves))
+
+        def move_file(path: Path) -> None:
+            target = moves[path]
+            if target.exists():
+                raise FileExistsError(f"{target.relative_to(self.rm_folder)} already exists")
+            target.parent.mkdir(exist_ok=True)
+            with span("move", path):
+                path.rename(target)
+            snapshot.record_removed(path)
+            snapshot.record_created(target)
+
+        _, report = run_lock_aware(
+            list(moves), move_file, is_locked=snapshot.has_owner_file, delays=self.lock_retry_delays)
+        report.log(
+            "LAYOUT",
+            locked_message="Cannot move {name} - file may be open in Excel",
+            failed_message="Error moving {name}: {error}")
+        metrics.record_report(report)
+
+        # Subfolders of the previous layout left empty
+        for folder in sorted({path.parent for path in moves} - {self.rm_folder}):
+            try:
+                folder.rmdir()
+            except OSError:
+                pass
+
+        if not report.ok and not layout.sharded:
+            # A flat folder does not list subfolders: the files left there would be ignored
+            logger.error("[LAYOUT] Some files could not be moved: the folder keeps its current layout")
+            self._save_layout(snapshot)
+            return False
+
+        self.layout = layout
+        if layout.sharded:
+            self._save_layout(snapshot)
+        else:
+            layout.save()
+        self._snapshot = None
+        logger.info(f"[LAYOUT] RM_Collaborateurs now uses the '{mode}' layout")
+        return report.ok
+
+    @_command
+    def pointage(self, direct: bool = False, threshold: float | None = None,
+                 weeks: Iterable[str] | None = None, collaborators: Iterable[str] | None = None,
+                 history: bool = False, validate: bool = False) -> bool:
         """
         Export pointage (time tracking) data from collaborator files to XML.
 
@@ -407,64 +934,577 @@ class RoadmapManager:
         Reads data from the 'POINTAGE' sheet, starting at row 4, columns A-K.
         Stops reading when encountering a fully empty row.
 
+        Alongside the rows, 'pointage_status.xml' lists contiguous ranges of rows under / over the
+        hours threshold, so VBA colors SYNTHESE one range at a time (see roadmap.status).
+
+        With `weeks` or `collaborators`, only the matching rows are exported (partial refresh).
+        Files of other collaborators, and files whose week codes are known not to overlap
+        `weeks` (see roadmap.pointage.WeekIndex), are not opened; rows of other weeks are
+        dropped while reading.
+
+        Args:
+            direct (bool, optional): Write the rows straight into the SYNTHESE sheet of the closed
+                synthesis workbook instead of exporting XML (see roadmap.synthese). Falls back to
+                the XML export if the workbook cannot be written. Defaults to False.
+            threshold (float | None, optional): Weekly hours below which rows are red.
+                Defaults to `hours_threshold` (35).
+            weeks (Iterable[str] | None, optional): Week codes or ranges to export, e.g.
+                ['S0525', 'S0725-S0825']. Defaults to all weeks.
+            collaborators (Iterable[str] | None, optional): Collaborators to export. Defaults to all.
+            history (bool, optional): Also upsert the extracted rows into the local history store
+                ('pointage_history.db', see roadmap.history). Defaults to False.
+            validate (bool, optional): Also check the extracted rows against the 'LC' sheet of the
+                synthesis workbook and write the rows with issues to 'pointage_validation.csv'
+                (see roadmap.validation). The export itself is unchanged. Defaults to False.
+
         Returns:
             bool: True if data was exported, False if no data found or operation failed. Always creates XML file (empty if no data).
 
+        Raises:
+            ValueError: If a week range is invalid.
+
         Note:
             Creates an empty XML file if no data exists, as VBA expects the file to be present. Skips temporary Excel files (starting with '~$').
         """
         if not self.all_ok:
             return False
 
-        if not self.rm_folder.exists():
+        weeks = None if weeks is None else parse_weeks(weeks)
+        snapshot = self.snapshot()
+        if not snapshot.exists:
             logger.error("RM_Collaborateurs folder not found")
             return False
 
-        collaborator_files = [
-            filepath for filepath in self.rm_folder.glob("*.xlsx")
-            if not filepath.name.startswith("~$")
-        ]
+        all_files = snapshot.interfaces()
+        collaborator_files = select_files(all_files, collaborators)
+        index = WeekIndex.load(self.base_path)
+        if weeks is not None:
+            collaborator_files = [
+                path for path in collaborator_files if not index.can_skip(snapshot.entry(path.name), weeks)]
+        skipped = len(all_files) - len(collaborator_files)
+        if skipped:
+            metrics.count("skipped", skipped)
 
         if not collaborator_files:
-            logger.warning("No collaborator files found")
-            write_xml([], self.xml_output)
+            logger.warning("No collaborator files found" if not all_files else "[POINTAGE] No collaborator file matches the filters")
+            self._export_xml([], threshold)
             return False
 
-        logger.info(f"[POINTAGE] Processing {len(collaborator_files)} collaborator files")
+        logger.info(f"[POINTAGE] Processing {len(collaborator_files)} collaborator files"
+                    + (f" ({skipped} skipped by the filters)" if skipped else ""))
 
-        all_rows = []
+        # Reading works while Excel has a file open, but unsaved edits are not exported
+        for collaborator_file in collaborator_files:
+            if snapshot.has_owner_file(collaborator_file):
+                logger.warning(f"[POINTAGE] {collaborator_file.name} is open in Excel - unsaved changes will not be exported")
+
+        # Metadata read here, once: the reader threads do not touch the snapshot
+        entries = {path: snapshot.entry(path.name) for path in collaborator_files}
+
+        # Files that cannot be read are deferred and retried instead of aborting the run
+        read_file = profile_thread(lambda path: self._read_pointage_file(path, weeks, index, entries[path]))
+        results, report = run_lock_aware(
+            collaborator_files, read_file,
+            max_workers=self.max_io_workers, delays=self.lock_retry_delays)
+        report.log("POINTAGE", failed_message="Error reading {name}: {error}")
+        metrics.record_report(report)
+        if index.changed:
+            try:
+                index.save()
+            except OSError as e:
+                logger.warning(f"[POINTAGE] Could not save {index.path.name}: {e}")
 
+        records = []
         for collaborator_file in collaborator_files:
-            logger.info(f"[POINTAGE] Reading {collaborator_file}")
+            records.extend(results.get(collaborator_file, []))
 
-            wb = load_workbook(collaborator_file, data_only=True, read_only=True)
-            sheet = wb["POINTAGE"]
+        if history:
+            self._record_history(records, [path.name for path in collaborator_files if path in results], weeks)
+        if validate:
+            self._validate_records(records)
 
-            k1_value = sheet["K1"].value or 0
+        if not records:
+            logger.info("[POINTAGE] No data to export → creating EMPTY XML")
+            self._export_xml([], threshold)
+            return False
 
-            for row in sheet.iter_rows(min_row=4, min_col=1, max_col=11):
-                row_data = [cell.value for cell in row]
+        metrics.add_rows(len(records))
+        if direct and self.write_synthese(records, threshold):
+            return True
 
-                # Stop when hitting a fully empty row
-                if all(v is None for v in row_data):
-                    break
+        self._export_xml(records, threshold)
+        logger.info(f"[POINTAGE] XML successfully created with {len(records)} rows → {self.xml_output}")
 
-                # Append K1 total to help downstream coloring logic
-                row_data.append(k1_value)
-                all_rows.append(row_data)
+        return True
 
-            wb.close()
+    def _record_history(self, records: list[PointageRecord], sources: list[str], weeks: set[str] | None) -> None:
+        """
+        Upsert extracted records into the local history store.
 
-        if not all_rows:
-            logger.info("[POINTAGE] No data to export → creating EMPTY XML")
-            write_xml([], self.xml_output)
+        Private helper method for pointage(). A failure is logged and does not stop the export.
+
+        Args:
+            records (list[PointageRecord]): Extracted records.
+            sources (list[str]): Names of the files read successfully.
+            weeks (set[str] | None): Weeks the extraction was limited to, None for all.
+        """
+        try:
+            with span("save", self.history_file, rows=len(records)):
+                with PointageHistory(self.history_file) as store:
+                    result = store.upsert(records, sources, weeks)
+        except sqlite3.Error as e:
+            logger.error(f"[HISTORY] Could not update {self.history_file.name}: {e}")
+            return
+        logger.info(f"[HISTORY] {result.inserted} inserted, {result.updated} updated, {result.deleted} deleted, "
+                    f"{result.unchanged} unchanged → {self.history_file}")
+
+    def _validate_records(self, records: list[PointageRecord]) -> list[RowIssues] | None:
+        """
+        Check pointage rows against the LC sheet and write 'pointage_validation.csv'.
+
+        Args:
+            records (list[PointageRecord]): Rows read by pointage().
+
+        Returns:
+            list[RowIssues] | None: Rows with issues, or None if the LC sheet could not be read.
+
+        Note:
+            Failures are logged and never abort the export.
+        """
+        try:
+            with span("parse", self.synthese_file):
+                if self.content_cache is None:
+                    lc = LCIndex.load(self.synthese_file)
+                else:
+                    lc = self.content_cache.get("lc_index", self.synthese_file, LCIndex.load)
+        except (KeyError, OSError, zipfile.BadZipFile) as e:
+            logger.error(f"[VALIDATE] Could not read the LC sheet of {self.synthese_file.name}: {e}")
+            return None
+
+        issues = validate_records(records, lc)
+        try:
+            with span("save", self.validation_output, rows=len(issues)):
+                write_validation_report(self.validation_output, issues)
+        except OSError as e:
+            logger.error(f"[VALIDATE] Could not write {self.validation_output.name}: {e}")
+            return issues
+
+        if issues:
+            counts = ", ".join(f"{count} {code}" for code, count in count_issues(issues).items())
+            logger.warning(f"[VALIDATE] {len(issues)} of {len(records)} rows with issues ({counts}) → {self.validation_output}")
+        else:
+            logger.info(f"[VALIDATE] All {len(records)} rows match LC → {self.validation_output}")
+        return issues
+
+    def query(self, by: Iterable[str], weeks: Iterable[str] | None = None,
+              collaborators: Iterable[str] | None = None, keys: Iterable[str] | None = None,
+              year: int | None = None) -> list[tuple] | None:
+        """
+        Total hours from the local history store, grouped by some columns.
+
+        Args:
+            by (Iterable[str]): Grouping columns: collaborator, week, key, function, label, year.
+            weeks (Iterable[str] | None, optional): Week codes or ranges to include. Defaults to all.
+            collaborators (Iterable[str] | None, optional): Collaborators to include. Defaults to all.
+            keys (Iterable[str] | None, optional): LC keys to include. Defaults to all.
+            year (int | None, optional): Year to include. Defaults to all.
+
+        Returns:
+            list[tuple] | None: The grouping values followed by the total hours, one tuple per
+            group. None if the history store does not exist yet.
+
+        Raises:
+            ValueError: If a grouping column or week range is invalid.
+        """
+        if not self.history_file.exists():
+            logger.error(f"[QUERY] {self.history_file.name} not found - run 'pointage --history' first")
+            return None
+        weeks = None if weeks is None else parse_weeks(weeks)
+        with span("query", self.history_file):
+            with PointageHistory(self.history_file) as store:
+                return store.totals(by, weeks, collaborators, keys, year)
+
+    def history_table(self, name: str, weeks: Iterable[str] | None = None,
+                      collaborators: Iterable[str] | None = None,
+                      window: int = 4) -> tuple[list[str], list[tuple]] | None:
+        """
+        Build a dashboard table from the aggregates of the local history store.
+
+        Args:
+            name (str): 'verif' (hours per collaborator and week, with the non-zero share row),
+                'rolling' (rolling totals per collaborator and week) or 'fs' (consumed hours per
+                key and label, per collaborator).
+            weeks (Iterable[str] | None, optional): Week codes or ranges ('verif', 'rolling').
+                Defaults to all.
+            collaborators (Iterable[str] | None, optional): Collaborators ('verif', 'rolling').
+                Defaults to all.
+            window (int, optional): Weeks summed by 'rolling'. Defaults to 4.
+
+        Returns:
+            tuple[list[str], list[tuple]] | None: Column headers and rows, or None if the history
+            store does not exist yet.
+
+        Raises:
+            ValueError: If the table name, a week range or the window is invalid.
+        """
+        if name not in HISTORY_TABLES:
+            raise ValueError(f"Unknown table '{name}' (expected {', '.join(HISTORY_TABLES)})")
+        if not self.history_file.exists():
+            logger.error(f"[QUERY] {self.history_file.name} not found - run 'pointage --history' first")
+            return None
+        weeks = None if weeks is None else parse_weeks(weeks)
+        with span("query", self.history_file, table=name):
+            with PointageHistory(self.history_file) as store:
+                if name == "verif":
+                    return matrix_table(store.weekly_hours(weeks, collaborators), share=True)
+                if name == "rolling":
+                    return matrix_table(store.rolling_hours(window, weeks, collaborators))
+                return fs_table(store.consumed_hours())
+
+    def report(self, output: str | Path | None = None, weeks: Iterable[str] | None = None,
+               collaborators: Iterable[str] | None = None, threshold: float | None = None,
+               details: bool = False) -> Path | None:
+        """
+        Write the summary workbook of the pointage data (weekly heatmap, totals per function).
+
+        The records are streamed from the interface files and the workbook is written in
+        openpyxl's write-only mode (see roadmap.report), so memory stays flat on yearly,
+        department-wide reports. Nothing is exported to SYNTHESE.
+
+        Args:
+            output (str | Path | None, optional): Report workbook. Defaults to
+                'pointage_report.xlsx' in the base directory.
+            weeks (Iterable[str] | None, optional): Week codes or ranges to include. Defaults to all.
+            collaborators (Iterable[str] | None, optional): Collaborators to include. Defaults to all.
+            threshold (float | None, optional): Weekly hours shown in full green on the heatmap.
+                Defaults to `hours_threshold` (35).
+            details (bool, optional): Add a sheet with every pointage row. Defaults to False.
+
+        Returns:
+            Path | None: The report workbook, or None if it could not be written.
+
+        Raises:
+            ValueError: If a week range is invalid.
+        """
+        weeks = None if weeks is None else parse_weeks(weeks)
+        output = self.base_path / REPORT_FILE_NAME if output is None else Path(output)
+        threshold = self.hours_threshold if threshold is None else threshold
+        try:
+            with span("save", output) as fields:
+                summary = write_report(output, self.iter_pointage(collaborators, weeks), threshold, details)
+                fields["rows"] = summary.rows
+        except PermissionError:
+            logger.error(f"[REPORT] '{output.name}' is open in Excel - close it and try again")
+            return None
+        except OSError as e:
+            logger.error(f"[REPORT] Could not write {output.name}: {e}")
+            return None
+
+        metrics.add_rows(summary.rows)
+        if not summary.rows:
+            logger.warning("[REPORT] No pointage row matches the filters - the report is empty")
+        logger.info(f"[REPORT] {summary.collaborators} collaborator(s), {summary.weeks} week(s), "
+                    f"{summary.functions} function(s) from {summary.rows} rows → {output}")
+        return output
+
+    def _export_xml(self, records: list[PointageRecord], threshold: float | None = None) -> None:
+        """
+        Write the pointage rows and their status ranges for the VBA import.
+
+        Private helper method for pointage(). The rows keep the K1 total as 12th column, so
+        workbooks with the previous macros (helper column coloring) keep working.
+
+        Args:
+            records (list[PointageRecord]): Pointage records, in export order.
+            threshold (float | None, optional): Hours threshold. Defaults to `hours_threshold`.
+        """
+        threshold = self.hours_threshold if threshold is None else threshold
+        with span("save", self.xml_output, rows=len(records)):
+            write_xml((record.values for record in records), self.xml_output)
+        with span("save", self.status_output, rows=len(records)):
+            ranges = status_ranges((record.total for record in records), threshold)
+            write_status_xml(ranges, threshold, len(records), self.status_output)
+        logger.debug(f"[POINTAGE] {len(ranges)} status range(s) written → {self.status_output}")
+
+    def write_synthese(self, records: list[PointageRecord], threshold: float | None = None) -> bool:
+        """
+        Append pointage rows to the SYNTHESE sheet of the synthesis workbook.
+
+        Produces the result of the VBA import (rows, LC columns H/I, row colors) without Excel.
+
+        Args:
+            records (list[PointageRecord]): Pointage records, in export order.
+            threshold (float | None, optional): Hours threshold. Defaults to `hours_threshold`.
+
+        Returns:
+            bool: True if the workbook was written, False if it is open or cannot be patched.
+        """
+        threshold = self.hours_threshold if threshold is None else threshold
+        try:
+            with span("save", self.synthese_file, rows=len(records)):
+                start_row, count = write_synthese_rows(
+                    self.synthese_file, [record.values for record in records], threshold)
+        except PermissionError:
+            logger.warning(f"[POINTAGE] '{self.synthese_file.name}' is open in Excel - exporting XML for the VBA import instead")
+            return False
+        except Exception as e:
+            logger.error(f"[POINTAGE] Could not write SYNTHESE directly: {e} - exporting XML for the VBA import instead")
+            return False
+
+        logger.info(f"[POINTAGE] {count} row(s) written to SYNTHESE (rows {start_row}-{start_row + count - 1}) → {self.synthese_file}")
+        return True
+
+    def _read_pointage_file(self, collaborator_file: Path, weeks: set[str] | None = None,
+                            index: WeekIndex | None = None,
+                            entry: FileEntry | None = None) -> list[PointageRecord]:
+        """
+        Read the pointage rows of a single collaborator file.
+
+        Private helper method for pointage(). Reads the 'POINTAGE' sheet starting at row 4,
+        columns A-K, and stops at the first fully empty row.
+
+        Args:
+            collaborator_file (Path): Path to the collaborator interface file.
+            weeks (set[str] | None, optional): Week codes to keep. Defaults to all.
+            index (WeekIndex | None, optional): Week index updated with the weeks of the file.
+            entry (FileEntry | None, optional): Metadata of the file from the command's snapshot,
+                recorded in `index`. Defaults to None (index not updated).
+
+        Returns:
+            list[PointageRecord]: Records of the file, in sheet order. The K1 total of the
+            file is shared by its records, for the downstream coloring logic.
+
+        Raises:
+            PermissionError: If the file is locked (handled by the lock-aware runner).
+        """
+        logger.info(f"[POINTAGE] Reading {collaborator_file}")
+        weeks_seen = set() if index is not None and entry is not None else None
+        records = list(read_pointage_file(collaborator_file, weeks, weeks_seen))
+        if weeks_seen is not None:
+            index.record(entry, weeks_seen)
+        return records
+
+    @_command
+    def check(self, collaborators: Iterable[str] | None = None) -> list[CheckResult] | None:
+        """
+        Check the health of the interface files without opening them in openpyxl.
+
+        Only the zip central directory, 'xl/workbook.xml' and the POINTAGE sheet part of each
+        file are read, in parallel threads (see roadmap.check). Reported problems: damaged
+        package, missing POINTAGE / LC sheet, B1 not matching the file name, missing or
+        outdated list validations in POINTAGE, file locked or unreadable.
+
+        Args:
+            collaborators (Iterable[str] | None, optional): Collaborators to check. Defaults to all.
+
+        Returns:
+            list[CheckResult] | None: One result per file, in name order, or None if the
+            'RM_Collaborateurs' folder does not exist.
+        """
+        snapshot = self.snapshot()
+        if not snapshot.exists:
+            logger.error("RM_Collaborateurs folder not found")
+            return None
+        files = select_files(snapshot.interfaces(), collaborators)
+        logger.info(f"[CHECK] Checking {len(files)} interface files")
+
+        lock_scan = snapshot.lock_scan
+
+        def check_file(path: Path) -> CheckResult:
+            with span("check", path):
+                return check_interface(path, lock_scan)
+
+        results, report = run_lock_aware(files, profile_thread(check_file), max_workers=self.max_io_workers,
+                                         delays=self.lock_retry_delays)
+        metrics.record_report(report)
+        locked = set(report.locked)
+        failed = dict(report.failed)
+        checked = []
+        for path in files:
+            if path in results:
+                checked.append(results[path])
+                continue
+            result = CheckResult(path.name, collaborator_of(path))
+            if path in locked:
+                result.add(CHECK_LOCKED, "File is locked by another process")
+            else:
+                result.add(CHECK_ERROR, failed.get(path, "Not checked"))
+            checked.append(result)
+
+        for result in checked:
+            for problem in result.problems:
+                logger.warning(f"[CHECK] {result.file}: {problem.message}")
+        failed_count = sum(1 for result in checked if not result.ok)
+        logger.info(f"[CHECK] {len(checked) - failed_count} healthy, {failed_count} with problems")
+        return checked
+
+    def verify_archives(self, max_workers: int = 4, full: bool = False) -> list[ArchiveResult]:
+        """
+        Verify the CRC of every member of the archives of 'Archived' and 'Deleted'.
+
+        Archives that changed since the last run (or all of them with `full`) are read in pool
+        worker processes; the others reuse their result from 'archives_index.json' (see
+        roadmap.archives). The 'Archived' and 'Deleted' zips of one 'delete --archive' run are
+        then compared, so a snapshot missing files is reported even if each zip is readable.
+
+        Args:
+            max_workers (int, optional): Maximum number of worker processes. Defaults to 4.
+            full (bool, optional): Ignore the cached results and read every archive. Defaults to False.
+
+        Returns:
+            list[ArchiveResult]: One result per archive, sorted by folder and name.
+        """
+        index = ArchiveIndex.load(self.base_path)
+        archives: dict[str, tuple[Path, int, int]] = {}
+        for folder_name in ARCHIVE_FOLDERS:
+            snapshot = WorkspaceSnapshot.take(self.base_path / folder_name)
+            for path in sorted(p for suffix in ARCHIVE_SUFFIXES for p in snapshot.interfaces(suffix)):
+                entry = snapshot.entry(path.name)
+                if entry is not None:
+                    archives[f"{folder_name}/{path.name}"] = (path, entry.size, entry.mtime_ns)
+
+        results: dict[str, ArchiveResult] = {}
+        pending = []
+        for name, (path, size, mtime_ns) in archives.items():
+            cached = None if full else index.result(name, size, mtime_ns)
+            if cached is None:
+                pending.append(name)
+            else:
+                results[name] = cached
+        metrics.count("skipped", len(results))
+        logger.info(f"[ARCHIVES] {len(archives)} archive(s), {len(pending)} to verify, {len(results)} unchanged")
+
+        if pending:
+            trace_context = worker_context()
+            profile_context = profiling_context()
+            # Reading and inflating is CPU-bound: one process per archive
+            with self._process_pool(min(max_workers, len(pending))) as executor:
+                futures = [executor.submit(run_task, profile_context, trace_context,
+                                           verify_archive, str(archives[name][0]), name) for name in pending]
+                for name, future in zip(pending, futures):
+                    _, size, mtime_ns = archives[name]
+                    try:
+                        result, spans, profile = future.result()
+                        tracer.extend(spans)
+                        profiler.add_worker(profile)
+                        metrics.observe_file(result.seconds)
+                    except Exception as e:
+                        tracer.extend(getattr(e, "trace_spans", []))
+                        profiler.add_worker(getattr(e, "profile", None))
+                        metrics.count("failed")
+                        result = ArchiveResult(name)
+                        result.add(ARCHIVE_ERROR, f"Verification failed: {e}")
+                    results[name] = result
+                    index.record(result, size, mtime_ns)
+            metrics.count("processed", len(pending))
+
+        index.prune(set(archives))
+        if index.changed:
+            try:
+                index.save()
+            except OSError as e:
+                logger.warning(f"[ARCHIVES] Could not save {index.path.name}: {e}")
+
+        checked = [results[name] for name in archives]
+        check_snapshots(checked)
+        for result in checked:
+            for problem in result.problems:
+                logger.warning(f"[ARCHIVES] {result.file}: {problem.message}")
+        failed_count = sum(1 for result in checked if not result.ok)
+        logger.info(f"[ARCHIVES] {len(checked) - failed_count} sound, {failed_count} with problems")
+        return checked
+
+    @_command
+    def iter_pointage(self, collaborators: Iterable[str] | None = None,
+                      weeks: Iterable[str] | None = None) -> Iterator[PointageRecord]:
+        """
+        Stream the pointage records of the interface files, without exporting them.
+
+        In-process alternative to pointage() for Python tools: records are read lazily, one
+        file at a time, and nothing is written (see roadmap.pointage).
+
+        Args:
+            collaborators (Iterable[str] | None, optional): Collaborators to keep (files of the
+                others are not opened). Defaults to all.
+            weeks (Iterable[str] | None, optional): Week codes to keep, e.g. {'S0525'}.
+                Defaults to all.
+
+        Yields:
+            PointageRecord: Records, file after file in name order.
+
+        Example:
+            >>> hours = {}
+            >>> for record in manager.iter_pointage(weeks={"S0525"}):
+            ...     hours[record.collaborator] = hours.get(record.collaborator, 0) + (record.hours or 0)
+        """
+        snapshot = self.snapshot()
+        if not snapshot.exists:
+            logger.error("RM_Collaborateurs folder not found")
+            return
+        yield from iter_pointage(snapshot.interfaces(), collaborators, weeks)
+
+    def extract_lc(self, source: str | Path | None = None, sheet_name: str = EXTRACT_MSP_SHEET) -> bool:
+        """
+        Build the LC lookup table from an MS Project extract, without Excel.
+
+        Replaces Btn_Extract_LC_MSP: the extract is streamed once, deduplicated, and the unique
+        rows are written to 'LC'!F:K of the synthesis workbook and to the 'LC.xlsx' payload
+        consumed by update_lc().
+
+        Args:
+            source (str | Path | None, optional): Workbook (.xlsx / .xlsm) or tabular export
+                (.csv / .txt). Defaults to the 'Extract_MSP' sheet of the synthesis workbook.
+            sheet_name (str, optional): Sheet of the extract in a workbook. Defaults to 'Extract_MSP'.
+
+        Returns:
+            bool: True if the lookup table was built, False otherwise.
+
+        Note:
+            When the synthesis workbook is open in Excel, only 'LC.xlsx' is written and 'LC'!F:K
+            is left unchanged.
+        """
+        if not self.all_ok:
+            logger.error("[LC_EXTRACT] Required files are missing. Cannot proceed.")
+            return False
+
+        source = Path(source) if source is not None else self.synthese_file
+        logger.info(f"[LC_EXTRACT] Reading MS Project extract from {source}")
+        try:
+            with span("parse", source) as fields:
+                extract = extract_lookup(source, sheet_name)
+                fields["rows"] = extract.source_rows
+        except Exception as e:
+            logger.error(f"[LC_EXTRACT] Error reading {source.name}: {e}")
+            return False
+
+        if not extract.rows:
+            logger.warning(f"[LC_EXTRACT] No data found in {source.name}. Nothing to do.")
+            return False
+        logger.info(f"[LC_EXTRACT] LC table generated: {len(extract.rows)} unique rows from {extract.source_rows} source rows")
+
+        try:
+            with span("save", self.lc_payload, rows=len(extract.rows)):
+                write_lc_payload(self.synthese_file, extract.rows, self.lc_payload)
+            logger.info(f"[LC_EXTRACT] LC payload written → {self.lc_payload}")
+        except Exception as e:
+            logger.error(f"[LC_EXTRACT] Error writing {self.lc_payload.name}: {e}")
             return False
 
-        write_xml(all_rows, self.xml_output)
-        logger.info(f"[POINTAGE] XML successfully created with {len(all_rows)} rows → {self.xml_output}")
+        try:
+            with span("save", self.synthese_file, rows=len(extract.rows)):
+                write_lookup_table(self.synthese_file, extract.rows)
+        except PermissionError:
+            logger.warning(f"[LC_EXTRACT] '{self.synthese_file.name}' is open in Excel - LC lookup table not updated, "
+                           "close the workbook and run lc-extract again")
+            return True
+        except Exception as e:
+            logger.error(f"[LC_EXTRACT] Could not write the LC lookup table: {e}")
+            return True
 
+        logger.info(f"[LC_EXTRACT] LC lookup table updated → {self.synthese_file}")
         return True
 
+    @_command
     def update_lc(self) -> None:
         """
         Update conditional lists (LC) in 'RM_template.xlsx' and all collaborator interface files.
@@ -491,7 +1531,7 @@ class RoadmapManager:
         logger.info("[UPDATE_LC] Starting LC update process")
 
         # Read LC data from LC.xlsx file (generated by VBA button)
-        lc_data = load_lc_excel(self.base_path)
+        lc_data = self._load_lc_data()
 
         if not lc_data:
             logger.warning("[UPDATE_LC] No LC data found in LC.xlsx. Nothing to update.")
@@ -502,25 +1542,56 @@ class RoadmapManager:
         # Update template file
         logger.info("[UPDATE_LC] Updating template file...")
         try:
-            self._update_lc_in_file(self.template_file, lc_data)
+            if self._update_lc_in_file(self.template_file, lc_data) == LC_LOCKED:
+                logger.error(f"[UPDATE_LC] '{self.template_file.name}' is opened: the template was not updated")
         except Exception as e:
             logger.error(f"[UPDATE_LC] Error updating template file: {e}")
 
         # Update all collaborator files
-        if self.rm_folder.exists():
-            rm_files = list(self.rm_folder.glob("*.xlsx"))
-            rm_files = [f for f in rm_files if not f.name.startswith("~$")]
+        snapshot = self.snapshot()
+        if snapshot.exists:
+            rm_files = snapshot.interfaces()
             logger.info(f"[UPDATE_LC] Updating {len(rm_files)} collaborator files...")
-
-            for rm_file in rm_files:
-                try:
-                    self._update_lc_in_file(rm_file, lc_data)
-                except Exception as e:
-                    logger.error(f"[UPDATE_LC] Error updating {rm_file.name}: {e}")
+            self._update_lc_in_files(rm_files, lc_data, snapshot)
 
         logger.info("[UPDATE_LC] LC update completed")
 
-    def _update_lc_in_file(self, file_path: Path, lc_data: list) -> None:
+    def _update_lc_in_files(self, rm_files: list[Path], lc_data: list, snapshot: WorkspaceSnapshot) -> None:
+        """
+        Update the 'LC' sheet of interface files in parallel threads (see _update_lc_in_file).
+
+        Args:
+            rm_files (list[Path]): Interface files to update.
+            lc_data (list): Rows to write to the 'LC' sheet.
+            snapshot (WorkspaceSnapshot): Snapshot of RM_Collaborateurs, used to detect files open in Excel.
+        """
+        def update_file(rm_file: Path) -> str:
+            outcome = self._update_lc_in_file(rm_file, lc_data)
+            if outcome == LC_LOCKED:
+                # Copy or copy back was refused: file is locked, defer it to the retry queue
+                raise PermissionError(f"{rm_file.name} is locked")
+            if outcome == LC_FAILED:
+                raise RuntimeError("LC not updated (see the error above)")
+            return outcome
+
+        # Files open in Excel are deferred and retried while the others are updated
+        results, report = run_lock_aware(
+            rm_files, profile_thread(update_file), is_locked=snapshot.lock_scan.is_locked,
+            max_workers=self.max_io_workers, delays=self.lock_retry_delays)
+        report.log(
+            "UPDATE_LC",
+            locked_message="Cannot update {name} - it may be open in Excel. Skipped.",
+            failed_message="Error updating {name}: {error}")
+
+        # Files without an LC sheet were left untouched: not counted as processed
+        skipped = [path for path, outcome in results.items() if outcome == LC_SKIPPED]
+        for path in skipped:
+            (report.processed if path in report.processed else report.recovered).remove(path)
+            report.durations.pop(path, None)
+        metrics.count("skipped", len(skipped))
+        metrics.record_report(report)
+
+    def _update_lc_in_file(self, file_path: Path, lc_data: list) -> str:
         """
         Update 'LC' sheet in a single Excel file.
 
@@ -533,7 +1604,9 @@ class RoadmapManager:
                 (columns B-I). None values represent empty cells.
 
         Returns:
-            None: Logs warning and returns early if 'LC' sheet not found.
+            str: LC_UPDATED if the file was rewritten, LC_SKIPPED if it has no 'LC' sheet,
+                LC_LOCKED if it could not be copied or copied back because it is locked (open in
+                Excel; not logged, the caller reports it), LC_FAILED on any other error (logged).
 
         Note:
             Updates cell values only, preserving all formatting (colors, borders, fonts, etc.).
@@ -554,82 +1627,90 @@ class RoadmapManager:
             # Try to copy the file using shutil (works if file is not open)
             # If file is open, this will fail - user needs to save and close it first
             try:
-                shutil.copy2(file_path, temp_path)
+                with span("copy", file_path):
+                    shutil.copy2(file_path, temp_path)
             except PermissionError:
-                logger.warning(f"[UPDATE_LC] Cannot update {file_path.name} - it may be open in Excel. Skipping this file.")
-                return
+                return LC_LOCKED
             except Exception as e:
-                logger.warning(f"[UPDATE_LC] Error copying {file_path.name}: {e}. Skipping this file.")
-                return
+                logger.error(f"[UPDATE_LC] Error copying {file_path.name}: {e}. Skipping this file.")
+                return LC_FAILED
 
             # Load workbook from temp file - use data_only=False to preserve formulas and data validation
-            wb = load_workbook(temp_path, data_only=False)
+            with span("open", file_path):
+                wb = load_workbook(temp_path, data_only=False)
 
             if "LC" not in wb.sheetnames:
                 logger.warning(f"[UPDATE_LC] LC sheet not found in {file_path.name}")
                 wb.close()
-                return
+                return LC_SKIPPED
 
-            lc_sheet = wb["LC"]
+            with span("transform", file_path, rows=len(lc_data)):
+                lc_sheet = wb["LC"]
 
-            # Find the last row with data to clear old data efficiently
-            last_data_row = len(lc_data) + 1  # +1 because we start at row 2
-            old_max_row = lc_sheet.max_row
+                # Find the last row with data to clear old data efficiently
+                last_data_row = len(lc_data) + 1  # +1 because we start at row 2
+                old_max_row = lc_sheet.max_row
             
-            # Clear old data in bulk if it exists beyond our new data
-            if old_max_row > last_data_row:
-                # Delete rows beyond our data range (much faster than clearing cell by cell)
-                lc_sheet.delete_rows(last_data_row + 1, old_max_row - last_data_row)
-
-            # Write new data starting at row 2 using bulk operations
-            # Prepare data as a list of lists for efficient writing
-            # Set all cells to text format to prevent date interpretation
-            for row_idx, row_data in enumerate(lc_data, start=2):
-                # Write all 8 columns at once (B-I = columns 2-9)
-                for col_idx in range(8):
-                    excel_col = col_idx + 2  # Excel column number (B=2, C=3, ..., I=9)
-                    cell = lc_sheet.cell(row=row_idx, column=excel_col)
-                    # Set cell format to text FIRST to prevent date interpretation
-                    cell.number_format = '@'  # '@' is Excel's text format code
-                    if col_idx < len(row_data) and row_data[col_idx] is not None:
-                        # Convert to string and ensure it's written as text
-                        # This prevents Excel from interpreting date-like strings as dates
-                        value_str = str(row_data[col_idx]).strip()
-                        # Write as string value - the '@' format ensures it stays as text
-                        # Setting number_format before value ensures Excel treats it as text
-                        cell.value = value_str
-                    else:
-                        cell.value = None
-
-            # Recreate data validation lists for collaborator files (same as create_interfaces())
-            # This ensures consistent validation regardless of file state
-            is_collab_file = file_path.name.startswith("RM_") or "RM_Collaborateurs" in str(file_path.parent)
-
-            if is_collab_file and "POINTAGE" in wb.sheetnames:
-                ws_pointage = wb["POINTAGE"]
-                try:
-                    logger.info(f"[UPDATE_LC] Recreating data validation lists for collaborator file {file_path.name}")
-                    add_data_validations_to_sheet(ws_pointage, start_row=3)
-                    logger.info(f"[UPDATE_LC] Successfully recreated data validation lists in {file_path.name}")
-                except Exception as e:
-                    logger.error(f"[UPDATE_LC] Error recreating data validation in {file_path.name}: {e}")
+                # Clear old data in bulk if it exists beyond our new data
+                if old_max_row > last_data_row:
+                    # Delete rows beyond our data range (much faster than clearing cell by cell)
+                    lc_sheet.delete_rows(last_data_row + 1, old_max_row - last_data_row)
+
+                # Write new data starting at row 2 using bulk operations
+                # Prepare data as a list of lists for efficient writing
+                # Set all cells to text format to prevent date interpretation
+                for row_idx, row_data in enumerate(lc_data, start=2):
+                    # Write all 8 columns at once (B-I = columns 2-9)
+                    for col_idx in range(8):
+                        excel_col = col_idx + 2  # Excel column number (B=2, C=3, ..., I=9)
+                        cell = lc_sheet.cell(row=row_idx, column=excel_col)
+                        # Set cell format to text FIRST to prevent date interpretation
+                        cell.number_format = '@'  # '@' is Excel's text format code
+                        if col_idx < len(row_data) and row_data[col_idx] is not None:
+                            # Convert to string and ensure it's written as text
+                            # This prevents Excel from interpreting date-like strings as dates
+                            value_str = str(row_data[col_idx]).strip()
+                            # Write as string value - the '@' format ensures it stays as text
+                            # Setting number_format before value ensures Excel treats it as text
+                            cell.value = value_str
+                        else:
+                            cell.value = None
+
+                # Recreate data validation lists for collaborator files (same as create_interfaces())
+                # This ensures consistent validation regardless of file state
+                is_collab_file = file_path.name.startswith("RM_") or "RM_Collaborateurs" in str(file_path.parent)
+
+                if is_collab_file and "POINTAGE" in wb.sheetnames:
+                    ws_pointage = wb["POINTAGE"]
+                    try:
+                        logger.info(f"[UPDATE_LC] Recreating data validation lists for collaborator file {file_path.name}")
+                        add_data_validations_to_sheet(ws_pointage, start_row=3)
+                        logger.info(f"[UPDATE_LC] Successfully recreated data validation lists in {file_path.name}")
+                    except Exception as e:
+                        logger.error(f"[UPDATE_LC] Error recreating data validation in {file_path.name}: {e}")
 
             # Save modified workbook to temp file
-            wb.save(temp_path)
-            wb.close()
-            wb = None
+            with span("save", file_path):
+                wb.save(temp_path)
+                wb.close()
+                wb = None
 
             # Small delay to ensure file handle is released
             time.sleep(0.1)
 
             # Copy modified temp file back to original location
             # This works even if the original file is open (we overwrite it)
-            shutil.copy2(temp_path, file_path)
+            with span("copy_back", file_path):
+                shutil.copy2(temp_path, file_path)
+            return LC_UPDATED
 
+        except PermissionError:
+            # Copy back refused: the file was opened meanwhile, it is left unchanged
+            return LC_LOCKED
         except Exception as e:
             logger.error(f"[UPDATE_LC] Error updating LC in {file_path.name}: {e}")
             # Don't raise - allow other files to be processed
-            return
+            return LC_FAILED
         finally:
             # Clean up temporary file
             if temp_path.exists():
@@ -0,0 +1,242 @@
+"""
+Workspace snapshot index for the collaborator interface folder.
+
+On a OneDrive or SMB folder every metadata call (glob, exists, stat) is a network round trip.
+Instead of each command re-globbing 'RM_Collaborateurs' and calling Path.exists() per
+collaborator, a snapshot lists the folder once with os.scandir and records:
+    - Interface file names (sizes and modification times are read on demand, then cached)
+    - Excel owner files ('~$...'), i.e. which workbooks are open
+
+All existence checks and listings of a command are then answered from memory. Operations that
+create or delete files record the change in the snapshot so it stays valid for the rest of
+the command.
+
+With a sharded layout (see roadmap.layout) the subfolders are listed too, concurrently, and
+files are indexed by name whatever their subfolder: interface names are unique in the folder.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from roadmap.locks import OWNER_FILE_PREFIX, LockScan
+from roadmap.registry import interface_key
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """
+    Metadata of one file captured by a snapshot.
+
+    Attributes:
+        name (str): File name.
+        size (int): Size in bytes.
+        mtime_ns (int): Last modification time in nanoseconds.
+    """
+    name: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class WorkspaceSnapshot:
+    """
+    In-memory index of a folder taken with a single directory listing.
+
+    Attributes:
+        folder (Path): Indexed folder.
+        entries (dict[str, FileEntry | None]): Regular files by name (owner files included),
+            None until the metadata of the file is requested with entry().
+        taken_at (float): time.monotonic() value when the snapshot was taken.
+        exists (bool): False if the folder did not exist when the snapshot was taken.
+        locations (dict[str, Path]): Subfolder of the files that are not directly in `folder`
+            (sharded layout).
+
+    Example:
+        >>> snapshot = WorkspaceSnapshot.take(rm_folder)
+        >>> snapshot.has_file("RM_GANI Karim.xlsx")
+        True
+    """
+    folder: Path
+    entries: dict[str, FileEntry | None] = field(default_factory=dict)
+    taken_at: float = 0.0
+    exists: bool = True
+    locations: dict[str, Path] = field(default_factory=dict)
+    _lock_scan: LockScan | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def take(cls, folder: Path | str, shards: bool = False, max_workers: int = 8) -> "WorkspaceSnapshot":
+        """
+        List a folder once and index every regular file it contains.
+
+        Args:
+            folder (Path | str): Folder to index. A missing folder yields an empty snapshot.
+            shards (bool, optional): Also index the files of its subfolders (sharded layout).
+                Defaults to False.
+            max_workers (int, optional): Threads listing the subfolders. Defaults to 8.
+
+        Returns:
+            WorkspaceSnapshot: The snapshot. A name found in several places is indexed once:
+            the folder first, then the subfolders in name order.
+        """
+        folder = Path(folder)
+        try:
+            files, subfolders = _list_folder(folder)
+        except FileNotFoundError:
+            return cls(folder=folder, taken_at=time.monotonic(), exists=False)
+
+        entries: dict[str, FileEntry | None] = dict.fromkeys(files)
+        locations = {}
+        if shards and subfolders:
+            # Each listing is a round trip on a synced folder: shards are listed concurrently
+            shard_folders = [folder / name for name in sorted(subfolders)]
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(shard_folders))) as pool:
+                listings = list(pool.map(_list_shard, shard_folders))
+            for shard_folder, names in zip(shard_folders, listings):
+                for name in names:
+                    if name not in entries:
+                        entries[name] = None
+                        locations[name] = shard_folder
+
+        return cls(folder=folder, entries=entries, taken_at=time.monotonic(), locations=locations)
+
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the snapshot was taken."""
+        return time.monotonic() - self.taken_at
+
+    @property
+    def owner_files(self) -> frozenset[str]:
+        """Names of the Excel owner files ('~$...') in the folder."""
+        return frozenset(name for name in self.entries if name.startswith(OWNER_FILE_PREFIX))
+
+    @property
+    def lock_scan(self) -> LockScan:
+        """Lock scan derived from the snapshot (no additional directory listing)."""
+        if self._lock_scan is None:
+            self._lock_scan = LockScan(folder=self.folder, owner_files=self.owner_files)
+        return self._lock_scan
+
+    def path(self, name: str) -> Path:
+        """Return the path of a file of the snapshot (in `folder` or in its subfolder)."""
+        return self.locations.get(name, self.folder) / name
+
+    def has_file(self, name: str) -> bool:
+        """Return True if a file with this name was present."""
+        return name in self.entries
+
+    def entry(self, name: str) -> FileEntry | None:
+        """
+        Return the metadata of a file, reading it on first access.
+
+        Args:
+            name (str): File name.
+
+        Returns:
+            FileEntry | None: The metadata, or None if the file is absent (or vanished).
+        """
+        if name not in self.entries:
+            return None
+        if self.entries[name] is None:
+            try:
+                st = self.path(name).stat()
+            except OSError:
+                return None
+            self.entries[name] = FileEntry(name, st.st_size, st.st_mtime_ns)
+        return self.entries[name]
+
+    def interfaces(self, suffix: str = ".xlsx") -> list[Path]:
+        """
+        Return the workbook paths of the folder, sorted by name.
+
+        Args:
+            suffix (str, optional): File extension to keep. Defaults to '.xlsx'.
+
+        Returns:
+            list[Path]: Paths of matching files, excluding Excel owner files ('~$...'), subfolder
+            files included.
+        """
+        return [
+            self.path(name) for name in sorted(self.entries)
+            if name.endswith(suffix) and not name.startswith(OWNER_FILE_PREFIX)
+        ]
+
+    def interface_keys(self) -> dict[str, Path]:
+        """
+        Return the interface paths by file name key.
+
+        Names are compared without case, like Windows and OneDrive do: 'RM_gani karim.xlsx' is the
+        interface of 'GANI Karim', and writing 'RM_GANI Karim.xlsx' would overwrite it. Accents
+        are kept: 'RM_Helene DUPONT.xlsx' is not the interface of 'Hélène DUPONT'.
+
+        Returns:
+            dict[str, Path]: First interface in name order for each key (see
+            roadmap.registry.interface_key); files without the 'RM_' prefix are left out.
+        """
+        keys: dict[str, Path] = {}
+        for path in self.interfaces():
+            key = interface_key(path)
+            if key is not None:
+                keys.setdefault(key, path)
+        return keys
+
+    def has_owner_file(self, path: Path | str) -> bool:
+        """Return True if the workbook is open in Excel (see LockScan.has_owner_file)."""
+        return self.lock_scan.has_owner_file(path)
+
+    def record_created(self, path: Path | str) -> None:
+        """
+        Record a file written by the current command.
+
+        Args:
+            path (Path | str): Created file. Its metadata is read on demand, like listed files.
+        """
+        path = Path(path)
+        self.entries[path.name] = None
+        if path.parent != self.folder:
+            self.locations[path.name] = path.parent
+        else:
+            self.locations.pop(path.name, None)
+        self.exists = True
+        self._lock_scan = None
+
+    def record_removed(self, path: Path | str) -> None:
+        """
+        Record a file deleted by the current command.
+
+        Args:
+            path (Path | str): Deleted file.
+        """
+        self.entries.pop(Path(path).name, None)
+        self.locations.pop(Path(path).name, None)
+        self._lock_scan = None
+
+
+def _list_folder(folder: Path) -> tuple[list[str], list[str]]:
+    """
+    Names of the regular files and of the subfolders of a folder, from one listing.
+
+    Raises:
+        FileNotFoundError: If the folder does not exist.
+    """
+    files, subfolders = [], []
+    with os.scandir(folder) as it:
+        for entry in it:
+            try:
+                # File type comes with the listing: no extra call per file
+                if entry.is_file():
+                    files.append(entry.name)
+                elif entry.is_dir():
+                    subfolders.append(entry.name)
+            except OSError:
+                continue
+    return files, subfolders
+
+
+def _list_shard(folder: Path) -> list[str]:
+    """Names of the regular files of a subfolder, empty if it vanished."""
+    try:
+        return _list_folder(folder)[0]
+    except OSError:
+        return []
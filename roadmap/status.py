@@ -0,0 +1,88 @@
+"""
+Row status classes for SYNTHESE coloring.
+
+A SYNTHESE row is colored from the weekly total of its collaborator (K1 of the interface file):
+red under the hours threshold, green otherwise. ApplySyntheseRowColoring used to read the total
+back from a helper column and color each row through COM. The pointage engine now computes the
+status of every exported row and merges consecutive rows with the same status into ranges, so
+VBA colors each range with a single call (see 'pointage_status.xml' and ApplySyntheseStatusRanges).
+"""
+from dataclasses import dataclass
+from typing import Iterable
+
+DEFAULT_THRESHOLD = 35.0
+STATUS_UNDER = "under"
+STATUS_OVER = "over"
+
+
+def row_status(total, threshold: float = DEFAULT_THRESHOLD) -> str | None:
+    """
+    Classify a weekly total against the hours threshold.
+
+    Args:
+        total: Weekly total of the collaborator (K1 of the interface file).
+        threshold (float, optional): Hours below which the row is 'under'. Defaults to 35.
+
+    Returns:
+        str | None: STATUS_UNDER, STATUS_OVER, or None for a non-numeric total. An empty total
+        counts as 0, as IsNumeric(Empty) is True in VBA.
+    """
+    if total is None or total == "":
+        total = 0
+    if isinstance(total, str):
+        total = total.strip().replace(",", ".")
+    try:
+        total = float(total)
+    except (TypeError, ValueError):
+        return None
+    return STATUS_UNDER if total < threshold else STATUS_OVER
+
+
+@dataclass(frozen=True)
+class StatusRange:
+    """
+    Consecutive exported rows sharing a status.
+
+    Attributes:
+        status (str): STATUS_UNDER or STATUS_OVER.
+        first (int): 1-based position of the first row in the export.
+        last (int): 1-based position of the last row in the export.
+    """
+    status: str
+    first: int
+    last: int
+
+    @property
+    def count(self) -> int:
+        """Number of rows in the range."""
+        return self.last - self.first + 1
+
+
+def status_ranges(totals: Iterable, threshold: float = DEFAULT_THRESHOLD) -> list[StatusRange]:
+    """
+    Merge the statuses of consecutive rows into ranges.
+
+    Args:
+        totals (Iterable): Weekly total of each exported row, in export order.
+        threshold (float, optional): Hours threshold. Defaults to 35.
+
+    Returns:
+        list[StatusRange]: Ranges in export order. Rows without status (non-numeric total)
+        are not covered, as ApplySyntheseRowColoring leaves them uncolored.
+
+    Example:
+        >>> [(r.status, r.first, r.last) for r in status_ranges([20, 20, 40, None, "x", 40])]
+        [('under', 1, 2), ('over', 3, 3), ('under', 4, 4), ('over', 6, 6)]
+    """
+    ranges = []
+    current, first = None, 0
+    position = 0
+    for position, total in enumerate(totals, start=1):
+        status = row_status(total, threshold)
+        if status != current:
+            if current is not None:
+                ranges.append(StatusRange(current, first, position - 1))
+            current, first = status, position
+    if current is not None:
+        ranges.append(StatusRange(current, first, position))
+    return ranges
@@ -0,0 +1,311 @@
+"""
+Planning of 'roadmap sync': cleanup, create and LC update of RM_Collaborateurs in one pass.
+
+Keeping the folder current used to take three commands (cleanup, create, update), each reading
+the collaborator list and listing the folder again; new interfaces got the template's LC from
+'create', then were rewritten by 'update'. 'sync' reads the list, LC.xlsx and the folder once
+and plans every file operation before running any:
+    - archive: interfaces of collaborators no longer in the list (zipped to 'Deleted', then removed)
+    - template: the template, when its LC sheet or POINTAGE validations differ from LC.xlsx
+    - create: collaborators without an interface, built from the updated template, so new
+      interfaces get the latest LC and validations when they are written
+    - update: interfaces whose LC sheet or POINTAGE validations differ from LC.xlsx
+
+Whether a workbook is current is decided from its LC sheet and validations, read without
+openpyxl (see roadmap.xlsx): up-to-date interfaces are not rewritten, and each file is written
+at most once.
+"""
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from roadmap.batch import ContentCache
+from roadmap.check import CheckResult, check_validations
+from roadmap.layout import InterfaceLayout
+from roadmap.locks import LockScan, run_lock_aware
+from roadmap.profiling import profile_thread
+from roadmap.registry import file_name_key, interface_file_name, interface_key
+from roadmap.snapshot import WorkspaceSnapshot
+from roadmap.xlsx import open_package, read_data_validations, read_rows, sheet_names
+
+logger = logging.getLogger(__name__)
+
+# Operations, in execution order
+SYNC_ARCHIVE = "archive"
+SYNC_TEMPLATE = "template"
+SYNC_CREATE = "create"
+SYNC_UPDATE = "update"
+SYNC_OPERATIONS = (SYNC_ARCHIVE, SYNC_TEMPLATE, SYNC_CREATE, SYNC_UPDATE)
+
+# LC block written by update (see RoadmapManager._update_lc_in_file): B:I from row 2
+LC_FIRST_ROW = 2
+LC_FIRST_COL = 2
+LC_LAST_COL = 9
+
+# Seconds per file when the run metrics have no history (see estimate_rates)
+DEFAULT_FILE_SECONDS = {SYNC_ARCHIVE: 0.05, SYNC_TEMPLATE: 1.5, SYNC_CREATE: 1.0, SYNC_UPDATE: 1.5}
+# Command whose file durations ('roadmap_metrics.json') measure each operation
+RATE_COMMANDS = {SYNC_ARCHIVE: "cleanup", SYNC_TEMPLATE: "update", SYNC_CREATE: "create", SYNC_UPDATE: "update"}
+
+
+@dataclass
+class SyncAction:
+    """
+    One planned file operation.
+
+    Attributes:
+        operation (str): 'archive', 'template', 'create' or 'update'.
+        path (Path): File archived, created or rewritten.
+        collaborator (str | None): Collaborator of the file (None for the template).
+        reason (str): Why the operation is needed.
+        size (int): Bytes of the file read or written (the template size for a creation).
+    """
+    operation: str
+    path: Path
+    collaborator: str | None
+    reason: str
+    size: int = 0
+
+
+@dataclass
+class SyncPlan:
+    """
+    File operations of a sync, computed before any file is written.
+
+    Attributes:
+        actions (list[SyncAction]): Operations, in execution order.
+        collaborators (int): Collaborators of the list.
+        lc_rows (int): Rows of LC.xlsx (0 when there is no LC.xlsx: nothing is updated).
+        current (int): Interfaces kept untouched (already up to date).
+        lc_data (list[list]): Rows of LC.xlsx, written by the template and update operations.
+    """
+    actions: list[SyncAction] = field(default_factory=list)
+    collaborators: int = 0
+    lc_rows: int = 0
+    current: int = 0
+    lc_data: list[list] = field(default_factory=list, repr=False)
+
+    def of(self, operation: str) -> list[SyncAction]:
+        """Actions of one operation."""
+        return [action for action in self.actions if action.operation == operation]
+
+    @property
+    def empty(self) -> bool:
+        """True if the folder is already in sync."""
+        return not self.actions
+
+    def estimate(self, rates: dict[str, float], max_workers: int = 1) -> dict[str, float]:
+        """
+        Estimated seconds of each operation.
+
+        Args:
+            rates (dict[str, float]): Seconds per file of each operation (see estimate_rates).
+            max_workers (int, optional): Worker processes of the creations. Defaults to 1.
+
+        Returns:
+            dict[str, float]: Seconds per operation (SYNC_OPERATIONS order). Creations run in
+            worker processes, the other operations are counted sequentially.
+        """
+        estimates = {}
+        for operation in SYNC_OPERATIONS:
+            count = len(self.of(operation))
+            seconds = count * rates.get(operation, DEFAULT_FILE_SECONDS[operation])
+            if operation == SYNC_CREATE and count:
+                seconds /= min(max_workers, count)
+            estimates[operation] = seconds
+        return estimates
+
+
+def estimate_rates(state: dict | None = None) -> dict[str, float]:
+    """
+    Seconds per file of each operation, from the run metrics of earlier commands.
+
+    Args:
+        state (dict | None, optional): Accumulated metrics (see roadmap.metrics.load_state).
+            Defaults to None (default rates).
+
+    Returns:
+        dict[str, float]: Mean file duration of 'cleanup', 'create' and 'update' runs, or
+        DEFAULT_FILE_SECONDS for commands without history.
+    """
+    durations = (state or {}).get("file_duration", {})
+    rates = {}
+    for operation, command in RATE_COMMANDS.items():
+        histogram = durations.get(command) or {}
+        count = histogram.get("count", 0)
+        rates[operation] = histogram.get("sum", 0.0) / count if count else DEFAULT_FILE_SECONDS[operation]
+    return rates
+
+
+def _text(value) -> str | None:
+    """Cell value as update writes it: stripped text, None when empty."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def lc_rows_of(lc_data: list[list]) -> list[tuple]:
+    """
+    LC.xlsx rows as they read back from a workbook once written by update.
+
+    Args:
+        lc_data (list[list]): Rows of LC.xlsx (see roadmap.helpers.load_lc_excel).
+
+    Returns:
+        list[tuple]: One tuple of LC_LAST_COL - LC_FIRST_COL + 1 values per row.
+    """
+    width = LC_LAST_COL - LC_FIRST_COL + 1
+    return [tuple(_text(row[i]) if i < len(row) else None for i in range(width)) for row in lc_data]
+
+
+def stale_reason(path: Path | str, lc_rows: list[tuple], lock_scan: LockScan | None = None) -> str | None:
+    """
+    Tell why a workbook needs an LC update.
+
+    Args:
+        path (Path | str): Interface or template.
+        lc_rows (list[tuple]): Expected LC rows (see lc_rows_of).
+        lock_scan (LockScan | None, optional): Owner files of the folder (see
+            roadmap.xlsx.open_package). Defaults to None (the folder is scanned).
+
+    Returns:
+        str | None: The first difference found (LC sheet, then POINTAGE validations), or None
+        if the workbook is current or has no LC sheet (update leaves it untouched).
+
+    Raises:
+        zipfile.BadZipFile: If the workbook is not a valid package (and the other package
+            reading errors, see roadmap.check.check_interface).
+    """
+    with open_package(path, lock_scan) as zf:
+        sheets = sheet_names(zf)
+        if "LC" not in sheets:
+            return None
+        width = LC_LAST_COL - LC_FIRST_COL + 1
+        rows = read_rows(zf, "LC", min_row=LC_FIRST_ROW, min_col=LC_FIRST_COL, max_col=LC_LAST_COL)
+        for offset, expected in enumerate(lc_rows):
+            cells = rows.get(LC_FIRST_ROW + offset, {})
+            if tuple(_text(cells.get(LC_FIRST_COL + i)) for i in range(width)) != expected:
+                return f"LC row {LC_FIRST_ROW + offset} differs from LC.xlsx"
+        extra = [row for row in rows if row >= LC_FIRST_ROW + len(lc_rows)
+                 and any(_text(value) for value in rows[row].values())]
+        if extra:
+            return f"LC has {len(extra)} row(s) beyond LC.xlsx"
+        if "POINTAGE" in sheets:
+            result = CheckResult(Path(path).name, "")
+            check_validations(result, read_data_validations(zf, "POINTAGE"))
+            if result.problems:
+                return f"{len(result.problems)} POINTAGE validation(s) outdated"
+    return None
+
+
+def plan_sync(collaborators: Iterable[str], snapshot: WorkspaceSnapshot, template: Path,
+              lc_data: list[list], max_workers: int = 4, cache: ContentCache | None = None,
+              layout: InterfaceLayout | None = None, archive: bool = True) -> SyncPlan:
+    """
+    Compute the file operations that bring RM_Collaborateurs in line with the list and LC.xlsx.
+
+    Args:
+        collaborators (Iterable[str]): Collaborator list (see RoadmapManager._load_collaborators).
+        snapshot (WorkspaceSnapshot): Listing of RM_Collaborateurs.
+        template (Path): 'RM_template.xlsx'.
+        lc_data (list[list]): Rows of LC.xlsx, empty when there is none (no template or
+            update operation is planned then).
+        max_workers (int, optional): Threads reading the LC sheets. Defaults to 4.
+        cache (ContentCache | None, optional): Parse cache of a batch: the template is checked
+            once per distinct template and LC content. Defaults to None.
+        layout (InterfaceLayout | None, optional): Layout of the folder, giving where new
+            interfaces are created. Defaults to None (flat folder).
+        archive (bool, optional): Plan the archive of the interfaces not in the list. Defaults to
+            True; False keeps them (list from the collaborator registry alone).
+
+    Returns:
+        SyncPlan: The plan. Nothing is written.
+
+    Note:
+        Names are compared by file name key (see roadmap.registry.file_name_key), like cleanup: a
+        file differing from its collaborator by case or spacing is kept, not recreated. Names
+        differing by accents are different files.
+        Interfaces that cannot be read are left out of the plan with a warning ('roadmap check'
+        reports them).
+    """
+    collaborators = list(collaborators)
+    plan = SyncPlan(collaborators=len(collaborators), lc_rows=len(lc_data), lc_data=lc_data)
+
+    expected = {}
+    for collab in collaborators:
+        expected.setdefault(file_name_key(collab), collab)
+    kept: dict[str, Path] = {}
+    for path in snapshot.interfaces():
+        key = interface_key(path)
+        if key in expected and key not in kept:
+            kept[key] = path
+        elif archive:
+            entry = snapshot.entry(path.name)
+            plan.actions.append(SyncAction(SYNC_ARCHIVE, path, path.stem[3:] or None,
+                                           "Not in the collaborator list", entry.size if entry else 0))
+
+    stale: dict[Path, str | None] = {}
+    if lc_data:
+        lc_rows = lc_rows_of(lc_data)
+        template_kind = f"template_lc:{hash(tuple(lc_rows))}"
+        lock_scan = snapshot.lock_scan
+
+        def reason(path: Path) -> str | None:
+            if path == template:
+                if cache is not None:
+                    return cache.get(template_kind, path, lambda p: stale_reason(p, lc_rows))
+                return stale_reason(path, lc_rows)
+            return stale_reason(path, lc_rows, lock_scan)
+
+        results, report = run_lock_aware([template, *kept.values()], profile_thread(reason),
+                                         max_workers=max_workers, delays=())
+        stale = dict(results)
+        for path in report.locked:
+            stale[path] = "Could not be read (locked): updated if it is released"
+        for path, error in report.failed:
+            logger.warning(f"[SYNC] Cannot read {path.name}: {error}. Not updated (see 'roadmap check').")
+
+    template_size = template.stat().st_size if template.exists() else 0
+    if stale.get(template):
+        plan.actions.append(SyncAction(SYNC_TEMPLATE, template, None, stale[template], template_size))
+
+    for key, collab in expected.items():
+        if key not in kept:
+            path = layout.path_for(collab) if layout else snapshot.folder / interface_file_name(collab)
+            plan.actions.append(SyncAction(SYNC_CREATE, path, collab, "No interface file", template_size))
+
+    for key, path in kept.items():
+        if stale.get(path):
+            entry = snapshot.entry(path.name)
+            plan.actions.append(SyncAction(SYNC_UPDATE, path, expected[key], stale[path], entry.size if entry else 0))
+        else:
+            plan.current += 1
+    return plan
+
+
+def action_rows(plan: SyncPlan) -> list[tuple[str, str, str]]:
+    """(operation, file, reason) of every action, for 'roadmap sync --dry-run'."""
+    return [(action.operation, action.path.name, action.reason) for action in plan.actions]
+
+
+def estimate_rows(plan: SyncPlan, rates: dict[str, float], max_workers: int = 1) -> list[tuple]:
+    """
+    (operation, files, MB, estimated seconds) per operation, then the total.
+
+    Args:
+        plan (SyncPlan): The plan.
+        rates (dict[str, float]): Seconds per file of each operation (see estimate_rates).
+        max_workers (int, optional): Worker processes of the creations. Defaults to 1.
+
+    Returns:
+        list[tuple]: Rows of the cost table printed by 'roadmap sync --dry-run'.
+    """
+    estimates = plan.estimate(rates, max_workers)
+    rows = []
+    for operation in SYNC_OPERATIONS:
+        actions = plan.of(operation)
+        rows.append((operation, len(actions), sum(a.size for a in actions) / 1e6, estimates[operation]))
+    rows.append(("total", len(plan.actions), sum(row[2] for row in rows), sum(estimates.values())))
+    return rows
@@ -0,0 +1,190 @@
+"""
+Direct writer for the SYNTHESE sheet of the synthesis workbook.
+
+The VBA import (Btn_Collect_RM_Data) parses 'pointage_output.xml' with MSXML, writes each cell
+(ImportPointageRows), fills columns H/I from the LC lookup table (UpdateSyntheseFromLC) and colors
+each row through COM (ApplySyntheseRowColoring). This module produces the same end result straight
+in the '.xlsm' package, without Excel:
+    - Rows are appended below the last non-empty cell of column A (from row 3)
+    - H/I are looked up in 'LC'!F:K with the same composite key as UpdateSyntheseFromLC
+    - Columns A-K are filled red (total < threshold) or green, like ApplySyntheseRowColoring.
+      The helper column (BA) that carries the total for VBA is not written, since VBA
+      clears it after coloring.
+
+Only the SYNTHESE sheet part and 'xl/styles.xml' are rewritten, as text, so namespace prefixes,
+other sheets and the VBA project are preserved byte for byte (see roadmap.xlsx.replace_parts).
+The workbook must be closed.
+"""
+from pathlib import Path
+
+from roadmap.locks import LockScan
+from roadmap.status import DEFAULT_THRESHOLD, STATUS_UNDER, row_status
+from roadmap.xlsx import (CellStyles, last_value_row, open_package, patch_rows,
+                          read_rows, replace_parts, sheet_part_name)
+
+# SYNTHESE layout (see VBA modGlobals)
+SYNTHESE_SHEET = "SYNTHESE"
+LC_SHEET = "LC"
+SYN_FIRST_DATA_ROW = 3
+SYN_DATA_LAST_COL = 11
+SYN_COL_E = 5
+SYN_COL_F = 6
+SYN_COL_G = 7
+SYN_COL_H = 8
+SYN_COL_I = 9
+
+# LC lookup table F:K, built by Btn_Extract_LC_MSP
+LC_LOOKUP_FIRST_ROW = 2
+LC_LOOKUP_COL_F = 6
+LC_LOOKUP_COL_K = 11
+LC_LOOKUP_KEY_DELIM = "|"
+
+# ApplySyntheseRowColoring colors
+RED_FILL = "FFFF0000"     # RGB(255, 0, 0)
+GREEN_FILL = "FF00B050"   # RGB(0, 176, 80)
+
+
+def vba_text(value) -> str:
+    """
+    Convert a cell value to text like VBA Trim(CStr(value)).
+
+    Args:
+        value: Cell value.
+
+    Returns:
+        str: Trimmed text ('' for None, integral floats without decimals).
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def split_sprint(value) -> tuple[str, str] | None:
+    """
+    Split a SYNTHESE column E value around 'Sprint' (case-insensitive).
+
+    Args:
+        value: Cell value, e.g. 'KEY001 Sprint 3'.
+
+    Returns:
+        tuple[str, str] | None: ('KEY001', '3'), or None if 'Sprint' is absent.
+    """
+    text = vba_text(value)
+    pos = text.casefold().find("sprint")
+    if pos < 0:
+        return None
+    return text[:pos].strip(), text[pos + 6:].strip()
+
+
+def build_lc_lookup(lc_rows: dict[int, dict[int, object]]) -> dict[str, tuple | None]:
+    """
+    Build the LC lookup used to fill SYNTHESE columns H/I.
+
+    Mirrors UpdateSyntheseFromLC: the key is J|G|F|K (function, label, key, sprint) compared
+    case-insensitively, and a key found on several rows maps to nothing.
+
+    Args:
+        lc_rows (dict[int, dict[int, object]]): 'LC' cells by row, then column (see read_rows).
+
+    Returns:
+        dict[str, tuple | None]: (H, I) values by key, None for duplicated keys.
+    """
+    lookup = {}
+    last_row = max((r for r, cells in lc_rows.items() if vba_text(cells.get(LC_LOOKUP_COL_F)) and r >= LC_LOOKUP_FIRST_ROW),
+                   default=LC_LOOKUP_FIRST_ROW - 1)
+    for r in range(LC_LOOKUP_FIRST_ROW, last_row + 1):
+        cells = lc_rows.get(r, {})
+        key = LC_LOOKUP_KEY_DELIM.join(
+            vba_text(cells.get(col)) for col in (10, 7, 6, 11)).casefold()
+        lookup[key] = None if key in lookup else (cells.get(8), cells.get(9))
+    return lookup
+
+
+def apply_lc_lookup(row: list, lookup: dict[str, tuple | None]) -> list:
+    """
+    Return a copy of a SYNTHESE row with columns H/I taken from the LC lookup.
+
+    Args:
+        row (list): Row values, column A first.
+        lookup (dict[str, tuple | None]): Lookup from build_lc_lookup().
+
+    Returns:
+        list: The row with H/I replaced, or cleared when there is no unique match.
+    """
+    row = list(row) + [None] * max(0, SYN_COL_I - len(row))
+    match = None
+    parts = split_sprint(row[SYN_COL_E - 1])
+    if parts is not None:
+        key = LC_LOOKUP_KEY_DELIM.join([
+            vba_text(row[SYN_COL_G - 1]), vba_text(row[SYN_COL_F - 1]), parts[0], parts[1]]).casefold()
+        match = lookup.get(key)
+    row[SYN_COL_H - 1], row[SYN_COL_I - 1] = match if match else (None, None)
+    return row
+
+
+def row_fill(total, threshold: float = DEFAULT_THRESHOLD) -> str | None:
+    """
+    Return the fill color of a SYNTHESE row, like ApplySyntheseRowColoring.
+
+    Args:
+        total: Weekly total of the collaborator (K1 of the interface file).
+        threshold (float, optional): Hours below which the row is red. Defaults to 35.
+
+    Returns:
+        str | None: RED_FILL, GREEN_FILL, or None for a non-numeric total (see row_status).
+    """
+    status = row_status(total, threshold)
+    if status is None:
+        return None
+    return RED_FILL if status == STATUS_UNDER else GREEN_FILL
+
+
+def write_synthese_rows(synthese_file: Path | str, rows: list[list],
+                        threshold: float = DEFAULT_THRESHOLD) -> tuple[int, int]:
+    """
+    Append pointage rows to the SYNTHESE sheet of a closed synthesis workbook.
+
+    Args:
+        synthese_file (Path | str): Path to 'Synthèse_RM_CE.xlsm'.
+        rows (list[list]): Pointage rows as exported for VBA: 11 values (A-K) followed by
+            the weekly total used for coloring.
+        threshold (float, optional): Hours below which a row is red. Defaults to 35.
+
+    Returns:
+        tuple[int, int]: First row written and number of rows written.
+
+    Raises:
+        PermissionError: If the workbook is open in Excel.
+        ValueError: If a target cell holds a formula.
+        KeyError: If the SYNTHESE or LC sheet does not exist.
+    """
+    synthese_file = Path(synthese_file)
+    if LockScan.scan(synthese_file.parent).is_locked(synthese_file):
+        raise PermissionError(f"'{synthese_file.name}' is open in Excel")
+
+    with open_package(synthese_file) as zf:
+        part = sheet_part_name(zf, SYNTHESE_SHEET)
+        sheet_xml = zf.read(part).decode("utf-8")
+        styles = CellStyles(zf.read("xl/styles.xml").decode("utf-8"))
+        lookup = build_lc_lookup(read_rows(zf, LC_SHEET, min_row=LC_LOOKUP_FIRST_ROW,
+                                           min_col=LC_LOOKUP_COL_F, max_col=LC_LOOKUP_COL_K))
+
+    if not rows:
+        return SYN_FIRST_DATA_ROW, 0
+
+    # Same start row as Btn_Collect_RM_Data: below the last non-empty cell of column A
+    start_row = max(last_value_row(sheet_xml, 1) + 1, SYN_FIRST_DATA_ROW)
+
+    values, fills = {}, {}
+    for offset, row in enumerate(rows):
+        row_number = start_row + offset
+        values[row_number] = apply_lc_lookup(row[:SYN_DATA_LAST_COL], lookup)
+        fills[row_number] = row_fill(row[SYN_DATA_LAST_COL] if len(row) > SYN_DATA_LAST_COL else None, threshold)
+    sheet_xml = patch_rows(sheet_xml, values, 1, SYN_DATA_LAST_COL, styles, fills, SYNTHESE_SHEET)
+
+    replace_parts(synthese_file, {part: sheet_xml.encode("utf-8"), "xl/styles.xml": styles.render()})
+    return start_row, len(rows)
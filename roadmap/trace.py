@@ -0,0 +1,179 @@
+"""
+Structured timing traces for roadmap commands.
+
+With 'roadmap --trace <command>', every command records spans: one per phase of the work
+done on each file (open, parse, transform, save, copy, copy_back, archive, delete ...), plus
+one for the whole command. They are written as JSON lines to 'roadmap_trace.jsonl' next to
+'roadmap.log', one object per span:
+
+    {"run": "20250106T091500-4242", "command": "update", "phase": "save",
+     "file": "RM_GANI Karim.xlsx", "start": 1736151300.123, "duration_ms": 812.4,
+     "status": "ok", "pid": 4242, "process": "main", "thread": "ThreadPoolExecutor-0_1"}
+
+Spans of pool workers (create --way para) are buffered in the worker and returned with its
+result (see run_traced), then written by the main process, so a single process appends to
+the file. When tracing is disabled, span() costs one attribute check.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+TRACE_FILE_NAME = "roadmap_trace.jsonl"
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+class Tracer:
+    """
+    Records spans of the current process.
+
+    Attributes:
+        path (Path | None): JSON lines file the spans are appended to.
+        command (str | None): Command being traced (e.g. 'pointage').
+        run_id (str | None): Identifier shared by all spans of one invocation.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.command = None
+        self.run_id = None
+        self.process = "main"
+        self._buffer = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.run_id is not None
+
+    def enable(self, path: Path | str, command: str, run_id: str | None = None) -> None:
+        """
+        Start tracing to a JSON lines file.
+
+        Args:
+            path (Path | str): File the spans are appended to (created if needed).
+            command (str): Command being traced.
+            run_id (str | None, optional): Run identifier. Defaults to start time and PID.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.command = command
+        self.run_id = run_id or f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}"
+
+    def disable(self) -> None:
+        self.path = self.command = self.run_id = None
+        self._buffer = None
+
+    @contextlib.contextmanager
+    def span(self, phase: str, file: Path | str | None = None, **attrs) -> Iterator[dict]:
+        """
+        Time a block as one span.
+
+        Args:
+            phase (str): Phase name, e.g. 'open', 'parse', 'transform', 'save', 'copy_back'.
+            file (Path | str | None, optional): File the phase works on (its name is recorded).
+            **attrs: Extra JSON-serializable fields, e.g. rows=120.
+
+        Yields:
+            dict: Extra fields, which the block may complete (e.g. with a row count).
+
+        Note:
+            A block raising an exception is recorded with status 'error' and the exception
+            is re-raised.
+        """
+        if not self.enabled:
+            yield attrs
+            return
+        start_wall, start = time.time(), time.perf_counter()
+        status, error = STATUS_OK, None
+        try:
+            yield attrs
+        except BaseException as e:
+            status, error = STATUS_ERROR, f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record = {
+                "run": self.run_id,
+                "command": self.command,
+                "phase": phase,
+                "file": Path(file).name if file is not None else None,
+                "start": round(start_wall, 3),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "status": status,
+                "pid": os.getpid(),
+                "process": self.process,
+                "thread": threading.current_thread().name,
+            }
+            if error is not None:
+                record["error"] = error
+            record.update(attrs)
+            self.record(record)
+
+    def record(self, record: dict) -> None:
+        """Write one span (or buffer it, in a worker)."""
+        if self._buffer is not None:
+            self._buffer.append(record)
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def extend(self, records: list[dict]) -> None:
+        """Write spans returned by a worker process."""
+        for record in records:
+            self.record(record)
+
+
+# Tracer of the current process
+tracer = Tracer()
+
+
+def span(phase: str, file: Path | str | None = None, **attrs):
+    """Time a block as one span of the current process (see Tracer.span)."""
+    return tracer.span(phase, file, **attrs)
+
+
+def worker_context() -> tuple[str, str] | None:
+    """Tracing context to pass to pool workers: (command, run id), or None when disabled."""
+    return (tracer.command, tracer.run_id) if tracer.enabled else None
+
+
+def run_traced(context: tuple[str, str] | None, func: Callable, *args) -> tuple[object, list[dict]]:
+    """
+    Call a function in a pool worker, collecting its spans.
+
+    Must be submitted instead of `func` itself (it is picklable for ProcessPoolExecutor):
+    executor.submit(run_traced, worker_context(), func, *args).
+
+    Args:
+        context (tuple[str, str] | None): Value of worker_context() in the main process.
+        func (Callable): Function to run, instrumented with span().
+        *args: Arguments of the function.
+
+    Returns:
+        tuple[object, list[dict]]: Result of the function and the spans it recorded, to pass
+        to tracer.extend() in the main process. No spans when tracing is disabled.
+
+    Note:
+        If the function raises, its spans are attached to the exception as `trace_spans`.
+    """
+    if context is None:
+        return func(*args), []
+    worker = Tracer()
+    worker.command, worker.run_id = context
+    worker.process = "worker"
+    worker._buffer = []
+    global tracer
+    previous, tracer = tracer, worker
+    try:
+        return func(*args), worker._buffer
+    except Exception as e:
+        e.trace_spans = worker._buffer
+        raise
+    finally:
+        tracer = previous
@@ -0,0 +1,218 @@
+"""
+Data quality validation of the pointage rows against the LC sheet (pointage --validate).
+
+The dropdowns of the interfaces (see roadmap.engine.add_data_validations_to_sheet) do not stop
+pasted values, and finding the bad rows by hand in SYNTHESE takes hours. Each exported row is
+checked against the 'LC' sheet of the synthesis workbook:
+    - the key (E), label (F) and function (G) must be in the lists of LC columns B, C and D
+    - for sprint keys ('KEY001 Sprint 3'), the function / label / key / sprint combination must
+      match a row of the LC lookup table F:K (same key as UpdateSyntheseFromLC, see
+      roadmap.synthese.build_lc_lookup)
+    - the hours (J) must be a number between 0 and MAX_ROW_HOURS
+    - a row identical to an earlier row of the same file (columns A-K) is a duplicate
+
+The LC lists are loaded once into sets and the lookup into a dict, so each row costs a few
+hash lookups whatever the size of LC. The issues are written to 'pointage_validation.csv';
+the XML export keeps its columns, since the VBA import reads them by position.
+"""
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from roadmap.pointage import COL_HOURS, POINTAGE_LAST_COL, PointageRecord
+from roadmap.synthese import (LC_LOOKUP_FIRST_ROW, LC_LOOKUP_KEY_DELIM, LC_SHEET,
+                              build_lc_lookup, split_sprint, vba_text)
+from roadmap.xlsx import open_package, read_rows
+
+VALIDATION_FILE_NAME = "pointage_validation.csv"
+MAX_ROW_HOURS = 24.0
+
+# LC lists used by the POINTAGE dropdowns ('LC'!B3:D10000)
+LC_LIST_FIRST_ROW = 3
+LC_COL_KEY = 2
+LC_COL_LABEL = 3
+LC_COL_FUNCTION = 4
+
+# Issue codes
+ISSUE_UNKNOWN_KEY = "unknown_key"
+ISSUE_UNKNOWN_LABEL = "unknown_label"
+ISSUE_UNKNOWN_FUNCTION = "unknown_function"
+ISSUE_INVALID_COMBINATION = "invalid_combination"
+ISSUE_INVALID_HOURS = "invalid_hours"
+ISSUE_DUPLICATE = "duplicate"
+
+REPORT_COLUMNS = ["file", "row", "collaborator", "week", "key", "label", "function", "hours", "issues", "details"]
+
+
+def _normalized(value) -> str:
+    """Text compared with the LC values: trimmed like VBA and case-insensitive, like the dropdowns."""
+    return vba_text(value).casefold()
+
+
+@dataclass(frozen=True)
+class LCIndex:
+    """
+    Sets and lookup of the 'LC' sheet used to validate the pointage rows.
+
+    Attributes:
+        keys (frozenset[str]): Normalized keys of column B.
+        labels (frozenset[str]): Normalized labels of column C.
+        functions (frozenset[str]): Normalized functions of column D.
+        lookup (dict[str, tuple | None]): LC lookup table F:K (see build_lc_lookup).
+    """
+    keys: frozenset[str]
+    labels: frozenset[str]
+    functions: frozenset[str]
+    lookup: dict[str, tuple | None] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(cls, lc_rows: dict[int, dict[int, object]]) -> "LCIndex":
+        """
+        Build the index from the cells of the 'LC' sheet.
+
+        Args:
+            lc_rows (dict[int, dict[int, object]]): 'LC' cells by row, then column (see read_rows).
+
+        Returns:
+            LCIndex: The index. Empty cells are not part of the lists.
+        """
+        def column(col: int) -> frozenset[str]:
+            values = (_normalized(cells.get(col)) for r, cells in lc_rows.items() if r >= LC_LIST_FIRST_ROW)
+            return frozenset(value for value in values if value)
+
+        return cls(column(LC_COL_KEY), column(LC_COL_LABEL), column(LC_COL_FUNCTION), build_lc_lookup(lc_rows))
+
+    @classmethod
+    def load(cls, workbook: Path | str) -> "LCIndex":
+        """
+        Read the 'LC' sheet of a workbook (B:K only, streamed, see roadmap.xlsx).
+
+        Args:
+            workbook (Path | str): Synthesis workbook (or any workbook with an 'LC' sheet).
+
+        Returns:
+            LCIndex: The index.
+
+        Raises:
+            KeyError: If the workbook has no 'LC' sheet.
+            OSError: If the workbook cannot be read.
+        """
+        with open_package(workbook) as zf:
+            rows = read_rows(zf, LC_SHEET, min_row=LC_LOOKUP_FIRST_ROW, min_col=LC_COL_KEY, max_col=11)
+        return cls.from_rows(rows)
+
+
+@dataclass
+class RowIssues:
+    """
+    Issues found on one pointage row.
+
+    Attributes:
+        record (PointageRecord): The row.
+        codes (list[str]): Issue codes, e.g. ['unknown_key', 'invalid_hours'].
+        details (list[str]): One human-readable detail per code.
+    """
+    record: PointageRecord
+    codes: list[str] = field(default_factory=list)
+    details: list[str] = field(default_factory=list)
+
+    def add(self, code: str, detail: str) -> None:
+        """Record an issue."""
+        self.codes.append(code)
+        self.details.append(detail)
+
+    def report_row(self) -> list:
+        """Row of the validation report (see REPORT_COLUMNS)."""
+        record = self.record
+        return [record.source, record.sheet_row or None, record.collaborator, record.week, record.key,
+                record.label, record.function, record.values[COL_HOURS], ";".join(self.codes),
+                "; ".join(self.details)]
+
+
+def validate_records(records: Iterable[PointageRecord], lc: LCIndex,
+                     max_hours: float = MAX_ROW_HOURS) -> list[RowIssues]:
+    """
+    Validate pointage rows against the LC sheet.
+
+    Args:
+        records (Iterable[PointageRecord]): Rows, e.g. the rows read by pointage().
+        lc (LCIndex): LC lists and lookup.
+        max_hours (float, optional): Highest hours value of a row. Defaults to 24.
+
+    Returns:
+        list[RowIssues]: Rows with at least one issue, in input order.
+
+    Note:
+        Combinations are only checked when the LC lookup table F:K is filled, and only for
+        sprint keys, which are the rows the lookup covers.
+    """
+    issues = []
+    normalized: dict[object, str] = {}
+    seen: set[tuple] = set()
+
+    def norm(value) -> str:
+        # Texts are interned in records, so each distinct value is normalized once
+        text = normalized.get(value)
+        if text is None:
+            text = normalized[value] = _normalized(value)
+        return text
+
+    for record in records:
+        row = RowIssues(record)
+        key, label, function = norm(record.key), norm(record.label), norm(record.function)
+        if key not in lc.keys:
+            row.add(ISSUE_UNKNOWN_KEY, f"Key '{record.key or ''}' is not in LC column B")
+        if label not in lc.labels:
+            row.add(ISSUE_UNKNOWN_LABEL, f"Label '{record.label or ''}' is not in LC column C")
+        if function not in lc.functions:
+            row.add(ISSUE_UNKNOWN_FUNCTION, f"Function '{record.function or ''}' is not in LC column D")
+
+        parts = split_sprint(record.key) if lc.lookup else None
+        if parts is not None:
+            combination = LC_LOOKUP_KEY_DELIM.join([function, label, parts[0].casefold(), parts[1].casefold()])
+            match = lc.lookup.get(combination, ())
+            if match == ():
+                row.add(ISSUE_INVALID_COMBINATION, "No LC row for this key, label and function")
+            elif match is None:
+                row.add(ISSUE_INVALID_COMBINATION, "Several LC rows for this key, label and function")
+
+        raw_hours = record.values[COL_HOURS]
+        if record.hours is None:
+            row.add(ISSUE_INVALID_HOURS, "Hours are missing" if vba_text(raw_hours) == ""
+                    else f"Hours '{raw_hours}' are not a number")
+        elif not 0 <= record.hours <= max_hours:
+            row.add(ISSUE_INVALID_HOURS, f"Hours {record.hours:g} are out of range (0 to {max_hours:g})")
+
+        identity = (record.source, record.values[:POINTAGE_LAST_COL])
+        if identity in seen:
+            row.add(ISSUE_DUPLICATE, "Same values as an earlier row of the file")
+        else:
+            seen.add(identity)
+
+        if row.codes:
+            issues.append(row)
+    return issues
+
+
+def count_issues(issues: Iterable[RowIssues]) -> dict[str, int]:
+    """Number of rows per issue code, in code order."""
+    counts: dict[str, int] = {}
+    for row in issues:
+        for code in row.codes:
+            counts[code] = counts.get(code, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def write_validation_report(path: Path | str, issues: Iterable[RowIssues]) -> None:
+    """
+    Write the rows with issues as CSV (UTF-8 with BOM, so Excel opens it as UTF-8).
+
+    Args:
+        path (Path | str): Output file.
+        issues (Iterable[RowIssues]): Result of validate_records().
+    """
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_COLUMNS)
+        writer.writerows(row.report_row() for row in issues)
@@ -0,0 +1,68 @@
+"""
+Entry point of the pool worker processes.
+
+With the spawn start method (Windows, PyInstaller builds), each worker imports the modules
+needed to unpickle its tasks before running the first one. Tasks are therefore submitted
+through this module, which only imports the engine (roadmap.engine), the logging queue
+setup and the tracing / profiling wrappers: not roadmap.helpers, whose import creates the
+log folder, configures logging and loads the CLI modules. roadmap/__init__.py loads its
+exports lazily, so importing this module does not pull the rest of the package either.
+
+Usage from the main process:
+    with ProcessPoolExecutor(max_workers, initializer=initialize, initargs=(worker_log_queue(),)) as executor:
+        future = executor.submit(run_task, profiling_context(), worker_context(), build_interface, *args)
+        value, spans, profile = future.result()
+"""
+import os
+import sys
+from typing import Callable
+
+from roadmap.logging_config import init_worker_logging
+from roadmap.profiling import run_profiled
+from roadmap.trace import run_traced
+
+
+def initialize(log_queue) -> None:
+    """
+    Pool initializer: send the worker's log records to the main process.
+
+    Args:
+        log_queue (multiprocessing.queues.Queue | None): Value of worker_log_queue() in the main process.
+    """
+    init_worker_logging(log_queue)
+
+
+def run_task(profile_context: bool, trace_context: tuple[str, str] | None, func: Callable,
+             *args) -> tuple[object, list[dict], dict | None]:
+    """
+    Run one task, collecting its timing spans and profile.
+
+    Args:
+        profile_context (bool): Value of profiling_context() in the main process.
+        trace_context (tuple[str, str] | None): Value of worker_context() in the main process.
+        func (Callable): Engine function to run (e.g. roadmap.engine.build_interface).
+        *args: Arguments of the function.
+
+    Returns:
+        tuple[object, list[dict], dict | None]: Result of the function, its spans (for
+        tracer.extend()) and its profile (for profiler.add_worker()).
+
+    Note:
+        If the function raises, the exception carries `trace_spans` and `profile`.
+    """
+    (value, spans), profile = run_profiled(profile_context, run_traced, trace_context, func, *args)
+    return value, spans, profile
+
+
+def ping() -> dict:
+    """
+    Trivial task used to measure worker start-up (see benchmarks.suite).
+
+    Returns:
+        dict: PID of the worker, number of loaded modules and whether the CLI modules were loaded.
+    """
+    return {
+        "pid": os.getpid(),
+        "modules": len(sys.modules),
+        "cli_loaded": "roadmap.helpers" in sys.modules or "roadmap.main" in sys.modules,
+    }
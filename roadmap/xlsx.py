@@ -0,0 +1,884 @@
+"""
+Streaming access to the parts of an Excel package (.xlsx / .xlsm).
+
+Loading 'Synthèse_RM_CE.xlsm' with openpyxl parses every sheet, style and the VBA project
+just to read one column. An Excel file is a zip package, so this module reads only what
+is needed:
+    - 'xl/workbook.xml' and its relationships, to find the part of a sheet by name
+    - The sheet part itself, streamed with iterparse and stopped as soon as possible
+    - 'xl/sharedStrings.xml', streamed up to the last string index actually referenced
+
+A workbook open in Excel is read from a temporary snapshot copy, so the read never races
+with Excel saving the file.
+
+Writing goes through replace_parts(), which rewrites the package with a few parts replaced
+and every other part (including 'xl/vbaProject.bin') copied byte for byte. Sheet parts are
+edited as text with patch_rows() and CellStyles, so namespace prefixes and everything outside
+the cells written are kept as they are.
+"""
+import contextlib
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Iterator
+from xml.sax.saxutils import escape, unescape
+
+from roadmap.locks import LockScan
+
+SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIP_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+# Built-in number formats showing a date and/or a time
+_DATE_FORMAT_IDS = frozenset(range(14, 23)) | {45, 46, 47}
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_ROW = re.compile(r"<row\b[^>]*?(?:/>|>.*?</row>)", re.S)
+_CELL = re.compile(r"<c\b[^>]*?(?:/>|>.*?</c>)", re.S)
+_REF_ATTR = re.compile(r'(?<![\w:])r="([A-Z]*)(\d+)"')
+_STYLE_ATTR = re.compile(r'(?<![\w:])s="(\d+)"')
+_DATA_VALIDATION = re.compile(r"<((?:\w+:)?)dataValidation(?=[\s/>])([^>]*?)(?:/>|>(.*?)</\1dataValidation>)", re.S)
+_ATTR = re.compile(r'([\w:]+)="([^"]*)"')
+_SQREF = re.compile(r"<(?:\w+:)?sqref>(.*?)</(?:\w+:)?sqref>", re.S)
+_FORMULA1 = re.compile(r"<(?:\w+:)?formula1>(.*?)</(?:\w+:)?formula1>", re.S)
+_INNER_TAG = re.compile(r"<[^>]+>")
+
+
+def _tag(name: str) -> str:
+    return f"{{{SPREADSHEET_NS}}}{name}"
+
+
+def column_index(letters: str) -> int:
+    """
+    Convert column letters to a 1-based index.
+
+    Args:
+        letters (str): Column letters, e.g. 'B' or 'BA'.
+
+    Returns:
+        int: Column index, e.g. 2 or 53.
+    """
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index
+
+
+def column_letters(index: int) -> str:
+    """
+    Convert a 1-based column index to letters.
+
+    Args:
+        index (int): Column index, e.g. 53.
+
+    Returns:
+        str: Column letters, e.g. 'BA'.
+    """
+    letters = ""
+    while index > 0:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+@contextlib.contextmanager
+def open_package(path: Path | str, lock_scan: LockScan | None = None) -> Iterator[zipfile.ZipFile]:
+    """
+    Open an Excel package for reading, from a snapshot copy if the workbook is open.
+
+    Args:
+        path (Path | str): Path to the .xlsx / .xlsm file.
+        lock_scan (LockScan | None, optional): Owner files of the workbook folder, e.g. the
+            lock scan of a workspace snapshot shared by the files of a command. Defaults to
+            None (the folder is scanned).
+
+    Yields:
+        zipfile.ZipFile: The opened package.
+
+    Note:
+        The workbook is copied to a temporary directory when Excel holds it (owner file or
+        exclusive lock) or when opening it directly raises PermissionError. The copy is
+        removed on exit.
+    """
+    path = Path(path)
+    zf = None
+    if lock_scan is None:
+        lock_scan = LockScan.scan(path.parent)
+    if not lock_scan.is_locked(path):
+        try:
+            zf = zipfile.ZipFile(path)
+        except PermissionError:
+            zf = None
+
+    if zf is not None:
+        with zf:
+            yield zf
+        return
+
+    with tempfile.TemporaryDirectory(prefix="roadmap_snapshot_") as tmp:
+        copy = Path(tmp) / path.name
+        shutil.copyfile(path, copy)
+        with zipfile.ZipFile(copy) as zf:
+            yield zf
+
+
+def sheet_names(zf: zipfile.ZipFile) -> list[str]:
+    """
+    List the sheet names of a workbook, in tab order, from 'xl/workbook.xml' only.
+
+    Args:
+        zf (zipfile.ZipFile): Opened Excel package.
+
+    Returns:
+        list[str]: Sheet names.
+
+    Raises:
+        KeyError: If the package has no 'xl/workbook.xml' part.
+    """
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    return [sheet.get("name") for sheet in workbook.iter(_tag("sheet"))]
+
+
+def sheet_part_name(zf: zipfile.ZipFile, sheet_name: str) -> str:
+    """
+    Find the package part holding a worksheet.
+
+    Args:
+        zf (zipfile.ZipFile): Opened Excel package.
+        sheet_name (str): Worksheet name, e.g. 'Gestion_Interfaces'.
+
+    Returns:
+        str: Part name inside the zip, e.g. 'xl/worksheets/sheet1.xml'.
+
+    Raises:
+        KeyError: If the workbook has no sheet with this name.
+    """
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rel_id = None
+    for sheet in workbook.iter(_tag("sheet")):
+        if sheet.get("name") == sheet_name:
+            rel_id = sheet.get(f"{{{RELATIONSHIP_NS}}}id")
+            break
+    if rel_id is None:
+        raise KeyError(f"Sheet '{sheet_name}' not found")
+
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{{{PACKAGE_REL_NS}}}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise KeyError(f"Relationship '{rel_id}' of sheet '{sheet_name}' not found")
+
+
+def read_shared_strings(zf: zipfile.ZipFile, indices: set[int] | None) -> dict[int, str]:
+    """
+    Stream the shared string table and keep only the requested entries.
+
+    Args:
+        zf (zipfile.ZipFile): Opened Excel package.
+        indices (set[int] | None): String indices referenced by the cells being read,
+            or None for the whole table.
+
+    Returns:
+        dict[int, str]: Text of each requested index. Parsing stops after the highest one.
+    """
+    strings = {}
+    if (indices is not None and not indices) or "xl/sharedStrings.xml" not in zf.namelist():
+        return strings
+
+    last = max(indices) if indices is not None else None
+    position = 0
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag != _tag("si"):
+                continue
+            if indices is None or position in indices:
+                strings[position] = _string_item_text(elem)
+            elem.clear()
+            if last is not None and position >= last:
+                break
+            position += 1
+    return strings
+
+
+def _is_date_format(code: str) -> bool:
+    """Whether a number format code shows a date or a time (quoted text and [..] sections ignored)."""
+    code = re.sub(r'"[^"]*"|\[[^\]]*\]|\\.|[_*].', "", code)
+    return re.search(r"[dmyhs]", code, re.I) is not None
+
+
+def date_styles(zf: zipfile.ZipFile) -> set[int]:
+    """
+    Find the cell formats that display a date or a time.
+
+    Args:
+        zf (zipfile.ZipFile): Opened Excel package.
+
+    Returns:
+        set[int]: cellXfs indices (the 's' attribute of cells) with a date/time number format.
+    """
+    if "xl/styles.xml" not in zf.namelist():
+        return set()
+    root = ET.fromstring(zf.read("xl/styles.xml"))
+    custom = {int(fmt.get("numFmtId")): fmt.get("formatCode", "") for fmt in root.iter(_tag("numFmt"))}
+    xfs = root.find(_tag("cellXfs"))
+    result = set()
+    for idx, xf in enumerate(xfs if xfs is not None else []):
+        fmt_id = int(xf.get("numFmtId", 0))
+        if fmt_id in _DATE_FORMAT_IDS or (fmt_id in custom and _is_date_format(custom[fmt_id])):
+            result.add(idx)
+    return result
+
+
+def from_excel_serial(serial: float) -> datetime:
+    """Convert an Excel date serial number to a datetime (to the second)."""
+    return _EXCEL_EPOCH + timedelta(seconds=round(serial * 86400))
+
+
+def _string_item_text(item: ET.Element) -> str:
+    """Text of a string item (<si> or <is>): plain <t>, or rich text <r><t> runs."""
+    # Phonetic runs (<rPh>) also contain <t> elements and are not part of the displayed text
+    texts = [t.text or "" for t in item.findall(_tag("t"))]
+    texts += [t.text or "" for run in item.findall(_tag("r")) for t in run.findall(_tag("t"))]
+    return "".join(texts)
+
+
+def _raw_value(cell: ET.Element) -> tuple[str | None, str | None]:
+    """Return the (type, raw text) of a cell element."""
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        item = cell.find(_tag("is"))
+        return "str", (_string_item_text(item) if item is not None else None)
+    v = cell.find(_tag("v"))
+    return cell_type, (v.text if v is not None else None)
+
+
+def _format_value(cell_type: str, raw: str | None, strings: dict[int, str]) -> str:
+    """Convert a raw cell value to the text Excel would display for a plain cell."""
+    if raw is None:
+        return ""
+    if cell_type == "s":
+        return strings.get(int(raw), "")
+    if cell_type == "b":
+        return "TRUE" if raw == "1" else "FALSE"
+    if cell_type == "n":
+        number = float(raw)
+        return str(int(number)) if number.is_integer() else str(number)
+    return raw
+
+
+def _typed_value(cell_type: str, raw: str | None, strings: dict[int, str]):
+    """Convert a raw cell value to a Python value (str, int, float or bool)."""
+    if raw is None:
+        return None
+    if cell_type == "s":
+        return strings.get(int(raw), "")
+    if cell_type == "b":
+        return raw == "1"
+    if cell_type == "n":
+        number = float(raw)
+        return int(number) if number.is_integer() else number
+    return raw
+
+
+def iter_rows(zf: zipfile.ZipFile, sheet_name: str, min_row: int = 1, min_col: int = 1,
+              max_col: int = 16384, dates: bool = False) -> Iterator[tuple[int, dict[int, object]]]:
+    """
+    Stream the non-empty cells of a block of columns of a worksheet, row by row.
+
+    Unlike read_rows(), nothing is kept in memory but the current row and the shared string
+    table (read in full the first time a shared string is met), so sheets of any size can
+    be processed in a single pass.
+
+    Args:
+        zf (zipfile.ZipFile): Opened Excel package (see open_package).
+        sheet_name (str): Worksheet name.
+        min_row (int, optional): First row to read. Defaults to 1.
+        min_col (int, optional): First column index. Defaults to 1.
+        max_col (int, optional): Last column index. Defaults to the last Excel column.
+        dates (bool, optional): Return cells with a date/time format as datetime instead of
+            their serial number. Defaults to False.
+
+    Yields:
+        tuple[int, dict[int, object]]: Row number and values by column index, for rows with
+        at least one non-empty cell in the block.
+    """
+    date_xfs = date_styles(zf) if dates else set()
+    strings = None
+    part = sheet_part_name(zf, sheet_name)
+    with zf.open(part) as f:
+        row_number = 0
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag != _tag("row"):
+                continue
+            row_number = int(elem.get("r") or row_number + 1)
+            cells = {}
+            if row_number >= min_row:
+                position = 0
+                for cell in elem.iter(_tag("c")):
+                    match = _CELL_REF.fullmatch(cell.get("r", ""))
+                    position = column_index(match.group(1)) if match else position + 1
+                    if position < min_col or position > max_col:
+                        continue
+                    cell_type, raw = _raw_value(cell)
+                    if raw is None or raw == "":
+                        continue
+                    if cell_type == "s" and strings is None:
+                        strings = read_shared_strings(zf, None)
+                    if cell_type == "n" and int(cell.get("s", 0)) in date_xfs:
+                        cells[position] = from_excel_serial(float(raw))
+                    else:
+                        cells[position] = _typed_value(cell_type, raw, strings or {})
+            elem.clear()
+            if cells:
+                yield row_number, cells
+
+
+def read_rows(zf: zipfile.ZipFile, sheet_name: str, min_row: int = 1,
+              min_col: int = 1, max_col: int = 16384, dates: bool = False) -> dict[int, dict[int, object]]:
+    """
+    Read the non-empty cells of a block of columns of a worksheet.
+
+    Args:
+        zf (zipfile.ZipFile): Opened Excel package (see open_package).
+        sheet_name (str): Worksheet name.
+        min_row (int, optional): First row to read. Defaults to 1.
+        min_col (int, optional): First column index. Defaults to 1.
+        max_col (int, optional): Last column index. Defaults to the last Excel column.
+        dates (bool, optional): Return cells with a date/time format as datetime. Defaults to
+            False, in which case dates are returned as their serial number.
+
+    Returns:
+        dict[int, dict[int, object]]: Values by row number, then by column index. Strings,
+        numbers (int when integral) and booleans.
+    """
+    date_xfs = date_styles(zf) if dates else set()
+    raw_rows: dict[int, dict[int, tuple[str, str | None, int]]] = {}
+    part = sheet_part_name(zf, sheet_name)
+    with zf.open(part) as f:
+        row_number = 0
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag != _tag("row"):
+                continue
+            row_number = int(elem.get("r") or row_number + 1)
+            if row_number >= min_row:
+                position = 0
+                cells = {}
+                for cell in elem.iter(_tag("c")):
+                    match = _CELL_REF.fullmatch(cell.get("r", ""))
+                    position = column_index(match.group(1)) if match else position + 1
+                    if min_col <= position <= max_col:
+                        cell_type, raw = _raw_value(cell)
+                        if raw is not None and raw != "":
+                            cells[position] = (cell_type, raw, int(cell.get("s", 0)))
+                if cells:
+                    raw_rows[row_number] = cells
+            elem.clear()
+
+    strings = read_shared_strings(zf, {
+        int(raw) for cells in raw_rows.values() for cell_type, raw, _ in cells.values() if cell_type == "s"})
+    return {
+        row: {
+            col: (from_excel_serial(float(raw)) if cell_type == "n" and style in date_xfs
+                  else _typed_value(cell_type, raw, strings))
+            for col, (cell_type, raw, style) in cells.items()
+        }
+        for row, cells in raw_rows.items()
+    }
+
+
+def read_cell(zf: zipfile.ZipFile, sheet_name: str, ref: str):
+    """
+    Read a single cell, stopping the parse at its row.
+
+    Args:
+        zf (zipfile.ZipFile): Opened Excel package (see open_package).
+        sheet_name (str): Worksheet name.
+        ref (str): Cell reference, e.g. 'B1'.
+
+    Returns:
+        str | int | float | bool | None: The cell value (a shared string is resolved by reading
+        the string table up to its index only), None if the cell is empty.
+    """
+    letters, number = _CELL_REF.fullmatch(ref).groups()
+    row_number, column = int(number), column_index(letters)
+    with zf.open(sheet_part_name(zf, sheet_name)) as f:
+        current = 0
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag != _tag("row"):
+                continue
+            current = int(elem.get("r") or current + 1)
+            if current > row_number:
+                return None
+            if current < row_number:
+                elem.clear()
+                continue
+            position = 0
+            for cell in elem.iter(_tag("c")):
+                match = _CELL_REF.fullmatch(cell.get("r", ""))
+                position = column_index(match.group(1)) if match else position + 1
+                if position != column:
+                    continue
+                cell_type, raw = _raw_value(cell)
+                if raw is None or raw == "":
+                    return None
+                strings = read_shared_strings(zf, {int(raw)}) if cell_type == "s" else {}
+                return _typed_value(cell_type, raw, strings)
+            return None
+    return None
+
+
+def read_data_validations(zf: zipfile.ZipFile, sheet_name: str) -> list[tuple[str, str | None, str | None]]:
+    """
+    Read the data validations of a worksheet.
+
+    <dataValidations> comes after <sheetData>, so the sheet part is scanned as bytes (not
+    parsed) up to the first validation block, and only the rest is read as text. Both the
+    main block and the Excel 2010 extension block ('x14:dataValidations' in <extLst>, where
+    Excel saves validations referring to another sheet) are returned.
+
+    Args:
+        zf (zipfile.ZipFile): Opened Excel package (see open_package).
+        sheet_name (str): Worksheet name.
+
+    Returns:
+        list[tuple[str, str | None, str | None]]: (sqref, type, formula1) of each validation,
+        e.g. ('E3:E1000', 'list', "'LC'!$B$3:$B$10000"). The formula is returned as stored,
+        without a leading '='.
+    """
+    tail, found = b"", None
+    with zf.open(sheet_part_name(zf, sheet_name)) as f:
+        while chunk := f.read(1 << 16):
+            if found is not None:
+                found += chunk
+                continue
+            data = tail + chunk
+            position = data.find(b"dataValidations")
+            if position < 0:
+                tail = data[-32:]
+            else:
+                found = bytearray(data[max(position - 16, 0):])
+    if found is None:
+        return []
+
+    validations = []
+    for match in _DATA_VALIDATION.finditer(found.decode("utf-8", errors="replace")):
+        attrs = dict(_ATTR.findall(match.group(2)))
+        body = match.group(3) or ""
+        sqref = attrs.get("sqref")
+        if sqref is None:
+            sqref_match = _SQREF.search(body)
+            sqref = sqref_match.group(1) if sqref_match else ""
+        formula = None
+        formula_match = _FORMULA1.search(body)
+        if formula_match:
+            # x14 validations wrap the formula in <xm:f>
+            text = unescape(_INNER_TAG.sub("", formula_match.group(1)), {"&quot;": '"', "&apos;": "'"})
+            formula = text.strip().lstrip("=") or None
+        validations.append((sqref.strip(), attrs.get("type"), formula))
+    return validations
+
+
+def replace_parts(path: Path | str, parts: dict[str, bytes]) -> None:
+    """
+    Rewrite an Excel package with some parts replaced.
+
+    Every other part is copied unchanged (same bytes, same compression), so the VBA project
+    and everything the caller did not touch are preserved. The new package is written next to
+    the original and moved over it, so a failure never leaves a truncated workbook.
+
+    Args:
+        path (Path | str): Path to the .xlsx / .xlsm file. It must not be open in Excel.
+        parts (dict[str, bytes]): New content by part name, e.g. {'xl/styles.xml': b'...'}.
+
+    Raises:
+        KeyError: If a part to replace does not exist in the package.
+        PermissionError: If the workbook cannot be replaced (open in Excel).
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=".~roadmap_", suffix=path.suffix, dir=path.parent)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(path) as zin, zipfile.ZipFile(tmp_name, "w") as zout:
+            missing = set(parts) - set(zin.namelist())
+            if missing:
+                raise KeyError(f"Parts not found in {path.name}: {sorted(missing)}")
+            for info in zin.infolist():
+                data = parts[info.filename] if info.filename in parts else zin.read(info.filename)
+                zout.writestr(info, data, compress_type=info.compress_type)
+        shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_column(path: Path | str, sheet_name: str, column: str = "B",
+                start_row: int = 1, stop_at_blank: bool = True) -> list[str]:
+    """
+    Read the values of one column of a worksheet without loading the workbook.
+
+    Args:
+        path (Path | str): Path to the .xlsx / .xlsm file.
+        sheet_name (str): Worksheet name.
+        column (str, optional): Column letters. Defaults to 'B'.
+        start_row (int, optional): First row to read. Defaults to 1.
+        stop_at_blank (bool, optional): Stop at the first empty cell, like the VBA loops
+            reading 'Gestion_Interfaces'. Defaults to True.
+
+    Returns:
+        list[str]: Stripped cell texts from start_row down. Without stop_at_blank,
+        empty cells are returned as '' up to the last non-empty one.
+
+    Raises:
+        KeyError: If the sheet does not exist.
+        zipfile.BadZipFile: If the file is not an Excel package.
+    """
+    column = column.upper()
+    target = column_index(column)
+    cells: dict[int, tuple[str, str | None]] = {}
+
+    with open_package(path) as zf:
+        part = sheet_part_name(zf, sheet_name)
+        with zf.open(part) as f:
+            expected_row = start_row
+            row_number = 0
+            for _, elem in ET.iterparse(f, events=("end",)):
+                if elem.tag != _tag("row"):
+                    continue
+                # 'r' is optional: without it, rows follow each other
+                row_number = int(elem.get("r") or row_number + 1)
+                if row_number < start_row:
+                    elem.clear()
+                    continue
+                if stop_at_blank and row_number > expected_row:
+                    # Missing row element: the cell of the expected row is empty
+                    break
+
+                value = None
+                position = 0
+                for cell in elem.iter(_tag("c")):
+                    match = _CELL_REF.fullmatch(cell.get("r", ""))
+                    position = column_index(match.group(1)) if match else position + 1
+                    if position == target:
+                        value = _raw_value(cell)
+                        break
+                    if position > target:
+                        break
+                elem.clear()
+
+                if stop_at_blank and (value is None or not (value[1] or "").strip()):
+                    break
+                if value is not None:
+                    cells[row_number] = value
+                expected_row = row_number + 1
+
+        strings = read_shared_strings(
+            zf, {int(raw) for cell_type, raw in cells.values() if cell_type == "s" and raw is not None})
+
+    values = {row: _format_value(cell_type, raw, strings).strip() for row, (cell_type, raw) in cells.items()}
+    if stop_at_blank:
+        result = []
+        for row in sorted(values):
+            if not values[row]:
+                break
+            result.append(values[row])
+        return result
+
+    last = max((row for row, text in values.items() if text), default=start_row - 1)
+    return [values.get(row, "") for row in range(start_row, last + 1)]
+
+
+def _set_attr(open_tag: str, name: str, value) -> str:
+    """Set an attribute in an XML start tag."""
+    pattern = re.compile(rf'(?<![\w:]){name}="[^"]*"')
+    if pattern.search(open_tag):
+        return pattern.sub(f'{name}="{value}"', open_tag, count=1)
+    end = -2 if open_tag.endswith("/>") else -1
+    return f'{open_tag[:end]} {name}="{value}"{open_tag[end:]}'
+
+
+class _ItemList:
+    """Items of an XML collection element (e.g. <fills>), edited as text."""
+
+    def __init__(self, xml: str, tag: str, item_tag: str):
+        self.xml = xml
+        self.tag = tag
+        self.match = re.search(rf"<{tag}\b[^>]*?(?:/>|>(.*?)</{tag}>)", xml, re.S)
+        if self.match is None:
+            raise ValueError(f"<{tag}> not found in styles")
+        content = self.match.group(1) or ""
+        self.items = re.findall(rf"<{item_tag}\b[^>]*?(?:/>|>.*?</{item_tag}>)", content, re.S)
+        self.size = len(self.items)
+
+    def add(self, item: str) -> int:
+        """Return the index of an identical item, appending it if needed."""
+        if item in self.items:
+            return self.items.index(item)
+        self.items.append(item)
+        return len(self.items) - 1
+
+    def render(self, xml: str) -> str:
+        """Return the styles XML with this collection rewritten (if it changed)."""
+        if len(self.items) == self.size:
+            return xml
+        match = re.search(rf"<{self.tag}\b[^>]*?(?:/>|>(.*?)</{self.tag}>)", xml, re.S)
+        open_tag = re.match(rf"<{self.tag}\b[^>]*?/?>", match.group(0)).group(0).replace("/>", ">")
+        open_tag = _set_attr(open_tag, "count", len(self.items))
+        return xml[:match.start()] + open_tag + "".join(self.items) + f"</{self.tag}>" + xml[match.end():]
+
+
+class CellStyles:
+    """Derives cell formats (fill, number format) from existing ones in 'xl/styles.xml'."""
+
+    def __init__(self, xml: str):
+        self.xml = xml
+        self.fills = _ItemList(xml, "fills", "fill")
+        self.xfs = _ItemList(xml, "cellXfs", "xf")
+        self._cache = {}
+
+    def fill_id(self, rgb: str) -> int:
+        for idx, fill in enumerate(self.fills.items):
+            if 'patternType="solid"' in fill and re.search(rf'<fgColor\b[^>]*rgb="{rgb}"', fill, re.I):
+                return idx
+        return self.fills.add(
+            f'<fill><patternFill patternType="solid"><fgColor rgb="{rgb}"/><bgColor indexed="64"/></patternFill></fill>')
+
+    def derive(self, base: int, fill: str | None = None, num_fmt: int | None = None) -> int:
+        """
+        Return the index of a cell format equal to `base` with a fill and/or number format.
+
+        Args:
+            base (int): Existing cellXfs index (column or cell style).
+            fill (str | None): ARGB color of a solid fill.
+            num_fmt (int | None): Built-in number format id (e.g. 14 for dates).
+
+        Returns:
+            int: cellXfs index, reused when an identical format already exists.
+        """
+        if fill is None and num_fmt is None:
+            return base
+        key = (base, fill, num_fmt)
+        if key not in self._cache:
+            xf = self.xfs.items[base] if base < len(self.xfs.items) else self.xfs.items[0]
+            open_tag = re.match(r"<xf\b[^>]*?/?>", xf).group(0)
+            new_tag = open_tag
+            if fill is not None:
+                new_tag = _set_attr(_set_attr(new_tag, "fillId", self.fill_id(fill)), "applyFill", 1)
+            if num_fmt is not None:
+                new_tag = _set_attr(_set_attr(new_tag, "numFmtId", num_fmt), "applyNumberFormat", 1)
+            self._cache[key] = self.xfs.add(new_tag + xf[len(open_tag):])
+        return self._cache[key]
+
+    def render(self) -> bytes:
+        xml = self.fills.render(self.xml)
+        xml = self.xfs.render(xml)
+        return xml.encode("utf-8")
+
+
+def _excel_value(value) -> tuple[str | None, str | None, int | None]:
+    """
+    Convert a Python value to (cell type, cell content, number format id).
+
+    Dates and times become serial numbers with a built-in date/time format.
+    """
+    if value is None or value == "":
+        return None, None, None
+    if isinstance(value, bool):
+        return "b", f"<v>{int(value)}</v>", None
+    if isinstance(value, (int, float)):
+        return None, f"<v>{value!r}</v>", None
+    if isinstance(value, datetime):
+        serial = (value - _EXCEL_EPOCH).total_seconds() / 86400
+        return None, f"<v>{serial!r}</v>", 22 if (value.hour, value.minute, value.second) != (0, 0, 0) else 14
+    if isinstance(value, date):
+        return None, f"<v>{(value - _EXCEL_EPOCH.date()).days}</v>", 14
+    if isinstance(value, time):
+        serial = (value.hour * 3600 + value.minute * 60 + value.second) / 86400
+        return None, f"<v>{serial!r}</v>", 21
+    if isinstance(value, timedelta):
+        return None, f"<v>{value.total_seconds() / 86400!r}</v>", 46
+    text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+    return "inlineStr", f'<is><t xml:space="preserve">{text}</t></is>', None
+
+
+def _cell_xml(ref: str, value, base_style: int, fill: str | None, styles: CellStyles) -> str:
+    cell_type, content, num_fmt = _excel_value(value)
+    style = styles.derive(base_style, fill, num_fmt)
+    attrs = f'r="{ref}"' + (f' s="{style}"' if style else "") + (f' t="{cell_type}"' if cell_type else "")
+    return f"<c {attrs}>{content}</c>" if content else f"<c {attrs}/>"
+
+
+def _column_styles(sheet_xml: str, first_col: int, last_col: int) -> dict[int, int]:
+    """Default style of each column of a block, from the <cols> element."""
+    styles = {}
+    for col in re.finditer(r"<col\b[^>]*>", sheet_xml):
+        tag = col.group(0)
+        style = re.search(r'(?<![\w:])style="(\d+)"', tag)
+        lo = re.search(r'(?<![\w:])min="(\d+)"', tag)
+        hi = re.search(r'(?<![\w:])max="(\d+)"', tag)
+        if style and lo and hi:
+            for idx in range(max(int(lo.group(1)), first_col), min(int(hi.group(1)), last_col) + 1):
+                styles[idx] = int(style.group(1))
+    return styles
+
+
+def _sheet_data(sheet_xml: str) -> re.Match:
+    return re.search(r"<sheetData\b[^>]*?(?:/>|>(.*?)</sheetData>)", sheet_xml, re.S)
+
+
+def _parse_rows(content: str) -> list[tuple[int, str]]:
+    """Split <sheetData> content into (row number, row XML)."""
+    rows = []
+    row_number = 0
+    for match in _ROW.finditer(content):
+        chunk = match.group(0)
+        open_tag = re.match(r"<row\b[^>]*?/?>", chunk).group(0)
+        ref = _REF_ATTR.search(open_tag)
+        row_number = int(ref.group(2)) if ref else row_number + 1
+        rows.append((row_number, chunk))
+    return rows
+
+
+def _has_value(cell: str) -> bool:
+    return re.search(r"<(?:v|is|f)\b", cell) is not None
+
+
+def _cell_column(cell: str, position: int) -> int:
+    ref = _REF_ATTR.search(re.match(r"<c\b[^>]*?/?>", cell).group(0))
+    return column_index(ref.group(1)) if ref and ref.group(1) else position + 1
+
+
+def _render_row(row_number: int, values: list, first_col: int, last_col: int, fill: str | None,
+                styles: CellStyles, col_styles: dict[int, int], existing: str | None, sheet_name: str) -> str:
+    """Build a row with the cells of a column block replaced, merged with the existing row XML."""
+    open_tag = f'<row r="{row_number}">'
+    before, after, base_styles = [], [], {}
+    if existing is not None:
+        open_tag = re.match(r"<row\b[^>]*?/?>", existing).group(0).replace("/>", ">")
+        open_tag = re.sub(r'\s+spans="[^"]*"', "", open_tag)
+        position = 0
+        for cell in _CELL.findall(existing):
+            position = _cell_column(cell, position)
+            if position < first_col:
+                before.append(cell)
+            elif position > last_col:
+                after.append(cell)
+            else:
+                if re.search(r"<f\b", cell):
+                    raise ValueError(
+                        f"'{sheet_name}'!{column_letters(position)}{row_number} holds a formula; "
+                        "use the VBA import for this workbook")
+                style = _STYLE_ATTR.search(re.match(r"<c\b[^>]*?/?>", cell).group(0))
+                base_styles[position] = int(style.group(1)) if style else 0
+
+    cells = []
+    for col in range(first_col, last_col + 1):
+        offset = col - first_col
+        value = values[offset] if offset < len(values) else None
+        base = base_styles.get(col, col_styles.get(col, 0))
+        if (value is None or value == "") and fill is None and not base and col not in base_styles:
+            # Nothing to write and no format to keep
+            continue
+        cells.append(_cell_xml(f"{column_letters(col)}{row_number}", value, base, fill, styles))
+    return open_tag + "".join(before + cells + after) + "</row>"
+
+
+def _update_dimension(sheet_xml: str, first_row: int, last_row: int, first_col: int, last_col: int) -> str:
+    """Extend the <dimension> of the sheet to a block of rows and columns."""
+    match = re.search(r'<dimension\b[^>]*?ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"', sheet_xml)
+    if not match:
+        return sheet_xml
+    start_col = column_letters(min(column_index(match.group(1)), first_col))
+    end_col = column_letters(max(column_index(match.group(3) or match.group(1)), last_col))
+    end_row = max(int(match.group(4) or match.group(2)), last_row)
+    ref = f'ref="{start_col}{min(int(match.group(2)), first_row)}:{end_col}{end_row}"'
+    return sheet_xml[:match.start()] + re.sub(r'ref="[^"]*"', ref, match.group(0)) + sheet_xml[match.end():]
+
+
+def last_value_row(sheet_xml: str, column: int) -> int:
+    """
+    Find the last row with a value in a column, like Cells(Rows.Count, col).End(xlUp).Row.
+
+    Args:
+        sheet_xml (str): Worksheet part XML.
+        column (int): Column index.
+
+    Returns:
+        int: Row number, or 0 if the column is empty.
+    """
+    sheet_data = _sheet_data(sheet_xml)
+    last = 0
+    for row_number, chunk in _parse_rows((sheet_data.group(1) or "") if sheet_data else ""):
+        position = 0
+        for cell in _CELL.findall(chunk):
+            position = _cell_column(cell, position)
+            if position >= column:
+                if position == column and _has_value(cell):
+                    last = row_number
+                break
+    return last
+
+
+def patch_rows(sheet_xml: str, rows: dict[int, list], first_col: int, last_col: int, styles: CellStyles,
+               fills: dict[int, str | None] | None = None, sheet_name: str = "") -> str:
+    """
+    Write a block of columns on some rows of a worksheet part, as text.
+
+    Args:
+        sheet_xml (str): Worksheet part XML.
+        rows (dict[int, list]): Values by row number; value i goes to column first_col + i.
+            Missing or None values leave the cell empty with its format, like ClearContents.
+        first_col (int): First column of the block.
+        last_col (int): Last column of the block.
+        styles (CellStyles): Styles of the package, extended with the fills and date formats used.
+        fills (dict[int, str | None] | None, optional): ARGB solid fill of the block by row number.
+        sheet_name (str, optional): Sheet name, for error messages.
+
+    Returns:
+        str: The worksheet part XML. Cells outside the block and rows not written are kept as is.
+
+    Raises:
+        ValueError: If a cell of the block holds a formula.
+    """
+    if not rows:
+        return sheet_xml
+    fills = fills or {}
+    sheet_data = _sheet_data(sheet_xml)
+    existing = _parse_rows(sheet_data.group(1) or "")
+    existing_by_row = dict(existing)
+    col_styles = _column_styles(sheet_xml, first_col, last_col)
+
+    new_rows = {
+        row_number: _render_row(row_number, values, first_col, last_col, fills.get(row_number), styles,
+                                col_styles, existing_by_row.get(row_number), sheet_name)
+        for row_number, values in rows.items()
+    }
+
+    content = []
+    new_iter = iter(sorted(new_rows))
+    next_new = next(new_iter, None)
+    for row_number, chunk in existing:
+        if row_number in new_rows:
+            continue
+        while next_new is not None and next_new < row_number:
+            content.append(new_rows[next_new])
+            next_new = next(new_iter, None)
+        content.append(chunk)
+    while next_new is not None:
+        content.append(new_rows[next_new])
+        next_new = next(new_iter, None)
+
+    open_tag = re.match(r"<sheetData\b[^>]*?/?>", sheet_data.group(0)).group(0).replace("/>", ">")
+    sheet_xml = (sheet_xml[:sheet_data.start()] + open_tag + "".join(content) + "</sheetData>"
+                 + sheet_xml[sheet_data.end():])
+    return _update_dimension(sheet_xml, min(rows), max(rows), first_col, last_col)
@@ -4,12 +4,46 @@ Pytest configuration and shared fixtures for Roadmap Manager tests.
 This module provides reusable fixtures for setting up test environments
 with the required file structure and test data.
 """
+import importlib
 import io
 from pathlib import Path
 
 import pytest
 from openpyxl import Workbook
 
+from roadmap.logging_config import configure_logging, stop_logging
+
+
+@pytest.fixture(scope="session", autouse=True)
+def test_log_file(tmp_path_factory):
+    """
+    Write the log of the test session to a temporary folder, not to the project's '.logs'.
+
+    Returns:
+        Path: The log file.
+    """
+    log_file = tmp_path_factory.mktemp("logs") / "roadmap.log"
+    stop_logging()
+    configure_logging(log_file)
+    yield log_file
+    stop_logging()
+
+
+@pytest.fixture(autouse=True)
+def exe_dir(tmp_path, monkeypatch):
+    """
+    Point the CLI output folder (metrics, trace and profile files) to the test's temporary folder.
+
+    Returns:
+        Path: The log file path main() sees; the files are written next to it.
+    """
+    log_file = tmp_path / ".logs" / "roadmap.log"
+    # Imported here: importing roadmap.main at collection would shadow the 'roadmap.main' function export
+    rm_main = importlib.import_module("roadmap.main")
+    monkeypatch.setattr(rm_main, "get_exe_dir", lambda: str(log_file))
+    return log_file
+
+
 @pytest.fixture
 def setup_test_environment(tmp_path):
     """
@@ -177,3 +211,99 @@ def template_bytes(tmp_path):
     wb.save(buffer)
 
     return buffer.getvalue()
+
+
+class SimulatedLocker:
+    """
+    Simulate Excel holding collaborator workbooks open on platforms without mandatory locks.
+
+    Locking a file creates its '~$' owner file and makes the exclusive-handle probe report it
+    as held. A lock can be released explicitly or automatically after a number of probes.
+    """
+
+    def __init__(self):
+        self.held = {}
+
+    def lock(self, path: Path, release_after: int | None = None, owner_file: bool = True) -> None:
+        """
+        Hold a file open.
+
+        Args:
+            path (Path): Workbook to hold.
+            release_after (int | None): Release after this many handle probes.
+            owner_file (bool): Also create the Excel owner file. Use False to simulate a
+                handle held by another process (e.g. a sync client), which releases on probes.
+        """
+        path = Path(path)
+        if owner_file:
+            (path.parent / f"~${path.name}").write_text("owner")
+        self.held[path] = release_after
+
+    def release(self, path: Path) -> None:
+        """Close the file: remove the owner file and the handle."""
+        path = Path(path)
+        self.held.pop(path, None)
+        (path.parent / f"~${path.name}").unlink(missing_ok=True)
+
+    def probe(self, path: Path) -> bool:
+        """Replacement for roadmap.locks.probe_exclusive."""
+        path = Path(path)
+        if path not in self.held:
+            return False
+        remaining = self.held[path]
+        if remaining is not None:
+            if remaining <= 0:
+                self.release(path)
+                return False
+            self.held[path] = remaining - 1
+        return True
+
+    def check(self, path: Path) -> None:
+        """Raise PermissionError like Windows does when the file is held."""
+        if self.probe(path):
+            raise PermissionError(f"[WinError 32] {Path(path).name} is being used by another process")
+
+
+@pytest.fixture
+def simulated_locker(monkeypatch):
+    """
+    Provide a SimulatedLocker wired into roadmap.locks.
+
+    Returns:
+        SimulatedLocker: The locker; use lock()/release() on workbook paths.
+    """
+    import roadmap.locks as locks_module
+
+    locker = SimulatedLocker()
+    monkeypatch.setattr(locks_module, "probe_exclusive", locker.probe)
+    return locker
+
+
+POINTAGE = {
+    "GANI Karim": (37.5, [("S0525", "KEY001", "Lot 1", "Dev", 7.5), ("S0625", "KEY002", "Lot 2", "Test", "3,5")]),
+    "CLIGNIEZ Yann": (20, [("S0525", "KEY001", "Lot 1", "Dev", 4), ("S0725", " KEY003 ", "Lot 3", "Dev", None)]),
+    "MOUHOUT Marouane": (None, [("S0625", "KEY002", "Lot 2", "Test", 8)]),
+}
+
+
+def write_interface(path, name, total, rows):
+    """Write an interface file whose POINTAGE sheet follows the production layout (data from row 4)."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "POINTAGE"
+    ws["B1"], ws["K1"] = name, total
+    for row, (week, key, label, function, hours) in enumerate(rows, start=4):
+        values = ["S", name, week, None, key, label, function, None, None, hours, None]
+        for col, value in enumerate(values, start=1):
+            ws.cell(row=row, column=col, value=value)
+    wb.save(path)
+
+
+@pytest.fixture
+def pointage_environment(setup_test_environment):
+    """Base directory whose interfaces hold POINTAGE rows in the production layout."""
+    rm_folder = setup_test_environment / "RM_Collaborateurs"
+    rm_folder.mkdir(exist_ok=True)
+    for name, (total, rows) in POINTAGE.items():
+        write_interface(rm_folder / f"RM_{name}.xlsx", name, total, rows)
+    return setup_test_environment
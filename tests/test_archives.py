@@ -0,0 +1,173 @@
+"""
+Archive Verification Tests for Roadmap Manager.
+
+Tests for the integrity check of the 'Archived' and 'Deleted' zips (roadmap.archives).
+"""
+import json
+import os
+import zipfile
+
+import pytest
+
+from roadmap.archives import (ARCHIVE_CORRUPT, ARCHIVE_INCOMPLETE,
+                              ARCHIVE_INDEX_FILE_NAME, ArchiveIndex,
+                              ArchiveResult, check_snapshots, summarize,
+                              verify_archive)
+from roadmap.roadmap import RoadmapManager
+
+TIMESTAMP = "01022025_101500"
+
+
+def write_zip(path, files, compression=zipfile.ZIP_DEFLATED):
+    path.parent.mkdir(exist_ok=True)
+    with zipfile.ZipFile(path, "w", compression) as zf:
+        for name, data in files.items():
+            zf.writestr(f"RM_Collaborateurs/{name}", data)
+    return path
+
+
+def flip_byte(path, data):
+    """Damage the stored data of a member without touching the zip structure."""
+    content = path.read_bytes()
+    offset = content.index(data)
+    path.write_bytes(content[:offset] + bytes([content[offset] ^ 0xFF]) + content[offset + 1:])
+
+
+def codes(result):
+    return [problem.code for problem in result.problems]
+
+
+FILES = {"RM_GANI Karim.xlsx": b"gani" * 1000, "RM_CLIGNIEZ Yann.xlsx": b"cligniez" * 1000}
+
+
+class TestVerifyArchive:
+    """Tests for verify_archive()."""
+
+    def test_sound(self, tmp_path):
+        path = write_zip(tmp_path / "a.zip", FILES)
+
+        result = verify_archive(str(path), "Archived/a.zip")
+
+        assert result.ok and result.file == "Archived/a.zip"
+        assert sorted(result.members) == ["RM_Collaborateurs/RM_CLIGNIEZ Yann.xlsx", "RM_Collaborateurs/RM_GANI Karim.xlsx"]
+        assert result.size == 12000
+
+    def test_bad_crc(self, tmp_path):
+        path = write_zip(tmp_path / "a.zip", {"RM_A.xlsx": b"stored data"}, zipfile.ZIP_STORED)
+        flip_byte(path, b"stored data")
+
+        result = verify_archive(str(path), "a.zip")
+
+        assert codes(result) == [ARCHIVE_CORRUPT]
+        assert result.problems[0].message.startswith("RM_Collaborateurs/RM_A.xlsx: Bad CRC-32")
+        assert result.members == ["RM_Collaborateurs/RM_A.xlsx"]
+
+    def test_truncated(self, tmp_path):
+        path = write_zip(tmp_path / "a.zip", FILES)
+        path.write_bytes(path.read_bytes()[:-50])
+
+        result = verify_archive(str(path), "a.zip")
+
+        assert codes(result) == [ARCHIVE_CORRUPT] and result.members == []
+        assert "truncated or damaged" in result.problems[0].message
+
+    def test_empty(self, tmp_path):
+        path = write_zip(tmp_path / "a.zip", {})
+
+        assert codes(verify_archive(str(path), "a.zip")) == [ARCHIVE_INCOMPLETE]
+
+
+class TestCheckSnapshots:
+    """Tests for check_snapshots()."""
+
+    def test_pair_missing_files(self):
+        archived = ArchiveResult(f"Archived/Archive_RM_Collaborateurs_{TIMESTAMP}.zip", members=["a", "b", "c"])
+        deleted = ArchiveResult(f"Deleted/Deleted_RM_Collaborateurs_{TIMESTAMP}.zip", members=["a"])
+        other = ArchiveResult("Deleted/Deleted_RM_Collaborateurs_02022025_101500.zip", members=["a"])
+
+        check_snapshots([archived, deleted, other])
+
+        assert archived.ok and other.ok
+        assert codes(deleted) == [ARCHIVE_INCOMPLETE]
+        assert deleted.problems[0].message == f"2 file(s) of Archive_RM_Collaborateurs_{TIMESTAMP}.zip missing: b, c"
+
+
+class TestArchiveIndex:
+    """Tests for ArchiveIndex."""
+
+    def test_round_trip(self, tmp_path):
+        index = ArchiveIndex.load(tmp_path)
+        result = ArchiveResult("Archived/a.zip", members=["a"], size=3)
+        result.add(ARCHIVE_CORRUPT, "a: Bad CRC-32")
+        index.record(result, 10, 123)
+        index.save()
+
+        cached = ArchiveIndex.load(tmp_path).result("Archived/a.zip", 10, 123)
+
+        assert cached.cached and (cached.members, cached.size, codes(cached)) == (["a"], 3, [ARCHIVE_CORRUPT])
+        assert ArchiveIndex.load(tmp_path).result("Archived/a.zip", 11, 123) is None
+
+    def test_unreadable_file(self, tmp_path):
+        (tmp_path / ARCHIVE_INDEX_FILE_NAME).write_text("{not json")
+
+        assert ArchiveIndex.load(tmp_path).result("Archived/a.zip", 10, 123) is None
+
+
+class TestManagerVerifyArchives:
+    """Tests for RoadmapManager.verify_archives()."""
+
+    @pytest.fixture
+    def archives(self, setup_test_environment):
+        base = setup_test_environment
+        write_zip(base / "Archived" / f"Archive_RM_Collaborateurs_{TIMESTAMP}.zip", FILES)
+        write_zip(base / "Deleted" / f"Deleted_RM_Collaborateurs_{TIMESTAMP}.zip", dict(list(FILES.items())[:1]))
+        stored = write_zip(base / "Deleted" / "Deleted_Missing_RM_collaborators_02022025_101500.zip",
+                           {"RM_A.xlsx": b"stored data"}, zipfile.ZIP_STORED)
+        flip_byte(stored, b"stored data")
+        return base
+
+    def test_verify_and_cache(self, archives, monkeypatch):
+        manager = RoadmapManager(archives)
+
+        results = manager.verify_archives(max_workers=2)
+
+        assert [(r.file, codes(r), r.cached) for r in results] == [
+            (f"Archived/Archive_RM_Collaborateurs_{TIMESTAMP}.zip", [], False),
+            ("Deleted/Deleted_Missing_RM_collaborators_02022025_101500.zip", [ARCHIVE_CORRUPT], False),
+            (f"Deleted/Deleted_RM_Collaborateurs_{TIMESTAMP}.zip", [ARCHIVE_INCOMPLETE], False),
+        ]
+
+        # Nothing changed: no archive is read and the pool is not started
+        def no_pool(*args, **kwargs):
+            raise AssertionError("pool started")
+
+        monkeypatch.setattr("roadmap.roadmap.ProcessPoolExecutor", no_pool)
+        again = manager.verify_archives()
+
+        assert [(r.file, codes(r)) for r in again] == [(r.file, codes(r)) for r in results]
+        assert summarize(again)["verified"] == 0 and all(r.cached for r in again)
+
+    def test_changed_and_removed_archives(self, archives):
+        manager = RoadmapManager(archives)
+        manager.verify_archives(max_workers=2)
+        (archives / "Deleted" / "Deleted_Missing_RM_collaborators_02022025_101500.zip").unlink()
+        rewritten = write_zip(archives / "Deleted" / f"Deleted_RM_Collaborateurs_{TIMESTAMP}.zip", FILES)
+        stat = rewritten.stat()
+        os.utime(rewritten, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        results = manager.verify_archives(max_workers=2)
+
+        assert [(r.file, r.ok, r.cached) for r in results] == [
+            (f"Archived/Archive_RM_Collaborateurs_{TIMESTAMP}.zip", True, True),
+            (f"Deleted/Deleted_RM_Collaborateurs_{TIMESTAMP}.zip", True, False),
+        ]
+        index = json.loads((archives / ARCHIVE_INDEX_FILE_NAME).read_text(encoding="utf-8"))
+        assert sorted(index["files"]) == [r.file for r in results]
+
+    def test_full(self, archives):
+        manager = RoadmapManager(archives)
+        manager.verify_archives(max_workers=2)
+
+        results = manager.verify_archives(max_workers=2, full=True)
+
+        assert not any(r.cached for r in results)
@@ -0,0 +1,144 @@
+"""
+Batch Tests for Roadmap Manager.
+
+Tests for the runs across several base directories (roadmap.batch): manifest, parse cache and
+shared worker pool.
+"""
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from openpyxl import Workbook
+
+import roadmap.roadmap as roadmap_module
+from roadmap.batch import ContentCache, batch_base_dirs, read_manifest
+from roadmap.roadmap import RoadmapManager
+from roadmap.sync import stale_reason
+
+
+def write_lc(base_dir, key="KEY001"):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "LC"
+    ws["B2"], ws["C2"], ws["D2"] = key, "Lot 1", "Dev"
+    wb.save(base_dir / "LC.xlsx")
+
+
+@pytest.fixture
+def two_workspaces(setup_test_environment, tmp_path_factory):
+    """A second base directory, copy of the first one."""
+    other = tmp_path_factory.mktemp("project_b")
+    shutil.copytree(setup_test_environment, other, dirs_exist_ok=True)
+    return setup_test_environment, other
+
+
+class TestManifest:
+    """Tests for read_manifest() and batch_base_dirs()."""
+
+    def test_read_manifest(self, tmp_path):
+        absolute = tmp_path / "abs"
+        manifest = tmp_path / "projects.txt"
+        manifest.write_text(f"# nightly\nproject_a\n\n  {absolute}  \n", encoding="utf-8")
+
+        assert read_manifest(manifest) == [tmp_path / "project_a", absolute]
+
+    def test_batch_base_dirs(self, tmp_path):
+        manifest = tmp_path / "projects.txt"
+        manifest.write_text("a\nb\n", encoding="utf-8")
+
+        base_dirs = batch_base_dirs([str(tmp_path / "b"), str(tmp_path / "c")], str(manifest))
+
+        assert base_dirs == [tmp_path / "b", tmp_path / "c", tmp_path / "a"]
+        assert batch_base_dirs() == []
+
+
+class TestContentCache:
+    """Tests for ContentCache."""
+
+    def test_same_content_parsed_once(self, tmp_path):
+        for name, text in (("a.txt", "same"), ("b.txt", "same"), ("c.txt", "other")):
+            (tmp_path / name).write_text(text)
+        cache = ContentCache()
+        parsed = []
+
+        def parse(path):
+            parsed.append(path.name)
+            return path.read_text()
+
+        values = [cache.get("text", tmp_path / name, parse) for name in ("a.txt", "b.txt", "c.txt")]
+
+        assert values == ["same", "same", "other"]
+        assert parsed == ["a.txt", "c.txt"]
+        assert (cache.hits, cache.misses) == (1, 2)
+        cache.get("length", tmp_path / "a.txt", lambda path: 4)
+        assert cache.misses == 3
+
+    def test_errors_are_not_cached(self, tmp_path):
+        (tmp_path / "a.txt").write_text("x")
+        cache = ContentCache()
+
+        def fail(path):
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            cache.get("text", tmp_path / "a.txt", fail)
+        assert cache.get("text", tmp_path / "a.txt", lambda path: "ok") == "ok"
+
+
+class TestSharedResources:
+    """Tests for the worker pool and parse cache shared by the workspaces of a batch."""
+
+    def test_lc_parsed_once(self, two_workspaces, monkeypatch):
+        calls = []
+        load = roadmap_module.load_lc_excel
+
+        def counting_load(base_dir, delete=True):
+            calls.append(base_dir)
+            return load(base_dir, delete=delete)
+
+        monkeypatch.setattr(roadmap_module, "load_lc_excel", counting_load)
+        cache = ContentCache()
+        results = []
+        for base_dir in two_workspaces:
+            write_lc(base_dir)
+            manager = RoadmapManager(base_dir)
+            manager.content_cache = cache
+            results.append(manager._load_lc_data())
+
+        assert results[0] == results[1] and results[0][0][0] == "KEY001"
+        assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+        assert not any((base_dir / "LC.xlsx").exists() for base_dir in two_workspaces)
+
+    def test_shared_pool(self, two_workspaces, monkeypatch):
+        def no_pool(*args, **kwargs):
+            raise AssertionError("a new pool was started")
+
+        monkeypatch.setattr(roadmap_module, "ProcessPoolExecutor", no_pool)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            for base_dir in two_workspaces:
+                manager = RoadmapManager(base_dir)
+                manager.executor = pool
+                manager.create_interfaces_fast()
+            # The shared pool is still usable after the commands
+            assert pool.submit(lambda: 1).result() == 1
+
+        for base_dir in two_workspaces:
+            assert len(list((base_dir / "RM_Collaborateurs").glob("RM_*.xlsx"))) == 3
+
+    def test_template_checked_once(self, two_workspaces, monkeypatch):
+        checked = []
+
+        def counting_reason(path, lc_rows):
+            checked.append(path.name)
+            return stale_reason(path, lc_rows)
+
+        monkeypatch.setattr("roadmap.sync.stale_reason", counting_reason)
+        cache = ContentCache()
+        for base_dir in two_workspaces:
+            write_lc(base_dir)
+            manager = RoadmapManager(base_dir)
+            manager.content_cache = cache
+            plan = manager.sync(dry_run=True)
+            assert [action.operation for action in plan.actions] == ["template", "create", "create", "create"]
+
+        assert checked.count("RM_template.xlsx") == 1
@@ -0,0 +1,75 @@
+"""
+Benchmark Harness Tests for Roadmap Manager.
+
+Tests for the synthetic workspace generator and the command timing suite,
+run at a tiny scale.
+"""
+import pytest
+from openpyxl import load_workbook
+
+from benchmarks.suite import COMMANDS, compare, run, time_worker_spawn
+from benchmarks.workspace import WorkspaceSpec, fill_pointage, make_workspace
+from roadmap.roadmap import RoadmapManager
+
+TINY = WorkspaceSpec(collaborators=3, rows=4, lc_rows=10)
+
+
+class TestWorkspace:
+    """Tests for the workspace generator."""
+
+    def test_generated_workspace_is_usable(self, tmp_path):
+        base = make_workspace(tmp_path / "base", TINY)
+        manager = RoadmapManager(base)
+        assert manager.all_ok
+
+        manager.create_interfaces()
+        assert fill_pointage(base, TINY) == 3
+
+        ws = load_workbook(base / "RM_Collaborateurs" / "RM_COLLAB0000 Test.xlsx")["POINTAGE"]
+        assert ws["B4"].value == "COLLAB0000 Test"
+        assert ws["K1"].value == sum(ws.cell(row=r, column=10).value for r in range(4, 8))
+        assert load_workbook(base / "Synthèse_RM_CE.xlsm")["LC"]["F12"].value == "KEY00009"
+
+    def test_same_seed_same_content(self, tmp_path):
+        make_workspace(tmp_path / "a", TINY)
+        make_workspace(tmp_path / "b", TINY)
+
+        def extract(base):
+            ws = load_workbook(base / "Synthèse_RM_CE.xlsm")["Extract_MSP"]
+            return [row for row in ws.iter_rows(values_only=True)]
+
+        assert extract(tmp_path / "a") == extract(tmp_path / "b")
+
+
+class TestSuite:
+    """Tests for run() and compare()."""
+
+    def test_run_times_every_command(self, tmp_path):
+        results = run(TINY, workdir=tmp_path)
+
+        assert list(results["timings"]) == list(COMMANDS)
+        assert all(seconds >= 0 for seconds in results["timings"].values())
+        assert results["spec"] == TINY.to_dict()
+        assert len(results["runs"]) == 1
+
+    def test_compare_flags_regressions(self):
+        baseline = {"spec": TINY.to_dict(), "timings": {"create": 1.0, "pointage": 2.0}}
+        results = {"spec": TINY.to_dict(), "timings": {"create": 1.2, "pointage": 3.0, "update": 1.0}}
+
+        comparisons = {c.command: c for c in compare(results, baseline, tolerance=0.25)}
+
+        assert set(comparisons) == {"create", "pointage"}
+        assert not comparisons["create"].regressed
+        assert comparisons["pointage"].regressed
+        assert comparisons["pointage"].ratio == 1.5
+
+    def test_compare_refuses_other_scale(self):
+        with pytest.raises(ValueError, match="differs"):
+            compare({"spec": TINY.to_dict(), "timings": {}},
+                    {"spec": WorkspaceSpec().to_dict(), "timings": {}})
+
+    def test_worker_spawn_skips_cli(self):
+        seconds, info = time_worker_spawn()
+
+        assert seconds > 0
+        assert not info["cli_loaded"]
@@ -0,0 +1,137 @@
+"""
+Interface Check Tests for Roadmap Manager.
+
+Tests for the health check of the interface files (roadmap.check).
+"""
+import json
+import os
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from roadmap.check import (CHECK_CORRUPT, CHECK_LOCKED, CHECK_MISSING_SHEET,
+                           CHECK_STALE_VALIDATION, CHECK_WRONG_NAME,
+                           check_interface, summarize, to_json)
+from roadmap.engine import build_interface
+from roadmap.roadmap import RoadmapManager
+
+
+def build(base_dir, file_name, name):
+    path = base_dir / "RM_Collaborateurs" / file_name
+    build_interface((base_dir / "RM_template.xlsx").read_bytes(), str(path), name)
+    return path
+
+
+def codes(result):
+    return [problem.code for problem in result.problems]
+
+
+class TestCheckInterface:
+    """Tests for check_interface()."""
+
+    def test_healthy(self, setup_test_environment):
+        path = build(setup_test_environment, "RM_GANI Karim.xlsx", "GANI Karim")
+
+        result = check_interface(path)
+
+        assert result.ok and result.collaborator == "GANI Karim"
+
+    def test_wrong_name(self, setup_test_environment):
+        path = build(setup_test_environment, "RM_GANI Karim.xlsx", "CLIGNIEZ Yann")
+
+        result = check_interface(path)
+
+        assert codes(result) == [CHECK_WRONG_NAME]
+        assert "'CLIGNIEZ Yann'" in result.problems[0].message
+
+    def test_missing_sheets_and_validations(self, setup_test_environment):
+        path = setup_test_environment / "RM_Collaborateurs" / "RM_GANI Karim.xlsx"
+        wb = Workbook()
+        wb.active.title = "POINTAGE"
+        wb.active["B1"] = "GANI Karim"
+        wb.save(path)
+
+        result = check_interface(path)
+
+        assert codes(result) == [CHECK_MISSING_SHEET] + [CHECK_STALE_VALIDATION] * 4
+        assert "'LC'" in result.problems[0].message
+
+    def test_stale_validation(self, setup_test_environment):
+        path = build(setup_test_environment, "RM_GANI Karim.xlsx", "GANI Karim")
+        wb = load_workbook(path)
+        ws = wb["POINTAGE"]
+        ws.data_validations.dataValidation = [dv for dv in ws.data_validations.dataValidation
+                                              if "$B$" not in dv.formula1]
+        old = DataValidation(type="list", formula1="='LC'!$B$3:$B$500")
+        old.add("E3:E1000")
+        ws.add_data_validation(old)
+        wb.save(path)
+
+        result = check_interface(path)
+
+        assert codes(result) == [CHECK_STALE_VALIDATION]
+        assert "Column E" in result.problems[0].message and "$B$500" in result.problems[0].message
+
+    def test_corrupt(self, setup_test_environment):
+        path = build(setup_test_environment, "RM_GANI Karim.xlsx", "GANI Karim")
+        path.write_bytes(path.read_bytes()[:-200])
+
+        result = check_interface(path)
+
+        assert codes(result) == [CHECK_CORRUPT]
+
+
+class TestManagerCheck:
+    """Tests for RoadmapManager.check() and its report."""
+
+    def test_check_all(self, setup_test_environment):
+        build(setup_test_environment, "RM_CLIGNIEZ Yann.xlsx", "CLIGNIEZ Yann")
+        build(setup_test_environment, "RM_GANI Karim.xlsx", "GANI")
+        (setup_test_environment / "RM_Collaborateurs" / "RM_MOUHOUT Marouane.xlsx").write_text("not a zip")
+
+        results = RoadmapManager(setup_test_environment).check()
+
+        assert [(r.file, codes(r)) for r in results] == [
+            ("RM_CLIGNIEZ Yann.xlsx", []),
+            ("RM_GANI Karim.xlsx", [CHECK_WRONG_NAME]),
+            ("RM_MOUHOUT Marouane.xlsx", [CHECK_CORRUPT]),
+        ]
+        report = json.loads(to_json(results))
+        assert (report["checked"], report["failed"]) == (3, 2)
+        assert report["problems"] == {CHECK_CORRUPT: 1, CHECK_WRONG_NAME: 1}
+        assert report["files"][0]["ok"] is True
+
+    def test_collaborator_filter(self, setup_test_environment):
+        build(setup_test_environment, "RM_CLIGNIEZ Yann.xlsx", "CLIGNIEZ Yann")
+        build(setup_test_environment, "RM_GANI Karim.xlsx", "GANI")
+
+        results = RoadmapManager(setup_test_environment).check(collaborators=["cliegniez yann", "CLIGNIEZ Yann"])
+
+        assert [r.file for r in results] == ["RM_CLIGNIEZ Yann.xlsx"]
+
+    def test_lists_the_folder_once(self, setup_test_environment, monkeypatch):
+        for idx in range(10):
+            build(setup_test_environment, f"RM_Person {idx}.xlsx", f"Person {idx}")
+        listings = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: listings.append(path) or real_scandir(path))
+
+        results = RoadmapManager(setup_test_environment).check()
+
+        assert len(results) == 10
+        assert listings == [setup_test_environment / "RM_Collaborateurs"]
+
+    def test_locked_file(self, setup_test_environment, monkeypatch):
+        build(setup_test_environment, "RM_GANI Karim.xlsx", "GANI Karim")
+
+        def locked(path, lock_scan=None):
+            raise PermissionError("locked")
+
+        monkeypatch.setattr("roadmap.roadmap.check_interface", locked)
+        manager = RoadmapManager(setup_test_environment)
+        manager.lock_retry_delays = ()
+
+        results = manager.check()
+
+        assert codes(results[0]) == [CHECK_LOCKED]
+        assert summarize(results)["failed"] == 1
@@ -12,3 +12,81 @@ def test_cli_delete_force():
     parser = get_parser()
     args = parser.parse_args(["delete", "--force"])
     assert args.force is True
+
+
+def test_cli_pointage_direct():
+    parser = get_parser()
+    assert parser.parse_args(["pointage"]).direct is False
+    assert parser.parse_args(["pointage", "--direct"]).direct is True
+
+
+def test_cli_pointage_threshold():
+    parser = get_parser()
+    assert parser.parse_args(["pointage"]).threshold is None
+    assert parser.parse_args(["pointage", "--threshold", "32.5"]).threshold == 32.5
+
+
+def test_cli_pointage_filters():
+    parser = get_parser()
+    args = parser.parse_args(["pointage"])
+    assert args.weeks is None and args.collab is None and not args.validate
+    assert parser.parse_args(["pointage", "--validate"]).validate
+    args = parser.parse_args(["pointage", "--weeks", "S0525", "S0725-S0825", "--collab", "GANI Karim"])
+    assert args.weeks == ["S0525", "S0725-S0825"]
+    assert args.collab == ["GANI Karim"]
+
+
+def test_cli_report():
+    parser = get_parser()
+    args = parser.parse_args(["report"])
+    assert (args.output, args.weeks, args.collab, args.threshold, args.details) == (None, None, None, None, False)
+    args = parser.parse_args(["report", "--output", "yearly.xlsx", "--weeks", "S0125-S5225", "--details"])
+    assert (args.output, args.weeks, args.details) == ("yearly.xlsx", ["S0125-S5225"], True)
+
+
+def test_cli_check():
+    parser = get_parser()
+    args = parser.parse_args(["check"])
+    assert (args.collab, args.json) == (None, False)
+    args = parser.parse_args(["check", "--collab", "GANI Karim", "--json"])
+    assert (args.collab, args.json) == (["GANI Karim"], True)
+
+
+def test_cli_archives_verify():
+    parser = get_parser()
+    args = parser.parse_args(["archives", "verify"])
+    assert (args.action, args.archives_action, args.full, args.workers, args.json) == ("archives", "verify", False, 4, False)
+    args = parser.parse_args(["archives", "verify", "--full", "--workers", "8", "--json"])
+    assert (args.full, args.workers, args.json) == (True, 8, True)
+
+
+def test_cli_sync():
+    parser = get_parser()
+    args = parser.parse_args(["sync"])
+    assert (args.action, args.dry_run, args.workers) == ("sync", False, 8)
+    args = parser.parse_args(["sync", "--dry-run", "--workers", "2"])
+    assert (args.dry_run, args.workers) == (True, 2)
+
+
+def test_cli_layout():
+    parser = get_parser()
+    args = parser.parse_args(["layout"])
+    assert (args.action, args.shard, args.prefix_length, args.teams) == ("layout", None, 1, None)
+    args = parser.parse_args(["layout", "--shard", "team", "--teams", "teams.csv"])
+    assert (args.shard, args.teams) == ("team", "teams.csv")
+
+
+def test_cli_batch():
+    parser = get_parser()
+    args = parser.parse_args(["pointage"])
+    assert (args.batch, args.manifest, args.pool_workers) == (None, None, 8)
+    args = parser.parse_args(["--batch", "A", "--batch", "B", "--manifest", "projects.txt", "--pool-workers", "4", "sync"])
+    assert (args.batch, args.manifest, args.pool_workers, args.action) == (["A", "B"], "projects.txt", 4, "sync")
+
+
+def test_cli_lc_extract():
+    parser = get_parser()
+    args = parser.parse_args(["lc-extract"])
+    assert (args.action, args.source, args.sheet) == ("lc-extract", None, "Extract_MSP")
+    args = parser.parse_args(["lc-extract", "--source", "msp.csv"])
+    assert args.source == "msp.csv"
@@ -0,0 +1,216 @@
+"""
+Pointage History Tests for Roadmap Manager.
+
+Tests for the SQLite history store (roadmap.history) and for the
+'pointage --history' / 'query' operations.
+"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import roadmap.history as history_module
+from roadmap.history import (HISTORY_FILE_NAME, AGGREGATES, PointageHistory,
+                             format_table, fs_table, matrix_table)
+from roadmap.pointage import PointageRecord, consumed_hours, weekly_hours
+from roadmap.roadmap import RoadmapManager
+
+
+def record(source, week, key, hours, function="Dev", comment=None, label="Lot 1"):
+    collaborator = source.removeprefix("RM_").removesuffix(".xlsx")
+    cells = ["S", collaborator, week, None, key, label, function, comment, datetime(2025, 2, 3), hours, None]
+    return PointageRecord.from_cells(source, cells, 35)
+
+
+@pytest.fixture
+def store():
+    with PointageHistory(":memory:") as history:
+        yield history
+
+
+class TestUpsert:
+    """Tests for PointageHistory.upsert()."""
+
+    def test_insert_then_unchanged(self, store):
+        records = [record("RM_A.xlsx", "S0525", "KEY001", 4), record("RM_A.xlsx", "S0525", "KEY002", 3)]
+
+        first = store.upsert(records, ["RM_A.xlsx"])
+        second = store.upsert(records, ["RM_A.xlsx"])
+
+        assert (first.inserted, first.unchanged) == (2, 0)
+        assert (second.inserted, second.updated, second.deleted, second.unchanged) == (0, 0, 0, 2)
+        assert len(store) == 2
+
+    def test_changed_and_removed_rows(self, store):
+        store.upsert([record("RM_A.xlsx", "S0525", "KEY001", 4), record("RM_A.xlsx", "S0525", "KEY002", 3),
+                      record("RM_B.xlsx", "S0525", "KEY001", 8)], ["RM_A.xlsx", "RM_B.xlsx"])
+
+        result = store.upsert([record("RM_A.xlsx", "S0525", "KEY001", 5)], ["RM_A.xlsx"])
+
+        assert (result.inserted, result.updated, result.deleted) == (0, 1, 1)
+        assert store.totals(["collaborator"]) == [("A", 5.0), ("B", 8.0)]
+
+    def test_weeks_outside_the_filter_are_kept(self, store):
+        store.upsert([record("RM_A.xlsx", "S0525", "KEY001", 4), record("RM_A.xlsx", "S0625", "KEY001", 6)],
+                     ["RM_A.xlsx"])
+
+        result = store.upsert([], ["RM_A.xlsx"], weeks={"S0625"})
+
+        assert result.deleted == 1
+        assert store.totals(["week"]) == [("S0525", 4.0)]
+
+
+class TestTotals:
+    """Tests for PointageHistory.totals()."""
+
+    @pytest.fixture
+    def filled(self, store):
+        store.upsert([
+            record("RM_A.xlsx", "S5224", "KEY001", 2),
+            record("RM_A.xlsx", "S0525", "KEY001", 4),
+            record("RM_A.xlsx", "S0525", "KEY002", 3, function="Test"),
+            record("RM_B.xlsx", "S0225", "KEY001", 8),
+        ], ["RM_A.xlsx", "RM_B.xlsx"])
+        return store
+
+    def test_group_by_week_is_chronological(self, filled):
+        assert filled.totals(["week"]) == [("S5224", 2.0), ("S0225", 8.0), ("S0525", 7.0)]
+
+    def test_filters(self, filled):
+        assert filled.totals(["collaborator", "function"], year=2025) == [("A", "Dev", 4.0), ("A", "Test", 3.0),
+                                                                         ("B", "Dev", 8.0)]
+        assert filled.totals(["key"], collaborators=["A"], weeks=["S0525"]) == [("KEY001", 4.0), ("KEY002", 3.0)]
+        assert filled.totals([], keys=["KEY001"]) == [(14.0,)]
+
+    def test_unknown_column(self, filled):
+        with pytest.raises(ValueError, match="Unknown grouping column"):
+            filled.totals(["hours"])
+
+
+def aggregate_rows(store):
+    return {table: sorted(store.connection.execute(f"SELECT * FROM {table}").fetchall()) for table in AGGREGATES}
+
+
+class TestAggregates:
+    """Tests for the aggregate tables maintained by triggers."""
+
+    FIRST = [
+        record("RM_A.xlsx", "S5224", "KEY001 Sprint 1", 2),
+        record("RM_A.xlsx", "S0125", "KEY001 Sprint 1", 4),
+        record("RM_A.xlsx", "S0125", "KEY001 Sprint 2", 3, function="Test"),
+        record("RM_A.xlsx", "S0225", "KEY002", 5, label="Lot 2"),
+        record("RM_B.xlsx", "S0125", "KEY001 Sprint 1", 8),
+        record("RM_B.xlsx", "S0225", "KEY001 Sprint 1", None),
+    ]
+    SECOND = [
+        record("RM_A.xlsx", "S5224", "KEY001 Sprint 1", 2),
+        record("RM_A.xlsx", "S0125", "KEY001 Sprint 1", 6),
+        record("RM_A.xlsx", "S0325", "KEY003 Sprint 4", 1, label="Lot 3"),
+        record("RM_B.xlsx", "S0125", "KEY001 Sprint 1", 8),
+        record("RM_B.xlsx", "S0225", "KEY001 Sprint 1", 7.5),
+    ]
+
+    @pytest.fixture
+    def updated(self, store):
+        store.upsert(self.FIRST, ["RM_A.xlsx", "RM_B.xlsx"])
+        store.upsert(self.SECOND, ["RM_A.xlsx", "RM_B.xlsx"])
+        return store
+
+    def test_incremental_matches_rebuild(self, updated):
+        incremental = aggregate_rows(updated)
+
+        updated.rebuild()
+
+        assert aggregate_rows(updated) == incremental
+        assert incremental["agg_collab_week"]
+
+    def test_removed_groups_are_deleted(self, updated):
+        weeks = [row[0] for row in updated.connection.execute("SELECT week FROM agg_collab_week WHERE collaborator = 'A'")]
+
+        assert sorted(weeks) == ["S0125", "S0325", "S5224"]
+
+    def test_exports_match_the_records(self, updated):
+        assert updated.weekly_hours() == weekly_hours(self.SECOND)
+        assert updated.consumed_hours() == consumed_hours(self.SECOND)
+
+    def test_totals_from_aggregates_match_rows(self, updated, monkeypatch):
+        queries = [(["collaborator"], {}), (["week"], {"year": 2025}), (["collaborator", "week"], {"weeks": ["S0125"]}),
+                   (["function", "sprint"], {}), ([], {})]
+        from_aggregates = [updated.totals(by, **filters) for by, filters in queries]
+
+        monkeypatch.setattr(history_module, "TOTALS_AGGREGATES", ())
+
+        assert from_aggregates == [updated.totals(by, **filters) for by, filters in queries]
+
+    def test_rolling_hours(self, updated):
+        rolling = updated.rolling_hours(window=2)
+
+        assert rolling["A"] == {"S5224": 2.0, "S0125": 8.0, "S0325": 1.0}
+        assert rolling["B"] == {"S0125": 8.0, "S0225": 15.5}
+        assert updated.rolling_hours(window=3, weeks=["S0325"]) == {"A": {"S0325": 7.0}}
+        assert updated.rolling_hours(window=4, weeks=["S0325"]) == {"A": {"S0325": 9.0}}
+        with pytest.raises(ValueError):
+            updated.rolling_hours(window=0)
+
+    def test_migrates_older_store(self, tmp_path):
+        path = tmp_path / HISTORY_FILE_NAME
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE pointage (source TEXT NOT NULL, week TEXT NOT NULL, line INTEGER NOT NULL, "
+                     "collaborator TEXT, year INTEGER, week_num INTEGER, key TEXT, label TEXT, function TEXT, "
+                     "comment TEXT, work_date TEXT, hours REAL, entered_at TEXT, updated_at TEXT NOT NULL, "
+                     "PRIMARY KEY (source, week, line))")
+        conn.execute("INSERT INTO pointage VALUES ('RM_A.xlsx', 'S0125', 1, 'A', 2025, 1, 'KEY001 Sprint 1', "
+                     "'Lot 1', 'Dev', NULL, '2025-02-03T00:00:00', 4.0, NULL, '2025-01-06')")
+        conn.commit()
+        conn.close()
+
+        with PointageHistory(path) as history:
+            assert history.weekly_hours() == {"A": {"S0125": 4.0}}
+            assert history.consumed_hours().by_key_function == {("KEY001", "Dev"): 4.0}
+            result = history.upsert([record("RM_A.xlsx", "S0125", "KEY001 Sprint 1", 4)], ["RM_A.xlsx"])
+            assert result.unchanged == 1
+
+
+def test_tables():
+    table = {"B": {"S0225": 4.0}, "A": {"S0225": 0.0, "S0125": 8.0}}
+
+    columns, rows = matrix_table(table, share=True)
+
+    assert columns == ["collaborator", "S0125", "S0225"]
+    assert rows == [("A", 8.0, 0.0), ("B", 0.0, 4.0), ("% non-zero", 0.5, 0.5)]
+    consumed = consumed_hours([record("RM_A.xlsx", "S0125", "KEY001 Sprint 1", 4),
+                               record("RM_B.xlsx", "S0125", "KEY001 Sprint 2", 2)])
+    assert fs_table(consumed) == (["key", "label", "hours", "A", "B"], [("KEY001", "Lot 1", 6.0, 4.0, 2.0)])
+
+
+def test_format_table():
+    assert format_table(["collaborator", "hours"], [("A", 4.0), ("Bob", 12.5)]).splitlines() == [
+        "collaborator  hours", "------------  -----", "A              4.00", "Bob           12.50"]
+
+
+class TestManagerHistory:
+    """Tests for pointage(history=True) and query()."""
+
+    def test_pointage_history_and_query(self, pointage_environment):
+        manager = RoadmapManager(pointage_environment)
+        assert manager.query(["collaborator"]) is None
+
+        assert manager.pointage(history=True)
+
+        assert (pointage_environment / HISTORY_FILE_NAME).exists()
+        assert manager.query(["collaborator"]) == [
+            ("CLIGNIEZ Yann", 4.0), ("GANI Karim", 11.0), ("MOUHOUT Marouane", 8.0)]
+        assert manager.query(["week"], weeks=["S0525-S0625"], collaborators=["GANI Karim"]) == [
+            ("S0525", 7.5), ("S0625", 3.5)]
+        assert manager.history_table("verif", collaborators=["GANI Karim", "MOUHOUT Marouane"]) == (
+            ["collaborator", "S0525", "S0625"],
+            [("GANI Karim", 7.5, 3.5), ("MOUHOUT Marouane", 0.0, 8.0), ("% non-zero", 0.5, 1.0)])
+        with pytest.raises(ValueError):
+            manager.history_table("heatmap")
+
+    def test_pointage_without_history(self, pointage_environment):
+        manager = RoadmapManager(pointage_environment)
+
+        assert manager.pointage()
+
+        assert not (pointage_environment / HISTORY_FILE_NAME).exists()
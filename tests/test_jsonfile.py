@@ -0,0 +1,60 @@
+"""
+JSON State File Tests for Roadmap Manager.
+
+Tests for the tolerant reads and atomic writes shared by the registry, the week and archive
+indexes and the layout index (roadmap.jsonfile).
+"""
+import json
+
+import pytest
+
+import roadmap.jsonfile as jsonfile_module
+from roadmap.jsonfile import load_json, save_json
+
+
+class TestLoadJson:
+    """Tests for load_json()."""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "state.json"
+
+        save_json(path, {"files": {"RM_Hélène DUPONT.xlsx": 1}})
+
+        assert load_json(path, lambda data: data["files"], "TEST", "Ignored.") == {"RM_Hélène DUPONT.xlsx": 1}
+        assert "Hélène" in path.read_text(encoding="utf-8")
+
+    def test_missing_file_is_silent(self, tmp_path, caplog):
+        with caplog.at_level("WARNING"):
+            assert load_json(tmp_path / "absent.json", dict, "TEST", "Ignored.") is None
+
+        assert caplog.text == ""
+
+    @pytest.mark.parametrize("content", ["{not json", '{"version": "x"}'])
+    def test_unreadable_file_is_logged(self, tmp_path, caplog, content):
+        path = tmp_path / "state.json"
+        path.write_text(content, encoding="utf-8")
+
+        with caplog.at_level("WARNING"):
+            assert load_json(path, lambda data: int(data["version"]), "TEST", "Starting over.") is None
+
+        assert "[TEST] Could not read state.json" in caplog.text
+        assert "Starting over." in caplog.text
+
+
+class TestSaveJson:
+    """Tests for save_json()."""
+
+    def test_failed_write_keeps_old_content(self, tmp_path, monkeypatch):
+        path = tmp_path / "state.json"
+        save_json(path, {"version": 1})
+
+        def refused(src, dst):
+            raise PermissionError("locked")
+
+        monkeypatch.setattr(jsonfile_module.os, "replace", refused)
+
+        with pytest.raises(PermissionError):
+            save_json(path, {"version": 2})
+
+        assert json.loads(path.read_text(encoding="utf-8")) == {"version": 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
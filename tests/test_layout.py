@@ -0,0 +1,198 @@
+"""
+Layout Tests for Roadmap Manager.
+
+Tests for the sharded layout of RM_Collaborateurs (roadmap.layout) and the commands using it.
+"""
+import json
+
+import pytest
+from openpyxl import Workbook
+
+from roadmap.layout import (LAYOUT_FLAT, LAYOUT_INDEX_FILE_NAME, LAYOUT_PREFIX,
+                            LAYOUT_TEAM, UNASSIGNED_SHARD, InterfaceLayout,
+                            read_teams, shard_folder_name)
+from roadmap.roadmap import RoadmapManager
+from roadmap.snapshot import WorkspaceSnapshot
+from roadmap.sync import lc_rows_of, stale_reason
+
+NAMES = ["CLIGNIEZ Yann", "GANI Karim", "MOUHOUT Marouane"]
+
+
+def relative_files(folder):
+    return sorted(p.relative_to(folder).as_posix() for p in folder.rglob("*.xlsx"))
+
+
+class TestInterfaceLayout:
+    """Tests for InterfaceLayout and the team file."""
+
+    def test_shards(self, tmp_path):
+        prefix = InterfaceLayout(tmp_path, LAYOUT_PREFIX, prefix_length=2)
+        team = InterfaceLayout(tmp_path, LAYOUT_TEAM, teams={"gani karim": "R&D / Tests"})
+
+        assert prefix.shard("  Élodie MARTIN") == "EL"
+        assert prefix.path_for("GANI Karim") == tmp_path / "GA" / "RM_GANI Karim.xlsx"
+        assert team.shard("gani  KARIM") == "R&D _ Tests"
+        assert team.shard("NEW One") == UNASSIGNED_SHARD
+        assert InterfaceLayout(tmp_path).path_for("GANI Karim") == tmp_path / "RM_GANI Karim.xlsx"
+        assert shard_folder_name("...") == "_"
+
+    def test_read_teams(self, tmp_path):
+        teams_file = tmp_path / "teams.csv"
+        teams_file.write_text("Collaborateur;Equipe\nGANI Karim;Team A\nCLIGNIEZ Yann;\n", encoding="utf-8")
+
+        assert read_teams(teams_file) == {"collaborateur": "Equipe", "gani karim": "Team A"}
+
+    def test_round_trip(self, tmp_path):
+        layout = InterfaceLayout(tmp_path, LAYOUT_TEAM, teams={"gani karim": "Team A"})
+        layout.index([tmp_path / "Team A" / "RM_GANI Karim.xlsx"])
+        layout.save()
+
+        loaded = InterfaceLayout.load(tmp_path)
+
+        assert (loaded.mode, loaded.teams, loaded.paths) == (
+            LAYOUT_TEAM, {"gani karim": "Team A"}, {"GANI Karim": "Team A/RM_GANI Karim.xlsx"})
+        InterfaceLayout(tmp_path).save()
+        assert not (tmp_path / LAYOUT_INDEX_FILE_NAME).exists()
+
+    def test_unreadable_index(self, tmp_path):
+        (tmp_path / LAYOUT_INDEX_FILE_NAME).write_text('{"layout": "diagonal"}', encoding="utf-8")
+
+        assert InterfaceLayout.load(tmp_path).mode == LAYOUT_FLAT
+
+
+class TestShardedSnapshot:
+    """Tests for WorkspaceSnapshot.take() on a sharded folder."""
+
+    def test_subfolders(self, tmp_path):
+        for relative in ("RM_Root.xlsx", "A/RM_Abel.xlsx", "A/~$RM_Abel.xlsx", "B/RM_Bob.xlsx", "B/RM_Root.xlsx"):
+            (tmp_path / relative).parent.mkdir(exist_ok=True)
+            (tmp_path / relative).write_bytes(b"x")
+
+        snapshot = WorkspaceSnapshot.take(tmp_path, shards=True, max_workers=2)
+
+        assert snapshot.interfaces() == [tmp_path / "A" / "RM_Abel.xlsx", tmp_path / "B" / "RM_Bob.xlsx",
+                                         tmp_path / "RM_Root.xlsx"]
+        assert snapshot.entry("RM_Bob.xlsx").size == 1
+        assert snapshot.has_owner_file(tmp_path / "A" / "RM_Abel.xlsx")
+        assert WorkspaceSnapshot.take(tmp_path).interfaces() == [tmp_path / "RM_Root.xlsx"]
+
+        snapshot.record_removed(tmp_path / "B" / "RM_Bob.xlsx")
+        snapshot.record_created(tmp_path / "C" / "RM_Carl.xlsx")
+        assert snapshot.path("RM_Carl.xlsx") == tmp_path / "C" / "RM_Carl.xlsx"
+        assert "RM_Bob.xlsx" not in snapshot.locations
+
+    def test_thousands_of_collaborators(self, tmp_path):
+        names = [f"{chr(65 + i % 26)}{i:04d} Person" for i in range(3000)]
+        for name in names:
+            (tmp_path / f"RM_{name}.xlsx").write_bytes(b"")
+        manager_layout = InterfaceLayout(tmp_path, LAYOUT_PREFIX)
+        for path in WorkspaceSnapshot.take(tmp_path).interfaces():
+            target = manager_layout.path_for(path.stem[3:])
+            target.parent.mkdir(exist_ok=True)
+            path.rename(target)
+
+        snapshot = WorkspaceSnapshot.take(tmp_path, shards=True)
+
+        assert len(snapshot.interfaces()) == 3000
+        assert all(snapshot.path(f"RM_{name}.xlsx") == manager_layout.path_for(name) for name in names)
+
+
+class TestManagerLayout:
+    """Tests for RoadmapManager.set_layout() and the commands on a sharded folder."""
+
+    def test_migrate_and_back(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+        rm_folder = base / "RM_Collaborateurs"
+        manager = RoadmapManager(base)
+
+        assert manager.set_layout(LAYOUT_PREFIX)
+
+        assert relative_files(rm_folder) == ["C/RM_CLIGNIEZ Yann.xlsx", "G/RM_GANI Karim.xlsx",
+                                             "M/RM_MOUHOUT Marouane.xlsx"]
+        index = json.loads((rm_folder / LAYOUT_INDEX_FILE_NAME).read_text(encoding="utf-8"))
+        assert index["layout"] == LAYOUT_PREFIX
+        assert index["collaborators"]["GANI Karim"] == "G/RM_GANI Karim.xlsx"
+
+        teams = {"gani karim": "Team A", "cligniez yann": "Team A"}
+        assert RoadmapManager(base).set_layout(LAYOUT_TEAM, teams=teams)
+        assert relative_files(rm_folder) == ["Team A/RM_CLIGNIEZ Yann.xlsx", "Team A/RM_GANI Karim.xlsx",
+                                             f"{UNASSIGNED_SHARD}/RM_MOUHOUT Marouane.xlsx"]
+
+        assert RoadmapManager(base).set_layout(LAYOUT_FLAT)
+        assert relative_files(rm_folder) == [f"RM_{name}.xlsx" for name in NAMES]
+        assert sorted(p.name for p in rm_folder.iterdir()) == [f"RM_{name}.xlsx" for name in NAMES]
+
+    def test_open_file_moves_nothing(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+        rm_folder = base / "RM_Collaborateurs"
+        (rm_folder / "~$RM_GANI Karim.xlsx").write_bytes(b"owner")
+
+        assert not RoadmapManager(base).set_layout(LAYOUT_PREFIX)
+        assert relative_files(rm_folder)[:3] == [f"RM_{name}.xlsx" for name in NAMES]
+        assert not (rm_folder / LAYOUT_INDEX_FILE_NAME).exists()
+
+    def test_create_and_cleanup(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+        rm_folder = base / "RM_Collaborateurs"
+        RoadmapManager(base).set_layout(LAYOUT_PREFIX)
+        Workbook().save(rm_folder / "G" / "RM_GONE Person.xlsx")
+        (rm_folder / "G" / "RM_GANI Karim.xlsx").unlink()
+
+        RoadmapManager(base).delete_missing_collaborators()
+        RoadmapManager(base).create_interfaces()
+
+        assert relative_files(rm_folder) == ["C/RM_CLIGNIEZ Yann.xlsx", "G/RM_GANI Karim.xlsx",
+                                             "M/RM_MOUHOUT Marouane.xlsx"]
+        assert InterfaceLayout.load(rm_folder).paths == {
+            name: f"{name[0]}/RM_{name}.xlsx" for name in NAMES}
+
+    def test_create_fast(self, setup_test_environment):
+        base = setup_test_environment
+        RoadmapManager(base).set_layout(LAYOUT_PREFIX)
+
+        RoadmapManager(base).create_interfaces_fast(max_workers=2)
+
+        assert relative_files(base / "RM_Collaborateurs") == [f"{name[0]}/RM_{name}.xlsx" for name in NAMES]
+
+    def test_update_and_pointage(self, setup_test_environment_with_data):
+        base = setup_test_environment_with_data
+        manager = RoadmapManager(base)
+        manager.pointage()
+        flat_export = (base / "pointage_output.xml").read_text(encoding="utf-8")
+
+        manager.set_layout(LAYOUT_PREFIX)
+        manager.pointage()
+
+        assert (base / "pointage_output.xml").read_text(encoding="utf-8") == flat_export
+
+        lc_data = [["KEY009", "Label 9", "Function 9"]]
+        wb = Workbook()
+        wb.active.title = "LC"
+        wb["LC"].append([])
+        wb["LC"].append([None, *lc_data[0]])
+        wb.save(base / "LC.xlsx")
+        manager.update_lc()
+
+        for name in NAMES:
+            assert stale_reason(base / "RM_Collaborateurs" / name[0] / f"RM_{name}.xlsx", lc_rows_of(lc_data)) is None
+
+    def test_delete_keeps_layout(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+        RoadmapManager(base).set_layout(LAYOUT_PREFIX)
+
+        RoadmapManager(base).delete_and_archive_interfaces(archive=False)
+
+        layout = InterfaceLayout.load(base / "RM_Collaborateurs")
+        assert (layout.mode, layout.paths) == (LAYOUT_PREFIX, {})
+        assert relative_files(base / "RM_Collaborateurs") == []
+
+    @pytest.mark.parametrize("dry_run", [True, False])
+    def test_sync_creates_in_shard(self, setup_test_environment_with_interfaces, dry_run):
+        base = setup_test_environment_with_interfaces
+        RoadmapManager(base).set_layout(LAYOUT_PREFIX)
+        (base / "RM_Collaborateurs" / "G" / "RM_GANI Karim.xlsx").unlink()
+
+        plan = RoadmapManager(base).sync(dry_run=dry_run, max_workers=2)
+
+        assert [a.path for a in plan.actions] == [base / "RM_Collaborateurs" / "G" / "RM_GANI Karim.xlsx"]
+        assert (base / "RM_Collaborateurs" / "G" / "RM_GANI Karim.xlsx").exists() is not dry_run
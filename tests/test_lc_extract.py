@@ -0,0 +1,142 @@
+"""
+LC Extraction Tests for Roadmap Manager.
+
+Tests for building the LC lookup table from an MS Project extract (Extract_MSP
+sheet or tabular export) and writing it to the synthesis workbook and 'LC.xlsx'.
+"""
+import zipfile
+from datetime import datetime
+
+import pytest
+from openpyxl import load_workbook
+
+from roadmap.helpers import load_lc_excel
+from roadmap.lc_extract import (dedupe_lookup, extract_lookup, lookup_row,
+                                write_lookup_table)
+from roadmap.roadmap import RoadmapManager
+
+
+def msp_row(key, label="Label", work=8, finish=None, function="Func", sprint=1):
+    """Extract_MSP values A-U with B, C, F, N, O and U set."""
+    row = [None] * 21
+    row[1], row[2], row[5], row[13], row[14], row[20] = key, function, label, work, finish, sprint
+    return row
+
+
+@pytest.fixture
+def msp_environment(setup_test_environment):
+    """Test environment whose synthesis workbook has an Extract_MSP sheet and an old lookup table."""
+    path = setup_test_environment / "Synthèse_RM_CE.xlsm"
+    wb = load_workbook(path)
+    ws = wb.create_sheet("Extract_MSP")
+    ws.append(["Id", "Key", "Function", None, None, "Label"])
+    ws.append(msp_row("KEY001", work=0, finish=datetime(2025, 1, 6)))
+    ws.append(msp_row("key001 ", work=0, finish=datetime(2025, 1, 6)))   # duplicate (case, spaces)
+    ws.append(msp_row(None))                                             # skipped, no key
+    ws.append(msp_row("KEY002", label="Other", work=3.5))
+    lc = wb["LC"]
+    lc["B2"], lc["F2"] = "Keys", "Lookup"
+    lc["D3"] = "Function 1"
+    for row in range(3, 8):
+        lc.cell(row=row, column=6, value=f"OLD{row}")
+        lc.cell(row=row, column=11, value=row)
+    wb.save(path)
+    return setup_test_environment
+
+
+class TestLookupRows:
+    """Tests for the Btn_Extract_LC_MSP row mapping and deduplication."""
+
+    def test_lookup_row_maps_columns_and_blanks_zero(self):
+        assert lookup_row(dict(enumerate(msp_row(" KEY ", work="0,0"), start=1))) == [
+            "KEY", "Label", None, None, "Func", 1]
+        assert lookup_row(dict(enumerate(msp_row("KEY", work=2), start=1)))[2] == 2
+        assert lookup_row(dict(enumerate(msp_row("  "), start=1))) is None
+
+    def test_dedupe_keeps_first_occurrence_case_insensitively(self):
+        rows = [msp_row("A", label="x"), msp_row("a", label="X"), msp_row("A", sprint=2), msp_row(None)]
+
+        extract = dedupe_lookup((idx, dict(enumerate(row, start=1))) for idx, row in enumerate(rows, start=2))
+
+        assert [row[0] for row in extract.rows] == ["A", "A"]
+        assert extract.rows[1][5] == 2
+        assert extract.source_rows == 3
+
+    def test_tabular_export(self, tmp_path):
+        source = tmp_path / "msp.csv"
+        lines = [";".join(["Id", "Key", "Function", "", "", "Label"] + [""] * 15)]
+        lines += [";".join(str(v) if v is not None else "" for v in msp_row(key, work=0)) for key in ("KÉY", "kéy", "B")]
+        source.write_bytes("\r\n".join(lines).encode("cp1252"))
+
+        extract = extract_lookup(source)
+
+        assert extract.rows == [["KÉY", "Label", None, None, "Func", "1"], ["B", "Label", None, None, "Func", "1"]]
+        assert extract.source_rows == 3
+
+    def test_unsupported_source(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported"):
+            extract_lookup(tmp_path / "project.mpp")
+
+
+class TestWriteLookupTable:
+    """Tests for writing LC!F:K into the package."""
+
+    def test_replaces_old_rows_and_keeps_other_columns(self, msp_environment):
+        path = msp_environment / "Synthèse_RM_CE.xlsm"
+
+        write_lookup_table(path, [["K1", "L1", None, datetime(2025, 1, 6), "F1", 1]])
+
+        ws = load_workbook(path)["LC"]
+        assert [c.value for c in ws[3][5:11]] == ["K1", "L1", None, datetime(2025, 1, 6), "F1", 1]
+        assert ws["I3"].is_date
+        assert all(ws.cell(row=r, column=c).value is None for r in range(4, 8) for c in range(6, 12))
+        assert ws["B3"].value == "KEY001" and ws["D3"].value == "Function 1"
+
+    def test_refuses_open_workbook(self, msp_environment, simulated_locker):
+        path = msp_environment / "Synthèse_RM_CE.xlsm"
+        simulated_locker.lock(path)
+
+        with pytest.raises(PermissionError):
+            write_lookup_table(path, [["K1", "L1", None, None, "F1", 1]])
+
+
+class TestManagerExtractLc:
+    """extract_lc() writes the lookup table and the LC.xlsx payload."""
+
+    def test_extract_from_workbook(self, msp_environment, caplog):
+        manager = RoadmapManager(msp_environment)
+
+        with caplog.at_level("INFO"):
+            assert manager.extract_lc() is True
+
+        assert "2 unique rows from 4 source rows" in caplog.text
+        ws = load_workbook(manager.synthese_file)["LC"]
+        assert [ws.cell(row=r, column=6).value for r in range(3, 8)] == ["KEY001", "KEY002", None, None, None]
+        assert ws["H4"].value == 3.5
+
+        lc_data = load_lc_excel(msp_environment)
+        assert lc_data[1][:8] == ["KEY001", "Label 1", "Function 1", None, "KEY001", "Label", None, "06/01/2025"]
+        assert lc_data[2][4:7] == ["KEY002", "Other", "3.5"]
+
+    def test_open_workbook_only_writes_payload(self, msp_environment, simulated_locker, caplog):
+        manager = RoadmapManager(msp_environment)
+        with zipfile.ZipFile(manager.synthese_file) as zf:
+            before = zf.read("xl/worksheets/sheet3.xml")
+        simulated_locker.lock(manager.synthese_file)
+
+        with caplog.at_level("WARNING"):
+            assert manager.extract_lc() is True
+
+        assert manager.lc_payload.exists()
+        assert "LC lookup table not updated" in caplog.text
+        with zipfile.ZipFile(manager.synthese_file) as zf:
+            assert zf.read("xl/worksheets/sheet3.xml") == before
+
+    def test_missing_sheet(self, setup_test_environment, caplog):
+        manager = RoadmapManager(setup_test_environment)
+
+        with caplog.at_level("ERROR"):
+            assert manager.extract_lc() is False
+
+        assert "[LC_EXTRACT] Error reading" in caplog.text
+        assert not manager.lc_payload.exists()
@@ -0,0 +1,353 @@
+"""
+Lock-aware File Access Tests for Roadmap Manager.
+
+Tests for owner-file scanning, the deferred retry queue and the consolidated
+lock report, plus their integration in RoadmapManager commands.
+"""
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+import roadmap.pointage as pointage_module
+import roadmap.roadmap as roadmap_module
+from roadmap.locks import (LockScan, backoff_delays, owner_file_names,
+                           probe_exclusive, run_lock_aware)
+from roadmap.roadmap import RoadmapManager
+
+
+class TestLockScan:
+    """Tests for owner-file scanning."""
+
+    def test_owner_file_names(self):
+        """Both the prefixed and the truncated owner file forms are candidates."""
+        assert owner_file_names("RM_GANI Karim.xlsx") == ("~$RM_GANI Karim.xlsx", "~$_GANI Karim.xlsx")
+
+    def test_scan_detects_owner_file(self, tmp_path):
+        """A workbook with an owner file is reported as open."""
+        target = tmp_path / "RM_GANI Karim.xlsx"
+        target.write_bytes(b"data")
+        (tmp_path / "~$RM_GANI Karim.xlsx").write_text("owner")
+
+        scan = LockScan.scan(tmp_path)
+
+        assert scan.has_owner_file(target)
+        assert not scan.has_owner_file(tmp_path / "RM_Other.xlsx")
+
+    def test_scan_detects_truncated_owner_file(self, tmp_path):
+        """Office replaces the first two characters for long names."""
+        target = tmp_path / "RM_MOUHOUT Marouane.xlsx"
+        (tmp_path / "~$_MOUHOUT Marouane.xlsx").write_text("owner")
+
+        assert LockScan.scan(tmp_path).has_owner_file(target)
+
+    def test_owner_file_removed_after_scan_releases_file(self, tmp_path):
+        """Flagged files are re-checked on disk so closing Excel releases them."""
+        target = tmp_path / "RM_GANI Karim.xlsx"
+        owner = tmp_path / "~$RM_GANI Karim.xlsx"
+        owner.write_text("owner")
+        scan = LockScan.scan(tmp_path)
+
+        owner.unlink()
+
+        assert not scan.has_owner_file(target)
+
+    def test_scan_missing_folder(self, tmp_path):
+        """Scanning a missing folder yields an empty scan."""
+        scan = LockScan.scan(tmp_path / "missing")
+
+        assert scan.owner_files == frozenset()
+
+    def test_probe_exclusive_unlocked_and_missing(self, tmp_path):
+        """Plain files and missing files are not reported as held."""
+        target = tmp_path / "file.xlsx"
+        target.write_bytes(b"data")
+
+        assert probe_exclusive(target) is False
+        assert probe_exclusive(tmp_path / "missing.xlsx") is False
+
+    def test_is_locked_uses_simulated_handle(self, tmp_path, simulated_locker):
+        """A handle held by another process is detected without an owner file."""
+        target = tmp_path / "RM_GANI Karim.xlsx"
+        target.write_bytes(b"data")
+        simulated_locker.lock(target, owner_file=False)
+
+        assert LockScan.scan(tmp_path).is_locked(target)
+
+
+class TestBackoff:
+    """Tests for the backoff schedule."""
+
+    def test_backoff_delays(self):
+        assert backoff_delays(3) == (0.2, 0.4, 0.8)
+        assert backoff_delays(2, base_delay=1, factor=3) == (1, 3)
+        assert backoff_delays(0) == ()
+        assert backoff_delays(-1) == ()
+
+
+class TestRunLockAware:
+    """Tests for the deferred retry queue."""
+
+    def _files(self, tmp_path, count=3):
+        files = []
+        for idx in range(count):
+            path = tmp_path / f"RM_{idx}.xlsx"
+            path.write_bytes(b"data")
+            files.append(path)
+        return files
+
+    def test_all_unlocked_processed_in_order(self, tmp_path):
+        files = self._files(tmp_path)
+
+        results, report = run_lock_aware(files, lambda p: p.name, max_workers=3, delays=())
+
+        assert list(results) == files
+        assert report.processed == files
+        assert report.ok
+
+    def test_locked_file_deferred_then_recovered(self, tmp_path, simulated_locker):
+        """A file released during the backoff is processed after the others."""
+        files = self._files(tmp_path)
+        simulated_locker.lock(files[1], release_after=2, owner_file=False)
+        order = []
+        sleeps = []
+
+        def func(path):
+            simulated_locker.check(path)
+            order.append(path)
+            return path.name
+
+        results, report = run_lock_aware(
+            files, func, delays=(0.1, 0.2, 0.4), sleep=sleeps.append)
+
+        assert order == [files[0], files[2], files[1]]
+        assert report.processed == [files[0], files[2]]
+        assert report.recovered == [files[1]]
+        assert results[files[1]] == files[1].name
+        assert sleeps == [0.1, 0.2]
+
+    def test_permanently_locked_file_reported(self, tmp_path, simulated_locker):
+        files = self._files(tmp_path)
+        simulated_locker.lock(files[0])
+        scan = LockScan.scan(tmp_path)
+        called = []
+
+        results, report = run_lock_aware(
+            files, called.append, is_locked=scan.has_owner_file, delays=(0, 0), sleep=lambda d: None)
+
+        assert files[0] not in called
+        assert report.locked == [files[0]]
+        assert files[0] not in results
+        assert not report.ok
+
+    def test_failure_does_not_stop_run(self, tmp_path):
+        files = self._files(tmp_path)
+
+        def func(path):
+            if path == files[0]:
+                raise RuntimeError("corrupt")
+            return True
+
+        results, report = run_lock_aware(files, func, delays=())
+
+        assert report.failed == [(files[0], "corrupt")]
+        assert set(results) == {files[1], files[2]}
+
+    def test_report_log(self, tmp_path, caplog):
+        files = self._files(tmp_path, count=2)
+
+        def func(path):
+            if path == files[0]:
+                raise PermissionError("locked")
+            raise ValueError("bad")
+
+        _, report = run_lock_aware(files, func, delays=(0,), sleep=lambda d: None)
+        with caplog.at_level("INFO"):
+            report.log("TEST", locked_message="Busy {name}", failed_message="Broken {name}: {error}")
+
+        assert "[TEST] Busy RM_0.xlsx" in caplog.text
+        assert "[TEST] Broken RM_1.xlsx: bad" in caplog.text
+        assert "0 processed (0 after retry), 1 locked, 1 failed" in caplog.text
+
+
+class TestManagerLockHandling:
+    """Integration of the lock-aware layer in RoadmapManager commands."""
+
+    def _write_lc(self, tmp_path):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "LC"
+        ws["B2"] = "NewKey"
+        wb.save(tmp_path / "LC.xlsx")
+        wb.close()
+
+    def test_update_lc_skips_open_file_and_updates_others(self, setup_test_environment_with_interfaces, simulated_locker, caplog):
+        tmp_path = setup_test_environment_with_interfaces
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0,)
+        self._write_lc(tmp_path)
+
+        locked = manager.rm_folder / "RM_GANI Karim.xlsx"
+        simulated_locker.lock(locked)
+
+        with caplog.at_level("INFO"):
+            manager.update_lc()
+
+        wb = load_workbook(locked)
+        assert wb["LC"]["B2"].value is None
+        wb.close()
+        wb = load_workbook(manager.rm_folder / "RM_CLIGNIEZ Yann.xlsx")
+        assert wb["LC"]["B2"].value == "NewKey"
+        wb.close()
+        assert "Cannot update RM_GANI Karim.xlsx - it may be open in Excel. Skipped." in caplog.text
+        assert "1 locked" in caplog.text
+
+    def test_update_lc_retries_until_released(self, setup_test_environment_with_interfaces, simulated_locker, caplog):
+        tmp_path = setup_test_environment_with_interfaces
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0, 0, 0)
+        self._write_lc(tmp_path)
+
+        locked = manager.rm_folder / "RM_GANI Karim.xlsx"
+        simulated_locker.lock(locked, release_after=1, owner_file=False)
+
+        with caplog.at_level("INFO"):
+            manager.update_lc()
+
+        wb = load_workbook(locked)
+        assert wb["LC"]["B2"].value == "NewKey"
+        wb.close()
+        assert "Cannot update" not in caplog.text
+        assert "3 processed (1 after retry)" in caplog.text
+
+    def test_update_lc_reports_locked_file_once(self, setup_test_environment_with_interfaces, simulated_locker, caplog):
+        """Each locked attempt is retried silently: the lock report is the only message."""
+        tmp_path = setup_test_environment_with_interfaces
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0, 0, 0)
+        self._write_lc(tmp_path)
+        simulated_locker.lock(manager.rm_folder / "RM_GANI Karim.xlsx", owner_file=False)
+
+        with caplog.at_level("INFO"):
+            manager.update_lc()
+
+        assert caplog.text.count("RM_GANI Karim.xlsx - it may be open in Excel") == 1
+        assert "Skipping this file" not in caplog.text
+
+    def test_pointage_continues_when_file_locked(self, setup_test_environment_with_data, simulated_locker, monkeypatch, caplog):
+        """A locked file no longer aborts the whole export."""
+        tmp_path = setup_test_environment_with_data
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0,)
+
+        locked = manager.rm_folder / "RM_GANI Karim.xlsx"
+        simulated_locker.lock(locked, owner_file=False)
+        original_load = pointage_module.load_workbook
+
+        def guarded_load(path, *args, **kwargs):
+            simulated_locker.check(path)
+            return original_load(path, *args, **kwargs)
+
+        monkeypatch.setattr(pointage_module, "load_workbook", guarded_load)
+
+        with caplog.at_level("WARNING"):
+            result = manager.pointage()
+
+        assert result is True
+        rows = ET.parse(manager.xml_output).getroot().findall("row")
+        assert len(rows) == 4
+        assert "RM_GANI Karim.xlsx" in caplog.text
+
+    def test_pointage_reports_corrupt_file(self, setup_test_environment_with_data, caplog):
+        tmp_path = setup_test_environment_with_data
+        manager = RoadmapManager(tmp_path)
+        (manager.rm_folder / "RM_Broken.xlsx").write_text("not a zip")
+
+        with caplog.at_level("ERROR"):
+            result = manager.pointage()
+
+        assert result is True
+        assert "Error reading RM_Broken.xlsx" in caplog.text
+
+    def test_pointage_warns_for_open_file(self, setup_test_environment_with_data, caplog):
+        tmp_path = setup_test_environment_with_data
+        manager = RoadmapManager(tmp_path)
+        (manager.rm_folder / "~$RM_GANI Karim.xlsx").write_text("owner")
+
+        with caplog.at_level("WARNING"):
+            assert manager.pointage() is True
+
+        assert "RM_GANI Karim.xlsx is open in Excel" in caplog.text
+
+    def test_cleanup_defers_open_orphan(self, setup_test_environment_with_interfaces, simulated_locker, caplog):
+        tmp_path = setup_test_environment_with_interfaces
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0,)
+
+        orphan = manager.rm_folder / "RM_Orphan.xlsx"
+        orphan.write_bytes((manager.rm_folder / "RM_GANI Karim.xlsx").read_bytes())
+        simulated_locker.lock(orphan)
+        (tmp_path / "collabs.xml").write_text(
+            "<collaborators><collaborator>GANI Karim</collaborator></collaborators>", encoding="utf-8")
+
+        with caplog.at_level("WARNING"):
+            manager.delete_missing_collaborators()
+
+        assert orphan.exists()
+        assert not (manager.rm_folder / "RM_CLIGNIEZ Yann.xlsx").exists()
+        assert "Cannot delete RM_Orphan.xlsx - file may be open in Excel" in caplog.text
+
+    def test_delete_aborts_while_files_open(self, setup_test_environment_with_interfaces, caplog):
+        tmp_path = setup_test_environment_with_interfaces
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0, 0)
+        (manager.rm_folder / "~$RM_GANI Karim.xlsx").write_text("owner")
+
+        with caplog.at_level("WARNING"):
+            manager.delete_and_archive_interfaces(archive=True)
+
+        assert "1 file(s) open in Excel: RM_GANI Karim.xlsx" in caplog.text
+        assert "RM_GANI Karim.xlsx is still open in Excel" in caplog.text
+        assert len(list(manager.rm_folder.glob("RM_*.xlsx"))) == 3
+        assert not list((tmp_path / "Archived").iterdir())
+        assert not list((tmp_path / "Deleted").iterdir())
+
+    def test_delete_waits_for_files_closed(self, setup_test_environment_with_interfaces, monkeypatch):
+        tmp_path = setup_test_environment_with_interfaces
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0,)
+        owner = manager.rm_folder / "~$RM_GANI Karim.xlsx"
+        owner.write_text("owner")
+        original_run = roadmap_module.run_lock_aware
+
+        def closed_during_backoff(*args, **kwargs):
+            # Excel closes the file (and removes its owner file) before the first retry
+            return original_run(*args, sleep=lambda seconds: owner.unlink(missing_ok=True), **kwargs)
+
+        monkeypatch.setattr(roadmap_module, "run_lock_aware", closed_during_backoff)
+
+        manager.delete_and_archive_interfaces(archive=False)
+
+        assert not manager.rm_folder.exists()
+        assert len(list((tmp_path / "Deleted").glob("*.zip"))) == 1
+
+    def test_create_fast_retries_template(self, setup_test_environment, monkeypatch):
+        """The template is read again after a transient lock."""
+        tmp_path = setup_test_environment
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0, 0)
+
+        original_read_bytes = Path.read_bytes
+        attempts = {"count": 0}
+
+        def flaky_read_bytes(path):
+            if path == manager.template_file and attempts["count"] == 0:
+                attempts["count"] += 1
+                raise PermissionError("locked")
+            return original_read_bytes(path)
+
+        monkeypatch.setattr(roadmap_module.Path, "read_bytes", flaky_read_bytes)
+
+        manager.create_interfaces_fast(max_workers=1)
+
+        assert len(list(manager.rm_folder.glob("RM_*.xlsx"))) == 3
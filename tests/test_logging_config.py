@@ -0,0 +1,78 @@
+"""
+Logging Setup Tests for Roadmap Manager.
+
+Tests for the gzip log rotation and for worker processes logging through
+the main process.
+"""
+import gzip
+import logging
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from roadmap.logging_config import (LOG_FORMAT, init_worker_logging,
+                                    rotating_file_handler, worker_log_queue)
+
+
+def log_from_worker(idx):
+    """Module-level function, so it can be sent to a worker."""
+    logging.getLogger("roadmap.worker").info(f"[WORKER] file {idx} done")
+    return idx
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestRotation:
+    """Tests for the rotating file handler."""
+
+    def test_rotated_files_are_gzipped(self, tmp_path):
+        log_file = tmp_path / "roadmap.log"
+        handler = rotating_file_handler(log_file, max_bytes=200, backup_count=2)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger = logging.getLogger("roadmap.test_rotation")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            for idx in range(20):
+                logger.warning(f"line {idx:02d} " + "x" * 40)
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["roadmap.log", "roadmap.log.1.gz", "roadmap.log.2.gz"]
+        newest = gzip.decompress((tmp_path / "roadmap.log.1.gz").read_bytes()).decode("utf-8")
+        assert "[WARNING] line" in newest
+        assert "line 19" in log_file.read_text(encoding="utf-8")
+
+
+class TestWorkerLogging:
+    """Tests for init_worker_logging()."""
+
+    def test_worker_records_reach_main_process(self):
+        log_queue = multiprocessing.Queue()
+        handler = ListHandler()
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        try:
+            with ProcessPoolExecutor(max_workers=2, initializer=init_worker_logging, initargs=(log_queue,)) as executor:
+                assert sorted(executor.map(log_from_worker, range(4))) == [0, 1, 2, 3]
+        finally:
+            listener.stop()
+
+        messages = sorted(record.getMessage() for record in handler.records)
+        assert messages == [f"[WORKER] file {idx} done" for idx in range(4)]
+        assert all(record.processName != "MainProcess" for record in handler.records)
+
+    def test_main_process_provides_queue(self):
+        # Logging is configured when roadmap.helpers is imported
+        import roadmap.helpers  # noqa: F401
+
+        assert worker_log_queue() is worker_log_queue() is not None
+        assert any(isinstance(h, logging.handlers.QueueHandler) for h in logging.getLogger().handlers)
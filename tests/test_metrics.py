@@ -0,0 +1,177 @@
+"""
+Run Metrics Tests for Roadmap Manager.
+
+Tests for the metrics file written after each run, in the Prometheus text
+exposition format, and for the counts recorded by the commands.
+"""
+import importlib
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+from openpyxl import Workbook
+
+from roadmap.locks import run_lock_aware
+from roadmap.metrics import (METRICS_STATE_FILE_NAME, ErrorCounter, RunMetrics,
+                             load_state, metrics, render, update_state,
+                             write_metrics)
+from roadmap.roadmap import RoadmapManager
+
+# Import the actual roadmap.main module, not the package attribute
+rm_main = importlib.import_module("roadmap.main")
+
+
+def samples(text):
+    """Parse the metric lines into {'name{labels}': value}."""
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+            for line in text.splitlines() if line and not line.startswith("#")}
+
+
+@pytest.fixture
+def run_metrics():
+    """Start each test with empty run metrics."""
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+class TestMetricsFile:
+    """Tests for the accumulated state and its rendering."""
+
+    def test_histograms_are_cumulative(self, tmp_path):
+        run = RunMetrics()
+        for seconds in (0.01, 0.3, 0.4, 45):
+            run.observe_file(seconds)
+        run.count("skipped", 2)
+        state = update_state(load_state(tmp_path / METRICS_STATE_FILE_NAME), "update", 12.0, True, run, timestamp=100.0)
+
+        values = samples(render(state))
+
+        assert values['roadmap_file_duration_seconds_bucket{command="update",le="0.05"}'] == 1
+        assert values['roadmap_file_duration_seconds_bucket{command="update",le="0.5"}'] == 3
+        assert values['roadmap_file_duration_seconds_bucket{command="update",le="+Inf"}'] == 4
+        assert values['roadmap_file_duration_seconds_count{command="update"}'] == 4
+        assert values['roadmap_command_duration_seconds_bucket{command="update",le="5"}'] == 0
+        assert values['roadmap_command_duration_seconds_bucket{command="update",le="15"}'] == 1
+        assert values['roadmap_files_total{command="update",status="processed"}'] == 4
+        assert values['roadmap_files_total{command="update",status="skipped"}'] == 2
+        assert values['roadmap_last_run_timestamp_seconds{command="update"}'] == 100.0
+        assert values['roadmap_last_run_success{command="update"}'] == 1
+
+    def test_runs_accumulate(self, tmp_path):
+        run = RunMetrics()
+        run.add_rows(10)
+        write_metrics(tmp_path, "pointage", 1.0, True, run)
+        metrics_file = write_metrics(tmp_path, "pointage", 2.0, False, run)
+
+        values = samples(metrics_file.read_text(encoding="utf-8"))
+
+        assert values['roadmap_runs_total{command="pointage",outcome="success"}'] == 1
+        assert values['roadmap_runs_total{command="pointage",outcome="failure"}'] == 1
+        assert values["roadmap_pointage_rows_exported_total"] == 20
+        assert values['roadmap_command_duration_seconds_sum{command="pointage"}'] == 3.0
+        assert values['roadmap_last_run_success{command="pointage"}'] == 0
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_unreadable_state_restarts(self, tmp_path):
+        (tmp_path / METRICS_STATE_FILE_NAME).write_text("{not json", encoding="utf-8")
+
+        write_metrics(tmp_path, "create", 1.0, True, RunMetrics())
+
+        state = json.loads((tmp_path / METRICS_STATE_FILE_NAME).read_text(encoding="utf-8"))
+        assert state["runs"] == {"create": {"success": 1}}
+
+
+class TestCommandMetrics:
+    """Commands record their files and rows."""
+
+    def test_lock_report_durations(self, tmp_path):
+        paths = [tmp_path / "a", tmp_path / "b"]
+
+        _, report = run_lock_aware(paths, lambda path: None)
+
+        assert set(report.durations) == set(paths)
+        assert all(seconds >= 0 for seconds in report.durations.values())
+
+    def test_pointage_counts_files_and_rows(self, setup_test_environment_with_data, run_metrics):
+        RoadmapManager(setup_test_environment_with_data).pointage()
+
+        assert run_metrics.files["processed"] == 3
+        assert len(run_metrics.file_durations) == 3
+        assert run_metrics.rows_exported == 6
+
+    def test_update_counts_locked_files(self, setup_test_environment_with_interfaces, simulated_locker, run_metrics):
+        tmp_path = setup_test_environment_with_interfaces
+        wb = Workbook()
+        wb.active.title = "LC"
+        wb["LC"]["B2"] = "KEY001"
+        wb.save(tmp_path / "LC.xlsx")
+        simulated_locker.lock(tmp_path / "RM_Collaborateurs" / "RM_GANI Karim.xlsx")
+        manager = RoadmapManager(tmp_path)
+        manager.lock_retry_delays = (0,)
+
+        manager.update_lc()
+
+        assert run_metrics.files["processed"] == 2
+        assert run_metrics.files["locked"] == 1
+
+    def test_create_counts_skipped(self, setup_test_environment, run_metrics):
+        RoadmapManager(setup_test_environment).create_interfaces()
+        assert run_metrics.files["processed"] == 3
+
+        (setup_test_environment / "RM_Collaborateurs" / "RM_GANI Karim.xlsx").unlink()
+        run_metrics.reset()
+        RoadmapManager(setup_test_environment).create_interfaces_fast(max_workers=1)
+
+        assert run_metrics.files["processed"] == 1
+        assert run_metrics.files["skipped"] == 2
+        assert len(run_metrics.file_durations) == 1
+
+
+class TestMainMetrics:
+    """main() updates the metrics file after each run."""
+
+    def test_error_counter(self):
+        run = RunMetrics()
+        counter = ErrorCounter(run)
+        logger = logging.getLogger("roadmap.tests.errors")
+        logger.addHandler(counter)
+        try:
+            logger.warning("not counted")
+            logger.error("counted")
+            logger.critical("counted")
+        finally:
+            logger.removeHandler(counter)
+
+        assert run.errors == 2
+        run.reset()
+        assert run.errors == 0
+
+    @pytest.mark.parametrize("complete, outcome", [(True, "success"), (False, "failure")])
+    def test_logged_error_fails_the_run(self, monkeypatch, setup_test_environment, tmp_path, exe_dir,
+                                        complete, outcome):
+        base_dir = setup_test_environment if complete else tmp_path / "empty"
+        base_dir.mkdir(exist_ok=True)
+        fake_args = SimpleNamespace(action="update", basedir=str(base_dir))
+        monkeypatch.setattr(rm_main, "get_parser", lambda: SimpleNamespace(parse_args=lambda: fake_args))
+
+        rm_main.main()
+
+        values = samples(exe_dir.with_name("roadmap_metrics.prom").read_text(encoding="utf-8"))
+        assert values[f'roadmap_runs_total{{command="update",outcome="{outcome}"}}'] == 1
+        assert values['roadmap_last_run_success{command="update"}'] == int(complete)
+
+    def test_failed_run_is_counted(self, monkeypatch, setup_test_environment, tmp_path):
+        log_file = tmp_path / "logs" / "roadmap.log"
+        fake_args = SimpleNamespace(action="lc-extract", basedir=str(setup_test_environment),
+                                    source=str(tmp_path / "missing.csv"), sheet="Extract_MSP")
+        monkeypatch.setattr(rm_main, "get_parser", lambda: SimpleNamespace(parse_args=lambda: fake_args))
+        monkeypatch.setattr(rm_main, "get_exe_dir", lambda: str(log_file))
+
+        with pytest.raises(SystemExit):
+            rm_main.main()
+
+        values = samples(log_file.with_name("roadmap_metrics.prom").read_text(encoding="utf-8"))
+        assert values['roadmap_runs_total{command="lc-extract",outcome="failure"}'] == 1
+        assert values['roadmap_last_run_success{command="lc-extract"}'] == 0
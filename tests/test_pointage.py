@@ -0,0 +1,246 @@
+"""
+Pointage API Tests for Roadmap Manager.
+
+Tests for the typed, streaming access to the POINTAGE sheets of the
+interface files (roadmap.pointage).
+"""
+import threading
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import roadmap.pointage as pointage_module
+from roadmap.pointage import (WEEK_INDEX_FILE_NAME, PointageRecord, WeekCode,
+                              consumed_hours, iter_pointage, nonzero_share,
+                              parse_weeks, read_pointage_file, week_range,
+                              weekly_hours)
+from roadmap.roadmap import RoadmapManager
+from roadmap.snapshot import WorkspaceSnapshot
+from tests.conftest import write_interface
+
+
+class TestPointageRecord:
+    """Tests for record typing."""
+
+    def test_from_cells(self):
+        cells = ["S", "GANI Karim", " S0525 ", None, "KEY001", "Lot 1", "Dev", None, None, "7,5", None]
+
+        record = PointageRecord.from_cells("RM_GANI Karim.xlsx", cells, 37.5)
+
+        assert record.collaborator == "GANI Karim"
+        assert record.week == "S0525"
+        assert record.key == "KEY001"
+        assert record.hours == 7.5
+        assert record.k1 == 37.5
+        assert record.row() == cells + [37.5]
+
+    def test_empty_values(self):
+        record = PointageRecord.from_cells("RM_X.xlsx", [None] * 11, None)
+
+        assert record.hours is None and record.key is None
+        assert record.k1 == 0.0
+
+    def test_compact(self):
+        first = PointageRecord.from_cells("RM_A.xlsx", ["S", "A", "S0525", None, "".join(["KEY", "001"]),
+                                                        "Lot 1", "Dev", None, None, 1, None], 35)
+        second = PointageRecord.from_cells("RM_B.xlsx", ["S", "B", "S0525", None, "".join(["KEY", "001"]),
+                                                         "Lot 1", "Dev", None, None, 2, None], 35)
+
+        assert not hasattr(first, "__dict__")
+        assert first.key is second.key
+        assert first.values[4] is second.values[4]
+        assert first.week is second.week and isinstance(first.week, WeekCode)
+        assert first.hours == 1.0 and isinstance(first.hours, float)
+        assert first.values[9] == 1 and first.total == 35
+
+
+class TestWeekCode:
+    """Tests for the typed week codes."""
+
+    def test_parse(self):
+        code = WeekCode.parse(" S0525 ")
+
+        assert code == "S0525" and (code.week, code.year) == (5, 2025)
+        assert code.monday.isoformat() == "2025-01-27"
+        assert WeekCode.parse("S5325").monday is None
+        assert WeekCode.parse(None) is None
+        assert WeekCode.parse("Semaine 5").week is None
+
+    def test_chronological_order(self):
+        codes = [WeekCode.parse(c) for c in ("S0126", "other", "S5225", "S0225")]
+
+        assert sorted(codes, key=WeekCode.sort_key) == ["S0225", "S5225", "S0126", "other"]
+
+
+class TestWeekFilters:
+    """Tests for the --weeks filter values."""
+
+    def test_week_range_crosses_years(self):
+        assert week_range("S5225", "S0226") == ["S5225", "S0126", "S0226"]
+        assert week_range("S5226", "S0127") == ["S5226", "S5326", "S0127"]
+
+    def test_parse_weeks(self):
+        assert parse_weeks(["S0525,S0725-S0825", " S0925 "]) == {"S0525", "S0725", "S0825", "S0925"}
+        assert parse_weeks(["s0525", "s0625-s0725"]) == {"S0525", "S0625", "S0725"}
+
+    @pytest.mark.parametrize("spec", ["S0825-S0525", "S0525-week8", "S6025-S0126", "foo", "S6025", "S00525", "S0025"])
+    def test_invalid_range(self, spec):
+        with pytest.raises(ValueError):
+            parse_weeks([spec])
+
+
+class TestIterPointage:
+    """Tests for the streaming readers."""
+
+    def test_read_file(self, pointage_environment):
+        path = pointage_environment / "RM_Collaborateurs" / "RM_GANI Karim.xlsx"
+
+        records = list(read_pointage_file(path))
+
+        assert [(r.week, r.key, r.hours, r.k1) for r in records] == [
+            ("S0525", "KEY001", 7.5, 37.5), ("S0625", "KEY002", 3.5, 37.5)]
+        assert records[0].source == "RM_GANI Karim.xlsx"
+        assert [r.sheet_row for r in records] == [4, 5]
+
+    def test_is_lazy(self, pointage_environment):
+        files = sorted((pointage_environment / "RM_Collaborateurs").glob("RM_*.xlsx"))
+        files.append(pointage_environment / "RM_Collaborateurs" / "RM_Missing.xlsx")
+
+        records = iter_pointage(files)
+        first = next(records)
+
+        assert first.collaborator == "CLIGNIEZ Yann"
+        records.close()
+
+    def test_filters(self, pointage_environment):
+        files = (pointage_environment / "RM_Collaborateurs").glob("RM_*.xlsx")
+
+        records = list(iter_pointage(files, collaborators=["gani  karim", "MOUHOUT Marouane"], weeks=["S0625"]))
+
+        assert sorted(r.collaborator for r in records) == ["GANI Karim", "MOUHOUT Marouane"]
+        assert {r.week for r in records} == {"S0625"}
+
+    def test_unreadable_file_is_skipped(self, pointage_environment, caplog):
+        rm_folder = pointage_environment / "RM_Collaborateurs"
+        (rm_folder / "RM_Broken.xlsx").write_text("not a zip")
+
+        with caplog.at_level("ERROR"):
+            records = list(iter_pointage(sorted(rm_folder.glob("RM_*.xlsx"))))
+
+        assert len(records) == 5
+        assert "Error reading RM_Broken.xlsx" in caplog.text
+
+    def test_manager_iter_pointage(self, pointage_environment):
+        manager = RoadmapManager(pointage_environment)
+
+        hours = {}
+        for record in manager.iter_pointage(weeks={"S0525"}):
+            hours[record.collaborator] = hours.get(record.collaborator, 0) + record.hours
+
+        assert hours == {"CLIGNIEZ Yann": 4.0, "GANI Karim": 7.5}
+        assert not manager.xml_output.exists()
+
+
+def exported_rows(manager):
+    return [[col.text for col in row] for row in ET.parse(manager.xml_output).getroot()]
+
+
+class TestFilteredPointage:
+    """Tests for pointage(weeks=..., collaborators=...)."""
+
+    def test_weeks_and_collaborators(self, pointage_environment):
+        manager = RoadmapManager(pointage_environment)
+
+        assert manager.pointage(weeks=["S0525-S0625"], collaborators=["gani karim", "CLIGNIEZ Yann"])
+
+        assert [(row[1], row[2]) for row in exported_rows(manager)] == [
+            ("CLIGNIEZ Yann", "S0525"), ("GANI Karim", "S0525"), ("GANI Karim", "S0625")]
+
+    def test_no_match_exports_empty_xml(self, pointage_environment):
+        manager = RoadmapManager(pointage_environment)
+
+        assert not manager.pointage(collaborators=["Nobody"])
+
+        assert exported_rows(manager) == []
+
+    def test_week_index_skips_files(self, pointage_environment, monkeypatch):
+        RoadmapManager(pointage_environment).pointage()
+        assert (pointage_environment / WEEK_INDEX_FILE_NAME).exists()
+
+        opened = []
+        real_load = pointage_module.load_workbook
+
+        def load_workbook(path, *args, **kwargs):
+            opened.append(path.name)
+            return real_load(path, *args, **kwargs)
+
+        monkeypatch.setattr(pointage_module, "load_workbook", load_workbook)
+        manager = RoadmapManager(pointage_environment)
+        assert manager.pointage(weeks=["S0725"])
+
+        assert opened == ["RM_CLIGNIEZ Yann.xlsx"]
+        assert [row[4] for row in exported_rows(manager)] == [" KEY003 "]
+
+    def test_readers_do_not_touch_the_snapshot(self, pointage_environment, monkeypatch):
+        threads = set()
+        real_entry = WorkspaceSnapshot.entry
+        monkeypatch.setattr(WorkspaceSnapshot, "entry",
+                            lambda snapshot, name: threads.add(threading.current_thread()) or real_entry(snapshot, name))
+        manager = RoadmapManager(pointage_environment)
+        manager.max_io_workers = 3
+
+        assert manager.pointage()
+
+        assert threads == {threading.current_thread()}
+        assert (pointage_environment / WEEK_INDEX_FILE_NAME).exists()
+
+    def test_changed_file_is_read_again(self, pointage_environment):
+        RoadmapManager(pointage_environment).pointage()
+        rm_folder = pointage_environment / "RM_Collaborateurs"
+        write_interface(rm_folder / "RM_MOUHOUT Marouane.xlsx", "MOUHOUT Marouane", 40,
+                        [("S0725", "KEY004", "Lot 4", "Dev", 2)])
+
+        manager = RoadmapManager(pointage_environment)
+        assert manager.pointage(weeks=["S0725"])
+
+        assert sorted(row[1] for row in exported_rows(manager)) == ["CLIGNIEZ Yann", "MOUHOUT Marouane"]
+
+
+def record(collaborator, week, key, label, function, hours):
+    return PointageRecord.from_cells(f"RM_{collaborator}.xlsx",
+                                     ["S", collaborator, week, None, key, label, function, None, None, hours, None], 35)
+
+
+class TestAggregations:
+    """Tests for the Vérif_Collaborateur and Fichier de synthèse aggregations."""
+
+    RECORDS = [
+        record("A", "S0525", "KEY001 Sprint 1", "Lot 1", "Dev", 4),
+        record("A", "S0525", "KEY001 Sprint 2", "Lot 1", "Test", "3,5"),
+        record("A", "S0126", "KEY002 Sprint 1", "Lot 2", "Dev", 8),
+        record("B", "S0525", "KEY001 Sprint 1", "Lot 1", "Dev", 2),
+        record("B", "S0126", "KEY003", "Lot 3", "Dev", 1),
+        record("B", "S0126", "KEY001 Sprint 1", "Lot 1", "Dev", None),
+    ]
+
+    def test_weekly_hours(self):
+        table = weekly_hours(self.RECORDS)
+
+        assert table == {"A": {"S0525": 7.5, "S0126": 8.0}, "B": {"S0525": 2.0, "S0126": 1.0}}
+
+    def test_nonzero_share(self):
+        table = weekly_hours(self.RECORDS[:4])
+
+        share = nonzero_share(table, ["A", "B", "C", "D"])
+
+        assert list(share) == ["S0525", "S0126"]
+        assert share == {"S0525": 0.5, "S0126": 0.25}
+
+    def test_consumed_hours(self):
+        result = consumed_hours(self.RECORDS)
+
+        assert result.by_key_function == {("KEY001", "Dev"): 6.0, ("KEY001", "Test"): 3.5, ("KEY002", "Dev"): 8.0}
+        assert result.by_label == {"Lot 1": 9.5, "Lot 2": 8.0, "Lot 3": 1.0}
+        assert result.by_key_label == {("KEY001", "Lot 1"): 9.5, ("KEY002", "Lot 2"): 8.0}
+        assert result.by_collaborator == {("KEY001", "Lot 1", "A"): 7.5, ("KEY001", "Lot 1", "B"): 2.0,
+                                          ("KEY002", "Lot 2", "A"): 8.0}
@@ -0,0 +1,149 @@
+"""
+Profiling Tests for Roadmap Manager.
+
+Tests for '--profile': cProfile statistics and tracemalloc summary, merged
+across pool threads and worker processes.
+"""
+import importlib
+import pstats
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+import roadmap.profiling as profiling_module
+from roadmap.locks import run_lock_aware
+from roadmap.pointage import consumed_hours
+from roadmap.profiling import profile_thread, profiler, run_profiled
+from roadmap.roadmap import RoadmapManager
+
+# Import the actual roadmap.main module, not the package attribute
+rm_main = importlib.import_module("roadmap.main")
+
+
+def allocate_rows(count):
+    """Module-level function, so it can be sent to a worker."""
+    rows = [[f"cell {idx}"] * 10 for idx in range(count)]
+    if count < 0:
+        raise ValueError("negative")
+    return len(rows)
+
+
+def profiled_functions(prof_file):
+    return {func[2] for func in pstats.Stats(str(prof_file)).stats}
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    """Profile one test into a temporary folder."""
+    output = tmp_path / ".logs"
+    profiler.enable(output, command="test")
+    yield output
+    profiler.disable()
+
+
+class TestProfiler:
+    """Tests for the profile files."""
+
+    def test_disable_without_enable(self):
+        assert profiler.disable() is None
+
+    def test_writes_stats_and_summary(self, tmp_path):
+        profiler.enable(tmp_path / ".logs", command="update")
+        allocate_rows(20000)
+        prof_file, text_file = profiler.disable()
+
+        assert prof_file.name == "profile_update.prof"
+        assert "allocate_rows" in profiled_functions(prof_file)
+        summary = text_file.read_text(encoding="utf-8")
+        assert "Main process peak" in summary
+        assert "Top allocation sites, main process" in summary
+        assert not tracemalloc.is_tracing()
+
+    def test_thread_pool_calls_are_merged(self, profile_dir, tmp_path):
+        paths = [tmp_path / f"{idx}.txt" for idx in range(3)]
+
+        run_lock_aware(paths, profile_thread(lambda path: allocate_rows(10)), max_workers=3)
+
+        prof_file, _ = profiler.disable()
+        stats = pstats.Stats(str(prof_file)).stats
+        calls = [value[1] for func, value in stats.items() if func[2] == "allocate_rows"]
+        assert calls == [3]
+
+    def test_profile_thread_is_identity_when_disabled(self):
+        assert profile_thread(allocate_rows) is allocate_rows
+
+    def test_profile_thread_is_identity_when_profile_follows_threads(self, profile_dir, monkeypatch):
+        monkeypatch.setattr(profiling_module, "PROFILER_FOLLOWS_THREADS", True)
+
+        assert profile_thread(allocate_rows) is allocate_rows
+
+    def test_retry_in_calling_thread_keeps_command_profile(self, profile_dir, tmp_path):
+        paths = [tmp_path / f"{idx}.txt" for idx in range(2)]
+        attempts = []
+
+        def read(path):
+            attempts.append(path)
+            if attempts.count(path) == 1:
+                raise PermissionError("locked")
+            return allocate_rows(10)
+
+        _, report = run_lock_aware(paths, profile_thread(read), max_workers=2, delays=(0,), sleep=lambda _: None)
+        consumed_hours([])
+
+        prof_file, _ = profiler.disable()
+        assert report.recovered == paths
+        assert {"read", "consumed_hours"} <= profiled_functions(prof_file)
+
+    def test_profiled_command_with_threads(self, pointage_environment, profile_dir):
+        manager = RoadmapManager(pointage_environment)
+        manager.max_io_workers = 3
+
+        assert manager.pointage()
+
+        prof_file, _ = profiler.disable()
+        assert "read_pointage_file" in profiled_functions(prof_file)
+
+
+class TestWorkerProfiles:
+    """Tests for run_profiled()."""
+
+    def test_disabled(self):
+        assert run_profiled(False, allocate_rows, 5) == (5, None)
+
+    def test_returns_profile(self):
+        result, profile = run_profiled(True, allocate_rows, 20000)
+
+        assert result == 20000
+        assert any(func[2] == "allocate_rows" for func in profile["stats"])
+        assert profile["peak"] > 0
+        assert any("test_profiling.py" in site for site, _, _ in profile["sites"])
+
+    def test_profile_attached_to_error(self):
+        with pytest.raises(ValueError) as exc:
+            run_profiled(True, allocate_rows, -1)
+        assert "stats" in exc.value.profile
+
+    def test_parallel_create_merges_workers(self, setup_test_environment, profile_dir):
+        RoadmapManager(setup_test_environment).create_interfaces_fast(max_workers=2)
+
+        prof_file, text_file = profiler.disable()
+        assert "build_interface" in profiled_functions(prof_file)
+        assert "Worker calls: 3" in text_file.read_text(encoding="utf-8")
+
+
+class TestMainProfile:
+    """--profile profiles the command."""
+
+    def test_main_writes_profile(self, monkeypatch, setup_test_environment, tmp_path):
+        log_file = tmp_path / "logs" / "roadmap.log"
+        fake_args = SimpleNamespace(action="pointage", basedir=str(setup_test_environment),
+                                    threshold=0.4, direct=False, profile=True)
+        monkeypatch.setattr(rm_main, "get_parser", lambda: SimpleNamespace(parse_args=lambda: fake_args))
+        monkeypatch.setattr(rm_main, "get_exe_dir", lambda: str(log_file))
+
+        rm_main.main()
+
+        assert "pointage" in profiled_functions(log_file.with_name("profile_pointage.prof"))
+        assert log_file.with_name("profile_pointage.txt").exists()
+        assert not profiler.enabled
@@ -0,0 +1,194 @@
+"""
+Collaborator Registry Tests for Roadmap Manager.
+
+Tests for the persistent collaborator registry and its use as a fallback
+when 'collabs.xml' has already been consumed.
+"""
+import json
+
+from openpyxl import Workbook
+
+from roadmap.registry import (REGISTRY_FILE_NAME, CollaboratorRegistry,
+                              file_name_key, interface_file_name,
+                              interface_key, normalize_collab_key)
+from roadmap.roadmap import RoadmapManager
+
+
+class TestNormalization:
+    """Tests for key normalization helpers."""
+
+    def test_normalize_collab_key(self):
+        assert normalize_collab_key("  GANI   Karim ") == "gani karim"
+        assert normalize_collab_key("HÉLÈNE Dupré") == "helene dupre"
+
+    def test_file_name_key_keeps_accents(self):
+        assert file_name_key("  HÉLÈNE   Dupré ") == "hélène dupré"
+        assert file_name_key("Hélène DUPONT") != file_name_key("Helene DUPONT")
+
+    def test_interface_file_name(self):
+        assert interface_file_name("GANI Karim") == "RM_GANI Karim.xlsx"
+
+    def test_interface_key(self):
+        assert interface_key("RM_Collaborateurs/RM_gani  KARIM.xlsx") == "gani karim"
+        assert interface_key("RM_template.xlsx") == "template"
+        assert interface_key("RM_Hélène DUPONT.xlsx") == "hélène dupont"
+        assert interface_key("notes.xlsx") is None
+
+
+class TestCollaboratorRegistry:
+    """Tests for CollaboratorRegistry sync, diff and persistence."""
+
+    def test_load_missing_registry_is_empty(self, tmp_path):
+        registry = CollaboratorRegistry.load(tmp_path)
+
+        assert len(registry) == 0
+        assert registry.version == 0
+        assert registry.exists is False
+
+    def test_first_sync_adds_everyone(self, tmp_path):
+        registry = CollaboratorRegistry.load(tmp_path)
+
+        diff = registry.sync(["GANI Karim", "NAZIH Imane"])
+
+        assert diff.added == ["GANI Karim", "NAZIH Imane"]
+        assert diff.removed == []
+        assert registry.version == 1
+        assert (tmp_path / REGISTRY_FILE_NAME).exists()
+
+    def test_sync_diff_and_version(self, tmp_path):
+        registry = CollaboratorRegistry.load(tmp_path)
+        registry.sync(["GANI Karim", "NAZIH Imane"])
+
+        diff = registry.sync(["gani karim", "YAHYA Oumaima"])
+
+        assert diff.added == ["YAHYA Oumaima"]
+        assert diff.removed == ["NAZIH Imane"]
+        assert diff.unchanged == ["GANI Karim"]
+        assert registry.version == 2
+        assert registry.names() == ["gani karim", "YAHYA Oumaima"]
+
+    def test_sync_without_change_keeps_version(self, tmp_path):
+        registry = CollaboratorRegistry.load(tmp_path)
+        registry.sync(["GANI Karim"])
+
+        diff = registry.sync(["GANI Karim", " ", "GANI  Karim"])
+
+        assert not diff.changed
+        assert registry.version == 1
+        assert len(registry) == 1
+
+    def test_membership_ignores_case_not_accents(self, tmp_path):
+        registry = CollaboratorRegistry.load(tmp_path)
+        registry.sync(["Hélène DUPRÉ", "Helene DUPRE"])
+
+        assert "hélène  dupré" in registry
+        assert "Other Person" not in registry
+        assert registry.names() == ["Hélène DUPRÉ", "Helene DUPRE"]
+
+    def test_load_rekeys_accent_free_entries(self, tmp_path):
+        (tmp_path / REGISTRY_FILE_NAME).write_text(json.dumps({"version": 1, "collaborators": [
+            {"name": "Hélène DUPONT", "key": "helene dupont", "interface": "RM_Hélène DUPONT.xlsx"}]}),
+            encoding="utf-8")
+
+        registry = CollaboratorRegistry.load(tmp_path)
+
+        assert "Hélène DUPONT" in registry
+        assert "Helene DUPONT" not in registry
+
+    def test_reload_persists_state(self, tmp_path):
+        registry = CollaboratorRegistry.load(tmp_path)
+        registry.sync(["GANI Karim"])
+        registry.sync(["GANI Karim", "NAZIH Imane"])
+
+        reloaded = CollaboratorRegistry.load(tmp_path)
+
+        assert reloaded.names() == ["GANI Karim", "NAZIH Imane"]
+        assert reloaded.version == 2
+        data = json.loads((tmp_path / REGISTRY_FILE_NAME).read_text(encoding="utf-8"))
+        assert data["collaborators"][1] == {
+            "name": "NAZIH Imane", "key": "nazih imane", "interface": "RM_NAZIH Imane.xlsx"}
+
+    def test_corrupt_registry_starts_empty(self, tmp_path, caplog):
+        (tmp_path / REGISTRY_FILE_NAME).write_text("{not json", encoding="utf-8")
+
+        with caplog.at_level("WARNING"):
+            registry = CollaboratorRegistry.load(tmp_path)
+
+        assert len(registry) == 0
+        assert "Could not read" in caplog.text
+
+
+class TestManagerRegistryFallback:
+    """RoadmapManager uses the registry when collabs.xml is absent."""
+
+    def test_create_uses_registry_after_xml_consumed(self, setup_test_environment):
+        tmp_path = setup_test_environment
+        manager = RoadmapManager(tmp_path)
+        manager.create_interfaces()
+
+        # collabs.xml is gone; remove one interface and run again without VBA
+        (manager.rm_folder / "RM_GANI Karim.xlsx").unlink()
+        assert not manager.collabs_xml.exists()
+        RoadmapManager(tmp_path).create_interfaces()
+
+        assert (manager.rm_folder / "RM_GANI Karim.xlsx").exists()
+
+    def registry_only(self, base_dir):
+        CollaboratorRegistry.load(base_dir).sync(["CLIGNIEZ Yann", "GANI Karim", "NEW Person"])
+        (base_dir / "collabs.xml").unlink()
+        # Neither collabs.xml nor a readable synthesis workbook: the registry is the last source
+        (base_dir / "Synthèse_RM_CE.xlsm").write_bytes(b"not a zip package")
+
+    def test_cleanup_does_not_delete_from_registry(self, setup_test_environment_with_interfaces, caplog):
+        tmp_path = setup_test_environment_with_interfaces
+        self.registry_only(tmp_path)
+
+        with caplog.at_level("WARNING"):
+            RoadmapManager(tmp_path).delete_missing_collaborators()
+
+        assert (tmp_path / "RM_Collaborateurs" / "RM_MOUHOUT Marouane.xlsx").exists()
+        assert "not deleted from the collaborator registry alone" in caplog.text
+
+    def test_sync_does_not_archive_from_registry(self, setup_test_environment_with_interfaces):
+        tmp_path = setup_test_environment_with_interfaces
+        self.registry_only(tmp_path)
+
+        plan = RoadmapManager(tmp_path).sync(max_workers=1)
+
+        rm_folder = tmp_path / "RM_Collaborateurs"
+        assert [(action.operation, action.path.name) for action in plan.actions] == [
+            ("create", "RM_NEW Person.xlsx")]
+        assert (rm_folder / "RM_MOUHOUT Marouane.xlsx").exists()
+        assert (rm_folder / "RM_NEW Person.xlsx").exists()
+
+    def test_cleanup_keeps_files_differing_only_by_case(self, setup_test_environment_with_interfaces):
+        tmp_path = setup_test_environment_with_interfaces
+        rm_folder = tmp_path / "RM_Collaborateurs"
+        wb = Workbook()
+        wb.active.title = "POINTAGE"
+        wb.save(rm_folder / "RM_nazih imane.xlsx")
+        (tmp_path / "collabs.xml").write_text(
+            "<collaborators><collaborator>NAZIH Imane</collaborator></collaborators>", encoding="utf-8")
+
+        RoadmapManager(tmp_path).delete_missing_collaborators()
+
+        assert (rm_folder / "RM_nazih imane.xlsx").exists()
+        assert not (rm_folder / "RM_GANI Karim.xlsx").exists()
+
+    def test_xml_syncs_registry(self, setup_test_environment):
+        tmp_path = setup_test_environment
+        manager = RoadmapManager(tmp_path)
+
+        manager.create_interfaces()
+
+        registry = CollaboratorRegistry.load(tmp_path)
+        assert registry.names() == ["CLIGNIEZ Yann", "GANI Karim", "MOUHOUT Marouane"]
+
+    def test_empty_xml_does_not_wipe_registry(self, setup_test_environment):
+        tmp_path = setup_test_environment
+        CollaboratorRegistry.load(tmp_path).sync(["GANI Karim"])
+        (tmp_path / "collabs.xml").write_text("<collaborators></collaborators>", encoding="utf-8")
+
+        RoadmapManager(tmp_path).create_interfaces()
+
+        assert CollaboratorRegistry.load(tmp_path).names() == ["GANI Karim"]
@@ -0,0 +1,128 @@
+"""
+Report Tests for Roadmap Manager.
+
+Tests for the summary workbook written by 'roadmap report' (roadmap.report).
+"""
+import pytest
+from openpyxl import load_workbook
+
+from roadmap.pointage import PointageRecord
+from roadmap.report import (DETAILS_SHEET, FUNCTIONS_SHEET, HEATMAP_SHEET,
+                            REPORT_FILE_NAME, write_report)
+from roadmap.roadmap import RoadmapManager
+
+
+def record(collaborator, week, function, hours):
+    return PointageRecord.from_cells(f"RM_{collaborator}.xlsx",
+                                     ["S", collaborator, week, None, "KEY001", "Lot 1", function, None, None, hours, None], 35)
+
+
+def sheet_values(path, name):
+    wb = load_workbook(path)
+    try:
+        return [list(row) for row in wb[name].iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+class TestWriteReport:
+    """Tests for write_report()."""
+
+    RECORDS = [
+        record("B", "S0126", "Dev", 8),
+        record("A", "S5225", "Dev", 4),
+        record("A", "S0126", "Test", "3,5"),
+        record("A", "S0126", None, 1),
+        record("B", "S5225", "Dev", None),
+    ]
+
+    def test_heatmap(self, tmp_path):
+        path = tmp_path / "report.xlsx"
+
+        summary = write_report(path, iter(self.RECORDS))
+
+        assert (summary.rows, summary.collaborators, summary.weeks, summary.functions) == (5, 2, 2, 3)
+        assert sheet_values(path, HEATMAP_SHEET) == [
+            ["Collaborateur", "S5225", "S0126", "Total"],
+            ["A", 4, 4.5, 8.5],
+            ["B", 0, 8, 8],
+            ["Total", 4, 12.5, None],
+            ["% non nul", 0.5, 1, None],
+        ]
+
+    def test_heatmap_formatting(self, tmp_path):
+        path = tmp_path / "report.xlsx"
+        write_report(path, self.RECORDS, threshold=40)
+
+        ws = load_workbook(path)[HEATMAP_SHEET]
+
+        assert ws.freeze_panes == "B2"
+        rules = {str(ranges.sqref): rules for ranges, rules in ws.conditional_formatting._cf_rules.items()}
+        assert list(rules) == ["B2:C3"]
+        assert rules["B2:C3"][0].colorScale.cfvo[-1].val == 40
+
+    def test_functions(self, tmp_path):
+        path = tmp_path / "report.xlsx"
+
+        write_report(path, self.RECORDS)
+
+        rows = sheet_values(path, FUNCTIONS_SHEET)
+        assert rows[0] == ["Fonction", "Heures", "Part", "Lignes", "Collaborateurs"]
+        assert [(name, hours, count, collaborators) for name, hours, _, count, collaborators in rows[1:]] == [
+            ("Dev", 12, 2, 2), ("Test", 3.5, 1, 1), ("(vide)", 1, 1, 1)]
+        assert [share for _, _, share, _, _ in rows[1:]] == pytest.approx([12 / 16.5, 3.5 / 16.5, 1 / 16.5])
+
+    def test_details(self, tmp_path):
+        path = tmp_path / "report.xlsx"
+
+        write_report(path, self.RECORDS, details=True)
+
+        rows = sheet_values(path, DETAILS_SHEET)
+        assert load_workbook(path).sheetnames == [HEATMAP_SHEET, FUNCTIONS_SHEET, DETAILS_SHEET]
+        assert rows[0][:3] == ["Semaine", "Collaborateur", "Code semaine"]
+        assert rows[1:] == [list(r.values[:11]) for r in self.RECORDS]
+
+    def test_empty(self, tmp_path):
+        path = tmp_path / "report.xlsx"
+
+        summary = write_report(path, [])
+
+        assert summary.rows == 0
+        assert sheet_values(path, HEATMAP_SHEET) == [["Collaborateur", "Total"]]
+        assert load_workbook(path).sheetnames == [HEATMAP_SHEET, FUNCTIONS_SHEET]
+
+
+class TestManagerReport:
+    """Tests for RoadmapManager.report()."""
+
+    def test_default_output(self, pointage_environment):
+        manager = RoadmapManager(pointage_environment)
+
+        output = manager.report()
+
+        assert output == pointage_environment / REPORT_FILE_NAME
+        assert sheet_values(output, HEATMAP_SHEET)[1:4] == [
+            ["CLIGNIEZ Yann", 4, 0, 4], ["GANI Karim", 7.5, 3.5, 11], ["MOUHOUT Marouane", 0, 8, 8]]
+        assert not manager.xml_output.exists()
+
+    def test_filters(self, pointage_environment, tmp_path):
+        manager = RoadmapManager(pointage_environment)
+
+        output = manager.report(tmp_path / "weekly.xlsx", weeks=["S0625-S0725"], collaborators=["gani karim"])
+
+        assert sheet_values(output, HEATMAP_SHEET)[:2] == [["Collaborateur", "S0625", "Total"], ["GANI Karim", 3.5, 3.5]]
+
+    def test_invalid_weeks(self, pointage_environment):
+        with pytest.raises(ValueError):
+            RoadmapManager(pointage_environment).report(weeks=["S0825-S0525"])
+
+    def test_locked_output(self, pointage_environment, monkeypatch, caplog):
+        def locked(*args, **kwargs):
+            raise PermissionError("locked")
+
+        monkeypatch.setattr("roadmap.roadmap.write_report", locked)
+
+        with caplog.at_level("ERROR"):
+            assert RoadmapManager(pointage_environment).report() is None
+
+        assert "is open in Excel" in caplog.text
@@ -9,10 +9,12 @@ from pathlib import Path
 import shutil
 import tempfile
 
+import pytest
 from openpyxl import Workbook, load_workbook
 
 import roadmap.roadmap as roadmap_module
-from roadmap.roadmap import RoadmapManager
+from roadmap.metrics import metrics
+from roadmap.roadmap import LC_FAILED, LC_LOCKED, LC_SKIPPED, LC_UPDATED, RoadmapManager
 
 
 # Module-level function for pickling in multiprocessing tests
@@ -130,6 +132,41 @@ class TestCreateInterfaces:
         assert wb["POINTAGE"]["A1"].value == "EXISTING_MARKER"
         wb.close()
 
+    @pytest.mark.parametrize("fast", [False, True])
+    def test_create_interfaces_matches_names_by_key(self, setup_test_environment, fast):
+        """A file differing from its collaborator by case is kept, not overwritten (Windows, OneDrive)."""
+        tmp_path = setup_test_environment
+        rm_folder = tmp_path / "RM_Collaborateurs"
+        (rm_folder / "RM_gani karim.xlsx").write_bytes(b"existing")
+        manager = RoadmapManager(tmp_path)
+
+        if fast:
+            manager.create_interfaces_fast(max_workers=2)
+        else:
+            manager.create_interfaces()
+
+        assert sorted(p.name for p in rm_folder.glob("RM_*.xlsx")) == [
+            "RM_CLIGNIEZ Yann.xlsx", "RM_MOUHOUT Marouane.xlsx", "RM_gani karim.xlsx"]
+        assert (rm_folder / "RM_gani karim.xlsx").read_bytes() == b"existing"
+
+    @pytest.mark.parametrize("fast", [False, True])
+    def test_create_interfaces_keeps_accents_apart(self, setup_test_environment, fast):
+        """Names differing only by an accent are different files on Windows: each gets its interface."""
+        tmp_path = setup_test_environment
+        rm_folder = tmp_path / "RM_Collaborateurs"
+        (tmp_path / "collabs.xml").write_text(
+            "<collaborators><collaborator>Hélène DUPONT</collaborator>"
+            "<collaborator>Helene DUPONT</collaborator></collaborators>", encoding="utf-8")
+        manager = RoadmapManager(tmp_path)
+
+        if fast:
+            manager.create_interfaces_fast(max_workers=2)
+        else:
+            manager.create_interfaces()
+
+        assert sorted(p.name for p in rm_folder.glob("RM_*.xlsx")) == [
+            "RM_Helene DUPONT.xlsx", "RM_Hélène DUPONT.xlsx"]
+
     def test_create_interfaces_empty_collaborators(self, tmp_path):
         """Verify handling when no collaborators in list."""
         # Create required files
@@ -378,6 +415,18 @@ class TestDeleteMissingCollaborators:
         # Other files should still exist
         assert (rm_folder / "RM_CLIGNIEZ Yann.xlsx").exists()
 
+    def test_delete_missing_keeps_accent_variants(self, setup_test_environment):
+        tmp_path = setup_test_environment
+        rm_folder = tmp_path / "RM_Collaborateurs"
+        for name in ("RM_Hélène DUPONT.xlsx", "RM_Helene DUPONT.xlsx", "RM_hélène  dupont.xlsx"):
+            Workbook().save(rm_folder / name)
+        (tmp_path / "collabs.xml").write_text(
+            "<collaborators><collaborator>Helene DUPONT</collaborator></collaborators>", encoding="utf-8")
+
+        RoadmapManager(tmp_path).delete_missing_collaborators()
+
+        assert sorted(p.name for p in rm_folder.glob("RM_*.xlsx")) == ["RM_Helene DUPONT.xlsx"]
+
     def test_delete_missing_no_orphans(self, setup_test_environment_with_interfaces):
         """Verify no action when all files match collaborators."""
         tmp_path = setup_test_environment_with_interfaces
@@ -832,7 +881,7 @@ class TestUpdateLc:
         monkeypatch.setattr(roadmap_module.shutil, "copy2", fake_copy2)
 
         # Should not raise even if copy fails
-        manager._update_lc_in_file(target_file, [["Key", "Label"]])
+        assert manager._update_lc_in_file(target_file, [["Key", "Label"]]) == LC_LOCKED
 
     def test_update_lc_in_file_missing_lc_sheet(self, tmp_path):
         """Cover branch where LC sheet is missing from workbook."""
@@ -849,7 +898,7 @@ class TestUpdateLc:
         manager.all_ok = True
 
         # Should not raise even though LC sheet is missing
-        manager._update_lc_in_file(excel_path, [["Key", "Label"]])
+        assert manager._update_lc_in_file(excel_path, [["Key", "Label"]]) == LC_SKIPPED
 
     def test_update_lc_in_file_generic_exception_logs_error(self, setup_test_environment_with_interfaces, monkeypatch, caplog):
         """Cover generic exception handler inside _update_lc_in_file."""
@@ -871,7 +920,7 @@ class TestUpdateLc:
         monkeypatch.setattr(roadmap_module, "load_workbook", failing_load)
 
         with caplog.at_level("ERROR"):
-            manager._update_lc_in_file(target_file, [["Key", "Label"]])
+            assert manager._update_lc_in_file(target_file, [["Key", "Label"]]) == LC_FAILED
 
         assert f"[UPDATE_LC] Error updating LC in {target_file.name}: load error" in caplog.text
 
@@ -893,10 +942,38 @@ class TestUpdateLc:
         monkeypatch.setattr(roadmap_module.Path, "unlink", failing_unlink)
 
         with caplog.at_level("WARNING"):
-            manager._update_lc_in_file(manager.template_file, [["Key", "Label"]])
+            assert manager._update_lc_in_file(manager.template_file, [["Key", "Label"]]) == LC_UPDATED
 
         assert "Could not delete temporary file" in caplog.text
 
+    def test_update_lc_counts_locked_and_failed(self, setup_test_environment_with_interfaces, monkeypatch, caplog):
+        """Locked and failed interfaces are counted apart from the updated ones."""
+        tmp_path = setup_test_environment_with_interfaces
+        manager = RoadmapManager(tmp_path)
+        wb = Workbook()
+        wb.active.title = "LC"
+        wb["LC"]["B2"] = "NewKey"
+        wb.save(tmp_path / "LC.xlsx")
+        original_copy2 = roadmap_module.shutil.copy2
+
+        def fake_copy2(src, dst, *args, **kwargs):
+            if Path(dst).name == "RM_GANI Karim.xlsx":
+                raise PermissionError("locked")
+            if Path(src).name == "RM_MOUHOUT Marouane.xlsx":
+                raise OSError("disk error")
+            return original_copy2(src, dst, *args, **kwargs)
+
+        monkeypatch.setattr(roadmap_module.shutil, "copy2", fake_copy2)
+        manager.lock_retry_delays = ()
+        metrics.reset()
+
+        with caplog.at_level("WARNING"):
+            manager.update_lc()
+
+        assert (metrics.files["processed"], metrics.files["locked"], metrics.files["failed"]) == (1, 1, 1)
+        assert "Cannot update RM_GANI Karim.xlsx - it may be open in Excel" in caplog.text
+        assert "[UPDATE_LC] Error copying RM_MOUHOUT Marouane.xlsx" in caplog.text
+
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
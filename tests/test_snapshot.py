@@ -0,0 +1,159 @@
+"""
+Workspace Snapshot Tests for Roadmap Manager.
+
+Tests for the single-listing snapshot of 'RM_Collaborateurs' and its reuse
+by the manager commands.
+"""
+import json
+import os
+
+import pytest
+
+from benchmarks.stat_calls import BASELINE_FILE, compare, count_metadata_calls, run
+from roadmap.roadmap import RoadmapManager
+from roadmap.snapshot import WorkspaceSnapshot
+
+
+class TestWorkspaceSnapshot:
+    """Tests for WorkspaceSnapshot listing and bookkeeping."""
+
+    def test_take_indexes_files(self, tmp_path):
+        (tmp_path / "RM_B.xlsx").write_bytes(b"12345")
+        (tmp_path / "RM_A.xlsx").write_bytes(b"")
+        (tmp_path / "~$RM_A.xlsx").write_bytes(b"")
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "sub").mkdir()
+
+        snapshot = WorkspaceSnapshot.take(tmp_path)
+
+        assert snapshot.exists
+        assert [p.name for p in snapshot.interfaces()] == ["RM_A.xlsx", "RM_B.xlsx"]
+        assert snapshot.owner_files == {"~$RM_A.xlsx"}
+        assert not snapshot.has_file("sub")
+        assert snapshot.entry("RM_B.xlsx").size == 5
+        assert snapshot.entry("RM_missing.xlsx") is None
+
+    def test_missing_folder(self, tmp_path):
+        snapshot = WorkspaceSnapshot.take(tmp_path / "absent")
+
+        assert snapshot.exists is False
+        assert snapshot.interfaces() == []
+
+    def test_owner_file_detection(self, tmp_path):
+        (tmp_path / "RM_GANI Karim.xlsx").write_bytes(b"")
+        (tmp_path / "~$_GANI Karim.xlsx").write_bytes(b"")
+
+        snapshot = WorkspaceSnapshot.take(tmp_path)
+
+        assert snapshot.has_owner_file(tmp_path / "RM_GANI Karim.xlsx")
+
+    def test_interface_keys(self, tmp_path):
+        for name in ("RM_gani karim.xlsx", "RM_GANI Karim.xlsx", "~$RM_Bob.xlsx", "notes.xlsx"):
+            (tmp_path / name).write_bytes(b"")
+
+        snapshot = WorkspaceSnapshot.take(tmp_path)
+
+        assert snapshot.interface_keys() == {"gani karim": tmp_path / "RM_GANI Karim.xlsx"}
+
+    def test_record_created_and_removed(self, tmp_path):
+        snapshot = WorkspaceSnapshot.take(tmp_path)
+        target = tmp_path / "RM_NEW.xlsx"
+        target.write_bytes(b"abc")
+
+        snapshot.record_created(target)
+        assert snapshot.has_file("RM_NEW.xlsx")
+        assert snapshot.entry("RM_NEW.xlsx").size == 3
+
+        snapshot.record_removed(target)
+        assert not snapshot.has_file("RM_NEW.xlsx")
+
+    def test_listing_uses_one_call(self, tmp_path):
+        for idx in range(20):
+            (tmp_path / f"RM_{idx}.xlsx").write_bytes(b"")
+
+        with count_metadata_calls() as calls:
+            snapshot = WorkspaceSnapshot.take(tmp_path)
+            [snapshot.has_file(f"RM_{idx}.xlsx") for idx in range(20)]
+            snapshot.interfaces()
+
+        assert sum(calls.values()) == calls["os.scandir"] == 1
+
+
+class TestManagerSnapshot:
+    """RoadmapManager answers existence checks from the snapshot."""
+
+    def test_snapshot_reused_within_max_age(self, setup_test_environment):
+        manager = RoadmapManager(setup_test_environment)
+        manager.snapshot_max_age = 60
+
+        first = manager.snapshot()
+
+        assert manager.snapshot() is first
+        assert manager.snapshot(refresh=True) is not first
+
+    def test_one_snapshot_per_command(self, setup_test_environment, monkeypatch):
+        manager = RoadmapManager(setup_test_environment)
+        taken = []
+        original_take = WorkspaceSnapshot.take
+        monkeypatch.setattr(WorkspaceSnapshot, "take",
+                            lambda *args, **kwargs: taken.append(args) or original_take(*args, **kwargs))
+
+        first = manager.snapshot()
+        assert manager.snapshot() is first
+
+        manager.create_interfaces()
+        assert len(taken) == 2
+        manager.delete_missing_collaborators()
+        assert len(taken) == 3
+        assert manager.snapshot() is manager._snapshot is not first
+
+        manager.snapshot_max_age = 60
+        manager.delete_missing_collaborators()
+        assert len(taken) == 3
+
+    def test_create_records_new_files(self, setup_test_environment):
+        manager = RoadmapManager(setup_test_environment)
+
+        manager.create_interfaces()
+
+        assert [p.name for p in manager._snapshot.interfaces()] == [
+            "RM_CLIGNIEZ Yann.xlsx", "RM_GANI Karim.xlsx", "RM_MOUHOUT Marouane.xlsx"]
+
+    def test_create_with_all_files_present_lists_once(self, setup_test_environment, monkeypatch):
+        tmp_path = setup_test_environment
+        RoadmapManager(tmp_path).create_interfaces()
+        (tmp_path / "collabs.xml").write_text(
+            "<collaborators><collaborator>GANI Karim</collaborator></collaborators>", encoding="utf-8")
+        manager = RoadmapManager(tmp_path)
+        scandirs = []
+        original_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scandirs.append(path) or original_scandir(path))
+
+        manager.create_interfaces()
+
+        assert [os.fspath(p) for p in scandirs] == [os.fspath(manager.rm_folder)]
+
+
+class TestStatCallsBenchmark:
+    """The benchmark counts the metadata calls of the real commands."""
+
+    def test_commands_list_the_folder_once(self):
+        result = run(5, ("create", "cleanup", "check"))
+
+        assert [counts["listings"] for counts in result["commands"].values()] == [1, 1, 1]
+        assert result["commands"]["create"]["folder"] == {"os.scandir": 1, "os.stat": 2}
+        assert result["commands"]["cleanup"]["folder"] == {"os.scandir": 1}
+
+    def test_compare_with_stored_baseline(self):
+        baseline = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+        result = {"collaborators": baseline["collaborators"],
+                  "commands": {"create": {"folder_total": 3}, "check": {"folder_total": 1}}}
+
+        rows = compare(result, baseline)
+
+        assert [(command, old is not None) for command, old, _ in rows] == [("create", True), ("check", False)]
+        assert rows[0][1]["folder_total"] > baseline["collaborators"]
+
+    def test_compare_rejects_other_scale(self):
+        with pytest.raises(ValueError):
+            compare({"collaborators": 5, "commands": {}}, {"collaborators": 100, "commands": {}})
@@ -0,0 +1,101 @@
+"""
+Row Status Tests for Roadmap Manager.
+
+Tests for the precomputed SYNTHESE row statuses and the ranges exported
+to 'pointage_status.xml'.
+"""
+import xml.etree.ElementTree as ET
+
+import pytest
+from openpyxl import load_workbook
+
+from roadmap.helpers import write_status_xml
+from roadmap.roadmap import RoadmapManager
+from roadmap.status import (STATUS_OVER, STATUS_UNDER, StatusRange,
+                            row_status, status_ranges)
+
+
+class TestRowStatus:
+    """Tests for row_status and status_ranges."""
+
+    @pytest.mark.parametrize("total,expected", [
+        (34.9, STATUS_UNDER), (35, STATUS_OVER), (None, STATUS_UNDER), ("", STATUS_UNDER),
+        ("37,5", STATUS_OVER), ("n/a", None)])
+    def test_row_status(self, total, expected):
+        assert row_status(total) == expected
+
+    def test_custom_threshold(self):
+        assert row_status(30, threshold=28) == STATUS_OVER
+
+    def test_ranges_merge_consecutive_rows(self):
+        ranges = status_ranges([20, 20, 40, 40, 40, "x", 10])
+
+        assert ranges == [
+            StatusRange(STATUS_UNDER, 1, 2), StatusRange(STATUS_OVER, 3, 5), StatusRange(STATUS_UNDER, 7, 7)]
+        assert [r.count for r in ranges] == [2, 3, 1]
+
+    def test_no_rows(self):
+        assert status_ranges([]) == []
+
+
+class TestStatusXml:
+    """Tests for write_status_xml."""
+
+    def test_write_status_xml(self, tmp_path):
+        output = tmp_path / "pointage_status.xml"
+
+        write_status_xml([StatusRange(STATUS_UNDER, 1, 3), StatusRange(STATUS_OVER, 4, 4)], 35.0, 4, output)
+
+        root = ET.parse(output).getroot()
+        assert root.tag == "status"
+        assert root.attrib == {"threshold": "35.0", "rows": "4"}
+        assert [r.attrib for r in root.findall("range")] == [
+            {"status": "under", "first": "1", "last": "3"},
+            {"status": "over", "first": "4", "last": "4"},
+        ]
+
+
+class TestManagerStatusExport:
+    """pointage() writes status ranges next to the rows."""
+
+    def fill_interface(self, tmp_path, name, total, rows):
+        path = tmp_path / "RM_Collaborateurs" / f"RM_{name}.xlsx"
+        wb = load_workbook(path)
+        ws = wb["POINTAGE"]
+        ws["K1"] = total
+        for idx in range(rows):
+            ws.cell(row=4 + idx, column=2, value=name)
+            ws.cell(row=4 + idx, column=10, value=total / rows)
+        wb.save(path)
+
+    def test_one_range_per_collaborator_block(self, setup_test_environment_with_interfaces):
+        tmp_path = setup_test_environment_with_interfaces
+        self.fill_interface(tmp_path, "CLIGNIEZ Yann", 20, 3)
+        self.fill_interface(tmp_path, "GANI Karim", 40, 2)
+        self.fill_interface(tmp_path, "MOUHOUT Marouane", 10, 1)
+        manager = RoadmapManager(tmp_path)
+
+        manager.pointage()
+
+        root = ET.parse(manager.status_output).getroot()
+        assert root.get("rows") == "6"
+        assert [(r.get("status"), r.get("first"), r.get("last")) for r in root.findall("range")] == [
+            ("under", "1", "3"), ("over", "4", "5"), ("under", "6", "6")]
+
+    def test_threshold_option(self, setup_test_environment_with_interfaces):
+        tmp_path = setup_test_environment_with_interfaces
+        self.fill_interface(tmp_path, "GANI Karim", 20, 1)
+        manager = RoadmapManager(tmp_path)
+
+        manager.pointage(threshold=15)
+
+        root = ET.parse(manager.status_output).getroot()
+        assert root.get("threshold") == "15"
+        assert [r.get("status") for r in root.findall("range")] == ["over"]
+
+    def test_empty_export_writes_empty_status(self, setup_test_environment_with_interfaces):
+        manager = RoadmapManager(setup_test_environment_with_interfaces)
+
+        manager.pointage()
+
+        assert ET.parse(manager.status_output).getroot().findall("range") == []
@@ -0,0 +1,209 @@
+"""
+Sync Tests for Roadmap Manager.
+
+Tests for the cleanup / create / LC update planner and its execution (roadmap.sync, sync).
+"""
+import os
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from roadmap.roadmap import LC_FAILED, LC_LOCKED, RoadmapManager
+from roadmap.sync import (DEFAULT_FILE_SECONDS, SYNC_ARCHIVE, SYNC_CREATE,
+                          SYNC_TEMPLATE, SYNC_UPDATE, action_rows,
+                          estimate_rates, estimate_rows, lc_rows_of,
+                          plan_sync, stale_reason)
+from roadmap.snapshot import WorkspaceSnapshot
+
+LC_DATA = [["KEY001", "Lot 1", "Dev", None, None, None, None, "1"],
+           ["KEY002", "Lot 2", "Test"]]
+
+
+def write_lc(base_dir, rows=LC_DATA):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "LC"
+    for r, row in enumerate(rows, start=2):
+        for c, value in enumerate(row, start=2):
+            ws.cell(r, c, value)
+    wb.save(base_dir / "LC.xlsx")
+
+
+def planned(plan):
+    return [(action.operation, action.path.name) for action in plan.actions]
+
+
+class TestStaleReason:
+    """Tests for stale_reason()."""
+
+    def test_current_after_update(self, setup_test_environment_with_interfaces):
+        manager = RoadmapManager(setup_test_environment_with_interfaces)
+        path = manager.rm_folder / "RM_GANI Karim.xlsx"
+
+        assert stale_reason(path, lc_rows_of(LC_DATA)) == "LC row 2 differs from LC.xlsx"
+        manager._update_lc_in_file(path, LC_DATA)
+
+        assert stale_reason(path, lc_rows_of(LC_DATA)) is None
+        assert stale_reason(path, lc_rows_of(LC_DATA[:1])) == "LC has 1 row(s) beyond LC.xlsx"
+
+    def test_outdated_validations(self, setup_test_environment_with_interfaces):
+        manager = RoadmapManager(setup_test_environment_with_interfaces)
+        path = manager.rm_folder / "RM_GANI Karim.xlsx"
+        manager._update_lc_in_file(path, LC_DATA)
+        wb = load_workbook(path)
+        wb["POINTAGE"].data_validations.dataValidation = []
+        wb.save(path)
+
+        assert stale_reason(path, lc_rows_of(LC_DATA)) == "4 POINTAGE validation(s) outdated"
+
+
+class TestPlanSync:
+    """Tests for plan_sync()."""
+
+    def test_plan(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+        rm_folder = base / "RM_Collaborateurs"
+        (rm_folder / "RM_GANI Karim.xlsx").unlink()
+        Workbook().save(rm_folder / "RM_OLD Person.xlsx")
+
+        plan = plan_sync(["CLIGNIEZ Yann", "gani karim", "MOUHOUT  Marouane"], WorkspaceSnapshot.take(rm_folder),
+                         base / "RM_template.xlsx", LC_DATA)
+
+        assert planned(plan) == [
+            (SYNC_ARCHIVE, "RM_OLD Person.xlsx"),
+            (SYNC_TEMPLATE, "RM_template.xlsx"),
+            (SYNC_CREATE, "RM_gani karim.xlsx"),
+            (SYNC_UPDATE, "RM_CLIGNIEZ Yann.xlsx"),
+            (SYNC_UPDATE, "RM_MOUHOUT Marouane.xlsx"),
+        ]
+        assert plan.of(SYNC_UPDATE)[1].collaborator == "MOUHOUT  Marouane"
+        assert action_rows(plan)[0] == (SYNC_ARCHIVE, "RM_OLD Person.xlsx", "Not in the collaborator list")
+
+    def test_accent_variants_are_different_files(self, tmp_path):
+        for name in ("RM_Hélène DUPONT.xlsx", "RM_Helene DUPONT.xlsx", "RM_helene dupont.xlsx"):
+            (tmp_path / name).write_bytes(b"")
+
+        plan = plan_sync(["Hélène DUPONT", "Helene DUPONT"], WorkspaceSnapshot.take(tmp_path),
+                         tmp_path / "RM_template.xlsx", [])
+
+        assert planned(plan) == [(SYNC_ARCHIVE, "RM_helene dupont.xlsx")]
+
+    def test_no_lc_data(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+
+        plan = plan_sync(["CLIGNIEZ Yann", "GANI Karim", "MOUHOUT Marouane"],
+                         WorkspaceSnapshot.take(base / "RM_Collaborateurs"), base / "RM_template.xlsx", [])
+
+        assert plan.empty and plan.current == 3
+
+
+class TestEstimates:
+    """Tests for the cost estimates of sync --dry-run."""
+
+    def test_rates(self):
+        state = {"file_duration": {"create": {"sum": 3.0, "count": 6}, "update": {"sum": 0.0, "count": 0}}}
+
+        rates = estimate_rates(state)
+
+        assert rates[SYNC_CREATE] == 0.5
+        assert rates[SYNC_UPDATE] == DEFAULT_FILE_SECONDS[SYNC_UPDATE]
+        assert estimate_rates(None) == DEFAULT_FILE_SECONDS
+
+    def test_rows(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+        plan = plan_sync(["CLIGNIEZ Yann", "GANI Karim", "NEW One", "NEW Two"],
+                         WorkspaceSnapshot.take(base / "RM_Collaborateurs"), base / "RM_template.xlsx", [])
+        rates = {SYNC_ARCHIVE: 0.1, SYNC_TEMPLATE: 1.0, SYNC_CREATE: 1.0, SYNC_UPDATE: 2.0}
+
+        rows = estimate_rows(plan, rates, max_workers=2)
+
+        assert [(op, files, seconds) for op, files, _, seconds in rows] == [
+            (SYNC_ARCHIVE, 1, 0.1), (SYNC_TEMPLATE, 0, 0.0), (SYNC_CREATE, 2, 1.0), (SYNC_UPDATE, 0, 0.0),
+            ("total", 3, 1.1)]
+        assert rows[-1][2] > 0
+
+
+class TestManagerSync:
+    """Tests for RoadmapManager.sync()."""
+
+    def prepare(self, base):
+        rm_folder = base / "RM_Collaborateurs"
+        (rm_folder / "RM_GANI Karim.xlsx").unlink()
+        Workbook().save(rm_folder / "RM_OLD Person.xlsx")
+        write_lc(base)
+        return rm_folder
+
+    def test_dry_run_writes_nothing(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+        rm_folder = self.prepare(base)
+        before = {path.name: path.stat().st_mtime_ns for path in [*rm_folder.iterdir(), base / "RM_template.xlsx"]}
+
+        plan = RoadmapManager(base).sync(dry_run=True)
+
+        assert len(plan.actions) == 5
+        assert (base / "LC.xlsx").exists() and (base / "collabs.xml").exists()
+        assert not (base / "collabs_registry.json").exists()
+        assert {path.name: path.stat().st_mtime_ns
+                for path in [*rm_folder.iterdir(), base / "RM_template.xlsx"]} == before
+        assert list((base / "Deleted").iterdir()) == []
+
+    def test_sync_writes_each_file_once(self, setup_test_environment_with_interfaces, monkeypatch):
+        base = setup_test_environment_with_interfaces
+        rm_folder = self.prepare(base)
+        manager = RoadmapManager(base)
+        manager.lock_retry_delays = ()
+        written = []
+        update = manager._update_lc_in_file
+
+        def recording_update(path, lc_data):
+            written.append(path.name)
+            return update(path, lc_data)
+
+        monkeypatch.setattr(manager, "_update_lc_in_file", recording_update)
+
+        plan = manager.sync(max_workers=2)
+
+        assert sorted(written) == ["RM_CLIGNIEZ Yann.xlsx", "RM_MOUHOUT Marouane.xlsx", "RM_template.xlsx"]
+        assert sorted(p.name for p in rm_folder.iterdir()) == [
+            "RM_CLIGNIEZ Yann.xlsx", "RM_GANI Karim.xlsx", "RM_MOUHOUT Marouane.xlsx"]
+        assert len(list((base / "Deleted").glob("Deleted_Missing_RM_collaborators_*.zip"))) == 1
+        assert not (base / "LC.xlsx").exists()
+        assert len(plan.of(SYNC_CREATE)) == 1
+
+        # The new interface got the LC of LC.xlsx and the validations when it was created
+        created = rm_folder / "RM_GANI Karim.xlsx"
+        assert stale_reason(created, lc_rows_of(LC_DATA)) is None
+        assert load_workbook(created)["POINTAGE"]["B1"].value == "GANI Karim"
+
+        # Nothing left to do with the same LC
+        write_lc(base)
+        again = RoadmapManager(base).sync(dry_run=True)
+        assert again.empty and again.current == 3
+
+    @pytest.mark.parametrize("outcome", [LC_LOCKED, LC_FAILED])
+    def test_locked_template_updates_new_interfaces(self, setup_test_environment_with_interfaces, monkeypatch,
+                                                    outcome):
+        base = setup_test_environment_with_interfaces
+        self.prepare(base)
+        manager = RoadmapManager(base)
+        manager.lock_retry_delays = ()
+        written = []
+        update = manager._update_lc_in_file
+
+        def locked_template(path, lc_data):
+            written.append(path.name)
+            return outcome if path.name == "RM_template.xlsx" else update(path, lc_data)
+
+        monkeypatch.setattr(manager, "_update_lc_in_file", locked_template)
+
+        manager.sync(max_workers=2)
+
+        assert "RM_GANI Karim.xlsx" in written
+        assert stale_reason(base / "RM_Collaborateurs" / "RM_GANI Karim.xlsx", lc_rows_of(LC_DATA)) is None
+
+    def test_empty_list(self, setup_test_environment_with_interfaces):
+        base = setup_test_environment_with_interfaces
+        (base / "collabs.xml").write_text("<collaborators/>", encoding="utf-8")
+
+        assert RoadmapManager(base).sync() is None
+        assert len(os.listdir(base / "RM_Collaborateurs")) == 3
@@ -0,0 +1,180 @@
+"""
+Direct SYNTHESE Writer Tests for Roadmap Manager.
+
+Tests for writing pointage rows, LC columns and row fills straight into the
+synthesis workbook package.
+"""
+import zipfile
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from roadmap.roadmap import RoadmapManager
+from roadmap.synthese import (GREEN_FILL, RED_FILL, apply_lc_lookup,
+                              build_lc_lookup, row_fill, split_sprint,
+                              write_synthese_rows)
+
+
+def pointage_row(name, key="KEY001 Sprint 3", label="Label 1", function="Function 1", hours=7.5, total=20):
+    """Row as exported by pointage(): A-K followed by the K1 total."""
+    return ["S", name, "S0125", None, key, label, function, "old H", "old I", hours, None, total]
+
+
+@pytest.fixture
+def synthese_file(tmp_path):
+    """Synthesis workbook with SYNTHESE data up to row 4, an LC lookup table and a VBA part."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "SYNTHESE"
+    ws["A1"] = "Header"
+    ws["A3"] = "existing"
+    ws["A4"] = "existing"
+    ws["BA6"] = "keep me"
+
+    lc = wb.create_sheet("LC")
+    lc["F2"], lc["G2"], lc["H2"], lc["I2"], lc["J2"], lc["K2"] = "KEY001", "Label 1", "H value", 42, "Function 1", 3
+    lc["F3"], lc["G3"], lc["J3"], lc["K3"] = "DUP", "Label", "Func", 1
+    lc["F4"], lc["G4"], lc["J4"], lc["K4"] = "DUP", "Label", "Func", 1
+
+    path = tmp_path / "Synthèse_RM_CE.xlsm"
+    wb.save(path)
+    with zipfile.ZipFile(path, "a") as zf:
+        zf.writestr("xl/vbaProject.bin", b"\x00VBA project")
+    return path
+
+
+class TestLookupAndFill:
+    """Tests for the VBA-equivalent helpers."""
+
+    def test_split_sprint(self):
+        assert split_sprint("KEY001 sprint 3") == ("KEY001", "3")
+        assert split_sprint("KEY001") is None
+
+    def test_lookup_matches_case_insensitively_and_drops_duplicates(self):
+        lookup = build_lc_lookup({
+            2: {6: "KEY001", 7: "Label 1", 8: "H", 9: 42, 10: "Function 1", 11: 3},
+            3: {6: "DUP", 7: "L", 10: "F", 11: 1},
+            4: {6: "DUP", 7: "L", 10: "F", 11: 1},
+        })
+
+        row = apply_lc_lookup(pointage_row("A", key="key001 Sprint 3", function="FUNCTION 1")[:11], lookup)
+        dup = apply_lc_lookup(pointage_row("A", key="DUP Sprint 1", label="L", function="F")[:11], lookup)
+        no_sprint = apply_lc_lookup(pointage_row("A", key="KEY001")[:11], lookup)
+
+        assert row[7:9] == ["H", 42]
+        assert dup[7:9] == [None, None]
+        assert no_sprint[7:9] == [None, None]
+
+    @pytest.mark.parametrize("total,expected", [
+        (34.9, RED_FILL), (35, GREEN_FILL), (None, RED_FILL), ("40", GREEN_FILL), ("n/a", None)])
+    def test_row_fill(self, total, expected):
+        assert row_fill(total) == expected
+
+
+class TestWriteSyntheseRows:
+    """Tests for write_synthese_rows on a real package."""
+
+    def test_appends_rows_with_lookup_and_fills(self, synthese_file):
+        start, count = write_synthese_rows(synthese_file, [
+            pointage_row("GANI Karim", total=20),
+            pointage_row("NAZIH Imane", key="OTHER Sprint 1", total=40),
+        ])
+
+        assert (start, count) == (5, 2)
+        ws = load_workbook(synthese_file)["SYNTHESE"]
+        assert [c.value for c in ws[5][:11]] == [
+            "S", "GANI Karim", "S0125", None, "KEY001 Sprint 3", "Label 1", "Function 1", "H value", 42, 7.5, None]
+        assert ws["H6"].value is None and ws["I6"].value is None
+        assert {c.fill.fgColor.rgb for c in ws[5][:11]} == {RED_FILL}
+        assert {c.fill.fgColor.rgb for c in ws[6][:11]} == {GREEN_FILL}
+        assert ws["BA6"].value == "keep me"
+        assert ws["A3"].value == "existing"
+
+    def test_preserves_vba_project_and_other_parts(self, synthese_file):
+        with zipfile.ZipFile(synthese_file) as zf:
+            before = {name: zf.read(name) for name in zf.namelist()}
+
+        write_synthese_rows(synthese_file, [pointage_row("GANI Karim")])
+
+        with zipfile.ZipFile(synthese_file) as zf:
+            after = {name: zf.read(name) for name in zf.namelist()}
+        changed = {name for name in before if before[name] != after[name]}
+        assert after["xl/vbaProject.bin"] == b"\x00VBA project"
+        assert changed == {"xl/worksheets/sheet1.xml", "xl/styles.xml"}
+
+    def test_repeated_runs_reuse_styles(self, synthese_file):
+        write_synthese_rows(synthese_file, [pointage_row("A"), pointage_row("B", total=50)])
+        with zipfile.ZipFile(synthese_file) as zf:
+            styles = zf.read("xl/styles.xml")
+
+        write_synthese_rows(synthese_file, [pointage_row("C"), pointage_row("D", total=50)])
+
+        with zipfile.ZipFile(synthese_file) as zf:
+            assert zf.read("xl/styles.xml") == styles
+        assert load_workbook(synthese_file)["SYNTHESE"]["B8"].value == "D"
+
+    def test_dates_get_a_date_format(self, synthese_file):
+        row = pointage_row("A")
+        row[10] = datetime(2025, 1, 6)
+
+        write_synthese_rows(synthese_file, [row])
+
+        cell = load_workbook(synthese_file)["SYNTHESE"]["K5"]
+        assert cell.value == datetime(2025, 1, 6)
+        assert cell.is_date
+
+    def test_refuses_to_overwrite_formulas(self, synthese_file):
+        wb = load_workbook(synthese_file, keep_vba=True)
+        wb["SYNTHESE"]["C5"] = "=1+1"
+        wb.save(synthese_file)
+
+        with pytest.raises(ValueError, match="formula"):
+            write_synthese_rows(synthese_file, [pointage_row("A")])
+
+    def test_refuses_open_workbook(self, synthese_file, simulated_locker):
+        simulated_locker.lock(synthese_file)
+        with zipfile.ZipFile(synthese_file) as zf:
+            before = zf.read("xl/worksheets/sheet1.xml")
+
+        with pytest.raises(PermissionError):
+            write_synthese_rows(synthese_file, [pointage_row("A")])
+
+        with zipfile.ZipFile(synthese_file) as zf:
+            assert zf.read("xl/worksheets/sheet1.xml") == before
+
+
+class TestManagerDirectPointage:
+    """pointage(direct=True) writes SYNTHESE instead of exporting XML."""
+
+    def fill_interface(self, tmp_path, name, hours):
+        path = tmp_path / "RM_Collaborateurs" / f"RM_{name}.xlsx"
+        wb = load_workbook(path)
+        ws = wb["POINTAGE"]
+        ws["K1"] = hours
+        ws["A4"], ws["B4"], ws["E4"], ws["J4"] = "S", name, "KEY001 Sprint 1", hours
+        wb.save(path)
+
+    def test_direct_mode_writes_workbook(self, setup_test_environment_with_interfaces):
+        tmp_path = setup_test_environment_with_interfaces
+        self.fill_interface(tmp_path, "GANI Karim", 40)
+        manager = RoadmapManager(tmp_path)
+
+        assert manager.pointage(direct=True) is True
+
+        assert not manager.xml_output.exists()
+        ws = load_workbook(manager.synthese_file)["SYNTHESE"]
+        assert ws["B3"].value == "GANI Karim"
+        assert ws["A3"].fill.fgColor.rgb == GREEN_FILL
+
+    def test_direct_mode_falls_back_to_xml_when_open(self, setup_test_environment_with_interfaces, simulated_locker, caplog):
+        tmp_path = setup_test_environment_with_interfaces
+        self.fill_interface(tmp_path, "GANI Karim", 10)
+        manager = RoadmapManager(tmp_path)
+        simulated_locker.lock(manager.synthese_file)
+
+        with caplog.at_level("WARNING"):
+            assert manager.pointage(direct=True) is True
+
+        assert manager.xml_output.exists()
+        assert "exporting XML for the VBA import instead" in caplog.text
@@ -0,0 +1,132 @@
+"""
+Timing Trace Tests for Roadmap Manager.
+
+Tests for the JSON lines spans written with '--trace', including the spans
+recorded inside pool workers.
+"""
+import importlib
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from roadmap.roadmap import RoadmapManager
+from roadmap.trace import run_traced, span, tracer
+
+# Import the actual roadmap.main module, not the package attribute
+rm_main = importlib.import_module("roadmap.main")
+
+
+def read_spans(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def traced_work(value):
+    """Module-level function, so it can be sent to a worker."""
+    with span("transform", "file.xlsx", value=value):
+        if value < 0:
+            raise ValueError("negative")
+    return value * 2
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    """Enable tracing to a temporary file for one test."""
+    path = tmp_path / ".logs" / "roadmap_trace.jsonl"
+    tracer.enable(path, command="test", run_id="run-1")
+    yield path
+    tracer.disable()
+
+
+class TestTracer:
+    """Tests for span recording."""
+
+    def test_disabled_writes_nothing(self, tmp_path):
+        with span("open", tmp_path / "a.xlsx") as fields:
+            fields["rows"] = 3
+        assert not tracer.enabled
+
+    def test_spans_are_json_lines(self, trace_file, tmp_path):
+        with span("open", tmp_path / "RM_A.xlsx"):
+            pass
+        with pytest.raises(KeyError):
+            with span("parse", tmp_path / "RM_A.xlsx") as fields:
+                fields["rows"] = 2
+                raise KeyError("POINTAGE")
+
+        opened, parsed = read_spans(trace_file)
+        assert opened["phase"] == "open" and opened["file"] == "RM_A.xlsx"
+        assert opened["run"] == "run-1" and opened["command"] == "test"
+        assert opened["status"] == "ok" and opened["process"] == "main"
+        assert opened["duration_ms"] >= 0
+        assert parsed["status"] == "error" and parsed["rows"] == 2
+        assert "KeyError" in parsed["error"]
+
+    def test_run_traced_collects_worker_spans(self, trace_file):
+        result, spans = run_traced(("create", "run-1"), traced_work, 4)
+
+        assert result == 8
+        assert [(s["phase"], s["process"], s["value"]) for s in spans] == [("transform", "worker", 4)]
+        assert not trace_file.exists()
+
+        with pytest.raises(ValueError) as exc:
+            run_traced(("create", "run-1"), traced_work, -1)
+        assert exc.value.trace_spans[0]["status"] == "error"
+
+    def test_run_traced_without_context(self):
+        assert run_traced(None, traced_work, 1) == (2, [])
+
+
+class TestCommandTraces:
+    """Commands record per-file spans."""
+
+    def test_pointage_spans(self, setup_test_environment_with_interfaces, trace_file):
+        manager = RoadmapManager(setup_test_environment_with_interfaces)
+
+        manager.pointage()
+
+        spans = read_spans(trace_file)
+        opened = sorted(s["file"] for s in spans if s["phase"] == "open")
+        assert opened == ["RM_CLIGNIEZ Yann.xlsx", "RM_GANI Karim.xlsx", "RM_MOUHOUT Marouane.xlsx"]
+        assert all(s["rows"] == 0 for s in spans if s["phase"] == "parse")
+
+    def test_update_phases(self, setup_test_environment_with_interfaces, trace_file):
+        tmp_path = setup_test_environment_with_interfaces
+        from openpyxl import Workbook
+        wb = Workbook()
+        wb.active.title = "LC"
+        wb["LC"]["B2"] = "KEY001"
+        wb.save(tmp_path / "LC.xlsx")
+
+        RoadmapManager(tmp_path).update_lc()
+
+        phases = [s["phase"] for s in read_spans(trace_file) if s["file"] == "RM_GANI Karim.xlsx"]
+        assert phases == ["copy", "open", "transform", "save", "copy_back"]
+
+    def test_parallel_create_includes_worker_spans(self, setup_test_environment, trace_file):
+        manager = RoadmapManager(setup_test_environment)
+
+        manager.create_interfaces_fast(max_workers=1)
+
+        workers = [s for s in read_spans(trace_file) if s["process"] == "worker"]
+        assert {s["phase"] for s in workers} == {"open", "transform", "save"}
+        assert len(workers) == 9
+        assert all(s["pid"] != os.getpid() for s in workers)
+
+
+class TestMainTrace:
+    """--trace enables tracing for the command."""
+
+    def test_main_writes_command_span(self, monkeypatch, setup_test_environment, tmp_path):
+        log_file = tmp_path / "logs" / "roadmap.log"
+        fake_args = SimpleNamespace(action="cleanup", basedir=str(setup_test_environment), trace=True)
+        monkeypatch.setattr(rm_main, "get_parser", lambda: SimpleNamespace(parse_args=lambda: fake_args))
+        monkeypatch.setattr(rm_main, "get_exe_dir", lambda: str(log_file))
+
+        rm_main.main()
+
+        spans = read_spans(log_file.with_name("roadmap_trace.jsonl"))
+        assert spans[-1]["phase"] == "command"
+        assert spans[-1]["command"] == "cleanup"
+        assert not tracer.enabled
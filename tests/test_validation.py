@@ -0,0 +1,160 @@
+"""
+Pointage Validation Tests for Roadmap Manager.
+
+Tests for the data quality checks of the pointage rows against the LC sheet
+(roadmap.validation, pointage --validate).
+"""
+import csv
+
+from openpyxl import load_workbook
+
+from roadmap.pointage import PointageRecord
+from roadmap.roadmap import RoadmapManager
+from roadmap.validation import (ISSUE_DUPLICATE, ISSUE_INVALID_COMBINATION,
+                                ISSUE_INVALID_HOURS, ISSUE_UNKNOWN_FUNCTION,
+                                ISSUE_UNKNOWN_KEY, ISSUE_UNKNOWN_LABEL,
+                                VALIDATION_FILE_NAME, LCIndex, count_issues,
+                                validate_records, write_validation_report)
+
+# 'LC' cells by row, then column: lists in B:D from row 3, lookup table in F:K
+LC_ROWS = {
+    2: {6: "KEY001", 7: "Lot 1", 8: 10, 9: "Planned", 10: "Dev", 11: "1"},
+    3: {2: "KEY001 Sprint 1", 3: "Lot 1", 4: "Dev",
+        6: "KEY001", 7: "Lot 1", 8: 20, 9: "Planned", 10: "Test", 11: "1"},
+    4: {2: "KEY001 Sprint 2", 3: "Lot 2", 4: "Test",
+        6: "KEY001", 7: "Lot 2", 8: 5, 9: "Planned", 10: "Test", 11: "2"},
+    5: {2: "KEY002", 6: "KEY001", 7: "Lot 2", 8: 6, 9: "Planned", 10: "Test", 11: "2"},
+}
+
+
+def record(key, label, function, hours, source="RM_A.xlsx", date=None, row=4):
+    return PointageRecord.from_cells(source, ["S", "A", "S0525", None, key, label, function, None, date, hours, None],
+                                     35, row)
+
+
+def issue_codes(issues):
+    return [(row.record.sheet_row, row.codes) for row in issues]
+
+
+class TestLCIndex:
+    """Tests for the LC sets and lookup."""
+
+    def test_from_rows(self):
+        lc = LCIndex.from_rows(LC_ROWS)
+
+        assert lc.keys == {"key001 sprint 1", "key001 sprint 2", "key002"}
+        assert lc.labels == {"lot 1", "lot 2"}
+        assert lc.functions == {"dev", "test"}
+        assert lc.lookup["dev|lot 1|key001|1"] == (10, "Planned")
+
+    def test_load(self, setup_test_environment):
+        lc = LCIndex.load(setup_test_environment / "Synthèse_RM_CE.xlsm")
+
+        assert (lc.keys, lc.labels, lc.functions) == ({"key001"}, {"label 1"}, frozenset())
+
+
+class TestValidateRecords:
+    """Tests for validate_records()."""
+
+    LC = LCIndex.from_rows(LC_ROWS)
+
+    def test_valid_rows(self):
+        records = [record("KEY001 Sprint 1", "Lot 1", "Dev", 7.5),
+                   record(" key001 sprint 1 ", "LOT 1", "dev", "3,5", row=5),
+                   record("KEY002", "Lot 2", "Test", 0, row=6)]
+
+        assert validate_records(records, self.LC) == []
+
+    def test_unknown_values(self):
+        issues = validate_records([record("KEY009", "Lot 9", "Design", 1), record(None, None, None, 1, row=5)], self.LC)
+
+        assert issue_codes(issues) == [
+            (4, [ISSUE_UNKNOWN_KEY, ISSUE_UNKNOWN_LABEL, ISSUE_UNKNOWN_FUNCTION]),
+            (5, [ISSUE_UNKNOWN_KEY, ISSUE_UNKNOWN_LABEL, ISSUE_UNKNOWN_FUNCTION]),
+        ]
+        assert issues[0].details[0] == "Key 'KEY009' is not in LC column B"
+
+    def test_invalid_combination(self):
+        records = [record("KEY001 Sprint 2", "Lot 1", "Dev", 1),    # no LC row
+                   record("KEY001 Sprint 2", "Lot 2", "Test", 1, row=5)]  # two LC rows
+
+        issues = validate_records(records, self.LC)
+
+        assert issue_codes(issues) == [(4, [ISSUE_INVALID_COMBINATION]), (5, [ISSUE_INVALID_COMBINATION])]
+        assert issues[1].details == ["Several LC rows for this key, label and function"]
+
+    def test_combination_needs_lookup_table(self):
+        lc = LCIndex(self.LC.keys, self.LC.labels, self.LC.functions, {})
+
+        assert validate_records([record("KEY001 Sprint 2", "Lot 1", "Dev", 1)], lc) == []
+
+    def test_hours(self):
+        records = [record("KEY002", "Lot 2", "Test", None),
+                   record("KEY002", "Lot 2", "Test", "n/a", row=5),
+                   record("KEY002", "Lot 2", "Test", -1, row=6),
+                   record("KEY002", "Lot 2", "Test", 25, row=7)]
+
+        issues = validate_records(records, self.LC)
+
+        assert issue_codes(issues) == [(r, [ISSUE_INVALID_HOURS]) for r in (4, 5, 6, 7)]
+        assert [row.details[0] for row in issues] == [
+            "Hours are missing", "Hours 'n/a' are not a number",
+            "Hours -1 are out of range (0 to 24)", "Hours 25 are out of range (0 to 24)"]
+        assert validate_records(records[3:], self.LC, max_hours=30) == []
+
+    def test_duplicates(self):
+        records = [record("KEY002", "Lot 2", "Test", 2),
+                   record("KEY002", "Lot 2", "Test", 2, row=5),
+                   record("KEY002", "Lot 2", "Test", 2, source="RM_B.xlsx", row=4),
+                   record("KEY002", "Lot 2", "Test", 2, date="2025-01-28", row=6)]
+
+        issues = validate_records(records, self.LC)
+
+        assert issue_codes(issues) == [(5, [ISSUE_DUPLICATE])]
+        assert count_issues(issues) == {ISSUE_DUPLICATE: 1}
+
+    def test_report(self, tmp_path):
+        issues = validate_records([record("KEY009", "Lot 2", "Test", "n/a")], self.LC)
+        path = tmp_path / VALIDATION_FILE_NAME
+
+        write_validation_report(path, issues)
+
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0][:3] == ["file", "row", "collaborator"]
+        assert rows[1][:8] == ["RM_A.xlsx", "4", "A", "S0525", "KEY009", "Lot 2", "Test", "n/a"]
+        assert rows[1][8] == "unknown_key;invalid_hours"
+
+
+class TestPointageValidate:
+    """Tests for pointage(validate=True)."""
+
+    def test_report_written(self, pointage_environment):
+        synthese = pointage_environment / "Synthèse_RM_CE.xlsm"
+        wb = load_workbook(synthese)
+        ws = wb["LC"]
+        for row, (key, label, function) in enumerate([("KEY001", "Lot 1", "Dev"), ("KEY002", "Lot 2", "Test")], start=3):
+            ws.cell(row, 2, key), ws.cell(row, 3, label), ws.cell(row, 4, function)
+        wb.save(synthese)
+        manager = RoadmapManager(pointage_environment)
+
+        assert manager.pointage(validate=True)
+
+        with open(manager.validation_output, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [(r["file"], r["row"], r["issues"]) for r in rows] == [
+            ("RM_CLIGNIEZ Yann.xlsx", "5", "unknown_key;unknown_label;invalid_hours")]
+        assert manager.xml_output.exists()
+
+    def test_missing_lc_does_not_block_export(self, pointage_environment, caplog):
+        synthese = pointage_environment / "Synthèse_RM_CE.xlsm"
+        wb = load_workbook(synthese)
+        del wb["LC"]
+        wb.save(synthese)
+        manager = RoadmapManager(pointage_environment)
+
+        with caplog.at_level("ERROR"):
+            assert manager.pointage(validate=True)
+
+        assert "[VALIDATE] Could not read the LC sheet" in caplog.text
+        assert not manager.validation_output.exists()
@@ -0,0 +1,68 @@
+"""
+Worker Bootstrap Tests for Roadmap Manager.
+
+Tests that pool workers load only the engine, and for the task wrapper they run.
+"""
+import os
+import subprocess
+import sys
+
+from roadmap.engine import build_interface
+from roadmap.worker import ping, run_task
+
+
+def imported_modules(code):
+    """Run code in a fresh interpreter and return the roadmap/CLI modules it loaded."""
+    script = code + "\nimport sys\nprint(' '.join(m for m in sys.modules if m.startswith('roadmap') or m == 'argparse'))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+class TestWorkerImports:
+    """Tests for what a spawned worker imports."""
+
+    def test_worker_module_is_lightweight(self):
+        modules = imported_modules("import roadmap.worker")
+
+        assert "roadmap.helpers" not in modules
+        assert "roadmap.main" not in modules
+        assert "roadmap.roadmap" not in modules
+        assert "argparse" not in modules
+
+    def test_engine_does_not_load_cli(self):
+        modules = imported_modules("import roadmap.engine")
+
+        assert "roadmap.helpers" not in modules
+        assert "argparse" not in modules
+
+    def test_archives_do_not_load_cli(self):
+        modules = imported_modules("import roadmap.archives")
+
+        assert "roadmap.helpers" not in modules
+        assert "argparse" not in modules
+
+    def test_package_exports_are_lazy(self):
+        assert "roadmap.roadmap" not in imported_modules("import roadmap")
+        modules = imported_modules(
+            "import roadmap, inspect\nassert roadmap.RoadmapManager.__name__ == 'RoadmapManager'\n"
+            "assert inspect.isfunction(roadmap.main)")
+        assert "roadmap.roadmap" in modules
+
+
+class TestRunTask:
+    """Tests for run_task()."""
+
+    def test_returns_value_spans_and_profile(self, tmp_path, template_bytes):
+        output = tmp_path / "RM_TEST.xlsx"
+
+        seconds, spans, profile = run_task(False, None, build_interface, template_bytes, str(output), "TEST")
+
+        assert output.exists()
+        assert seconds > 0
+        assert spans == [] and profile is None
+
+    def test_ping(self):
+        info = ping()
+
+        assert info["pid"] == os.getpid()
+        assert info["modules"] == len(sys.modules)
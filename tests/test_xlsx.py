@@ -0,0 +1,235 @@
+"""
+Streaming Excel Reader Tests for Roadmap Manager.
+
+Tests for reading worksheet columns straight from the Excel package and for
+the collaborator list read from the synthesis workbook.
+"""
+import zipfile
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+import roadmap.xlsx as xlsx_module
+from roadmap.helpers import get_collaborators_from_workbook
+from roadmap.roadmap import RoadmapManager
+from roadmap.xlsx import (column_index, column_letters, iter_rows,
+                          last_value_row, open_package, read_cell, read_column,
+                          read_data_validations, sheet_names, sheet_part_name)
+
+WORKBOOK_XML = (
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Gestion_Interfaces" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+RELS_XML = (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="worksheet" Target="/xl/worksheets/sheet1.xml"/></Relationships>'
+)
+
+
+def write_package(path, sheet_data, shared_strings=None, after_data=""):
+    """Write a minimal Excel package with one 'Gestion_Interfaces' sheet."""
+    ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.xml", WORKBOOK_XML)
+        zf.writestr("xl/_rels/workbook.xml.rels", RELS_XML)
+        zf.writestr("xl/worksheets/sheet1.xml", f'<worksheet xmlns="{ns}"><sheetData>{sheet_data}</sheetData>{after_data}</worksheet>')
+        if shared_strings is not None:
+            zf.writestr("xl/sharedStrings.xml", f'<sst xmlns="{ns}">{shared_strings}</sst>')
+
+
+class TestColumnHelpers:
+    """Tests for column letter/index conversion."""
+
+    @pytest.mark.parametrize("letters,index", [("A", 1), ("B", 2), ("Z", 26), ("AA", 27), ("BA", 53)])
+    def test_round_trip(self, letters, index):
+        assert column_index(letters) == index
+        assert column_letters(index) == letters
+
+
+class TestReadColumn:
+    """Tests for read_column on openpyxl-written and hand-written packages."""
+
+    def test_reads_until_first_blank(self, tmp_path):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Gestion_Interfaces"
+        ws["B2"] = "Header"
+        ws["B3"] = "  GANI Karim "
+        ws["B4"] = 1234
+        ws["B5"] = "NAZIH Imane"
+        ws["B7"] = "After gap"
+        wb.create_sheet("SYNTHESE")["B3"] = "Not a collaborator"
+        wb.save(tmp_path / "book.xlsm")
+
+        values = read_column(tmp_path / "book.xlsm", "Gestion_Interfaces", "B", start_row=3)
+
+        assert values == ["GANI Karim", "1234", "NAZIH Imane"]
+
+    def test_without_stop_at_blank(self, tmp_path):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Gestion_Interfaces"
+        ws["B3"] = "A"
+        ws["B5"] = "C"
+        wb.save(tmp_path / "book.xlsx")
+
+        values = read_column(tmp_path / "book.xlsx", "Gestion_Interfaces", "B", start_row=3, stop_at_blank=False)
+
+        assert values == ["A", "", "C"]
+
+    def test_inline_rich_and_shared_strings(self, tmp_path):
+        sheet = (
+            '<row r="3"><c r="A3" t="s"><v>0</v></c><c r="B3" t="s"><v>1</v></c></row>'
+            '<row r="4"><c r="B4" t="inlineStr"><is><t>Inline Name</t></is></c></row>'
+            '<row r="5"><c t="str"><v>x</v></c><c t="b"><v>1</v></c></row>'
+        )
+        strings = (
+            '<si><t>Ignored</t></si>'
+            '<si><r><t>Rich </t></r><r><t>Name</t></r><rPh><t>phonetic</t></rPh></si>'
+            '<si><t>Never parsed</t></si>'
+        )
+        write_package(tmp_path / "book.xlsx", sheet, strings)
+
+        values = read_column(tmp_path / "book.xlsx", "Gestion_Interfaces", "B", start_row=3)
+
+        assert values == ["Rich Name", "Inline Name", "TRUE"]
+
+    def test_missing_sheet_raises(self, tmp_path):
+        write_package(tmp_path / "book.xlsx", "")
+
+        with pytest.raises(KeyError):
+            read_column(tmp_path / "book.xlsx", "SYNTHESE")
+
+    def test_absolute_and_relative_targets(self, tmp_path):
+        write_package(tmp_path / "book.xlsx", "")
+        Workbook().save(tmp_path / "openpyxl.xlsx")
+
+        with zipfile.ZipFile(tmp_path / "book.xlsx") as zf:
+            assert sheet_part_name(zf, "Gestion_Interfaces") == "xl/worksheets/sheet1.xml"
+        with zipfile.ZipFile(tmp_path / "openpyxl.xlsx") as zf:
+            assert sheet_part_name(zf, "Sheet") == "xl/worksheets/sheet1.xml"
+
+    def test_open_workbook_read_from_snapshot_copy(self, setup_test_environment, simulated_locker, monkeypatch):
+        synthese = setup_test_environment / "Synthèse_RM_CE.xlsm"
+        simulated_locker.lock(synthese)
+        opened = []
+        original_zipfile = xlsx_module.zipfile.ZipFile
+        monkeypatch.setattr(xlsx_module.zipfile, "ZipFile", lambda path, *a: opened.append(path) or original_zipfile(path, *a))
+
+        values = read_column(synthese, "Gestion_Interfaces", "B", start_row=3)
+
+        assert values == ["CLIGNIEZ Yann", "GANI Karim", "MOUHOUT Marouane"]
+        assert opened and opened[0] != synthese
+        assert not opened[0].exists()
+
+
+class TestIterRows:
+    """Tests for iter_rows and last_value_row."""
+
+    def test_streams_rows_with_dates(self, tmp_path):
+        path = tmp_path / "book.xlsx"
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Data"
+        ws.append(["Header", "B"])
+        ws.append(["a", datetime(2025, 1, 6), 3])
+        ws.append([None, None, None])
+        ws.append(["b", 1.5])
+        wb.save(path)
+
+        with open_package(path) as zf:
+            rows = list(iter_rows(zf, "Data", min_row=2, max_col=2, dates=True))
+            raw = dict(iter_rows(zf, "Data", min_row=2, max_col=2))
+
+        assert rows == [(2, {1: "a", 2: datetime(2025, 1, 6)}), (4, {1: "b", 2: 1.5})]
+        assert raw[2][2] == 45663
+
+    def test_last_value_row(self):
+        sheet_xml = ('<worksheet><sheetData><row r="1"><c r="A1"><v>1</v></c></row>'
+                     '<row r="5"><c r="A5"/><c r="B5"><v>2</v></c></row></sheetData></worksheet>')
+
+        assert last_value_row(sheet_xml, 1) == 1
+        assert last_value_row(sheet_xml, 2) == 5
+        assert last_value_row(sheet_xml, 3) == 0
+
+
+class TestSheetParts:
+    """Tests for sheet_names, read_cell and read_data_validations."""
+
+    VALIDATIONS = (
+        '<dataValidations count="1"><dataValidation type="list" sqref="E3:E1000">'
+        "<formula1>='LC'!$B$3:$B$10000</formula1></dataValidation></dataValidations>"
+        '<extLst><ext uri="{CCE6A557-97BC-4b89-ADB6-D9C93CAAB3DF}" '
+        'xmlns:x14="http://schemas.microsoft.com/office/spreadsheetml/2009/9/main">'
+        '<x14:dataValidations count="2" xmlns:xm="http://schemas.microsoft.com/office/excel/2006/main">'
+        '<x14:dataValidation type="list" allowBlank="1"><x14:formula1><xm:f>LC!$C$3:$C$10000</xm:f>'
+        '</x14:formula1><xm:sqref>F3:F1000</xm:sqref></x14:dataValidation>'
+        '<x14:dataValidation type="whole"/></x14:dataValidations></ext></extLst>'
+    )
+
+    def test_read_cell(self, tmp_path):
+        path = tmp_path / "book.xlsx"
+        write_package(path, '<row r="1"><c r="A1"><v>3</v></c><c r="B1" t="s"><v>1</v></c></row>'
+                            '<row r="2"><c r="B2" t="s"><v>0</v></c></row>',
+                      "<si><t>Header</t></si><si><t>GANI Karim</t></si>")
+
+        with open_package(path) as zf:
+            assert sheet_names(zf) == ["Gestion_Interfaces"]
+            assert read_cell(zf, "Gestion_Interfaces", "B1") == "GANI Karim"
+            assert read_cell(zf, "Gestion_Interfaces", "A1") == 3
+            assert read_cell(zf, "Gestion_Interfaces", "C1") is None
+            assert read_cell(zf, "Gestion_Interfaces", "B9") is None
+
+    def test_read_data_validations(self, tmp_path):
+        path = tmp_path / "book.xlsx"
+        rows = "".join(f'<row r="{r}"><c r="A{r}"><v>{r}</v></c></row>' for r in range(1, 5000))
+        write_package(path, rows, after_data=self.VALIDATIONS)
+
+        with open_package(path) as zf:
+            validations = read_data_validations(zf, "Gestion_Interfaces")
+
+        assert validations == [("E3:E1000", "list", "'LC'!$B$3:$B$10000"),
+                               ("F3:F1000", "list", "LC!$C$3:$C$10000"),
+                               ("", "whole", None)]
+
+    def test_no_validations(self, tmp_path):
+        path = tmp_path / "book.xlsx"
+        write_package(path, '<row r="1"><c r="A1"><v>1</v></c></row>')
+
+        with open_package(path) as zf:
+            assert read_data_validations(zf, "Gestion_Interfaces") == []
+
+
+class TestCollaboratorsFromWorkbook:
+    """Tests for get_collaborators_from_workbook and the manager source order."""
+
+    def test_reads_gestion_interfaces(self, setup_test_environment):
+        collabs = get_collaborators_from_workbook(setup_test_environment / "Synthèse_RM_CE.xlsm")
+
+        assert collabs == ["CLIGNIEZ Yann", "GANI Karim", "MOUHOUT Marouane"]
+
+    def test_missing_or_corrupt_workbook(self, tmp_path, caplog):
+        assert get_collaborators_from_workbook(tmp_path / "missing.xlsm") == []
+
+        (tmp_path / "bad.xlsm").write_bytes(b"garbage")
+        with caplog.at_level("ERROR"):
+            assert get_collaborators_from_workbook(tmp_path / "bad.xlsm") == []
+        assert "[GET_COLLABORATORS] Error reading bad.xlsm" in caplog.text
+
+    def test_create_without_collabs_xml(self, setup_test_environment):
+        tmp_path = setup_test_environment
+        (tmp_path / "collabs.xml").unlink()
+
+        RoadmapManager(tmp_path).create_interfaces()
+
+        created = sorted(p.name for p in (tmp_path / "RM_Collaborateurs").glob("*.xlsx"))
+        assert created == ["RM_CLIGNIEZ Yann.xlsx", "RM_GANI Karim.xlsx", "RM_MOUHOUT Marouane.xlsx"]
+
+    def test_collabs_xml_takes_precedence(self, setup_test_environment):
+        tmp_path = setup_test_environment
+        (tmp_path / "collabs.xml").write_text(
+            "<collaborators><collaborator>GANI Karim</collaborator></collaborators>", encoding="utf-8")
+
+        assert RoadmapManager(tmp_path)._load_collaborators() == ["GANI Karim"]